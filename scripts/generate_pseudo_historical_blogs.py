@@ -14,9 +14,10 @@ then writes parser-compatible markdown files:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import math
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import date, timedelta
 from pathlib import Path
 from statistics import stdev
@@ -52,6 +53,13 @@ REGIME_LABEL = {
 
 JP_WEEKDAY = "月火水木金土日"
 
+# Sidecar manifest of each generated file's inputs (consulted by incremental mode).
+MANIFEST_NAME = ".pseudo_blogs_manifest.json"
+# Bump when render_blog()/build_week_state() output changes for the same inputs.
+GENERATOR_VERSION = 1
+# Longest lookback used by build_week_state (63-day drawdown high).
+INPUT_LOOKBACK_DAYS = 63
+
 
 @dataclass
 class WeekState:
@@ -112,6 +120,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Overwrite existing files in output directory",
     )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Regenerate only weeks whose inputs changed (tracked in a sidecar manifest)",
+    )
     p.add_argument(
         "--warmup-days",
         type=int,
@@ -608,16 +621,81 @@ def build_week_state(
     )
 
 
+def params_hash(params: GenerationParams) -> str:
+    """Hash the generation parameters that affect blog content.
+
+    ``name`` is a label only and is excluded so renamed candidates with
+    identical logic share manifest entries.
+    """
+    payload = asdict(params)
+    payload.pop("name", None)
+    payload["_generator_version"] = GENERATOR_VERSION
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def data_fingerprint(
+    idx: int,
+    obs_date: date,
+    prices: dict[str, list[float]],
+    market: dict[date, tuple[float, float, float, float]],
+) -> str:
+    """Fingerprint the market inputs one week's blog was built from.
+
+    Covers every ETF close in the lookback window ending at *idx* plus the
+    observation-day VIX/index levels, i.e. exactly what build_week_state reads.
+    """
+    start_idx = max(0, idx - INPUT_LOOKBACK_DAYS)
+    h = hashlib.sha256()
+    for sym in ETF_SYMBOLS:
+        window = prices[sym][start_idx: idx + 1]
+        h.update(sym.encode("utf-8"))
+        h.update(json.dumps([round(v, 6) for v in window]).encode("utf-8"))
+    h.update(json.dumps([round(v, 6) for v in market[obs_date]]).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def load_manifest(out_dir: Path) -> dict[str, dict[str, str]]:
+    """Load the sidecar manifest ({blog filename: inputs}), or {} if missing/corrupt."""
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    entries = payload.get("entries") if isinstance(payload, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_manifest(out_dir: Path, entries: dict[str, dict[str, str]]) -> None:
+    """Atomically write the sidecar manifest."""
+    path = out_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    payload = {"version": GENERATOR_VERSION, "entries": dict(sorted(entries.items()))}
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
 def generate_pseudo_blogs(
     start: date,
     end: date,
     output_dir: Path,
     *,
     overwrite: bool = False,
+    incremental: bool = False,
     warmup_days: int = 120,
     params: GenerationParams | None = None,
+    provider: DataProvider | None = None,
 ) -> tuple[int, int]:
-    """Generate parser-compatible pseudo weekly blogs and return (generated, skipped)."""
+    """Generate parser-compatible pseudo weekly blogs and return (generated, skipped).
+
+    With ``incremental=True`` each written file's inputs (params hash,
+    observation date, data fingerprint) are recorded in a sidecar manifest,
+    and only weeks that are new or whose inputs changed are rewritten.
+    Files whose rendered content is unchanged are never touched, so their
+    mtimes (and any downstream parse caches) stay valid.
+    """
     if end < start:
         raise ValueError("end must be on or after start")
     if params is None:
@@ -630,9 +708,10 @@ def generate_pseudo_blogs(
     if cache_start and buffer_start < cache_start:
         buffer_start = cache_start
 
-    alpaca = AlpacaConfig.from_env()
-    fmp = FMPConfig.from_env()
-    provider = DataProvider(alpaca, fmp, cache_dir)
+    if provider is None:
+        alpaca = AlpacaConfig.from_env()
+        fmp = FMPConfig.from_env()
+        provider = DataProvider(alpaca, fmp, cache_dir)
     provider.load_etf_data(ETF_SYMBOLS, buffer_start, end)
     provider.load_fmp_data(buffer_start, end)
 
@@ -678,6 +757,10 @@ def generate_pseudo_blogs(
     out_dir = output_dir
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    p_hash = params_hash(params)
+    manifest = load_manifest(out_dir)
+    manifest_dirty = False
+
     week = first_monday_on_or_after(start)
     generated = 0
     skipped = 0
@@ -693,18 +776,41 @@ def generate_pseudo_blogs(
             week += timedelta(days=7)
             continue
 
+        out_file = out_dir / f"{week.isoformat()}-weekly-strategy.md"
+        inputs = {
+            "params_hash": p_hash,
+            "obs_date": obs.isoformat(),
+            "data_fingerprint": data_fingerprint(day_index[obs], obs, prices, market),
+        }
+
+        if incremental:
+            if out_file.exists() and manifest.get(out_file.name) == inputs:
+                skipped += 1
+                week += timedelta(days=7)
+                continue
+        elif out_file.exists() and not overwrite:
+            skipped += 1
+            week += timedelta(days=7)
+            continue
+
         state = build_week_state(week, obs, day_index, prices, market, params)
         content = render_blog(state)
 
-        out_file = out_dir / f"{week.isoformat()}-weekly-strategy.md"
-        if out_file.exists() and not overwrite:
+        if out_file.exists() and out_file.read_text(encoding="utf-8") == content:
+            # Inputs moved but output did not: keep the file (and its mtime).
             skipped += 1
         else:
             out_file.write_text(content, encoding="utf-8")
             generated += 1
+        if manifest.get(out_file.name) != inputs:
+            manifest[out_file.name] = inputs
+            manifest_dirty = True
 
         week += timedelta(days=7)
 
+    if manifest_dirty:
+        save_manifest(out_dir, manifest)
+
     return generated, skipped
 
 
@@ -718,6 +824,7 @@ def main() -> None:
         end=args.end,
         output_dir=args.output_dir,
         overwrite=args.overwrite,
+        incremental=args.incremental,
         warmup_days=args.warmup_days,
         params=GenerationParams(),
     )
@@ -24,6 +24,7 @@ from scripts.generate_pseudo_historical_blogs import (
     GenerationParams,
     generate_pseudo_blogs,
 )
+from trading.backtest.batch import run_batch
 from trading.backtest.config import BacktestConfig, CostModel
 from trading.backtest.data_provider import DataProvider
 from trading.backtest.strategy_timeline import StrategyTimeline
@@ -130,38 +131,34 @@ def build_provider(start: date, end: date) -> DataProvider:
     return provider
 
 
-def evaluate_candidate(
+def _failed_metrics(status: str) -> dict[str, float | str]:
+    return {
+        "status": status,
+        "p_value": 1.0,
+        "win_rate": 0.0,
+        "mean_weekly_excess": 0.0,
+        "information_ratio": 0.0,
+        "resample_p_value": 1.0,
+        "strategy_return": 0.0,
+        "spy_return": 0.0,
+        "trading_days": 0.0,
+    }
+
+
+def prepare_candidate(
     blogs_dir: Path,
-    provider: DataProvider,
     start: date,
     end: date,
-) -> dict[str, float | str]:
+) -> tuple[StrategyTimeline, BacktestConfig] | dict[str, float | str]:
+    """Build the timeline and config for one candidate, or failed metrics."""
     timeline = StrategyTimeline()
     timeline.build(blogs_dir)
     if not timeline.entries or not timeline.effective_start:
-        return {
-            "status": "invalid",
-            "p_value": 1.0,
-            "win_rate": 0.0,
-            "mean_weekly_excess": 0.0,
-            "information_ratio": 0.0,
-            "strategy_return": 0.0,
-            "spy_return": 0.0,
-            "trading_days": 0.0,
-        }
+        return _failed_metrics("invalid")
 
     run_start = max(start, timeline.effective_start)
     if run_start >= end:
-        return {
-            "status": "too_short",
-            "p_value": 1.0,
-            "win_rate": 0.0,
-            "mean_weekly_excess": 0.0,
-            "information_ratio": 0.0,
-            "strategy_return": 0.0,
-            "spy_return": 0.0,
-            "trading_days": 0.0,
-        }
+        return _failed_metrics("too_short")
 
     config = BacktestConfig(
         start=run_start,
@@ -171,19 +168,51 @@ def evaluate_candidate(
         blogs_dir=blogs_dir,
         cost_model=CostModel(spread_bps=1.0),
     )
-    wf = WalkForwardValidator(config, WalkForwardConfig(), timeline, provider)
-    result = wf.run()
+    return timeline, config
 
-    return {
-        "status": "ok",
-        "p_value": float(result.p_value),
-        "win_rate": float(result.win_rate),
-        "mean_weekly_excess": float(result.mean_weekly_excess),
-        "information_ratio": float(result.information_ratio),
-        "strategy_return": float(result.full_period.total_return_pct),
-        "spy_return": float(result.full_spy.total_return_pct),
-        "trading_days": float(result.full_period.trading_days),
-    }
+
+def evaluate_candidates(
+    blogs_dirs: list[Path],
+    provider: DataProvider,
+    start: date,
+    end: date,
+) -> list[dict[str, float | str]]:
+    """Walk-forward metrics for each candidate; backtests run as one batch."""
+    prepared = [prepare_candidate(d, start, end) for d in blogs_dirs]
+    jobs = [p for p in prepared if isinstance(p, tuple)]
+    full_results = iter(run_batch(jobs, provider))
+
+    metrics: list[dict[str, float | str]] = []
+    for p in prepared:
+        if not isinstance(p, tuple):
+            metrics.append(p)
+            continue
+        timeline, config = p
+        wf = WalkForwardValidator(config, WalkForwardConfig(), timeline, provider)
+        result = wf.run(full_result=next(full_results))
+        metrics.append({
+            "status": "ok",
+            "p_value": float(result.p_value),
+            "win_rate": float(result.win_rate),
+            "mean_weekly_excess": float(result.mean_weekly_excess),
+            "information_ratio": float(result.information_ratio),
+            "resample_p_value": float(
+                result.resampling.p_value if result.resampling else 1.0
+            ),
+            "strategy_return": float(result.full_period.total_return_pct),
+            "spy_return": float(result.full_spy.total_return_pct),
+            "trading_days": float(result.full_period.trading_days),
+        })
+    return metrics
+
+
+def evaluate_candidate(
+    blogs_dir: Path,
+    provider: DataProvider,
+    start: date,
+    end: date,
+) -> dict[str, float | str]:
+    return evaluate_candidates([blogs_dir], provider, start, end)[0]
 
 
 def train_objective(m: dict[str, float | str]) -> float:
@@ -207,17 +236,27 @@ def main() -> None:
     rows: list[dict[str, object]] = []
 
     print(f"Candidates: {len(candidates)}")
+    generated: list[tuple[int, int]] = []
     for cand in candidates:
-        run_dir = cand_dir / cand.candidate_id
-        gen_count, skip_count = generate_pseudo_blogs(
+        generated.append(generate_pseudo_blogs(
             start=args.start,
             end=args.end,
-            output_dir=run_dir,
-            overwrite=True,
+            output_dir=cand_dir / cand.candidate_id,
+            incremental=True,
             warmup_days=120,
             params=cand.params,
-        )
-        train_metrics = evaluate_candidate(run_dir, provider, args.start, args.train_end)
+            provider=provider,
+        ))
+
+    # All candidates share one date axis: backtest them in a single batch.
+    train_all = evaluate_candidates(
+        [cand_dir / cand.candidate_id for cand in candidates],
+        provider, args.start, args.train_end,
+    )
+    for cand, (gen_count, skip_count), train_metrics in zip(
+        candidates, generated, train_all,
+    ):
+        run_dir = cand_dir / cand.candidate_id
         score = train_objective(train_metrics)
         row: dict[str, object] = {
             "candidate_id": cand.candidate_id,
@@ -242,13 +281,11 @@ def main() -> None:
     top = rows_sorted[: max(1, args.top_k)]
 
     print(f"Top-{len(top)} candidates -> holdout evaluation")
-    for row in top:
-        holdout_metrics = evaluate_candidate(
-            Path(str(row["blogs_dir"])),
-            provider,
-            args.holdout_start,
-            args.end,
-        )
+    holdout_all = evaluate_candidates(
+        [Path(str(row["blogs_dir"])) for row in top],
+        provider, args.holdout_start, args.end,
+    )
+    for row, holdout_metrics in zip(top, holdout_all):
         row.update({f"holdout_{k}": v for k, v in holdout_metrics.items()})
         print(
             f"{row['candidate_id']} holdout: p={float(holdout_metrics['p_value']):.4f}, "
@@ -289,6 +326,7 @@ def main() -> None:
         "train_win_rate",
         "train_mean_weekly_excess",
         "train_information_ratio",
+        "train_resample_p_value",
         "train_strategy_return",
         "train_spy_return",
         "holdout_status",
@@ -296,6 +334,7 @@ def main() -> None:
         "holdout_win_rate",
         "holdout_mean_weekly_excess",
         "holdout_information_ratio",
+        "holdout_resample_p_value",
         "holdout_strategy_return",
         "holdout_spy_return",
         "blogs_dir",
@@ -0,0 +1,139 @@
+"""Tests for scripts/generate_pseudo_historical_blogs.py (incremental mode)."""
+
+from __future__ import annotations
+
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ensure scripts/ is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_pseudo_historical_blogs import (
+    ETF_SYMBOLS,
+    MANIFEST_NAME,
+    GenerationParams,
+    generate_pseudo_blogs,
+    load_manifest,
+    params_hash,
+)
+from trading.backtest.data_provider import DataProvider
+from trading.config import AlpacaConfig
+
+
+START = date(2024, 1, 1)
+END = date(2025, 3, 31)
+
+
+def _make_provider(bump_from: date | None = None) -> DataProvider:
+    """Synthetic provider; prices on/after *bump_from* are nudged up 1%."""
+    dp = DataProvider(AlpacaConfig())
+    etf = {s: {} for s in ETF_SYMBOLS}
+    fmp = {"vix": {}, "sp500": {}, "nasdaq": {}, "dow": {}}
+    d = START
+    i = 0
+    while d <= END:
+        if d.weekday() < 5:
+            bump = 1.01 if bump_from and d >= bump_from else 1.0
+            for j, sym in enumerate(ETF_SYMBOLS):
+                etf[sym][d] = round((100 + 10 * j) * (1 + 0.0005 * i) * bump, 4)
+            fmp["vix"][d] = 15.0 + (i % 7)
+            fmp["sp500"][d] = 5000.0 * (1 + 0.0005 * i) * bump
+            fmp["nasdaq"][d] = 18000.0 * (1 + 0.0005 * i) * bump
+            fmp["dow"][d] = 40000.0 * (1 + 0.0005 * i) * bump
+            i += 1
+        d += timedelta(days=1)
+    for sym, data in etf.items():
+        dp.inject_etf_data(sym, data)
+    for key, data in fmp.items():
+        dp.inject_fmp_data(key, data)
+    return dp
+
+
+def _run(out_dir: Path, provider: DataProvider, **kwargs) -> tuple[int, int]:
+    return generate_pseudo_blogs(
+        start=date(2024, 9, 2),
+        end=date(2025, 3, 3),
+        output_dir=out_dir,
+        incremental=True,
+        provider=provider,
+        **kwargs,
+    )
+
+
+# -- params_hash ---------------------------------------------------------------
+
+
+def test_params_hash_ignores_name():
+    assert params_hash(GenerationParams(name="a")) == params_hash(GenerationParams(name="b"))
+
+
+def test_params_hash_changes_with_logic():
+    assert params_hash(GenerationParams()) != params_hash(GenerationParams(tech_tilt=3.0))
+
+
+# -- incremental generation ----------------------------------------------------
+
+
+def test_first_run_writes_manifest(tmp_path):
+    generated, skipped = _run(tmp_path, _make_provider())
+
+    assert generated > 0
+    manifest = load_manifest(tmp_path)
+    blogs = sorted(p.name for p in tmp_path.glob("*-weekly-strategy.md"))
+    assert sorted(manifest) == blogs
+    entry = manifest[blogs[0]]
+    assert set(entry) == {"params_hash", "obs_date", "data_fingerprint"}
+
+
+def test_rerun_with_same_inputs_touches_nothing(tmp_path):
+    provider = _make_provider()
+    generated, _ = _run(tmp_path, provider)
+    mtimes = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.md")}
+
+    again, skipped = _run(tmp_path, provider)
+
+    assert again == 0
+    assert skipped >= generated
+    assert {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.md")} == mtimes
+
+
+def test_data_change_regenerates_only_affected_weeks(tmp_path):
+    _run(tmp_path, _make_provider())
+    before = load_manifest(tmp_path)
+
+    # Revise prices from mid-February: earlier weeks never saw that data.
+    generated, _ = _run(tmp_path, _make_provider(bump_from=date(2025, 2, 18)))
+
+    after = load_manifest(tmp_path)
+    changed = [k for k in after if after[k] != before[k]]
+    assert changed
+    assert all(k >= "2025-02-24" for k in changed)
+    assert generated <= len(changed)
+
+
+def test_params_change_regenerates_all(tmp_path):
+    provider = _make_provider()
+    first, _ = _run(tmp_path, provider)
+
+    generated, _ = _run(tmp_path, provider, params=GenerationParams(bear_cash_boost=9.0))
+
+    manifest = load_manifest(tmp_path)
+    assert {e["params_hash"] for e in manifest.values()} == {
+        params_hash(GenerationParams(bear_cash_boost=9.0))
+    }
+    assert generated <= first
+
+
+def test_corrupt_manifest_is_rebuilt(tmp_path):
+    provider = _make_provider()
+    _run(tmp_path, provider)
+    (tmp_path / MANIFEST_NAME).write_text("{not json", encoding="utf-8")
+
+    generated, _ = _run(tmp_path, provider)
+
+    # Content is unchanged, so files are kept but the manifest is restored.
+    assert generated == 0
+    payload = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert payload["entries"]
@@ -1,12 +1,21 @@
 """Backtest module for weekly trade strategy verification."""
 
+from trading.backtest.batch import run_batch
 from trading.backtest.config import BacktestConfig, CostModel
 from trading.backtest.data_provider import DataProvider
-from trading.backtest.engine import PhaseAEngine, PhaseBEngine
+from trading.backtest.engine import (
+    EventDrivenPhaseBEngine,
+    PhaseAEngine,
+    PhaseBEngine,
+)
 from trading.backtest.metrics import BacktestMetrics, BacktestResult
 from trading.backtest.portfolio_simulator import SimulatedPortfolio, TradeRecord
 from trading.backtest.strategy_timeline import StrategyTimeline
-from trading.backtest.trigger_matcher import TriggerMatcher
+from trading.backtest.trigger_matcher import (
+    TriggerMatcher,
+    TriggerSchedule,
+    build_trigger_schedule,
+)
 from trading.backtest.walk_forward import (
     WalkForwardConfig,
     WalkForwardResult,
@@ -19,13 +28,17 @@ __all__ = [
     "CostModel",
     "BacktestResult",
     "DataProvider",
+    "EventDrivenPhaseBEngine",
     "PhaseAEngine",
     "PhaseBEngine",
     "SimulatedPortfolio",
     "StrategyTimeline",
     "TradeRecord",
     "TriggerMatcher",
+    "TriggerSchedule",
     "WalkForwardConfig",
     "WalkForwardResult",
     "WalkForwardValidator",
+    "build_trigger_schedule",
+    "run_batch",
 ]
@@ -0,0 +1,191 @@
+"""Batched backtest runner: many (timeline, config) runs in one pass over the days."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+from trading.backtest.config import BacktestConfig
+from trading.backtest.data_provider import DataProvider
+from trading.backtest.engine import (
+    PhaseAEngine,
+    PhaseBEngine,
+    _PhaseBState,
+    _snapshot,
+    _strategies_by_day,
+    _week_end_flags,
+)
+from trading.backtest.metrics import BacktestResult, DailySnapshot
+from trading.backtest.portfolio_simulator import SimulatedPortfolio
+from trading.backtest.strategy_timeline import StrategyTimeline
+
+logger = logging.getLogger(__name__)
+
+
+class _SharedDayData:
+    """DataProvider view that memoizes the per-day lookups of the current day.
+
+    Every run in a batch asks for the same day's ETF prices, open prices and
+    market data; the first request hits the provider and the rest reuse it.
+    Anything else is delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: DataProvider) -> None:
+        self._provider = provider
+        self._day: Optional[date] = None
+        self._memo: dict[str, object] = {}
+
+    def __getattr__(self, name: str):
+        return getattr(self._provider, name)
+
+    def _get(self, name: str, d: date):
+        if d != self._day:
+            self._day = d
+            self._memo = {}
+        if name not in self._memo:
+            self._memo[name] = getattr(self._provider, name)(d)
+        return self._memo[name]
+
+    def get_etf_prices(self, d: date) -> dict[str, float]:
+        return self._get("get_etf_prices", d)
+
+    def get_etf_open_prices(self, d: date) -> dict[str, float]:
+        return self._get("get_etf_open_prices", d)
+
+    def get_market_data(self, d: date):
+        return self._get("get_market_data", d)
+
+
+@dataclass
+class _Run:
+    """One simulated portfolio advancing on the shared day axis."""
+
+    engine: object  # PhaseAEngine | PhaseBEngine
+    start: date
+    end: date
+    first: int  # index range on the shared axis (inclusive)
+    last: int
+    strategies: list
+    transitions: set[date]
+    portfolio: SimulatedPortfolio
+    schedule: object = None
+    state: _PhaseBState = field(default_factory=_PhaseBState)
+    snapshots: list[DailySnapshot] = field(default_factory=list)
+
+
+def run_batch(
+    jobs: list[tuple[StrategyTimeline, BacktestConfig]],
+    data_provider: DataProvider,
+) -> list[BacktestResult]:
+    """Run many backtests over one shared trading-day axis.
+
+    Each job is a ``(timeline, config)`` pair, where ``config.phase``
+    selects Phase A or Phase B.  The axis covers the union of all job
+    ranges; each day's prices, open prices, market data and calendar flags
+    are computed once and every portfolio is advanced in lockstep.
+    Per-timeline strategy lookups and Phase B trigger schedules are shared
+    by all jobs on the same timeline and date range.
+
+    Results are returned in job order and are identical to running each
+    job's ``PhaseAEngine`` / ``PhaseBEngine`` on its own.
+    """
+    if not jobs:
+        return []
+
+    shared = _SharedDayData(data_provider)
+    engines = []
+    for timeline, config in jobs:
+        if config.phase == "B":
+            engine = PhaseBEngine(config, timeline, shared)
+        else:
+            engine = PhaseAEngine(config, timeline, shared)
+        engines.append((engine, *engine._validate_range()))
+
+    axis = data_provider.get_trading_days(
+        min(start for _, start, _ in engines),
+        max(end for _, _, end in engines),
+    )
+    pos = {d: i for i, d in enumerate(axis)}
+    week_ends = _week_end_flags(axis)
+
+    # Per-timeline work shared across jobs
+    strategies_cache: dict[int, list] = {}
+    transitions_cache: dict[int, set[date]] = {}
+    schedule_cache: dict[tuple[int, date, date], object] = {}
+
+    runs: list[_Run] = []
+    for engine, start, end in engines:
+        timeline = engine._timeline
+        key = id(timeline)
+        if key not in strategies_cache:
+            strategies_cache[key] = _strategies_by_day(timeline, axis)
+            transitions_cache[key] = set(timeline.get_all_transition_days())
+
+        days = [d for d in axis if start <= d <= end]
+        run = _Run(
+            engine=engine,
+            start=start,
+            end=end,
+            first=pos[days[0]] if days else len(axis),
+            last=pos[days[-1]] if days else -1,
+            strategies=strategies_cache[key],
+            transitions=transitions_cache[key],
+            portfolio=engine._new_portfolio(),
+        )
+        if isinstance(engine, PhaseBEngine):
+            sched_key = (key, start, end)
+            if sched_key in schedule_cache:
+                engine.set_trigger_schedule(schedule_cache[sched_key])
+            run.schedule = engine._prepare_schedule(days)
+            if run.schedule is not None:
+                schedule_cache[sched_key] = run.schedule
+        runs.append(run)
+
+    for i, day in enumerate(axis):
+        active = [r for r in runs if r.first <= i <= r.last]
+        if not active:
+            continue
+
+        prices = shared.get_etf_prices(day)
+        if not prices:
+            logger.warning("No price data for %s, skipping", day)
+            continue
+
+        for run in active:
+            _step(run, i, day, prices, week_ends[i] or i == run.last)
+
+    return [
+        run.engine._build_result(run.start, run.end, run.snapshots, run.portfolio)
+        for run in runs
+    ]
+
+
+def _step(
+    run: _Run,
+    i: int,
+    day: date,
+    prices: dict[str, float],
+    last_of_week: bool,
+) -> None:
+    """Advance one run by one day, mirroring its engine's daily loop."""
+    engine = run.engine
+    strategy = run.strategies[i]
+    is_transition = day in run.transitions
+    is_week_end = engine._config.rebalance_timing == "week_end" and last_of_week
+
+    if isinstance(engine, PhaseBEngine):
+        trades_today = engine._process_day(
+            day, prices, strategy, is_transition, is_week_end,
+            run.portfolio, run.schedule, run.state,
+        )
+        scenario = run.state.current_scenario
+    else:
+        trades_today = engine._process_day(
+            day, prices, strategy, is_transition or is_week_end, run.portfolio,
+        )
+        scenario = "base"
+
+    run.portfolio.update_prices(prices)
+    run.snapshots.append(_snapshot(day, run.portfolio, scenario, trades_today))
@@ -10,7 +10,7 @@ from pathlib import Path
 
 from trading.backtest.config import BacktestConfig, CostModel
 from trading.backtest.data_provider import DataProvider
-from trading.backtest.engine import PhaseAEngine, PhaseBEngine
+from trading.backtest.engine import EventDrivenPhaseBEngine, PhaseAEngine, PhaseBEngine
 from trading.backtest.report import (
     print_comparison_table,
     print_terminal_report,
@@ -102,6 +102,14 @@ def build_parser() -> argparse.ArgumentParser:
         "--step-weeks", type=int, default=2,
         help="Rolling window step size in weeks (default: 2)",
     )
+    parser.add_argument(
+        "--resamples", type=int, default=20_000,
+        help="Bootstrap/permutation resamples for walk-forward (0 disables, default: 20000)",
+    )
+    parser.add_argument(
+        "--event-driven", action="store_true",
+        help="Phase B: skip quiet days (same results as the daily loop, faster)",
+    )
     parser.add_argument(
         "--verbose", action="store_true",
         help="Verbose logging",
@@ -201,6 +209,8 @@ def main(argv: list[str] | None = None) -> None:
     # --- Normal run (with optional benchmark) ---
     if args.phase == "A":
         engine = PhaseAEngine(config, timeline, data_provider)
+    elif args.event_driven:
+        engine = EventDrivenPhaseBEngine(config, timeline, data_provider)
     else:
         engine = PhaseBEngine(config, timeline, data_provider)
 
@@ -333,6 +343,7 @@ def _run_walk_forward(
     wf_config = WalkForwardConfig(
         window_weeks=args.window_weeks,
         step_weeks=args.step_weeks,
+        n_resamples=args.resamples,
     )
 
     print("\n=== Walk-Forward Validation ===", file=sys.stderr)
@@ -355,6 +366,11 @@ def _run_walk_forward(
     print(f"Mean Weekly Excess: {result.mean_weekly_excess:+.2f}%")
     print(f"t-statistic: {result.t_statistic:.2f}, p-value: {result.p_value:.4f}")
     print(f"Information Ratio: {result.information_ratio:.2f}")
+    if result.resampling is not None:
+        print(
+            f"Bootstrap p: {result.resampling.bootstrap_p_value:.4f}, "
+            f"permutation p: {result.resampling.permutation_p_value:.4f}"
+        )
     print(f"Rolling: {pos_win}/{total_win} windows positive")
 
     # Write report
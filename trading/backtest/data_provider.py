@@ -4,9 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
-import urllib.error
 import urllib.parse
-import urllib.request
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -15,6 +13,7 @@ from trading.config import AlpacaConfig, FMPConfig
 from trading.core.constants import ALLOWED_SYMBOLS, FMP_SYMBOLS
 from trading.core.holidays import USMarketCalendar
 from trading.data.models import MarketData
+from trading.services.http_session import HTTPSession
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +44,8 @@ class DataProvider:
         self._etf_cache: dict[str, dict[date, float]] = {}  # symbol -> {date: close}
         self._etf_open_cache: dict[str, dict[date, float]] = {}  # symbol -> {date: open}
         self._fmp_cache: dict[str, dict[date, float]] = {}  # indicator -> {date: value}
+        # Keep-alive pool for FMP history requests (created on first fetch)
+        self._http: Optional[HTTPSession] = None
 
     def load_etf_data(
         self,
@@ -251,9 +252,11 @@ class DataProvider:
                 f"?from={start.isoformat()}&to={end.isoformat()}"
                 f"&apikey={self._fmp.api_key}"
             )
-            req = urllib.request.Request(url, headers={"User-Agent": "trading-backtest"})
-            with urllib.request.urlopen(req, timeout=_REQUEST_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode())
+            if self._http is None:
+                self._http = HTTPSession(timeout=_REQUEST_TIMEOUT)
+            data = self._http.get_json(
+                url, headers={"User-Agent": "trading-backtest"},
+            )
 
             historical = data.get("historical", [])
             close_data: dict[date, float] = {}
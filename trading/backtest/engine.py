@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from datetime import date
 from typing import Optional
 
@@ -46,8 +47,8 @@ def _bisect_index(trading_days: list[date], day: date) -> Optional[int]:
     return None
 
 
-class PhaseAEngine:
-    """Phase A: Weekly rebalance to blog's current_allocation on transition days."""
+class _EngineBase:
+    """Shared setup and result assembly for the Phase A / Phase B engines."""
 
     def __init__(
         self,
@@ -59,7 +60,7 @@ class PhaseAEngine:
         self._timeline = timeline
         self._data = data_provider
 
-    def run(self) -> BacktestResult:
+    def _validate_range(self) -> tuple[date, date]:
         start = self._config.start
         end = self._config.end
 
@@ -74,11 +75,72 @@ class PhaseAEngine:
                 f"--start {start} is before first valid blog ({eff}). "
                 f"Use --start {eff} or later."
             )
+        return start, end
 
+    def _new_portfolio(self) -> SimulatedPortfolio:
         portfolio = SimulatedPortfolio(self._config.initial_capital)
         if self._config.slippage_bps > 0:
             portfolio.set_slippage_fn(self._config.apply_slippage)
         portfolio.set_cost_model(self._config.cost_model)
+        return portfolio
+
+    def _phase_label(self) -> str:
+        raise NotImplementedError
+
+    def _build_result(
+        self,
+        start: date,
+        end: date,
+        snapshots: list[DailySnapshot],
+        portfolio: SimulatedPortfolio,
+    ) -> BacktestResult:
+        metrics = BacktestMetrics(
+            snapshots, self._config.initial_capital,
+            trade_records=portfolio.trades,
+        )
+        transition_days = [
+            d for d in self._timeline.get_all_transition_days()
+            if start <= d <= end
+        ]
+
+        return metrics.build_result(
+            phase=self._phase_label(),
+            start_date=start,
+            end_date=end,
+            blogs_used=len(self._timeline.entries),
+            blogs_skipped=len(self._timeline.skipped),
+            skipped_reasons=[
+                (s.blog_date, s.reason) for s in self._timeline.skipped
+            ],
+            transition_days=transition_days,
+            trade_records=portfolio.trades,
+            total_cost=portfolio.total_costs,
+        )
+
+
+def _snapshot(
+    day: date,
+    portfolio: SimulatedPortfolio,
+    scenario: str,
+    trades_today: int,
+) -> DailySnapshot:
+    return DailySnapshot(
+        date=day,
+        total_value=portfolio.total_value,
+        cash=portfolio.cash,
+        positions_value=portfolio.total_value - portfolio.cash,
+        allocation=portfolio.get_allocation_pct(),
+        scenario=scenario,
+        trades_today=trades_today,
+    )
+
+
+class PhaseAEngine(_EngineBase):
+    """Phase A: Weekly rebalance to blog's current_allocation on transition days."""
+
+    def run(self) -> BacktestResult:
+        start, end = self._validate_range()
+        portfolio = self._new_portfolio()
 
         trading_days = self._data.get_trading_days(start, end)
         snapshots: list[DailySnapshot] = []
@@ -90,7 +152,6 @@ class PhaseAEngine:
                 continue
 
             strategy = self._timeline.get_strategy(day)
-            trades_today = 0
 
             should_rebalance = False
             if self._config.rebalance_timing == "week_end":
@@ -105,59 +166,51 @@ class PhaseAEngine:
                 if self._timeline.is_transition_day(day):
                     should_rebalance = True
 
-            if strategy and should_rebalance:
-                trades = portfolio.rebalance_to(
-                    strategy.current_allocation,
-                    prices,
-                    trade_date=day,
-                    reason="rebalance",
-                )
-                trades_today = len(trades)
-                if self._config.verbose and trades:
-                    logger.info(
-                        "Rebalance %s: %d trades, blog=%s",
-                        day, len(trades), strategy.blog_date,
-                    )
-
+            trades_today = self._process_day(
+                day, prices, strategy, should_rebalance, portfolio,
+            )
             portfolio.update_prices(prices)
+            snapshots.append(_snapshot(day, portfolio, "base", trades_today))
 
-            snap = DailySnapshot(
-                date=day,
-                total_value=portfolio.total_value,
-                cash=portfolio.cash,
-                positions_value=portfolio.total_value - portfolio.cash,
-                allocation=portfolio.get_allocation_pct(),
-                scenario="base",
-                trades_today=trades_today,
-            )
-            snapshots.append(snap)
+        return self._build_result(start, end, snapshots, portfolio)
 
-        metrics = BacktestMetrics(
-            snapshots, self._config.initial_capital,
-            trade_records=portfolio.trades,
+    def _process_day(
+        self,
+        day: date,
+        prices: dict[str, float],
+        strategy,
+        should_rebalance: bool,
+        portfolio: SimulatedPortfolio,
+    ) -> int:
+        """Rebalance to the blog's current_allocation if scheduled today."""
+        if not (strategy and should_rebalance):
+            return 0
+        trades = portfolio.rebalance_to(
+            strategy.current_allocation,
+            prices,
+            trade_date=day,
+            reason="rebalance",
         )
-        transition_days = [
-            d for d in self._timeline.get_all_transition_days()
-            if start <= d <= end
-        ]
+        if self._config.verbose and trades:
+            logger.info(
+                "Rebalance %s: %d trades, blog=%s",
+                day, len(trades), strategy.blog_date,
+            )
+        return len(trades)
 
-        phase_label = "A" if self._config.rebalance_timing == "transition" else "A-friday"
-        return metrics.build_result(
-            phase=phase_label,
-            start_date=start,
-            end_date=end,
-            blogs_used=len(self._timeline.entries),
-            blogs_skipped=len(self._timeline.skipped),
-            skipped_reasons=[
-                (s.blog_date, s.reason) for s in self._timeline.skipped
-            ],
-            transition_days=transition_days,
-            trade_records=portfolio.trades,
-            total_cost=portfolio.total_costs,
-        )
+    def _phase_label(self) -> str:
+        return "A" if self._config.rebalance_timing == "transition" else "A-friday"
+
+
+@dataclass
+class _PhaseBState:
+    """Mutable per-run state shared by the Phase B day handlers."""
 
+    pending_trigger: Optional[str] = None
+    current_scenario: str = "base"
 
-class PhaseBEngine:
+
+class PhaseBEngine(_EngineBase):
     """Phase B: Rule engine simulation with D-day detection / D+1 execution."""
 
     def __init__(
@@ -166,45 +219,30 @@ class PhaseBEngine:
         timeline: StrategyTimeline,
         data_provider: DataProvider,
     ) -> None:
-        self._config = config
-        self._timeline = timeline
-        self._data = data_provider
+        super().__init__(config, timeline, data_provider)
         self._trigger_matcher: Optional[object] = None
+        self._trigger_schedule: Optional[object] = None
 
     def set_trigger_matcher(self, matcher) -> None:
         """Set the trigger matcher (injected, avoids circular import)."""
         self._trigger_matcher = matcher
 
-    def run(self) -> BacktestResult:
-        from trading.backtest.trigger_matcher import TriggerMatcher
-
-        start = self._config.start
-        end = self._config.end
-
-        if not start or not end:
-            raise ValueError("start and end dates required")
+    def set_trigger_schedule(self, schedule) -> None:
+        """Reuse a precomputed market trigger schedule (see trigger_matcher).
 
-        eff = self._timeline.effective_start
-        if eff is None:
-            raise ValueError("No valid blogs found")
-        if start < eff:
-            raise ValueError(
-                f"--start {start} is before first valid blog ({eff}). "
-                f"Use --start {eff} or later."
-            )
-
-        if self._trigger_matcher is None:
-            self._trigger_matcher = TriggerMatcher()
+        A schedule built for a different trading-day range or VIX seed is
+        ignored and rebuilt when the engine runs.
+        """
+        self._trigger_schedule = schedule
 
-        portfolio = SimulatedPortfolio(self._config.initial_capital)
-        if self._config.slippage_bps > 0:
-            portfolio.set_slippage_fn(self._config.apply_slippage)
-        portfolio.set_cost_model(self._config.cost_model)
+    def run(self) -> BacktestResult:
+        start, end = self._validate_range()
+        portfolio = self._new_portfolio()
 
         trading_days = self._data.get_trading_days(start, end)
+        schedule = self._prepare_schedule(trading_days)
         snapshots: list[DailySnapshot] = []
-        pending_trigger: Optional[str] = None
-        current_scenario = "base"
+        state = _PhaseBState()
 
         for day in trading_days:
             prices = self._data.get_etf_prices(day)
@@ -212,111 +250,302 @@ class PhaseBEngine:
                 logger.warning("No price data for %s, skipping", day)
                 continue
 
-            market_data = self._data.get_market_data(day)
             strategy = self._timeline.get_strategy(day)
-            trades_today = 0
-            executed_today = False
-
-            # 1. Scheduled rebalance (highest priority)
             is_transition = self._timeline.is_transition_day(day)
             is_week_end = (
                 self._config.rebalance_timing == "week_end"
                 and _is_last_trading_day_of_week(day, trading_days)
             )
-            if strategy and (is_transition or is_week_end):
+            trades_today = self._process_day(
+                day, prices, strategy, is_transition, is_week_end,
+                portfolio, schedule, state,
+            )
+
+            portfolio.update_prices(prices)
+            snapshots.append(
+                _snapshot(day, portfolio, state.current_scenario, trades_today)
+            )
+
+        return self._build_result(start, end, snapshots, portfolio)
+
+    # --- Shared helpers ---
+
+    def _prepare_schedule(self, trading_days: list[date]):
+        """Install the default matcher and return the market trigger schedule.
+
+        Market-only triggers (VIX crosses, index levels) are precomputed;
+        only drift is evaluated inline, from the matcher's ``prev_vix``
+        seed.  Any other matcher, including a ``TriggerMatcher`` subclass,
+        keeps the day-by-day check() path and gets no schedule (returns
+        None).
+        """
+        from trading.backtest.trigger_matcher import (
+            TriggerMatcher,
+            build_trigger_schedule,
+        )
+
+        if self._trigger_matcher is None:
+            self._trigger_matcher = TriggerMatcher()
+        if type(self._trigger_matcher) is not TriggerMatcher:
+            return None
+
+        prev_vix = self._trigger_matcher.prev_vix
+        schedule = self._trigger_schedule
+        if schedule is None or not schedule.matches(trading_days, prev_vix):
+            schedule = build_trigger_schedule(
+                trading_days, self._data, self._timeline, prev_vix=prev_vix,
+            )
+            self._trigger_schedule = schedule
+        return schedule
+
+    def _process_day(
+        self,
+        day: date,
+        prices: dict[str, float],
+        strategy,
+        is_transition: bool,
+        is_week_end: bool,
+        portfolio: SimulatedPortfolio,
+        schedule,
+        state: _PhaseBState,
+    ) -> int:
+        """Run rebalance, D+1 execution and trigger detection for one day.
+
+        Returns the number of trades executed.  Prices are not marked to
+        market here; the caller does that before taking the snapshot.
+        """
+        trades_today = 0
+        executed_today = False
+
+        # 1. Scheduled rebalance (highest priority)
+        if strategy and (is_transition or is_week_end):
+            trades = portfolio.rebalance_to(
+                strategy.current_allocation,
+                prices,
+                trade_date=day,
+                reason="transition" if is_transition else "week_end_rebalance",
+            )
+            trades_today = len(trades)
+            executed_today = True
+            state.pending_trigger = None
+            state.current_scenario = "base"
+
+        # 2. Execute pending trigger from previous day (D+1 open)
+        pending_trigger = state.pending_trigger
+        if pending_trigger and not executed_today and strategy:
+            # Use open prices for D+1 execution; fall back to close
+            open_prices = self._data.get_etf_open_prices(day)
+            exec_prices = {**prices, **open_prices}
+
+            if pending_trigger == "drift":
+                # Drift: re-rebalance to current scenario allocation
+                if state.current_scenario in strategy.scenarios:
+                    alloc = strategy.scenarios[state.current_scenario].allocation
+                else:
+                    alloc = strategy.current_allocation
                 trades = portfolio.rebalance_to(
-                    strategy.current_allocation,
-                    prices,
+                    alloc, exec_prices,
                     trade_date=day,
-                    reason="transition" if is_transition else "week_end_rebalance",
+                    reason="trigger:drift",
                 )
                 trades_today = len(trades)
-                executed_today = True
-                pending_trigger = None
-                current_scenario = "base"
-
-            # 2. Execute pending trigger from previous day (D+1 open)
-            if pending_trigger and not executed_today and strategy:
-                # Use open prices for D+1 execution; fall back to close
-                open_prices = self._data.get_etf_open_prices(day)
-                exec_prices = {**prices, **open_prices}
-
-                if pending_trigger == "drift":
-                    # Drift: re-rebalance to current scenario allocation
-                    if current_scenario in strategy.scenarios:
-                        alloc = strategy.scenarios[current_scenario].allocation
-                    else:
-                        alloc = strategy.current_allocation
-                    trades = portfolio.rebalance_to(
-                        alloc, exec_prices,
-                        trade_date=day,
-                        reason="trigger:drift",
-                    )
-                    trades_today = len(trades)
+            else:
+                scenario_name = self._trigger_matcher.resolve_scenario(
+                    pending_trigger, strategy,
+                )
+                if scenario_name and scenario_name in strategy.scenarios:
+                    alloc = strategy.scenarios[scenario_name].allocation
+                    state.current_scenario = scenario_name
                 else:
-                    scenario_name = self._trigger_matcher.resolve_scenario(
-                        pending_trigger, strategy,
-                    )
-                    if scenario_name and scenario_name in strategy.scenarios:
-                        alloc = strategy.scenarios[scenario_name].allocation
-                        current_scenario = scenario_name
-                    else:
-                        # No candidate matched → fall back to current_allocation
-                        alloc = strategy.current_allocation
-                    trades = portfolio.rebalance_to(
-                        alloc, exec_prices,
-                        trade_date=day,
-                        reason=f"trigger:{pending_trigger}",
+                    # No candidate matched → fall back to current_allocation
+                    alloc = strategy.current_allocation
+                trades = portfolio.rebalance_to(
+                    alloc, exec_prices,
+                    trade_date=day,
+                    reason=f"trigger:{pending_trigger}",
+                )
+                trades_today = len(trades)
+            executed_today = True
+            state.pending_trigger = None
+
+        # 3. Check for triggers today (close-based, execute tomorrow)
+        # Always call check() to update internal state (prev_vix),
+        # but only act on triggers when no execution happened today.
+        if strategy:
+            if schedule is not None:
+                trigger = schedule.market_trigger(day)
+                if trigger is None and not executed_today:
+                    trigger = self._trigger_matcher.check_drift(
+                        portfolio, strategy,
                     )
-                    trades_today = len(trades)
-                executed_today = True
-                pending_trigger = None
-
-            # 3. Check for triggers today (close-based, execute tomorrow)
-            # Always call check() to update internal state (prev_vix),
-            # but only act on triggers when no execution happened today.
-            if strategy:
+            else:
                 trigger = self._trigger_matcher.check(
-                    market_data, portfolio, strategy,
+                    self._data.get_market_data(day), portfolio, strategy,
                 )
-                if trigger and not executed_today:
-                    pending_trigger = trigger
-                    if self._config.verbose:
-                        logger.info("Trigger detected %s on %s", trigger, day)
+            if trigger and not executed_today:
+                state.pending_trigger = trigger
+                if self._config.verbose:
+                    logger.info("Trigger detected %s on %s", trigger, day)
+
+        return trades_today
+
+    def _phase_label(self) -> str:
+        return "B" if self._config.rebalance_timing == "transition" else "B-friday"
+
+
+class EventDrivenPhaseBEngine(PhaseBEngine):
+    """Phase B engine that only does full work on event days.
+
+    Event days are transitions, week-end rebalances (``week_end`` timing),
+    days with a precomputed market trigger, days carrying a pending
+    trigger, and days whose drift check fires.  All other days are quiet:
+    holdings and cash cannot change, so they are marked to market from a
+    frozen copy of the positions without touching the portfolio, and the
+    drift check reuses the previous snapshot's allocation (exactly what
+    ``check_drift`` would see).  The portfolio is brought up to date just
+    before the next event day, so results are identical to
+    :class:`PhaseBEngine`.
+
+    Falls back to the daily loop when a custom (non-TriggerMatcher)
+    matcher is injected.
+    """
+
+    def run(self) -> BacktestResult:
+        start, end = self._validate_range()
+        trading_days = self._data.get_trading_days(start, end)
+        schedule = self._prepare_schedule(trading_days)
+        if schedule is None:
+            return super().run()
+
+        portfolio = self._new_portfolio()
+        strategies = _strategies_by_day(self._timeline, trading_days)
+        transitions = set(self._timeline.get_all_transition_days())
+        week_ends = (
+            _week_end_flags(trading_days)
+            if self._config.rebalance_timing == "week_end"
+            else [False] * len(trading_days)
+        )
+        matcher = self._trigger_matcher
+
+        snapshots: list[DailySnapshot] = []
+        state = _PhaseBState()
+
+        # Frozen view of the portfolio between events
+        held: list[tuple[str, float]] = []
+        marks: dict[str, float] = {}
+        cash = portfolio.cash
+        last_alloc: dict[str, float] = {}
+        stale = False  # portfolio prices lag behind marks
+
+        for i, day in enumerate(trading_days):
+            prices = self._data.get_etf_prices(day)
+            if not prices:
+                logger.warning("No price data for %s, skipping", day)
+                continue
+
+            strategy = strategies[i]
+            is_transition = day in transitions
+            is_event = strategy is not None and (
+                is_transition
+                or week_ends[i]
+                or state.pending_trigger is not None
+                or schedule.market_trigger(day) is not None
+            )
 
+            if not is_event:
+                # Quiet day: drift sees the allocation left by the last
+                # snapshot, then mark the frozen holdings to market.
+                if strategy is not None:
+                    trigger = matcher.check_allocation_drift(last_alloc, strategy)
+                    if trigger:
+                        state.pending_trigger = trigger
+                        if self._config.verbose:
+                            logger.info("Trigger detected %s on %s", trigger, day)
+
+                for symbol, _ in held:
+                    if symbol in prices:
+                        marks[symbol] = prices[symbol]
+                pos_value = sum(shares * marks[sym] for sym, shares in held)
+                total = cash + pos_value
+                allocation: dict[str, float] = {}
+                if total > 0:
+                    for sym, shares in held:
+                        if shares > 0:
+                            allocation[sym] = (shares * marks[sym] / total) * 100.0
+                stale = True
+                snapshots.append(DailySnapshot(
+                    date=day,
+                    total_value=total,
+                    cash=cash,
+                    positions_value=total - cash,
+                    allocation=allocation,
+                    scenario=state.current_scenario,
+                    trades_today=0,
+                ))
+                last_alloc = allocation
+                continue
+
+            if stale:
+                portfolio.update_prices(marks)
+                stale = False
+
+            trades_today = self._process_day(
+                day, prices, strategy, is_transition, week_ends[i],
+                portfolio, schedule, state,
+            )
             portfolio.update_prices(prices)
 
-            snap = DailySnapshot(
+            total = portfolio.total_value
+            last_alloc = portfolio.get_allocation_pct()
+            snapshots.append(DailySnapshot(
                 date=day,
-                total_value=portfolio.total_value,
+                total_value=total,
                 cash=portfolio.cash,
-                positions_value=portfolio.total_value - portfolio.cash,
-                allocation=portfolio.get_allocation_pct(),
-                scenario=current_scenario,
+                positions_value=total - portfolio.cash,
+                allocation=last_alloc,
+                scenario=state.current_scenario,
                 trades_today=trades_today,
+            ))
+
+            positions = portfolio.positions
+            held = [(sym, pos.shares) for sym, pos in positions.items()]
+            marks = {sym: pos.current_price for sym, pos in positions.items()}
+            cash = portfolio.cash
+
+        if stale:
+            portfolio.update_prices(marks)
+
+        return self._build_result(start, end, snapshots, portfolio)
+
+
+def _week_end_flags(trading_days: list[date]) -> list[bool]:
+    """Vectorised :func:`_is_last_trading_day_of_week` for a sorted list."""
+    n = len(trading_days)
+    flags = [False] * n
+    for i in range(n):
+        if i == n - 1:
+            flags[i] = True
+        else:
+            flags[i] = (
+                trading_days[i + 1].isocalendar()[1]
+                != trading_days[i].isocalendar()[1]
             )
-            snapshots.append(snap)
+    return flags
 
-        metrics = BacktestMetrics(
-            snapshots, self._config.initial_capital,
-            trade_records=portfolio.trades,
-        )
-        transition_days = [
-            d for d in self._timeline.get_all_transition_days()
-            if start <= d <= end
-        ]
 
-        phase_label = "B" if self._config.rebalance_timing == "transition" else "B-friday"
-        return metrics.build_result(
-            phase=phase_label,
-            start_date=start,
-            end_date=end,
-            blogs_used=len(self._timeline.entries),
-            blogs_skipped=len(self._timeline.skipped),
-            skipped_reasons=[
-                (s.blog_date, s.reason) for s in self._timeline.skipped
-            ],
-            transition_days=transition_days,
-            trade_records=portfolio.trades,
-            total_cost=portfolio.total_costs,
-        )
+def _strategies_by_day(timeline: StrategyTimeline, trading_days: list[date]) -> list:
+    """Active strategy per trading day in one pass over the timeline.
+
+    Equivalent to calling ``timeline.get_strategy(day)`` for each day of a
+    sorted *trading_days* list.
+    """
+    entries = timeline.entries
+    result = []
+    j = 0
+    active = None
+    for day in trading_days:
+        while j < len(entries) and entries[j].transition_day <= day:
+            active = entries[j].strategy
+            j += 1
+        result.append(active)
+    return result
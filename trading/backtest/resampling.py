@@ -0,0 +1,142 @@
+"""Resampling significance tests on weekly excess returns.
+
+Complements the normal-approximation ``paired_t_test`` in walk_forward with
+two distribution-free tests on the per-week excess series:
+
+- Stationary block bootstrap (Politis & Romano): resamples blocks of
+  geometric mean length to keep short-range autocorrelation, giving a
+  confidence interval and a two-sided p-value for the mean.
+- Sign-flip permutation: under H0 the weekly excess is symmetric around
+  zero, so each week's sign is exchangeable.
+
+All resamples are drawn at once as numpy arrays (in fixed-size chunks to
+bound memory) from a seeded generator, so results are reproducible.  numpy
+is a declared dependency but imported lazily, so the rest of the backtest
+package loads without it; running the tests without it raises ImportError.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_RESAMPLES = 20_000
+DEFAULT_BLOCK_WEEKS = 4.0
+DEFAULT_SEED = 42
+MIN_WEEKS = 4
+_CHUNK = 4_096  # resamples per array batch
+
+
+@dataclass
+class ResamplingResult:
+    """Outcome of the bootstrap and permutation tests on weekly excess (%)."""
+
+    n_weeks: int
+    n_resamples: int
+    seed: int
+    block_length: float
+    observed_mean: float
+    bootstrap_ci_low: float
+    bootstrap_ci_high: float
+    bootstrap_p_value: float
+    prob_positive: float  # share of bootstrap means > 0
+    permutation_p_value: float
+
+    @property
+    def p_value(self) -> float:
+        """Conservative combined p-value (the larger of the two tests)."""
+        return max(self.bootstrap_p_value, self.permutation_p_value)
+
+
+def stationary_bootstrap_indices(rng, n: int, size: int, block_length: float):
+    """Index matrix (size x n) for the stationary block bootstrap.
+
+    Each row starts a block at a uniform random position; at every later
+    step a new block starts with probability 1/block_length, otherwise the
+    previous index advances by one (wrapping around).
+    """
+    import numpy as np
+
+    p_new = 1.0 / max(block_length, 1.0)
+    new_block = rng.random((size, n)) < p_new
+    new_block[:, 0] = True
+    starts = rng.integers(0, n, size=(size, n))
+
+    cols = np.arange(n)
+    # Column of the most recent block start for every cell
+    block_start_col = np.maximum.accumulate(
+        np.where(new_block, cols, 0), axis=1,
+    )
+    rows = np.arange(size)[:, None]
+    start_idx = starts[rows, block_start_col]
+    return (start_idx + (cols - block_start_col)) % n
+
+
+def resample_weekly_excess(
+    weekly_excess: list[float],
+    n_resamples: int = DEFAULT_RESAMPLES,
+    block_length: float = DEFAULT_BLOCK_WEEKS,
+    seed: int = DEFAULT_SEED,
+    confidence: float = 0.95,
+) -> Optional[ResamplingResult]:
+    """Run the block bootstrap and sign-flip permutation tests.
+
+    Returns None when there are fewer than MIN_WEEKS observations or
+    resampling is disabled (``n_resamples <= 0``).
+
+    Raises
+    ------
+    ImportError
+        If numpy is not installed.
+    """
+    n = len(weekly_excess)
+    if n < MIN_WEEKS or n_resamples <= 0:
+        return None
+
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError(
+            "Resampling tests require numpy; install the package "
+            "dependencies (pip install -e .)"
+        ) from exc
+
+    x = np.asarray(weekly_excess, dtype=float)
+    observed = float(x.mean())
+    rng = np.random.default_rng(seed)
+
+    boot_means = np.empty(n_resamples)
+    perm_hits = 0
+    for lo in range(0, n_resamples, _CHUNK):
+        size = min(_CHUNK, n_resamples - lo)
+
+        idx = stationary_bootstrap_indices(rng, n, size, block_length)
+        boot_means[lo:lo + size] = x[idx].mean(axis=1)
+
+        signs = rng.integers(0, 2, size=(size, n), dtype=np.int8) * 2 - 1
+        perm_means = (signs * x).mean(axis=1)
+        perm_hits += int(np.count_nonzero(
+            np.abs(perm_means) >= abs(observed) - 1e-12
+        ))
+
+    alpha = (1.0 - confidence) / 2.0
+    ci_low, ci_high = np.quantile(boot_means, [alpha, 1.0 - alpha])
+
+    # Two-sided bootstrap p-value: recentre the bootstrap distribution on
+    # H0 (mean 0) and count resamples at least as extreme as observed.
+    boot_hits = int(np.count_nonzero(
+        np.abs(boot_means - observed) >= abs(observed) - 1e-12
+    ))
+
+    return ResamplingResult(
+        n_weeks=n,
+        n_resamples=n_resamples,
+        seed=seed,
+        block_length=block_length,
+        observed_mean=observed,
+        bootstrap_ci_low=float(ci_low),
+        bootstrap_ci_high=float(ci_high),
+        bootstrap_p_value=(boot_hits + 1) / (n_resamples + 1),
+        prob_positive=float(np.count_nonzero(boot_means > 0)) / n_resamples,
+        permutation_p_value=(perm_hits + 1) / (n_resamples + 1),
+    )
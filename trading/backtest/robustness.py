@@ -9,7 +9,7 @@ from pathlib import Path
 
 from trading.backtest.config import BacktestConfig, CostModel
 from trading.backtest.data_provider import DataProvider
-from trading.backtest.engine import PhaseAEngine, PhaseBEngine
+from trading.backtest.batch import run_batch
 from trading.backtest.metrics import BacktestResult
 from trading.backtest.strategy_timeline import StrategyTimeline
 
@@ -33,8 +33,10 @@ def run_cost_matrix(
         ("B-friday", "B", "week_end"),
     ]
 
-    results: list[dict] = []
-
+    # One batched pass over the days advances all mode x cost runs in
+    # lockstep; Phase B runs share one precomputed trigger schedule.
+    labels: list[tuple[str, float]] = []
+    jobs: list[tuple[StrategyTimeline, BacktestConfig]] = []
     for mode_name, phase, timing in modes:
         for cost_bps in cost_levels_bps:
             config = replace(
@@ -43,23 +45,21 @@ def run_cost_matrix(
                 rebalance_timing=timing,
                 cost_model=CostModel(spread_bps=cost_bps),
             )
+            labels.append((mode_name, cost_bps))
+            jobs.append((timeline, config))
 
-            if phase == "A":
-                engine = PhaseAEngine(config, timeline, data_provider)
-            else:
-                engine = PhaseBEngine(config, timeline, data_provider)
-
-            result = engine.run()
-            results.append({
-                "mode": mode_name,
-                "cost_bps": cost_bps,
-                "result": result,
-            })
-            logger.info(
-                "%s @ %d bps: net=%.2f%%, gross=%.2f%%",
-                mode_name, cost_bps,
-                result.total_return_pct, result.gross_return_pct,
-            )
+    results: list[dict] = []
+    for (mode_name, cost_bps), result in zip(labels, run_batch(jobs, data_provider)):
+        results.append({
+            "mode": mode_name,
+            "cost_bps": cost_bps,
+            "result": result,
+        })
+        logger.info(
+            "%s @ %d bps: net=%.2f%%, gross=%.2f%%",
+            mode_name, cost_bps,
+            result.total_return_pct, result.gross_return_pct,
+        )
 
     return results
 
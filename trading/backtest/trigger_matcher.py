@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
+from datetime import date
 from typing import Optional
 
 from trading.core.constants import VIX_RISK_ON, VIX_CAUTION, VIX_STRESS
@@ -26,9 +28,16 @@ TRIGGER_SCENARIO_MAP: dict[str, list[str]] = {
 class TriggerMatcher:
     """Detect market triggers and resolve to blog scenarios."""
 
-    def __init__(self, drift_threshold_pct: float = 3.0) -> None:
+    def __init__(
+        self, drift_threshold_pct: float = 3.0, prev_vix: Optional[float] = None,
+    ) -> None:
         self._drift_threshold = drift_threshold_pct
-        self._prev_vix: Optional[float] = None
+        self._prev_vix: Optional[float] = prev_vix
+
+    @property
+    def prev_vix(self) -> Optional[float]:
+        """Last VIX seen (the baseline for the next cross check)."""
+        return self._prev_vix
 
     def check(
         self,
@@ -40,6 +49,22 @@ class TriggerMatcher:
 
         Returns trigger type string or None.
         """
+        trigger = self.check_market(market_data, strategy)
+        if trigger:
+            return trigger
+        return self.check_drift(portfolio, strategy)
+
+    def check_market(
+        self,
+        market_data: MarketData,
+        strategy: StrategySpec,
+    ) -> Optional[str]:
+        """Check the market-only triggers (VIX crosses, then index levels).
+
+        These depend on market data and the strategy alone, never on the
+        portfolio, so they can be precomputed for a whole run
+        (see :func:`build_trigger_schedule`).
+        """
         vix = market_data.vix
 
         # VIX cross triggers (use strategy's thresholds if available)
@@ -86,16 +111,33 @@ class TriggerMatcher:
             if levels.sell_level and index_value >= levels.sell_level:
                 return "index_sell_level"
 
-        # Drift detection
+        return None
+
+    def check_drift(
+        self,
+        portfolio,  # SimulatedPortfolio
+        strategy: StrategySpec,
+    ) -> Optional[str]:
+        """Check the portfolio-dependent drift trigger."""
         if hasattr(portfolio, 'get_allocation_pct'):
-            current = portfolio.get_allocation_pct()
-            if strategy.current_allocation and current:
-                max_drift = max(
-                    abs(current.get(sym, 0) - target)
-                    for sym, target in strategy.current_allocation.items()
-                )
-                if max_drift > self._drift_threshold:
-                    return "drift"
+            return self.check_allocation_drift(
+                portfolio.get_allocation_pct(), strategy,
+            )
+        return None
+
+    def check_allocation_drift(
+        self,
+        current: dict[str, float],
+        strategy: StrategySpec,
+    ) -> Optional[str]:
+        """Drift check against an allocation snapshot ({symbol: pct})."""
+        if strategy.current_allocation and current:
+            max_drift = max(
+                abs(current.get(sym, 0) - target)
+                for sym, target in strategy.current_allocation.items()
+            )
+            if max_drift > self._drift_threshold:
+                return "drift"
 
         return None
 
@@ -124,3 +166,88 @@ class TriggerMatcher:
             trigger, candidates,
         )
         return None
+
+
+@dataclass
+class TriggerSchedule:
+    """Market-only triggers for a run, precomputed as day-aligned arrays.
+
+    ``days`` is the trading-day axis the schedule was built for.  For each
+    day, ``vix_triggers`` / ``index_triggers`` hold the trigger type that
+    fired (or None), and ``evaluated`` is False where the engine would not
+    have checked triggers at all (no prices or no active strategy).
+    ``prev_vix`` is the VIX the walk started from.
+    """
+
+    days: list[date]
+    vix_triggers: list[Optional[str]]
+    index_triggers: list[Optional[str]]
+    evaluated: list[bool]
+    prev_vix: Optional[float] = None
+    _pos: dict[date, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._pos = {d: i for i, d in enumerate(self.days)}
+
+    def matches(self, trading_days: list[date], prev_vix: Optional[float] = None) -> bool:
+        """True if this schedule was built for exactly *trading_days* and *prev_vix*."""
+        return self.days == trading_days and self.prev_vix == prev_vix
+
+    def market_trigger(self, day: date) -> Optional[str]:
+        """VIX trigger if any, else index trigger, else None."""
+        i = self._pos.get(day)
+        if i is None:
+            return None
+        return self.vix_triggers[i] or self.index_triggers[i]
+
+    @property
+    def trigger_count(self) -> int:
+        return sum(
+            1 for v, x in zip(self.vix_triggers, self.index_triggers) if v or x
+        )
+
+
+def build_trigger_schedule(
+    trading_days: list[date],
+    data_provider,  # DataProvider
+    timeline,  # StrategyTimeline
+    prev_vix: Optional[float] = None,
+) -> TriggerSchedule:
+    """Precompute VIX-cross and index-level triggers for *trading_days*.
+
+    Walks the days exactly as ``PhaseBEngine`` does: days without ETF
+    prices or without an active strategy are not evaluated, so they leave
+    the VIX cross state untouched.  The result is independent of costs,
+    slippage and rebalance timing, so one schedule can be shared by every
+    Phase B run over the same day range.  *prev_vix* seeds the VIX cross
+    state as in :class:`TriggerMatcher`.
+    """
+    matcher = TriggerMatcher(prev_vix=prev_vix)
+    n = len(trading_days)
+    vix_triggers: list[Optional[str]] = [None] * n
+    index_triggers: list[Optional[str]] = [None] * n
+    evaluated = [False] * n
+
+    for i, day in enumerate(trading_days):
+        if not data_provider.get_etf_prices(day):
+            continue
+        strategy = timeline.get_strategy(day)
+        if not strategy:
+            continue
+
+        evaluated[i] = True
+        trigger = matcher.check_market(data_provider.get_market_data(day), strategy)
+        if trigger is None:
+            continue
+        if trigger.startswith("vix_"):
+            vix_triggers[i] = trigger
+        else:
+            index_triggers[i] = trigger
+
+    return TriggerSchedule(
+        days=list(trading_days),
+        vix_triggers=vix_triggers,
+        index_triggers=index_triggers,
+        evaluated=evaluated,
+        prev_vix=prev_vix,
+    )
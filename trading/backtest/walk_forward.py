@@ -6,8 +6,16 @@ import math
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 from pathlib import Path
+from typing import Optional
 
 from trading.backtest.metrics import BacktestResult
+from trading.backtest.resampling import (
+    DEFAULT_BLOCK_WEEKS,
+    DEFAULT_RESAMPLES,
+    DEFAULT_SEED,
+    ResamplingResult,
+    resample_weekly_excess,
+)
 
 
 @dataclass
@@ -17,6 +25,10 @@ class WalkForwardConfig:
     window_weeks: int = 6
     step_weeks: int = 2
     min_weeks: int = 4
+    # Block bootstrap / sign-flip permutation on weekly excess (0 disables)
+    n_resamples: int = DEFAULT_RESAMPLES
+    block_length_weeks: float = DEFAULT_BLOCK_WEEKS
+    seed: int = DEFAULT_SEED
 
 
 @dataclass
@@ -62,6 +74,7 @@ class WalkForwardResult:
     t_statistic: float = 0.0
     p_value: float = 1.0
     information_ratio: float = 0.0
+    resampling: Optional[ResamplingResult] = None
     # Verdict
     verdict: str = "NOT_SIGNIFICANT"
     verdict_detail: str = ""
@@ -82,17 +95,23 @@ class WalkForwardValidator:
         self._timeline = timeline
         self._data = data_provider
 
-    def run(self) -> WalkForwardResult:
-        """Run all validation steps."""
+    def run(self, full_result=None) -> WalkForwardResult:
+        """Run all validation steps.
+
+        *full_result* may carry an already computed full-period
+        BacktestResult for this config (e.g. from ``batch.run_batch``);
+        otherwise the strategy is backtested here.
+        """
         from trading.backtest.benchmark import BenchmarkEngine
         from trading.backtest.engine import PhaseAEngine, PhaseBEngine
 
         # 1. Full period strategy
-        if self._config.phase == "B":
-            engine = PhaseBEngine(self._config, self._timeline, self._data)
-        else:
-            engine = PhaseAEngine(self._config, self._timeline, self._data)
-        full_result = engine.run()
+        if full_result is None:
+            if self._config.phase == "B":
+                engine = PhaseBEngine(self._config, self._timeline, self._data)
+            else:
+                engine = PhaseAEngine(self._config, self._timeline, self._data)
+            full_result = engine.run()
 
         # 2. Full period SPY B&H
         bench = BenchmarkEngine(
@@ -137,9 +156,17 @@ class WalkForwardValidator:
         t_stat, p_val = paired_t_test(daily_excess)
         ir = information_ratio(daily_excess)
 
-        # 8. Verdict
+        # 8. Resampling tests on weekly excess
+        resampling = resample_weekly_excess(
+            [w.excess_pct for w in weekly],
+            n_resamples=self._wf_config.n_resamples,
+            block_length=self._wf_config.block_length_weeks,
+            seed=self._wf_config.seed,
+        )
+
+        # 9. Verdict
         verdict, detail = determine_verdict(
-            p_val, win_rate, rolling, len(daily_excess),
+            p_val, win_rate, rolling, len(daily_excess), resampling,
         )
 
         return WalkForwardResult(
@@ -153,6 +180,7 @@ class WalkForwardValidator:
             t_statistic=t_stat,
             p_value=p_val,
             information_ratio=ir,
+            resampling=resampling,
             verdict=verdict,
             verdict_detail=detail,
         )
@@ -352,28 +380,39 @@ def determine_verdict(
     win_rate: float,
     rolling: list[WindowResult],
     n_days: int,
+    resampling: Optional[ResamplingResult] = None,
 ) -> tuple[str, str]:
     """Determine statistical verdict.
 
     SIGNIFICANT:     p < 0.05 AND win_rate >= 60%
+                     (AND resampling p < 0.05 when resampling is given)
     INCONCLUSIVE:    p < 0.10 OR win_rate >= 55%
     NOT_SIGNIFICANT: otherwise
     """
     positive_windows = sum(1 for w in rolling if w.excess_return_pct > 0)
     total_windows = len(rolling)
+    resample_note = ""
+    if resampling is not None:
+        resample_note = (
+            f" Bootstrap p={resampling.bootstrap_p_value:.4f}, "
+            f"permutation p={resampling.permutation_p_value:.4f}."
+        )
 
     if p_value < 0.05 and win_rate >= 0.60:
-        detail = (
-            f"p={p_value:.4f} < 0.05, win_rate={win_rate:.0%} >= 60%. "
-            f"Rolling: {positive_windows}/{total_windows} windows positive."
-        )
-        return "SIGNIFICANT", detail
+        if resampling is None or resampling.p_value < 0.05:
+            detail = (
+                f"p={p_value:.4f} < 0.05, win_rate={win_rate:.0%} >= 60%. "
+                f"Rolling: {positive_windows}/{total_windows} windows positive."
+                f"{resample_note}"
+            )
+            return "SIGNIFICANT", detail
 
     if p_value < 0.10 or win_rate >= 0.55:
         detail = (
             f"p={p_value:.4f}, win_rate={win_rate:.0%}. "
             f"n={n_days} days insufficient for definitive conclusion. "
             f"Rolling: {positive_windows}/{total_windows} windows positive."
+            f"{resample_note}"
         )
         return "INCONCLUSIVE", detail
 
@@ -442,6 +481,19 @@ def write_walk_forward_report(result: WalkForwardResult, path: Path) -> None:
     lines.append(f"- Daily excess return: {mean_daily:+.4f}% (ann. ~{ann_excess:+.1f}%)")
     lines.append(f"- t-statistic: {result.t_statistic:.2f}, p-value: {result.p_value:.4f}")
     lines.append(f"- Information Ratio: {result.information_ratio:.2f}")
+    rs = result.resampling
+    if rs is not None:
+        lines.append(
+            f"- Block bootstrap ({rs.n_resamples:,} resamples, "
+            f"mean block {rs.block_length:g} wk): mean weekly excess "
+            f"{rs.observed_mean:+.2f}% "
+            f"[95% CI {rs.bootstrap_ci_low:+.2f}%, {rs.bootstrap_ci_high:+.2f}%], "
+            f"p={rs.bootstrap_p_value:.4f}, P(mean>0)={rs.prob_positive:.0%}"
+        )
+        lines.append(
+            f"- Sign-flip permutation: p={rs.permutation_p_value:.4f} "
+            f"(seed {rs.seed})"
+        )
     lines.append(f"- **Verdict: {result.verdict}**")
     lines.append(f"- {result.verdict_detail}")
     lines.append("")
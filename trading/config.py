@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import dataclasses
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -29,14 +30,24 @@ class AlpacaConfig:
     secret_key: str = ""
     base_url: str = "https://paper-api.alpaca.markets"  # paper by default
     data_url: str = "https://data.alpaca.markets"
+    # Shared read cache TTLs (seconds, 0 disables). Orders and fills
+    # invalidate account/positions regardless of TTL.
+    quote_ttl_sec: float = 10.0
+    account_ttl_sec: float = 30.0
+    # Track fills via the trade-updates websocket (polling is the fallback)
+    trade_stream: bool = True
 
     @classmethod
-    def from_env(cls) -> AlpacaConfig:
+    def from_env(cls, prefix: str = "") -> AlpacaConfig:
+        """Read ``{prefix}ALPACA_*`` (prefix selects a per-account set)."""
         return cls(
-            api_key=_env("ALPACA_API_KEY"),
-            secret_key=_env("ALPACA_SECRET_KEY"),
-            base_url=_env("ALPACA_BASE_URL", "https://paper-api.alpaca.markets"),
-            data_url=_env("ALPACA_DATA_URL", "https://data.alpaca.markets"),
+            api_key=_env(f"{prefix}ALPACA_API_KEY"),
+            secret_key=_env(f"{prefix}ALPACA_SECRET_KEY"),
+            base_url=_env(f"{prefix}ALPACA_BASE_URL", "https://paper-api.alpaca.markets"),
+            data_url=_env(f"{prefix}ALPACA_DATA_URL", "https://data.alpaca.markets"),
+            quote_ttl_sec=_env_float(f"{prefix}ALPACA_QUOTE_TTL_SEC", 10.0),
+            account_ttl_sec=_env_float(f"{prefix}ALPACA_ACCOUNT_TTL_SEC", 30.0),
+            trade_stream=_env_bool(f"{prefix}ALPACA_TRADE_STREAM", True),
         )
 
     @property
@@ -64,6 +75,11 @@ class EmailConfig:
     sender: str = ""
     password: str = ""
     recipient: str = ""
+    smtp_starttls: bool = True
+    # Background delivery: INFO/ALERT messages are coalesced into one digest
+    # per window; CRITICAL is sent immediately. Queue is bounded.
+    digest_interval_sec: float = 60.0
+    queue_size: int = 200
 
     @classmethod
     def from_env(cls) -> EmailConfig:
@@ -73,6 +89,50 @@ class EmailConfig:
             sender=_env("EMAIL_SENDER"),
             password=_env("EMAIL_PASSWORD"),
             recipient=_env("EMAIL_RECIPIENT"),
+            smtp_starttls=_env_bool("SMTP_STARTTLS", True),
+            digest_interval_sec=_env_float("EMAIL_DIGEST_INTERVAL_SEC", 60.0),
+            queue_size=_env_int("EMAIL_QUEUE_SIZE", 200),
+        )
+
+
+# TradingConfig risk limits an account may override with
+# ACCOUNT_<NAME>_<FIELD> (e.g. ACCOUNT_LIVE_MAX_DAILY_LOSS_PCT=-2)
+ACCOUNT_RISK_FIELDS = (
+    "max_daily_loss_pct",
+    "max_weekly_loss_pct",
+    "max_drawdown_pct",
+    "max_daily_orders",
+    "max_daily_turnover_pct",
+    "max_single_order_pct",
+    "min_trade_pct",
+    "min_trade_usd",
+)
+
+
+@dataclass(frozen=True)
+class AccountConfig:
+    """One Alpaca account traded by the multi-account orchestrator."""
+
+    name: str
+    alpaca: AlpacaConfig = field(default_factory=AlpacaConfig)
+    dry_run: bool = False  # force dry-run even when the process runs --live
+    risk: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls, name: str) -> AccountConfig:
+        prefix = f"ACCOUNT_{name.upper()}_"
+        risk: dict[str, float] = {}
+        for field_name in ACCOUNT_RISK_FIELDS:
+            key = prefix + field_name.upper()
+            if key in os.environ:
+                risk[field_name] = (
+                    _env_int(key) if field_name == "max_daily_orders" else _env_float(key)
+                )
+        return cls(
+            name=name,
+            alpaca=AlpacaConfig.from_env(prefix),
+            dry_run=_env_bool(prefix + "DRY_RUN", False),
+            risk=risk,
         )
 
 
@@ -116,6 +176,43 @@ class TradingConfig:
     alpaca_position_max_staleness: int = 60
     alpaca_quote_max_staleness: int = 120
 
+    # Per-tick deadline for the concurrent FMP / treasury / Alpaca fetches
+    # (seconds). Sources still running at the deadline use previous values.
+    market_data_deadline_sec: float = 12.0
+
+    # Live order submission: max concurrent submit calls, and how long to
+    # wait for sell proceeds before sending buys that need the cash.
+    order_submit_concurrency: int = 4
+    sell_settle_timeout_sec: float = 30.0
+
+    # Layer 2 latency budget per agent run (seconds); past it the
+    # deterministic trigger -> scenario fallback is used instead.
+    agent_deadline_sec: float = 60.0
+
+    # Layer 2 decision cache: reuse a recent intent for the same quantized
+    # situation within this many seconds (0 disables); drift bucket size (%).
+    decision_cache_ttl_sec: float = 1800.0
+    decision_drift_bucket_pct: float = 2.5
+
+    # Fast-path polling between full ticks (seconds, 0 disables; 30-60
+    # recommended): VIX / index quotes only, escalates to a full tick when
+    # a VIX cross, level hit or drift is detected.
+    fast_tick_interval_sec: float = 0.0
+
+    # Watch the blogs directory with inotify (Linux) instead of stat-polling
+    # it every tick; falls back to stat polling when unavailable.
+    strategy_inotify: bool = True
+
+    # market_states retention: intraday rows older than this many days are
+    # rolled up into market_states_daily; vacuum is none/incremental/full.
+    market_state_retention_days: int = 30
+    market_state_vacuum: str = "incremental"
+
+    # Per-tick phase timings: persist to tick_metrics, and optionally log
+    # each tick as one JSON line on the "trading.tick_metrics" logger.
+    tick_metrics_enabled: bool = True
+    tick_metrics_json_log: bool = False
+
     # Index-to-ETF conversion tolerance
     index_etf_tolerance_pct: float = 0.5
 
@@ -127,6 +224,10 @@ class TradingConfig:
     # Mode
     dry_run: bool = True  # log-only mode (no actual orders)
 
+    # Multi-account mode (TRADING_ACCOUNTS=paper,live): one market / agent
+    # pass per tick fanned out to every account; empty = single account.
+    accounts: tuple[AccountConfig, ...] = ()
+
     @classmethod
     def from_env(cls) -> TradingConfig:
         project_root = Path(_env(
@@ -146,4 +247,36 @@ class TradingConfig:
             max_daily_loss_pct=_env_float("MAX_DAILY_LOSS_PCT", -3.0),
             max_weekly_loss_pct=_env_float("MAX_WEEKLY_LOSS_PCT", -7.0),
             max_drawdown_pct=_env_float("MAX_DRAWDOWN_PCT", -15.0),
+            market_data_deadline_sec=_env_float("MARKET_DATA_DEADLINE_SEC", 12.0),
+            order_submit_concurrency=_env_int("ORDER_SUBMIT_CONCURRENCY", 4),
+            sell_settle_timeout_sec=_env_float("SELL_SETTLE_TIMEOUT_SEC", 30.0),
+            agent_deadline_sec=_env_float("AGENT_DEADLINE_SEC", 60.0),
+            decision_cache_ttl_sec=_env_float("DECISION_CACHE_TTL_SEC", 1800.0),
+            decision_drift_bucket_pct=_env_float("DECISION_DRIFT_BUCKET_PCT", 2.5),
+            fast_tick_interval_sec=_env_float("FAST_TICK_INTERVAL_SEC", 0.0),
+            strategy_inotify=_env_bool("STRATEGY_INOTIFY", True),
+            market_state_retention_days=_env_int("MARKET_STATE_RETENTION_DAYS", 30),
+            market_state_vacuum=_env("MARKET_STATE_VACUUM", "incremental"),
+            tick_metrics_enabled=_env_bool("TICK_METRICS_ENABLED", True),
+            tick_metrics_json_log=_env_bool("TICK_METRICS_JSON_LOG", False),
+            accounts=tuple(
+                AccountConfig.from_env(name.strip())
+                for name in _env("TRADING_ACCOUNTS").split(",") if name.strip()
+            ),
+        )
+
+    def for_account(self, account: AccountConfig) -> TradingConfig:
+        """This config as seen by one account: its keys, DB and limits.
+
+        Each account gets its own database under ``<db dir>/accounts/``.
+        An account's dry_run can only add caution: ``--dry-run`` on the
+        process applies to every account.
+        """
+        return dataclasses.replace(
+            self,
+            alpaca=account.alpaca,
+            db_path=self.db_path.parent / "accounts" / f"{account.name}.db",
+            dry_run=self.dry_run or account.dry_run,
+            accounts=(),
+            **account.risk,
         )
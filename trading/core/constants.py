@@ -79,6 +79,7 @@ INDEX_TO_ETF: dict[str, str] = {
     "gold": "GLD",
     "oil": "XLE",
 }
+ETF_TO_INDEX: dict[str, str] = {etf: idx for idx, etf in INDEX_TO_ETF.items()}
 
 # --- Scheduler ---
 MARKET_OPEN_HOUR = 9
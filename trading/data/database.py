@@ -3,26 +3,48 @@
 from __future__ import annotations
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+from trading.data.migrator import MIGRATIONS_DIR, AppliedMigration, MigrationRunner
 from trading.data.models import AccountSnapshot
 
 
-MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+# market_states value columns, in schema order
+MARKET_STATE_COLUMNS = ("vix", "us10y", "sp500", "nasdaq", "dow", "gold", "oil", "copper")
 
 
 class Database:
-    """Synchronous SQLite wrapper for the trading system."""
+    """Synchronous SQLite wrapper for the trading system.
+
+    Each write method commits on its own unless it runs inside
+    :meth:`transaction`, in which case the writes are committed together
+    when the outermost block exits.
+
+    The ``state`` key/value table is cached in memory (write-through):
+    it is loaded on the first ``get_state`` and kept current by
+    ``set_state``.  The process is the only writer (SchedulerGuard), so
+    the cache is authoritative; :meth:`refresh_state_cache` reloads it if
+    another connection has committed since, and a rolled-back transaction
+    drops it.
+    """
 
     def __init__(self, db_path: str | Path):
         self.db_path = str(db_path)
         self._conn: Optional[sqlite3.Connection] = None
+        self._tx_depth = 0
+        self.commits = 0  # for tests / diagnostics
+        self._state_cache: Optional[dict[str, str]] = None
+        self._data_version: Optional[int] = None
 
     def connect(self) -> None:
         self._conn = sqlite3.connect(self.db_path)
         self._conn.row_factory = sqlite3.Row
+        # Only takes effect on a new (empty) database; lets the retention
+        # job reclaim pages with PRAGMA incremental_vacuum.
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA busy_timeout=5000")
 
@@ -30,6 +52,7 @@ class Database:
         if self._conn:
             self._conn.close()
             self._conn = None
+        self._state_cache = None
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -37,11 +60,48 @@ class Database:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._conn
 
-    def migrate(self) -> None:
-        migration_file = MIGRATIONS_DIR / "001_initial.sql"
-        sql = migration_file.read_text()
-        self.conn.executescript(sql)
-        self.conn.commit()
+    @contextmanager
+    def transaction(self) -> Iterator[Database]:
+        """Unit of work: defer commits until the outermost block exits.
+
+        Nested blocks join the outer one.  If the block raises, all writes
+        since the last commit are rolled back.  Writes that record a broker
+        side effect (``save_trade``, ``update_trade_status``,
+        ``increment_stop_seq``) still commit immediately, so a failure later
+        in the tick cannot erase the record of a submitted order.
+
+        Keep blocks short: the first deferred write takes SQLite's write
+        lock until the block exits, so a block spanning the agent call
+        would lock out other connections (retention, migrator, CLIs).
+        """
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.rollback()
+                self.invalidate_state_cache()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            self._commit()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._tx_depth > 0
+
+    def _commit(self, durable: bool = False) -> None:
+        """Commit now unless inside :meth:`transaction` (or *durable*)."""
+        if self._tx_depth and not durable:
+            return
+        if self.conn.in_transaction:
+            self.conn.commit()
+            self.commits += 1
+
+    def migrate(self, dry_run: bool = False) -> list[AppliedMigration]:
+        """Apply pending schema migrations (see :mod:`trading.data.migrator`)."""
+        return MigrationRunner(self.conn, MIGRATIONS_DIR).apply(dry_run=dry_run)
 
     # --- Snapshots ---
 
@@ -65,7 +125,7 @@ class Database:
             "INSERT OR IGNORE INTO snapshots (type, date, account_value) VALUES (?, ?, ?)",
             (snapshot_type, target_date.isoformat(), account_value),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_week_opening_snapshot(self) -> Optional[AccountSnapshot]:
         today = date.today()
@@ -106,26 +166,50 @@ class Database:
             "WHERE excluded.value > high_water_mark.value",
             (value, now),
         )
-        self.conn.commit()
+        self._commit()
 
     # --- State (key/value) ---
 
     def get_state(self, key: str, default: str = "0") -> str:
-        row = self.conn.execute(
-            "SELECT value FROM state WHERE key = ?", (key,)
-        ).fetchone()
-        if row is None:
-            return default
-        return row["value"]
+        if self._state_cache is None:
+            self._load_state_cache()
+        return self._state_cache.get(key, default)
 
-    def set_state(self, key: str, value: str) -> None:
+    def set_state(self, key: str, value: str, durable: bool = False) -> None:
+        """Upsert *key*; *durable* commits now even inside :meth:`transaction`.
+
+        Use *durable* for guard state (daily-check markers, processed stop
+        fills, API failure counters) that must not be rolled back.
+        """
         now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
             "INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?) "
             "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
             (key, value, now),
         )
-        self.conn.commit()
+        if self._state_cache is not None:
+            self._state_cache[key] = value
+        self._commit(durable=durable)
+
+    def invalidate_state_cache(self) -> None:
+        """Drop the cached state table; the next ``get_state`` reloads it."""
+        self._state_cache = None
+
+    def refresh_state_cache(self) -> bool:
+        """Reload the state cache if another connection committed since it
+        was loaded (``PRAGMA data_version``).  Returns True if reloaded."""
+        if self._state_cache is None:
+            return False
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._load_state_cache()
+        return True
+
+    def _load_state_cache(self) -> None:
+        rows = self.conn.execute("SELECT key, value FROM state").fetchall()
+        self._state_cache = {r["key"]: r["value"] for r in rows}
+        self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
 
     # --- Stop Sequence ---
 
@@ -139,14 +223,14 @@ class Database:
                 "INSERT INTO stop_seq (symbol, blog_date, seq) VALUES (?, ?, 0)",
                 (symbol, blog_date),
             )
-            self.conn.commit()
+            self._commit(durable=True)
             return 0
         new_seq = row["seq"] + 1
         self.conn.execute(
             "UPDATE stop_seq SET seq = ? WHERE symbol = ? AND blog_date = ?",
             (new_seq, symbol, blog_date),
         )
-        self.conn.commit()
+        self._commit(durable=True)
         return new_seq
 
     # --- Calibration ---
@@ -158,28 +242,40 @@ class Database:
         ).fetchone()
         return row["ratio"] if row else None
 
+    def get_calibrations(self, target_date: date) -> dict[str, float]:
+        """All calibration ratios for *target_date*, keyed by ETF symbol."""
+        rows = self.conn.execute(
+            "SELECT symbol, ratio FROM calibration WHERE date = ?",
+            (target_date.isoformat(),),
+        ).fetchall()
+        return {r["symbol"]: r["ratio"] for r in rows}
+
     def save_calibration(self, target_date: date, symbol: str, index_symbol: str, ratio: float) -> None:
         self.conn.execute(
             "INSERT OR REPLACE INTO calibration (date, symbol, index_symbol, ratio) VALUES (?, ?, ?, ?)",
             (target_date.isoformat(), symbol, index_symbol, ratio),
         )
-        self.conn.commit()
+        self._commit()
 
     # --- Decisions ---
 
     def log_decision(self, timestamp: str, run_id: Optional[str], trigger_type: str,
-                     result: str, scenario: Optional[str] = None, rationale: Optional[str] = None) -> None:
+                     result: str, scenario: Optional[str] = None, rationale: Optional[str] = None,
+                     fingerprint: Optional[str] = None, cache_hit: bool = False,
+                     fallback: bool = False, source_run_id: Optional[str] = None) -> None:
         self.conn.execute(
-            "INSERT INTO decisions (timestamp, run_id, trigger_type, result, scenario, rationale) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (timestamp, run_id, trigger_type, result, scenario, rationale),
+            "INSERT INTO decisions (timestamp, run_id, trigger_type, result, scenario, rationale, "
+            "fingerprint, cache_hit, fallback, source_run_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (timestamp, run_id, trigger_type, result, scenario, rationale,
+             fingerprint, int(cache_hit), int(fallback), source_run_id),
         )
-        self.conn.commit()
+        self._commit()
 
     def count_today_orders(self) -> int:
         today_str = date.today().isoformat()
         row = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM trades WHERE date(created_at, 'localtime') = ?",
+            "SELECT COUNT(*) as cnt FROM trades WHERE trade_date = ?",
             (today_str,),
         ).fetchone()
         return row["cnt"] if row else 0
@@ -188,7 +284,7 @@ class Database:
         today_str = date.today().isoformat()
         row = self.conn.execute(
             "SELECT COALESCE(SUM(ABS(quantity * filled_price)), 0) as total "
-            "FROM trades WHERE date(created_at, 'localtime') = ? AND filled_price IS NOT NULL",
+            "FROM trades WHERE trade_date = ? AND filled_price IS NOT NULL",
             (today_str,),
         ).fetchone()
         return row["total"] if row else 0.0
@@ -200,11 +296,12 @@ class Database:
                    filled_at: Optional[str] = None) -> None:
         self.conn.execute(
             "INSERT OR IGNORE INTO trades "
-            "(client_order_id, symbol, side, quantity, filled_price, status, filled_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (client_order_id, symbol, side, quantity, filled_price, status, filled_at),
+            "(client_order_id, symbol, side, quantity, filled_price, status, filled_at, trade_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (client_order_id, symbol, side, quantity, filled_price, status, filled_at,
+             date.today().isoformat()),
         )
-        self.conn.commit()
+        self._commit(durable=True)
 
     def update_trade_status(self, client_order_id: str, status: str,
                             filled_price: Optional[float] = None,
@@ -220,7 +317,7 @@ class Database:
                 "UPDATE trades SET status = ? WHERE client_order_id = ?",
                 (status, client_order_id),
             )
-        self.conn.commit()
+        self._commit(durable=True)
 
     # --- Market States ---
 
@@ -234,7 +331,7 @@ class Database:
             "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (timestamp, vix, us10y, sp500, nasdaq, dow, gold, oil, copper),
         )
-        self.conn.commit()
+        self._commit()
 
     def get_previous_market_state_timestamp(self) -> Optional[datetime]:
         """Get the timestamp of the most recent market_states row.
@@ -263,20 +360,172 @@ class Database:
             return None
 
     def get_previous_market_state(self, key: str) -> Optional[float]:
-        col_map = {
-            "vix": "vix", "us10y": "us10y", "sp500": "sp500",
-            "nasdaq": "nasdaq", "dow": "dow", "gold": "gold", "oil": "oil",
-            "copper": "copper",
-        }
-        col = col_map.get(key)
-        if not col:
+        if key not in MARKET_STATE_COLUMNS:
             return None
+        col = key
         row = self.conn.execute(
             f"SELECT {col} FROM market_states WHERE {col} IS NOT NULL "
             "ORDER BY id DESC LIMIT 1"
         ).fetchone()
         return row[0] if row else None
 
+    def get_recent_market_values(self, key: str, limit: int = 2) -> list[float]:
+        """Latest *limit* non-null values of one market_states column, newest first."""
+        if key not in MARKET_STATE_COLUMNS:
+            return []
+        rows = self.conn.execute(
+            f"SELECT {key} FROM market_states WHERE {key} IS NOT NULL "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def get_latest_market_state(self) -> dict[str, float]:
+        """Latest non-null value of every market_states column, in one query.
+
+        Columns with no intraday value left (e.g. after retention pruned
+        them) fall back to the close of the latest daily rollup.  Columns
+        that have never been recorded are omitted.  Each subquery walks the
+        column's partial index, so the cost does not grow with the table.
+        """
+        select = ", ".join(
+            f"(SELECT {col} FROM market_states WHERE {col} IS NOT NULL "
+            f"ORDER BY id DESC LIMIT 1) AS {col}"
+            for col in MARKET_STATE_COLUMNS
+        )
+        row = self.conn.execute(f"SELECT {select}").fetchone()
+        latest = {col: row[col] for col in MARKET_STATE_COLUMNS if row[col] is not None}
+        missing = [col for col in MARKET_STATE_COLUMNS if col not in latest]
+        if missing:
+            rows = self.conn.execute(
+                "SELECT d.metric, d.close FROM market_states_daily d "
+                "WHERE d.metric IN ({}) AND d.date = ("
+                "SELECT MAX(date) FROM market_states_daily WHERE metric = d.metric)"
+                .format(", ".join("?" * len(missing))),
+                missing,
+            ).fetchall()
+            latest.update({r["metric"]: r["close"] for r in rows})
+        return latest
+
+    # --- Market state rollup / retention ---
+
+    def rollup_market_states(self, before: date) -> tuple[int, int]:
+        """Fold intraday market_states rows dated before *before* into
+        ``market_states_daily`` and delete them.
+
+        The most recent row is always kept so freshness checks still have
+        a timestamp.  Returns ``(days_rolled, rows_deleted)``.
+        """
+        cutoff = before.isoformat()
+        newest = self.conn.execute("SELECT MAX(id) FROM market_states").fetchone()[0]
+        if newest is None:
+            return 0, 0
+        rows = self.conn.execute(
+            "SELECT id, timestamp, {} FROM market_states "
+            "WHERE timestamp < ? AND id < ? ORDER BY id".format(", ".join(MARKET_STATE_COLUMNS)),
+            (cutoff, newest),
+        ).fetchall()
+        if not rows:
+            return 0, 0
+
+        daily = _aggregate_daily(rows)
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO market_states_daily "
+                "(metric, date, open, high, low, close, samples) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(metric, date) DO UPDATE SET "
+                "high = MAX(high, excluded.high), low = MIN(low, excluded.low), "
+                "close = excluded.close, samples = samples + excluded.samples",
+                [(m, d, *ohlc) for (m, d), ohlc in daily.items()],
+            )
+            self.conn.execute(
+                "DELETE FROM market_states WHERE id <= ? AND timestamp < ?",
+                (rows[-1]["id"], cutoff),
+            )
+        return len({d for _, d in daily}), len(rows)
+
+    def get_daily_market_history(self, since: date) -> list[dict]:
+        """Daily OHLC per metric from *since* onwards, oldest first.
+
+        Combines the rollup table with days still held as intraday rows
+        (aggregated on the fly).
+        """
+        since_str = since.isoformat()
+        merged: dict[tuple[str, str], list] = {
+            (r["metric"], r["date"]): [r["open"], r["high"], r["low"], r["close"], r["samples"]]
+            for r in self.conn.execute(
+                "SELECT metric, date, open, high, low, close, samples "
+                "FROM market_states_daily WHERE date >= ?",
+                (since_str,),
+            )
+        }
+        raw = self.conn.execute(
+            "SELECT id, timestamp, {} FROM market_states "
+            "WHERE timestamp >= ? ORDER BY id".format(", ".join(MARKET_STATE_COLUMNS)),
+            (since_str,),
+        ).fetchall()
+        for key, (o, h, l, c, n) in _aggregate_daily(raw).items():
+            if key in merged:
+                prev = merged[key]
+                merged[key] = [prev[0], max(prev[1], h), min(prev[2], l), c, prev[4] + n]
+            else:
+                merged[key] = [o, h, l, c, n]
+        return [
+            {"date": d, "metric": m, "open": v[0], "high": v[1], "low": v[2],
+             "close": v[3], "samples": v[4]}
+            for (m, d), v in sorted(merged.items(), key=lambda kv: (kv[0][1], kv[0][0]))
+        ]
+
+    def vacuum(self, mode: str = "incremental") -> None:
+        """Reclaim free pages: ``"incremental"`` or ``"full"``.
+
+        A full VACUUM also switches the file to incremental auto-vacuum so
+        later runs can use the cheap mode.
+        """
+        if mode not in ("full", "incremental"):
+            raise ValueError(f"Unknown vacuum mode: {mode}")
+        if self._tx_depth:
+            raise RuntimeError("vacuum() cannot run inside a transaction")
+        self._commit()
+        if mode == "full":
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.conn.execute("VACUUM")
+        else:
+            self.conn.execute("PRAGMA incremental_vacuum").fetchall()
+            self.conn.commit()
+        # In WAL mode the freed pages only leave the main file at checkpoint
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    # --- Tick metrics ---
+
+    def save_tick_metrics(self, rows: list[tuple]) -> None:
+        """Insert ``(tick_id, job, started_at, phase, duration_ms, outcome)`` rows."""
+        self.conn.executemany(
+            "INSERT INTO tick_metrics (tick_id, job, started_at, phase, duration_ms, outcome) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._commit()
+
+    def prune_tick_metrics(self, before: date) -> int:
+        """Delete phase timings of runs started before *before*; returns rows deleted."""
+        cur = self.conn.execute(
+            "DELETE FROM tick_metrics WHERE started_at < ?", (before.isoformat(),),
+        )
+        self._commit()
+        return cur.rowcount
+
+    def get_tick_metrics(self, since: str, job: Optional[str] = None) -> list[dict]:
+        """Phase timings recorded at or after *since* (ISO timestamp)."""
+        sql = "SELECT * FROM tick_metrics WHERE started_at >= ?"
+        params: list = [since]
+        if job is not None:
+            sql += " AND job = ?"
+            params.append(job)
+        rows = self.conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [dict(r) for r in rows]
+
     def get_recent_decisions(self, limit: int = 20) -> list[dict]:
         rows = self.conn.execute(
             "SELECT * FROM decisions ORDER BY id DESC LIMIT ?", (limit,)
@@ -288,3 +537,24 @@ class Database:
             "SELECT * FROM trades ORDER BY id DESC LIMIT ?", (limit,)
         ).fetchall()
         return [dict(r) for r in rows]
+
+
+def _aggregate_daily(rows) -> dict[tuple[str, str], list]:
+    """Per (metric, UTC date) ``[open, high, low, close, samples]`` from
+    market_states rows ordered by id."""
+    daily: dict[tuple[str, str], list] = {}
+    for r in rows:
+        day = r["timestamp"][:10]
+        for col in MARKET_STATE_COLUMNS:
+            val = r[col]
+            if val is None:
+                continue
+            agg = daily.get((col, day))
+            if agg is None:
+                daily[(col, day)] = [val, val, val, val, 1]
+            else:
+                agg[1] = max(agg[1], val)
+                agg[2] = min(agg[2], val)
+                agg[3] = val
+                agg[4] += 1
+    return daily
@@ -0,0 +1,27 @@
+-- Indexes and stored trade dates for the per-tick / per-validation queries
+
+-- Local trade date, so "today's orders" is an index lookup instead of
+-- evaluating date(created_at, 'localtime') for every row.
+ALTER TABLE trades ADD COLUMN trade_date TEXT;
+UPDATE trades SET trade_date = date(created_at, 'localtime') WHERE trade_date IS NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_trade_date ON trades (trade_date);
+
+-- Rows inserted without an explicit trade_date still get one
+CREATE TRIGGER IF NOT EXISTS trades_fill_trade_date
+AFTER INSERT ON trades WHEN NEW.trade_date IS NULL
+BEGIN
+    UPDATE trades SET trade_date = date(NEW.created_at, 'localtime') WHERE id = NEW.id;
+END;
+
+-- Latest non-null value per market_states column: partial indexes keep
+-- each lookup O(log n) even for columns that are mostly NULL.
+CREATE INDEX IF NOT EXISTS idx_ms_vix ON market_states (id) WHERE vix IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_us10y ON market_states (id) WHERE us10y IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_sp500 ON market_states (id) WHERE sp500 IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_nasdaq ON market_states (id) WHERE nasdaq IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_dow ON market_states (id) WHERE dow IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_gold ON market_states (id) WHERE gold IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_oil ON market_states (id) WHERE oil IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ms_copper ON market_states (id) WHERE copper IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions (timestamp);
@@ -0,0 +1,18 @@
+-- Daily OHLC rollup of market_states (intraday rows older than the
+-- retention window are folded in here and deleted)
+
+CREATE TABLE IF NOT EXISTS market_states_daily (
+    metric TEXT NOT NULL,         -- 'vix', 'us10y', 'sp500', ...
+    date TEXT NOT NULL,           -- YYYY-MM-DD (UTC date of the ticks)
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (metric, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_states_daily_date ON market_states_daily (date);
+
+-- Retention cutoff lookup
+CREATE INDEX IF NOT EXISTS idx_market_states_timestamp ON market_states (timestamp);
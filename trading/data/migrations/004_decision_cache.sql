@@ -0,0 +1,5 @@
+-- Decision memoization: the situation fingerprint of each agent decision
+-- and whether the intent was reused from the decision cache
+
+ALTER TABLE decisions ADD COLUMN fingerprint TEXT;
+ALTER TABLE decisions ADD COLUMN cache_hit INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,3 @@
+-- Decisions made by the deterministic fallback after the agent deadline
+
+ALTER TABLE decisions ADD COLUMN fallback INTEGER NOT NULL DEFAULT 0;
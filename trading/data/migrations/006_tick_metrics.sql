@@ -0,0 +1,14 @@
+-- Per-tick phase timings (one row per phase per scheduler run; phase
+-- 'total' is the whole run and carries the outcome)
+
+CREATE TABLE IF NOT EXISTS tick_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tick_id TEXT NOT NULL,
+    job TEXT NOT NULL,            -- 'market_tick' / 'daily_check'
+    started_at TEXT NOT NULL,     -- ISO 8601 UTC
+    phase TEXT NOT NULL,          -- 'total', 'market_fetch', 'agent', ...
+    duration_ms REAL NOT NULL,
+    outcome TEXT                  -- 'no_action', 'trigger_fired', 'skipped', 'error', ...
+);
+
+CREATE INDEX IF NOT EXISTS idx_tick_metrics_started ON tick_metrics (started_at);
@@ -0,0 +1,4 @@
+-- Decisions that reused a cached intent run under a fresh run_id (so
+-- client_order_ids never repeat); this records the run they came from
+
+ALTER TABLE decisions ADD COLUMN source_run_id TEXT;
@@ -0,0 +1,261 @@
+"""Versioned schema migrations for the trading SQLite database.
+
+Migrations live in ``trading/data/migrations`` as ``NNN_name.sql`` or
+``NNN_name.py`` (a module defining ``upgrade(conn)``).  Applied versions are
+recorded in the ``schema_version`` table; each pending migration runs in its
+own transaction, so a failing migration leaves the schema at the previous
+version.
+
+Usage::
+
+    python -m trading.data.migrator                  # apply pending migrations
+    python -m trading.data.migrator --dry-run        # run and roll back
+    python -m trading.data.migrator --db path/to.db --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+_NAME_RE = re.compile(r"^(\d{3})_(\w+)\.(sql|py)$")
+
+_SCHEMA_VERSION_DDL = (
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    "version INTEGER PRIMARY KEY, "
+    "name TEXT NOT NULL, "
+    "applied_at TEXT NOT NULL, "
+    "duration_ms REAL)"
+)
+
+
+class MigrationError(Exception):
+    """A migration failed or the migrations directory is inconsistent."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def kind(self) -> str:
+        return self.path.suffix[1:]
+
+
+@dataclass
+class AppliedMigration:
+    migration: Migration
+    duration_ms: float
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """Return migrations in *directory* sorted by version."""
+    found: dict[int, Migration] = {}
+    for path in directory.iterdir():
+        m = _NAME_RE.match(path.name)
+        if m is None:
+            continue
+        version = int(m.group(1))
+        if version in found:
+            raise MigrationError(
+                f"Duplicate migration version {version:03d}: "
+                f"{found[version].path.name}, {path.name}"
+            )
+        found[version] = Migration(version=version, name=m.group(2), path=path)
+    return [found[v] for v in sorted(found)]
+
+
+def split_sql(script: str) -> list[str]:
+    """Split a SQL script into complete statements (trigger bodies intact)."""
+    statements: list[str] = []
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        if not buf and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            statements.append(buf.strip())
+            buf = ""
+    if buf.strip():
+        statements.append(buf.strip())
+    return statements
+
+
+class MigrationRunner:
+    """Applies pending migrations to one connection."""
+
+    def __init__(
+        self, conn: sqlite3.Connection, directory: Path = MIGRATIONS_DIR,
+    ) -> None:
+        self._conn = conn
+        self._migrations = discover_migrations(directory)
+
+    @property
+    def migrations(self) -> list[Migration]:
+        return list(self._migrations)
+
+    def applied_versions(self) -> set[int]:
+        self._ensure_version_table()
+        rows = self._conn.execute("SELECT version FROM schema_version").fetchall()
+        return {r[0] for r in rows}
+
+    def current_version(self) -> int:
+        return max(self.applied_versions(), default=0)
+
+    def pending(self) -> list[Migration]:
+        applied = self.applied_versions()
+        return [m for m in self._migrations if m.version not in applied]
+
+    def apply(self, dry_run: bool = False) -> list[AppliedMigration]:
+        """Apply pending migrations in version order.
+
+        With *dry_run*, every pending migration is executed inside one
+        transaction that is then rolled back: SQL errors surface and
+        timings are reported, but the database is left unchanged.
+        """
+        pending = self.pending()
+        if not pending:
+            return []
+
+        results: list[AppliedMigration] = []
+        if dry_run:
+            self._begin()
+            try:
+                for migration in pending:
+                    results.append(self._run(migration))
+            finally:
+                self._conn.rollback()
+            return results
+
+        for migration in pending:
+            self._begin()
+            try:
+                result = self._run(migration)
+                self._record(result)
+            except Exception:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+            logger.info(
+                "Applied migration %03d_%s (%.1f ms)",
+                migration.version, migration.name, result.duration_ms,
+            )
+            results.append(result)
+        return results
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _begin(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.commit()
+        self._conn.execute("BEGIN")
+
+    def _run(self, migration: Migration) -> AppliedMigration:
+        start = time.perf_counter()
+        try:
+            if migration.kind == "sql":
+                for stmt in split_sql(migration.path.read_text()):
+                    self._conn.execute(stmt)
+            else:
+                _load_upgrade(migration.path)(self._conn)
+        except Exception as exc:
+            raise MigrationError(
+                f"Migration {migration.path.name} failed: {exc}"
+            ) from exc
+        return AppliedMigration(
+            migration=migration,
+            duration_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def _record(self, result: AppliedMigration) -> None:
+        self._conn.execute(
+            "INSERT INTO schema_version (version, name, applied_at, duration_ms) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                result.migration.version,
+                result.migration.name,
+                datetime.now(timezone.utc).isoformat(),
+                round(result.duration_ms, 3),
+            ),
+        )
+
+    def _ensure_version_table(self) -> None:
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        ).fetchone()
+        if exists:
+            return
+        self._conn.execute(_SCHEMA_VERSION_DDL)
+        self._conn.commit()
+
+
+def _load_upgrade(path: Path):
+    spec = importlib.util.spec_from_file_location(f"_migration_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise MigrationError(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    upgrade = getattr(module, "upgrade", None)
+    if upgrade is None:
+        raise MigrationError(f"{path.name} does not define upgrade(conn)")
+    return upgrade
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from trading.config import TradingConfig
+
+    parser = argparse.ArgumentParser(description="Apply trading DB migrations")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="Database path (default: configured db_path)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Run pending migrations and roll back")
+    parser.add_argument("--status", action="store_true",
+                        help="Show current version and pending migrations")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    db_path = args.db or TradingConfig.from_env().db_path
+    conn = sqlite3.connect(str(db_path))
+    try:
+        runner = MigrationRunner(conn)
+        if args.status:
+            print(f"Current version: {runner.current_version()}")
+            for m in runner.pending():
+                print(f"  pending: {m.path.name}")
+            return 0
+        results = runner.apply(dry_run=args.dry_run)
+        label = "Would apply" if args.dry_run else "Applied"
+        for r in results:
+            print(f"{label} {r.migration.path.name} ({r.duration_ms:.1f} ms)")
+        if not results:
+            print("Schema is up to date")
+        return 0
+    except MigrationError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
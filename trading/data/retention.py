@@ -0,0 +1,106 @@
+"""Retention job for market_states history and tick metrics.
+
+Intraday rows (one per 15-minute tick) older than the retention window are
+rolled up into ``market_states_daily`` (OHLC per metric and day) and
+deleted; ``tick_metrics`` rows older than the window are deleted outright.
+Either is optionally followed by a VACUUM.  Runs daily from the scheduler
+after the close, or by hand::
+
+    python -m trading.data.retention --days 30 --vacuum full
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+from trading.data.database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+VACUUM_MODES = ("none", "incremental", "full")
+
+
+@dataclass
+class RetentionResult:
+    cutoff: date
+    days_rolled: int
+    rows_deleted: int
+    vacuum: str
+    metrics_deleted: int = 0
+
+
+def run_retention(
+    db: Database,
+    retain_days: int = DEFAULT_RETENTION_DAYS,
+    vacuum: str = "incremental",
+    today: Optional[date] = None,
+) -> RetentionResult:
+    """Roll up and prune market_states, and prune tick_metrics, older than
+    *retain_days*."""
+    if vacuum not in VACUUM_MODES:
+        raise ValueError(f"vacuum must be one of {VACUUM_MODES}, got {vacuum!r}")
+    cutoff = (today or date.today()) - timedelta(days=retain_days)
+
+    days_rolled, rows_deleted = db.rollup_market_states(before=cutoff)
+    metrics_deleted = db.prune_tick_metrics(before=cutoff)
+    pruned = rows_deleted or metrics_deleted
+    if pruned and vacuum != "none":
+        db.vacuum(vacuum)
+
+    logger.info(
+        "Retention: rolled %d day(s) before %s into market_states_daily, "
+        "deleted %d row(s) and %d tick metric row(s), vacuum=%s",
+        days_rolled, cutoff, rows_deleted, metrics_deleted, vacuum,
+    )
+    return RetentionResult(
+        cutoff=cutoff,
+        days_rolled=days_rolled,
+        rows_deleted=rows_deleted,
+        vacuum=vacuum if pruned else "none",
+        metrics_deleted=metrics_deleted,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from trading.config import TradingConfig
+
+    parser = argparse.ArgumentParser(
+        description="Roll up and prune market_states, prune tick_metrics",
+    )
+    parser.add_argument("--db", type=Path, default=None,
+                        help="Database path (default: configured db_path)")
+    parser.add_argument("--days", type=int, default=None,
+                        help="Intraday rows to keep, in days (default: config)")
+    parser.add_argument("--vacuum", choices=VACUUM_MODES, default=None,
+                        help="Vacuum mode after pruning (default: config)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config = TradingConfig.from_env()
+    db = Database(args.db or config.db_path)
+    db.connect()
+    try:
+        db.migrate()
+        result = run_retention(
+            db,
+            retain_days=args.days if args.days is not None else config.market_state_retention_days,
+            vacuum=args.vacuum or config.market_state_vacuum,
+        )
+    finally:
+        db.close()
+    print(
+        f"Rolled {result.days_rolled} day(s) before {result.cutoff}, "
+        f"deleted {result.rows_deleted} row(s) and "
+        f"{result.metrics_deleted} tick metric row(s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
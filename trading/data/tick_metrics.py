@@ -0,0 +1,200 @@
+"""Phase timings for scheduler runs.
+
+Each ``market_tick`` / ``daily_check`` run gets a :class:`TickTimer`; the
+orchestrator wraps every phase (strategy load, market fetch, rule check,
+agent, execution, fills, ...) in ``timer.span(name)``.  When the run ends
+the timer is persisted to ``tick_metrics`` (one row per phase plus a
+``total`` row carrying the outcome) and can be logged as one JSON line.
+
+Where the latency budget goes, by phase::
+
+    python -m trading.data.tick_metrics --days 7
+    python -m trading.data.tick_metrics --days 1 --job daily_check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from trading.data.database import Database
+
+logger = logging.getLogger(__name__)
+
+# JSON lines go to their own logger so a handler can route them separately
+json_logger = logging.getLogger("trading.tick_metrics")
+
+TOTAL = "total"
+
+
+class TickTimer:
+    """Accumulates wall-clock milliseconds per phase for one scheduler run.
+
+    A phase entered more than once in a run (e.g. ``agent`` for a missed
+    daily check and then a trigger) is summed into one entry.
+    """
+
+    def __init__(self, job: str, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.job = job
+        self.tick_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.outcome = "skipped"
+        self.phases: dict[str, float] = {}
+        self._clock = clock
+        self._start = clock()
+        self._total_ms: Optional[float] = None
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = (self._clock() - start) * 1000.0
+            self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    def finish(self, outcome: Optional[str] = None) -> float:
+        """Stop the clock and return the total duration in milliseconds."""
+        if outcome is not None:
+            self.outcome = outcome
+        if self._total_ms is None:
+            self._total_ms = (self._clock() - self._start) * 1000.0
+        return self._total_ms
+
+    @property
+    def total_ms(self) -> float:
+        if self._total_ms is not None:
+            return self._total_ms
+        return (self._clock() - self._start) * 1000.0
+
+    def rows(self) -> list[tuple]:
+        """``tick_metrics`` rows: the total first, then phases in run order."""
+        rows = [(self.tick_id, self.job, self.started_at, TOTAL,
+                 round(self.total_ms, 3), self.outcome)]
+        rows += [
+            (self.tick_id, self.job, self.started_at, phase, round(ms, 3), None)
+            for phase, ms in self.phases.items()
+        ]
+        return rows
+
+    def as_dict(self) -> dict:
+        return {
+            "tick_id": self.tick_id,
+            "job": self.job,
+            "started_at": self.started_at,
+            "outcome": self.outcome,
+            "total_ms": round(self.total_ms, 3),
+            "phases": {phase: round(ms, 3) for phase, ms in self.phases.items()},
+        }
+
+
+def record_tick(db: Database, timer: TickTimer, persist: bool = True,
+                json_log: bool = False) -> None:
+    """Persist and/or log a finished timer; never raises."""
+    timer.finish()
+    if json_log:
+        json_logger.info(json.dumps(timer.as_dict(), sort_keys=True))
+    if not persist:
+        return
+    try:
+        db.save_tick_metrics(timer.rows())
+    except Exception:
+        logger.exception("Failed to save tick metrics for %s", timer.tick_id)
+
+
+# ---------------------------------------------------------------------------
+# Summaries
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PhaseSummary:
+    phase: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    total_ms: float
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (0-100) of *values*."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lo, hi = math.floor(rank), math.ceil(rank)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def summarize(rows: list[dict]) -> list[PhaseSummary]:
+    """Per-phase latency summary of ``tick_metrics`` rows.
+
+    ``total`` comes first, then phases by descending total time spent.
+    """
+    by_phase: dict[str, list[float]] = {}
+    for r in rows:
+        by_phase.setdefault(r["phase"], []).append(r["duration_ms"])
+
+    summaries = [
+        PhaseSummary(
+            phase=phase,
+            count=len(values),
+            p50_ms=percentile(values, 50),
+            p95_ms=percentile(values, 95),
+            max_ms=max(values),
+            total_ms=sum(values),
+        )
+        for phase, values in by_phase.items()
+    ]
+    summaries.sort(key=lambda s: (s.phase != TOTAL, -s.total_ms))
+    return summaries
+
+
+def format_summary(summaries: list[PhaseSummary]) -> str:
+    lines = [f"{'phase':<18} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}"]
+    for s in summaries:
+        lines.append(
+            f"{s.phase:<18} {s.count:>6} {s.p50_ms:>10.2f} {s.p95_ms:>10.2f} {s.max_ms:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from trading.config import TradingConfig
+
+    parser = argparse.ArgumentParser(description="p50/p95 tick latency by phase")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="Database path (default: configured db_path)")
+    parser.add_argument("--days", type=float, default=7.0,
+                        help="Look-back window in days (default: 7)")
+    parser.add_argument("--job", choices=("market_tick", "daily_check"), default=None,
+                        help="Only this scheduler job (default: all)")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db or TradingConfig.from_env().db_path)
+    db.connect()
+    try:
+        db.migrate()
+        since = (datetime.now(timezone.utc) - timedelta(days=args.days)).isoformat()
+        rows = db.get_tick_metrics(since, job=args.job)
+    finally:
+        db.close()
+
+    if not rows:
+        print(f"No tick metrics in the last {args.days:g} day(s)")
+        return 0
+    print(format_summary(summarize(rows)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
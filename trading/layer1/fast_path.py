@@ -0,0 +1,161 @@
+"""Fast-path polling between the 15-minute ticks.
+
+The full tick fetches FMP, treasury and Alpaca data, writes market state
+and runs every rule.  Between ticks a VIX spike or a stop-level breach
+could go unseen for up to 15 minutes, so an optional poller
+(``FAST_TICK_INTERVAL_SEC``, 30-60 s recommended) checks the three rules
+that only need index quotes, against state kept in memory:
+
+- VIX threshold crossed since the previous poll (or full tick);
+- a blog trading level newly hit;
+- allocation drift newly past the threshold, with the last full tick's
+  portfolio re-priced from index moves via the day's index/ETF ratios.
+
+A poll is one FMP quote call for VIX and the three indices; it makes no
+Alpaca calls and writes nothing.  When a rule fires, :meth:`poll` returns
+its trigger name and the caller escalates to a full tick, which persists
+state and runs the normal pipeline.  Each full tick re-seeds the baseline.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from trading.config import TradingConfig
+from trading.core.constants import ETF_TO_INDEX, FMP_SYMBOLS
+from trading.data.models import MarketData, Portfolio, Position, StrategySpec
+from trading.layer1.rule_engine import drifted_symbols, levels_hit, vix_crossing
+from trading.services.fmp_client import FMPClient
+
+logger = logging.getLogger(__name__)
+
+FAST_QUOTE_FIELDS = ("vix", "sp500", "nasdaq", "dow")
+
+
+class FastPathMonitor:
+    """Cheap between-tick rule checks on VIX and index quotes."""
+
+    def __init__(self, config: TradingConfig, fmp: Optional[FMPClient] = None) -> None:
+        self._fmp = fmp or FMPClient(config.fmp)
+        self._symbols = [FMP_SYMBOLS[f] for f in FAST_QUOTE_FIELDS]
+
+        self._market: Optional[MarketData] = None
+        self._portfolio: Optional[Portfolio] = None
+        self._strategy: Optional[StrategySpec] = None
+        self._ratios: dict[str, float] = {}
+        self._levels: frozenset[tuple[str, str]] = frozenset()
+        self._drifted: frozenset[str] = frozenset()
+
+        # for tests / diagnostics
+        self.polls = 0
+        self.escalations = 0
+
+    @property
+    def seeded(self) -> bool:
+        return self._market is not None
+
+    def seed(
+        self,
+        market_data: MarketData,
+        portfolio: Portfolio,
+        strategy_spec: StrategySpec,
+        ratios: dict[str, float],
+    ) -> None:
+        """Reset the baseline from a completed full tick."""
+        self._market = market_data
+        self._portfolio = portfolio
+        self._strategy = strategy_spec
+        self._ratios = dict(ratios)
+        self._levels = _level_keys(market_data, strategy_spec)
+        self._drifted = _drift_keys(portfolio, strategy_spec)
+
+    def poll(self) -> Optional[str]:
+        """Fetch quotes and return the trigger that fired, or None."""
+        if not self.seeded:
+            return None
+        self.polls += 1
+        quotes = self._fmp.fetch_quotes(self._symbols)
+        if not quotes:
+            # Failure accounting belongs to the full tick
+            logger.debug("Fast path: quote fetch failed, waiting for the next full tick")
+            return None
+
+        market = self._market_data(quotes)
+        previous = self._market
+        self._market = market
+        strategy = self._strategy
+
+        reason = None
+        if previous.vix is not None and market.vix is not None:
+            crossing = vix_crossing(previous.vix, market.vix)
+            if crossing is not None:
+                logger.info(
+                    "Fast path: VIX crossed %.1f %s: %.2f -> %.2f",
+                    crossing[0], crossing[1], previous.vix, market.vix,
+                )
+                reason = "vix_threshold_crossed"
+
+        levels = _level_keys(market, strategy)
+        new_levels, self._levels = levels - self._levels, levels
+        if reason is None and new_levels:
+            logger.info("Fast path: level hit %s", sorted(new_levels))
+            reason = "index_hit_level"
+
+        drifted = _drift_keys(self._reprice(market), strategy)
+        new_drift, self._drifted = drifted - self._drifted, drifted
+        if reason is None and new_drift:
+            logger.info("Fast path: estimated drift on %s", sorted(new_drift))
+            reason = "portfolio_drift_exceeded"
+
+        if reason is not None:
+            self.escalations += 1
+        return reason
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _market_data(self, quotes: dict[str, dict]) -> MarketData:
+        """Baseline market data with the polled fields replaced."""
+        values = {}
+        for field_name in FAST_QUOTE_FIELDS:
+            price = quotes.get(FMP_SYMBOLS[field_name], {}).get("price")
+            if price is not None:
+                values[field_name] = float(price)
+        return dataclasses.replace(
+            self._market, timestamp=datetime.now(timezone.utc), **values,
+        )
+
+    def _reprice(self, market: MarketData) -> Portfolio:
+        """Baseline portfolio marked to the polled index levels."""
+        base = self._portfolio
+        positions: dict[str, Position] = {}
+        for symbol, pos in base.positions.items():
+            price = pos.current_price
+            ratio = self._ratios.get(symbol)
+            index_name = _ETF_TO_INDEX_NAME.get(symbol)
+            level = market.get_index(index_name) if index_name else None
+            if ratio and level is not None:
+                price = level / ratio
+            positions[symbol] = dataclasses.replace(
+                pos, current_price=price, market_value=pos.shares * price,
+            )
+        value = base.cash + sum(p.market_value for p in positions.values())
+        return Portfolio(account_value=value, cash=base.cash, positions=positions)
+
+
+# Index-tracking ETFs whose price follows a polled index
+_ETF_TO_INDEX_NAME = {
+    etf: index for etf, index in ETF_TO_INDEX.items() if index in FAST_QUOTE_FIELDS
+}
+
+
+def _level_keys(market: MarketData, strategy: StrategySpec) -> frozenset[tuple[str, str]]:
+    return frozenset((index, kind) for index, kind, _, _ in levels_hit(market, strategy))
+
+
+def _drift_keys(portfolio: Portfolio, strategy: StrategySpec) -> frozenset[str]:
+    return frozenset(symbol for symbol, _, _ in drifted_symbols(portfolio, strategy))
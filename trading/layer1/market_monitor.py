@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import date, datetime, timezone
 from typing import Optional
 
@@ -16,16 +17,33 @@ from trading.services.data_validator import MarketDataValidator
 
 logger = logging.getLogger(__name__)
 
+# Enough workers for one tick's sources plus stragglers from a previous
+# tick that overran its deadline (client timeouts bound how long they run).
+_FETCH_WORKERS = 6
+
 
 class MarketMonitor:
     """Fetch and validate market data from FMP and Alpaca."""
 
-    def __init__(self, config: TradingConfig, db: Database) -> None:
+    def __init__(
+        self,
+        config: TradingConfig,
+        db: Database,
+        fmp: Optional[FMPClient] = None,
+        alpaca: Optional[AlpacaClient] = None,
+    ) -> None:
         self._config = config
         self._db = db
-        self._fmp = FMPClient(config.fmp)
-        self._alpaca = AlpacaClient(config.alpaca)
+        self._fmp = fmp or FMPClient(config.fmp)
+        self._alpaca = alpaca or AlpacaClient(config.alpaca)
         self._validator = MarketDataValidator(config)
+        self._pool = ThreadPoolExecutor(
+            max_workers=_FETCH_WORKERS, thread_name_prefix="market-data",
+        )
+
+    def close(self) -> None:
+        """Release the fetch pool without waiting for in-flight requests."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
     def fetch_market_data(self) -> MarketData:
         """Fetch market data from FMP (indices/commodities) and Alpaca (ETFs).
@@ -34,15 +52,18 @@ class MarketMonitor:
         multiple sources, and is_fresh() to check fallback data staleness.
         On API failure: increment failure counter, fall back to previous values.
         On success: reset failure counter to 0.
+
+        The three sources are fetched concurrently; a source that has not
+        answered by ``market_data_deadline_sec`` is treated as failed for
+        this tick, so latency is bounded by the slowest source or the
+        deadline, whichever comes first.
         """
         now = datetime.now(timezone.utc)
 
-        # --- Fetch raw data as dicts ---
-        fmp_data = self._fetch_fmp_raw()
-        if fmp_data is not None:
-            self._fetch_treasury_into(fmp_data)
-
-        alpaca_data = self._fetch_alpaca_raw()
+        # --- Fetch raw data as dicts (concurrently, with a deadline) ---
+        fmp_data, treasury, alpaca_data = self._fetch_sources()
+        if fmp_data is not None and treasury is not None:
+            self._merge_treasury(fmp_data, treasury)
 
         # --- Get previous state for fallback ---
         previous = self._get_previous_as_dict()
@@ -87,12 +108,12 @@ class MarketMonitor:
 
         # --- Track API failures in DB (weighted: both fail = +2) ---
         if fmp_ok and alpaca_ok:
-            self._db.set_state("consecutive_api_failures", "0")
+            self._db.set_state("consecutive_api_failures", "0", durable=True)
         else:
             prev = int(self._db.get_state("consecutive_api_failures", "0"))
             increment = (0 if fmp_ok else 1) + (0 if alpaca_ok else 1)
             new_count = prev + increment
-            self._db.set_state("consecutive_api_failures", str(new_count))
+            self._db.set_state("consecutive_api_failures", str(new_count), durable=True)
             logger.warning(
                 "API failure detected: FMP=%s Alpaca=%s (increment=+%d, consecutive=%d)",
                 "OK" if fmp_ok else "FAIL",
@@ -193,11 +214,40 @@ class MarketMonitor:
                     data[attr] = float(price)
         return data
 
-    def _fetch_treasury_into(self, data: dict) -> None:
-        """Fetch 10Y yield from FMP and add to data dict."""
-        treasury = self._fmp.fetch_treasury()
-        if treasury is None:
-            return
+    def _fetch_sources(self) -> tuple[Optional[dict], Optional[dict], Optional[dict]]:
+        """Run the FMP quote, treasury and Alpaca fetches in parallel.
+
+        Returns (fmp_data, treasury, alpaca_data); any source that raised
+        or missed the tick deadline comes back as None.
+        """
+        sources = {
+            "fmp": self._fetch_fmp_raw,
+            "treasury": self._fmp.fetch_treasury,
+            "alpaca": self._fetch_alpaca_raw,
+        }
+        futures = {name: self._pool.submit(fn) for name, fn in sources.items()}
+        wait(futures.values(), timeout=self._config.market_data_deadline_sec)
+
+        results: dict[str, Optional[dict]] = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.error(
+                    "%s fetch missed the %.1fs tick deadline, using previous values",
+                    name, self._config.market_data_deadline_sec,
+                )
+                results[name] = None
+                continue
+            try:
+                results[name] = future.result()
+            except Exception:
+                logger.exception("%s fetch failed", name)
+                results[name] = None
+        return results["fmp"], results["treasury"], results["alpaca"]
+
+    @staticmethod
+    def _merge_treasury(data: dict, treasury: dict) -> None:
+        """Add the 10Y yield from an FMP treasury response to data dict."""
         if "year10" in treasury:
             data["us10y"] = treasury["year10"]
 
@@ -216,12 +266,7 @@ class MarketMonitor:
 
     def _get_previous_as_dict(self) -> dict:
         """Build a dict of previous market state values from DB."""
-        previous: dict = {}
-        for attr in ("vix", "us10y", "sp500", "nasdaq", "dow", "gold", "oil", "copper"):
-            val = self._db.get_previous_market_state(attr)
-            if val is not None:
-                previous[attr] = val
-        return previous
+        return dict(self._db.get_latest_market_state())
 
     @staticmethod
     def _get_index_price(index_symbol: str, md: MarketData) -> Optional[float]:
@@ -0,0 +1,348 @@
+"""Offline tick replay for Layer 1 throughput benchmarking.
+
+Feeds recorded ``market_states`` rows through the same per-tick path as
+``TradingSystem._market_tick_inner`` (market fetch and merge, portfolio,
+calibration, HWM, rule engine with kill switch) against a temporary SQLite
+database.  FMP and Alpaca are replaced by in-memory stand-ins that serve
+the current row, so ticks run back to back with no network:
+
+- ETF quotes are derived from the row's index / commodity levels;
+- the portfolio holds the strategy's ``current_allocation`` bought at the
+  first tick and is marked to market every tick;
+- no stop orders ever fill.
+
+Layer 2 / 3 are not run: a fired trigger is only counted.  The report
+gives ticks/sec, p50/p95 per phase, rule outcomes (a regression signal:
+the same input must give the same counts) and database growth::
+
+    python -m trading.layer1.replay --source data/trading_system.db --limit 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import logging
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from trading.config import EmailConfig, TradingConfig
+from trading.core.constants import FMP_SYMBOLS
+from trading.data.database import MARKET_STATE_COLUMNS, Database
+from trading.data.models import MarketData, Portfolio, Position, StrategySpec
+from trading.data.tick_metrics import PhaseSummary, TickTimer, format_summary, summarize
+from trading.layer1.kill_switch import KillSwitch
+from trading.layer1.loss_calculator import LossCalculator
+from trading.layer1.market_monitor import MarketMonitor
+from trading.layer1.rule_engine import RuleEngine
+
+logger = logging.getLogger(__name__)
+
+# ETF -> (market_states column, index points per ETF dollar)
+_ETF_TRACKS: dict[str, tuple[str, float]] = {
+    "SPY": ("sp500", 10.0),
+    "QQQ": ("nasdaq", 41.0),
+    "DIA": ("dow", 100.0),
+    "GLD": ("gold", 10.8),
+    "XLE": ("oil", 0.75),
+}
+_FLAT_PRICE = 100.0  # ETFs without a tracked series
+_COUNTED_TABLES = ("market_states", "calibration", "decisions", "state", "snapshots")
+
+
+# ---------------------------------------------------------------------------
+# In-memory stand-ins for the FMP and Alpaca clients
+# ---------------------------------------------------------------------------
+
+class _ReplayFeed:
+    """The market_states row being replayed, plus the derived book."""
+
+    def __init__(self, capital: float) -> None:
+        self.capital = capital
+        self.row: dict = {}
+        self.prices: dict[str, float] = {}
+        self.shares: dict[str, float] = {}
+        self.cash = capital
+
+    def advance(self, row: dict, allocation: dict[str, float]) -> None:
+        self.row = row
+        for symbol, (column, ratio) in _ETF_TRACKS.items():
+            level = row.get(column)
+            if level is not None:
+                self.prices[symbol] = round(level / ratio, 2)
+        for symbol in allocation:
+            self.prices.setdefault(symbol, _FLAT_PRICE)
+        if not self.shares:
+            for symbol, pct in allocation.items():
+                self.shares[symbol] = self.capital * pct / 100.0 / self.prices[symbol]
+            self.cash = self.capital * (1 - sum(allocation.values()) / 100.0)
+
+    def portfolio(self) -> Portfolio:
+        positions = {
+            symbol: Position(
+                symbol=symbol,
+                shares=qty,
+                market_value=qty * self.prices[symbol],
+                cost_basis=self.capital,
+                current_price=self.prices[symbol],
+            )
+            for symbol, qty in self.shares.items()
+        }
+        value = self.cash + sum(p.market_value for p in positions.values())
+        return Portfolio(account_value=value, cash=self.cash, positions=positions)
+
+
+class _ReplayFMP:
+    def __init__(self, feed: _ReplayFeed) -> None:
+        self._feed = feed
+
+    def fetch_quotes(self, symbols: list[str]) -> Optional[dict[str, dict]]:
+        row = self._feed.row
+        return {
+            fmp_symbol: {"price": row[column]}
+            for column, fmp_symbol in FMP_SYMBOLS.items()
+            if fmp_symbol in symbols and row.get(column) is not None
+        }
+
+    def fetch_treasury(self) -> Optional[dict[str, float]]:
+        us10y = self._feed.row.get("us10y")
+        return {"year10": us10y} if us10y is not None else None
+
+
+class _ReplayTrading:
+    def get_orders(self, req) -> list:
+        return []
+
+
+class _ReplayAlpaca:
+    def __init__(self, feed: _ReplayFeed) -> None:
+        self._feed = feed
+        self._trading = _ReplayTrading()
+
+    def get_quotes(self, symbols: list[str]) -> dict[str, float]:
+        return {s: self._feed.prices[s] for s in symbols if s in self._feed.prices}
+
+    def get_portfolio(self) -> Optional[Portfolio]:
+        return self._feed.portfolio()
+
+    def invalidate_portfolio(self) -> None:
+        pass
+
+
+class _TimedKillSwitch(KillSwitch):
+    """KillSwitch that reports its own span inside ``rule_check``."""
+
+    def __init__(self, config: TradingConfig, db: Database, replay: TickReplay) -> None:
+        super().__init__(config, db)
+        self._replay = replay
+
+    def check(self, market_data: MarketData, portfolio: Portfolio) -> Optional[str]:
+        with self._replay.span("kill_switch"):
+            return super().check(market_data, portfolio)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ReplayReport:
+    ticks: int
+    elapsed_sec: float
+    outcomes: dict[str, int]
+    phases: list[PhaseSummary]
+    db_bytes_start: int
+    db_bytes_end: int
+    rows_added: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    @property
+    def bytes_per_tick(self) -> float:
+        return (self.db_bytes_end - self.db_bytes_start) / self.ticks if self.ticks else 0.0
+
+
+def load_market_states(path: str | Path, limit: Optional[int] = None) -> list[dict]:
+    """Read ``market_states`` rows (oldest first) from a database, read-only."""
+    conn = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        sql = f"SELECT timestamp, {', '.join(MARKET_STATE_COLUMNS)} FROM market_states ORDER BY id"
+        params: tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return [dict(r) for r in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+class TickReplay:
+    """Replay recorded ticks through Layer 1 against a scratch database."""
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        strategy: StrategySpec,
+        capital: float = 100_000.0,
+    ) -> None:
+        self._config = config
+        self._strategy = strategy
+        self._capital = capital
+        self._timer: Optional[TickTimer] = None
+
+    def span(self, phase: str):
+        return self._timer.span(phase)
+
+    def run(self, rows: list[dict], db_path: Optional[str | Path] = None) -> ReplayReport:
+        """Replay *rows*; the scratch DB is kept at *db_path* if given."""
+        if db_path is not None:
+            return self._run(rows, Path(db_path))
+        with tempfile.TemporaryDirectory(prefix="tick-replay-") as tmp:
+            return self._run(rows, Path(tmp) / "replay.db")
+
+    def _run(self, rows: list[dict], db_path: Path) -> ReplayReport:
+        config = dataclasses.replace(
+            self._config,
+            db_path=db_path,
+            log_dir=db_path.parent / "logs",
+            email=EmailConfig(),  # never send mail from a replay
+            dry_run=True,
+        )
+        db = Database(db_path)
+        db.connect()
+        db.migrate()
+
+        feed = _ReplayFeed(self._capital)
+        alpaca = _ReplayAlpaca(feed)
+        monitor = MarketMonitor(config, db, fmp=_ReplayFMP(feed), alpaca=alpaca)
+        rule_engine = RuleEngine(
+            config, db, alpaca=alpaca, kill_switch=_TimedKillSwitch(config, db, self),
+        )
+        loss_calc = LossCalculator(db)
+        allocation = self._strategy.current_allocation
+
+        timers: list[TickTimer] = []
+        outcomes: Counter[str] = Counter()
+        rows_before = _row_counts(db)
+        bytes_before = _db_bytes(db)
+        start = time.perf_counter()
+        try:
+            for i, row in enumerate(rows):
+                feed.advance(row, allocation)
+                timer = self._timer = TickTimer("replay")
+                with db.transaction():
+                    with timer.span("market_fetch"):
+                        market_data = monitor.fetch_market_data()
+                    with timer.span("portfolio_fetch"):
+                        portfolio = monitor.fetch_portfolio()
+                    with timer.span("calibration"):
+                        monitor.calibrate_index_etf_ratios(market_data)
+                    with timer.span("hwm_update"):
+                        loss_calc.update_hwm_if_needed(portfolio)
+                        if i == 0:  # the 9:30 opening snapshots
+                            loss_calc.create_daily_snapshot(portfolio)
+                            loss_calc.create_weekly_snapshot(portfolio)
+                    with timer.span("rule_check"):
+                        result = rule_engine.check(market_data, portfolio, self._strategy)
+                timer.finish(result.type.value)
+                outcomes[result.type.value] += 1
+                timers.append(timer)
+            elapsed = time.perf_counter() - start
+
+            report = ReplayReport(
+                ticks=len(timers),
+                elapsed_sec=elapsed,
+                outcomes=dict(outcomes),
+                phases=summarize([
+                    {"phase": r[3], "duration_ms": r[4]} for t in timers for r in t.rows()
+                ]),
+                db_bytes_start=bytes_before,
+                db_bytes_end=_db_bytes(db),
+                rows_added={
+                    table: count - rows_before[table]
+                    for table, count in _row_counts(db).items()
+                },
+            )
+        finally:
+            self._timer = None
+            monitor.close()
+            db.close()
+
+        logger.info(
+            "Replayed %d ticks in %.2fs (%.0f ticks/s)",
+            report.ticks, report.elapsed_sec, report.ticks_per_sec,
+        )
+        return report
+
+
+def _row_counts(db: Database) -> dict[str, int]:
+    return {
+        table: db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in _COUNTED_TABLES
+    }
+
+
+def _db_bytes(db: Database) -> int:
+    """Main database file size after folding the WAL back in."""
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    return Path(db.db_path).stat().st_size
+
+
+def format_report(report: ReplayReport) -> str:
+    lines = [
+        f"Ticks:     {report.ticks} in {report.elapsed_sec:.2f}s "
+        f"({report.ticks_per_sec:.0f} ticks/s)",
+        "Outcomes:  " + ", ".join(f"{k}={v}" for k, v in sorted(report.outcomes.items())),
+        f"DB growth: {report.db_bytes_end - report.db_bytes_start} bytes "
+        f"({report.bytes_per_tick:.0f} bytes/tick); rows "
+        + ", ".join(f"{k}+{v}" for k, v in report.rows_added.items()),
+        "",
+        format_summary(report.phases),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from trading.layer2.tools.strategy_parser import find_latest_blog, parse_blog
+
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through Layer 1")
+    parser.add_argument("--source", type=Path, default=None,
+                        help="Database with market_states history (default: configured db_path)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Replay at most this many ticks (oldest first)")
+    parser.add_argument("--blogs-dir", type=Path, default=None,
+                        help="Strategy blogs directory (default: configured blogs_dir)")
+    parser.add_argument("--keep-db", type=Path, default=None,
+                        help="Keep the scratch database at this path")
+    parser.add_argument("--capital", type=float, default=100_000.0,
+                        help="Starting account value (default: 100000)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    config = TradingConfig.from_env()
+    blog = find_latest_blog(args.blogs_dir or config.blogs_dir)
+    if blog is None:
+        print("No strategy blog found")
+        return 1
+    rows = load_market_states(args.source or config.db_path, limit=args.limit)
+    if not rows:
+        print("No market_states rows to replay")
+        return 1
+
+    report = TickReplay(config, parse_blog(blog), capital=args.capital).run(
+        rows, db_path=args.keep_db,
+    )
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
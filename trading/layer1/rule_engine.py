@@ -21,11 +21,17 @@ VIX_THRESHOLDS = [VIX_RISK_ON, VIX_CAUTION, VIX_STRESS, VIX_PANIC]
 class RuleEngine:
     """Evaluate market conditions every 15 minutes and return a CheckResult."""
 
-    def __init__(self, config: TradingConfig, db: Database) -> None:
+    def __init__(
+        self,
+        config: TradingConfig,
+        db: Database,
+        alpaca: Optional[AlpacaClient] = None,
+        kill_switch: Optional[KillSwitch] = None,
+    ) -> None:
         self._config = config
         self._db = db
-        self._kill_switch = KillSwitch(config, db)
-        self._alpaca = AlpacaClient(config.alpaca)
+        self._kill_switch = kill_switch or KillSwitch(config, db)
+        self._alpaca = alpaca or AlpacaClient(config.alpaca)
         self._notifier = EmailNotifier(config)
 
     def check(
@@ -103,53 +109,29 @@ class RuleEngine:
         if prev_vix is None:
             return False
 
-        current = market_data.vix
-        previous = prev_vix
-
-        for threshold in VIX_THRESHOLDS:
-            crossed_up = previous < threshold <= current
-            crossed_down = previous >= threshold > current
-            if crossed_up or crossed_down:
-                direction = "UP" if crossed_up else "DOWN"
-                logger.info(
-                    "VIX crossed %.1f %s: %.2f -> %.2f",
-                    threshold, direction, previous, current,
-                )
-                return True
-
-        return False
+        crossing = vix_crossing(prev_vix, market_data.vix)
+        if crossing is None:
+            return False
+        threshold, direction = crossing
+        logger.info(
+            "VIX crossed %.1f %s: %.2f -> %.2f",
+            threshold, direction, prev_vix, market_data.vix,
+        )
+        return True
 
     def index_hit_level(
         self, market_data: MarketData, strategy_spec: StrategySpec
     ) -> bool:
         """Check if any index hit a buy/sell/stop level from the blog."""
-        for index_name, levels in strategy_spec.trading_levels.items():
-            current = market_data.get_index(index_name)
-            if current is None:
-                continue
-
-            if levels.buy_level is not None and current <= levels.buy_level:
-                logger.info(
-                    "%s hit buy level: %.2f <= %.2f",
-                    index_name, current, levels.buy_level,
-                )
-                return True
-
-            if levels.sell_level is not None and current >= levels.sell_level:
-                logger.info(
-                    "%s hit sell level: %.2f >= %.2f",
-                    index_name, current, levels.sell_level,
-                )
-                return True
-
-            if levels.stop_loss is not None and current <= levels.stop_loss:
-                logger.info(
-                    "%s hit stop level: %.2f <= %.2f",
-                    index_name, current, levels.stop_loss,
-                )
-                return True
-
-        return False
+        hits = levels_hit(market_data, strategy_spec)
+        if not hits:
+            return False
+        index_name, kind, current, level = hits[0]
+        op = ">=" if kind == "sell" else "<="
+        logger.info(
+            "%s hit %s level: %.2f %s %.2f", index_name, kind, current, op, level,
+        )
+        return True
 
     def drift_exceeded(
         self,
@@ -158,29 +140,20 @@ class RuleEngine:
         threshold: float = 3.0,
     ) -> bool:
         """Check if any position deviates more than threshold% from target."""
-        target_alloc = strategy_spec.current_allocation
-
-        for symbol, target_pct in target_alloc.items():
-            actual_pct = portfolio.get_position_pct(symbol)
-            if abs(actual_pct - target_pct) > threshold:
-                logger.info(
-                    "Drift: %s actual=%.1f%% target=%.1f%% (diff=%.1f%%)",
-                    symbol, actual_pct, target_pct, abs(actual_pct - target_pct),
-                )
-                return True
-
-        # Also check for positions not in the target (should be 0%)
-        for symbol in portfolio.positions:
-            if symbol not in target_alloc:
-                actual_pct = portfolio.get_position_pct(symbol)
-                if actual_pct > threshold:
-                    logger.info(
-                        "Drift: %s actual=%.1f%% not in target allocation",
-                        symbol, actual_pct,
-                    )
-                    return True
-
-        return False
+        drifted = drifted_symbols(portfolio, strategy_spec, threshold)
+        if not drifted:
+            return False
+        symbol, actual_pct, target_pct = drifted[0]
+        if target_pct is None:
+            logger.info(
+                "Drift: %s actual=%.1f%% not in target allocation", symbol, actual_pct,
+            )
+        else:
+            logger.info(
+                "Drift: %s actual=%.1f%% target=%.1f%% (diff=%.1f%%)",
+                symbol, actual_pct, target_pct, abs(actual_pct - target_pct),
+            )
+        return True
 
     def check_stop_order_fills(self) -> Optional[dict]:
         """Check if any GTC stop orders have been filled on Alpaca.
@@ -207,7 +180,8 @@ class RuleEngine:
                 if self._db.get_state(state_key, "0") == "1":
                     continue
 
-                self._db.set_state(state_key, "1")
+                self._db.set_state(state_key, "1", durable=True)
+                self._alpaca.invalidate_portfolio()
                 filled_price = float(o.filled_avg_price) if o.filled_avg_price else None
                 logger.info(
                     "Stop order filled: %s %s at %s",
@@ -244,3 +218,66 @@ class RuleEngine:
 
         self._db.set_state("api_failure_last_alerted", str(failures))
         return True
+
+
+# ---------------------------------------------------------------------------
+# Pure rule predicates (shared with the fast-path poller)
+# ---------------------------------------------------------------------------
+
+def vix_crossing(previous: float, current: float) -> Optional[tuple[float, str]]:
+    """First standard VIX threshold crossed between two readings.
+
+    Returns ``(threshold, "UP" | "DOWN")`` or None.
+    """
+    for threshold in VIX_THRESHOLDS:
+        if previous < threshold <= current:
+            return threshold, "UP"
+        if previous >= threshold > current:
+            return threshold, "DOWN"
+    return None
+
+
+def levels_hit(
+    market_data: MarketData, strategy_spec: StrategySpec,
+) -> list[tuple[str, str, float, float]]:
+    """Blog trading levels the indices are at or beyond.
+
+    Returns ``(index_name, "buy" | "sell" | "stop", current, level)`` tuples
+    in blog order.
+    """
+    hits = []
+    for index_name, levels in strategy_spec.trading_levels.items():
+        current = market_data.get_index(index_name)
+        if current is None:
+            continue
+        if levels.buy_level is not None and current <= levels.buy_level:
+            hits.append((index_name, "buy", current, levels.buy_level))
+        if levels.sell_level is not None and current >= levels.sell_level:
+            hits.append((index_name, "sell", current, levels.sell_level))
+        if levels.stop_loss is not None and current <= levels.stop_loss:
+            hits.append((index_name, "stop", current, levels.stop_loss))
+    return hits
+
+
+def drifted_symbols(
+    portfolio: Portfolio, strategy_spec: StrategySpec, threshold: float = 3.0,
+) -> list[tuple[str, float, Optional[float]]]:
+    """Positions more than *threshold* % away from the target allocation.
+
+    Returns ``(symbol, actual_pct, target_pct)``; ``target_pct`` is None for
+    a holding that is not in the target at all.
+    """
+    target_alloc = strategy_spec.current_allocation
+    drifted: list[tuple[str, float, Optional[float]]] = []
+    for symbol, target_pct in target_alloc.items():
+        actual_pct = portfolio.get_position_pct(symbol)
+        if abs(actual_pct - target_pct) > threshold:
+            drifted.append((symbol, actual_pct, target_pct))
+
+    # Also check for positions not in the target (should be 0%)
+    for symbol in portfolio.positions:
+        if symbol not in target_alloc:
+            actual_pct = portfolio.get_position_pct(symbol)
+            if actual_pct > threshold:
+                drifted.append((symbol, actual_pct, None))
+    return drifted
@@ -1,13 +1,23 @@
-"""Alpaca server-side stop order management."""
+"""Alpaca server-side stop order management.
+
+Stops are reconciled as a book: open stop orders are listed once, the
+desired stop per held symbol is computed for the whole portfolio, and only
+the difference is applied (replace changed stops, cancel orphans and
+duplicates, submit missing ones).  Calls for different orders run
+concurrently; everything touching the database stays on the calling
+thread.
+"""
 
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Callable, Optional
 
 from trading.config import TradingConfig
-from trading.core.constants import INDEX_TO_ETF
+from trading.core.constants import ETF_TO_INDEX
 from trading.data.database import Database
 from trading.data.models import Order, Portfolio, StrategySpec
 from trading.services.alpaca_client import AlpacaClient
@@ -15,6 +25,72 @@ from trading.services.email_notifier import EmailNotifier
 
 logger = logging.getLogger(__name__)
 
+_QTY_TOLERANCE = 1e-6
+
+
+@dataclass
+class StopAction:
+    """One change to the server-side stop book."""
+
+    kind: str                       # "submit" / "replace" / "cancel"
+    symbol: str
+    order_id: Optional[str] = None  # existing order (replace / cancel)
+    qty: Optional[float] = None
+    stop_price: Optional[float] = None
+    reason: str = ""
+    ok: Optional[bool] = None       # None until applied
+    fallback: bool = False          # replace failed, order was cancelled
+
+
+def plan_stop_actions(
+    desired: dict[str, tuple[float, float]],
+    open_stops: list[dict],
+    held_symbols: set[str],
+) -> list[StopAction]:
+    """Diff the desired stop book against the open stop orders.
+
+    *desired* maps symbol -> (qty, stop_price).  Stops for symbols no longer
+    held are cancelled; held symbols without a desired stop are left alone.
+    For each desired symbol the first open stop is kept (if unchanged) or
+    replaced, extra stops are cancelled, and a missing stop is submitted.
+    """
+    by_symbol: dict[str, list[dict]] = {}
+    for order in open_stops:
+        by_symbol.setdefault(order["symbol"], []).append(order)
+
+    actions: list[StopAction] = []
+    for symbol, orders in by_symbol.items():
+        if symbol not in held_symbols:
+            actions.extend(
+                StopAction("cancel", symbol, order_id=o["id"], reason="orphaned")
+                for o in orders
+            )
+
+    for symbol, (qty, stop_price) in desired.items():
+        existing = by_symbol.get(symbol, [])
+        if not existing:
+            actions.append(StopAction("submit", symbol, qty=qty, stop_price=stop_price))
+            continue
+        first, extras = existing[0], existing[1:]
+        actions.extend(
+            StopAction("cancel", symbol, order_id=o["id"], reason="duplicate")
+            for o in extras
+        )
+        if not _stop_matches(first, qty, stop_price):
+            actions.append(StopAction(
+                "replace", symbol, order_id=first["id"], qty=qty, stop_price=stop_price,
+            ))
+    return actions
+
+
+def _stop_matches(order: dict, qty: float, stop_price: float) -> bool:
+    if round(float(order.get("stop_price") or 0), 2) != stop_price:
+        return False
+    # Orders listed without a qty are compared on price only
+    if order.get("qty") is None:
+        return True
+    return abs(float(order["qty"]) - qty) <= _QTY_TOLERANCE
+
 
 class StopLossManager:
     """Manage Alpaca server-side GTC stop orders based on blog strategy."""
@@ -27,189 +103,187 @@ class StopLossManager:
 
     def sync_stop_orders(
         self, strategy_spec: StrategySpec, portfolio: Portfolio
-    ) -> None:
+    ) -> list[StopAction]:
         """Sync stop orders for all positions based on the current strategy.
 
         For each position held, compute the ETF stop price from the blog's
-        index-based stop levels and create/replace the server-side GTC stop.
+        index-based stop levels, then apply the minimal set of changes to
+        the server-side GTC stops.  Returns the planned actions (with
+        ``ok`` set once applied).
         """
-        self._cleanup_orphaned_stops(portfolio)
+        try:
+            open_stops = self._alpaca.list_open_stop_orders()
+        except Exception:
+            logger.exception("Failed to list open stop orders")
+            return []
 
-        for symbol, position in portfolio.positions.items():
-            etf_stop = self._index_to_etf_stop(symbol, strategy_spec.stop_losses)
-            if etf_stop is None:
-                continue
+        desired = self._desired_stops(strategy_spec, portfolio)
+        actions = plan_stop_actions(desired, open_stops, set(portfolio.positions))
+        if not actions:
+            return actions
 
-            if etf_stop >= position.current_price:
-                logger.warning(
-                    "Stop price %.2f >= current price %.2f for %s, skipping",
-                    etf_stop, position.current_price, symbol,
+        if self._config.dry_run:
+            for a in actions:
+                logger.info(
+                    "[DRY RUN] Would %s stop: %s%s", a.kind, a.symbol,
+                    f" qty={a.qty:.4f} stop={a.stop_price:.2f}" if a.kind != "cancel" else "",
                 )
-                continue
+            return actions
 
-            self._place_or_replace_stop(
-                symbol=symbol,
-                qty=position.shares,
-                stop_price=etf_stop,
-                blog_date=strategy_spec.blog_date,
-            )
+        self._apply(actions, strategy_spec.blog_date)
+        return actions
 
     def resync_after_fill_or_rebalance(
         self, portfolio: Portfolio, strategy_spec: StrategySpec
-    ) -> None:
+    ) -> list[StopAction]:
         """Re-sync stops after any trade or rebalance."""
-        self.sync_stop_orders(strategy_spec, portfolio)
+        return self.sync_stop_orders(strategy_spec, portfolio)
 
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
-    def _cleanup_orphaned_stops(self, portfolio: Portfolio) -> None:
-        """Cancel GTC stop orders for positions that no longer exist."""
-        try:
-            open_orders = self._alpaca.list_open_stop_orders()
-        except Exception:
-            logger.exception("Failed to list open stop orders for cleanup")
-            return
-
-        held_symbols = set(portfolio.positions.keys())
-
-        for order in open_orders:
-            if order["symbol"] not in held_symbols:
-                try:
-                    self._alpaca.cancel_order(order["id"])
-                    logger.info(
-                        "Cancelled orphaned stop order %s for %s",
-                        order["id"], order["symbol"],
-                    )
-                except Exception:
-                    logger.exception(
-                        "Failed to cancel orphaned stop %s", order["id"]
-                    )
+    def _desired_stops(
+        self, strategy_spec: StrategySpec, portfolio: Portfolio
+    ) -> dict[str, tuple[float, float]]:
+        ratios = self._db.get_calibrations(date.today())
+        desired: dict[str, tuple[float, float]] = {}
+        for symbol, position in portfolio.positions.items():
+            etf_stop = self._index_to_etf_stop(symbol, strategy_spec.stop_losses, ratios)
+            if etf_stop is None:
+                continue
+            etf_stop = round(etf_stop, 2)
 
-    def _place_or_replace_stop(
-        self, symbol: str, qty: float, stop_price: float, blog_date: str
-    ) -> None:
-        """Place a new stop or atomically replace an existing one.
+            if etf_stop >= position.current_price:
+                logger.warning(
+                    "Stop price %.2f >= current price %.2f for %s, skipping",
+                    etf_stop, position.current_price, symbol,
+                )
+                continue
+            desired[symbol] = (position.shares, etf_stop)
+        return desired
 
-        Uses Alpaca replace_order() to avoid a window where no stop exists
-        (the "no-guard" gap between cancel and submit).
+    def _apply(self, actions: list[StopAction], blog_date: str) -> None:
+        """Apply *actions*: cancels and replaces first, then submits.
 
-        Fallback: if replace_order() fails, falls back to cancel+submit.
+        Replace uses Alpaca replace_order() so there is no window without a
+        stop (the "no-guard" gap between cancel and submit); if it fails the
+        old stop is cancelled and a new one submitted.
         """
-        try:
-            existing = self._alpaca.list_open_stop_orders(symbol)
-        except Exception:
-            logger.exception("Failed to list existing stops for %s", symbol)
-            existing = []
-
-        if self._config.dry_run:
-            logger.info(
-                "[DRY RUN] Would %s stop: %s qty=%.4f stop=%.2f",
-                "replace" if existing else "place", symbol, qty, stop_price,
-            )
-            return
-
-        if len(existing) == 1:
-            # Idempotency: skip if stop_price unchanged
-            order = existing[0]
-            if float(order.get("stop_price", 0)) == stop_price:
-                return
-            # Atomic replace
-            result = self._alpaca.replace_order(
-                order_id=order["id"],
-                qty=qty,
-                stop_price=stop_price,
-            )
-            if result is not None:
+        self._run_concurrently(
+            self._apply_change, [a for a in actions if a.kind != "submit"],
+        )
+
+        submits: list[tuple[StopAction, Order]] = []
+        for a in actions:
+            if a.kind == "submit" or (a.kind == "replace" and a.fallback):
+                seq = self._next_seq(a.symbol, blog_date)
+                submits.append((a, Order(
+                    client_order_id=f"stop-{a.symbol}-{blog_date}-{seq}",
+                    symbol=a.symbol,
+                    side="sell",
+                    quantity=a.qty,
+                    order_type="stop",
+                    stop_price=a.stop_price,
+                    time_in_force="gtc",
+                )))
+        self._run_concurrently(lambda item: self._submit(*item), submits)
+
+        for a, order in submits:
+            if a.ok:
                 logger.info(
-                    "Replaced stop %s for %s: new stop=%.2f",
-                    order["id"], symbol, stop_price,
+                    "Placed stop order %s: %s qty=%.4f stop=%.2f",
+                    order.client_order_id, a.symbol, a.qty, a.stop_price,
+                )
+            else:
+                self._notifier.alert(
+                    f"Stop order failure: {a.symbol} at ${a.stop_price:.2f}"
                 )
-                return
-            # Fallback: replace failed, cancel+submit
-            logger.warning(
-                "replace_order failed for %s, falling back to cancel+submit",
-                symbol,
-            )
-            self._alpaca.cancel_order(order["id"])
 
-        elif len(existing) > 1:
-            # Anomaly: multiple stops — cancel extras, replace the first
-            for extra in existing[1:]:
-                try:
-                    self._alpaca.cancel_order(extra["id"])
+    def _apply_change(self, action: StopAction) -> None:
+        try:
+            if action.kind == "cancel":
+                action.ok = bool(self._alpaca.cancel_order(action.order_id))
+                if action.ok:
                     logger.info(
-                        "Cancelled extra stop %s for %s", extra["id"], symbol,
+                        "Cancelled %s stop order %s for %s",
+                        action.reason, action.order_id, action.symbol,
                     )
-                except Exception:
+                else:
                     logger.warning(
-                        "Could not cancel extra stop %s for %s",
-                        extra["id"], symbol,
+                        "Could not cancel %s stop %s for %s",
+                        action.reason, action.order_id, action.symbol,
                     )
-            # Try to replace the first
+                return
+
             result = self._alpaca.replace_order(
-                order_id=existing[0]["id"],
-                qty=qty,
-                stop_price=stop_price,
+                order_id=action.order_id,
+                qty=action.qty,
+                stop_price=action.stop_price,
             )
             if result is not None:
+                action.ok = True
                 logger.info(
                     "Replaced stop %s for %s: new stop=%.2f",
-                    existing[0]["id"], symbol, stop_price,
+                    action.order_id, action.symbol, action.stop_price,
                 )
                 return
-            # Replace failed, cancel and fall through to new placement
-            self._alpaca.cancel_order(existing[0]["id"])
-
-        # Place new stop (no existing or all cancelled)
-        seq = self._next_seq(symbol, blog_date)
-        client_order_id = f"stop-{symbol}-{blog_date}-{seq}"
-        try:
-            order = Order(
-                client_order_id=client_order_id,
-                symbol=symbol,
-                side="sell",
-                quantity=qty,
-                order_type="stop",
-                stop_price=stop_price,
-                time_in_force="gtc",
-            )
-            self._alpaca.submit_order(order)
-            logger.info(
-                "Placed stop order %s: %s qty=%.4f stop=%.2f",
-                client_order_id, symbol, qty, stop_price,
+            logger.warning(
+                "replace_order failed for %s, falling back to cancel+submit",
+                action.symbol,
             )
+            # Only resubmit once the old stop is gone, or it would be doubled
+            action.fallback = bool(self._alpaca.cancel_order(action.order_id))
+            if not action.fallback:
+                action.ok = False
         except Exception:
-            logger.exception("Failed to place stop order for %s", symbol)
-            self._notifier.alert(
-                f"Stop order failure: {symbol} at ${stop_price:.2f}"
+            logger.exception(
+                "Failed to %s stop %s for %s",
+                action.kind, action.order_id, action.symbol,
             )
+            action.ok = False
+
+    def _submit(self, action: StopAction, order: Order) -> None:
+        try:
+            action.ok = self._alpaca.submit_order(order) is not None
+        except Exception:
+            logger.exception("Failed to place stop order for %s", action.symbol)
+            action.ok = False
+
+    def _run_concurrently(self, fn: Callable, items: list) -> None:
+        if len(items) <= 1:
+            for item in items:
+                fn(item)
+            return
+        workers = min(len(items), max(1, self._config.order_submit_concurrency))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stop-sync") as pool:
+            list(pool.map(fn, items))
 
     def _index_to_etf_stop(
-        self, symbol: str, stop_losses: dict[str, float]
+        self,
+        symbol: str,
+        stop_losses: dict[str, float],
+        ratios: Optional[dict[str, float]] = None,
     ) -> Optional[float]:
         """Convert an index-level stop to an ETF stop price using calibration.
 
         The blog specifies stops as index levels (e.g. sp500: 5800).
         We need to convert to ETF prices (e.g. SPY: 580).
 
-        Returns None if no stop is defined or calibration is unavailable.
+        *ratios* is today's calibration by symbol (read from the DB if not
+        given).  Returns None if no stop is defined or calibration is
+        unavailable.
         """
-        # Find the index name for this ETF symbol
-        index_name: Optional[str] = None
-        for idx, etf in INDEX_TO_ETF.items():
-            if etf == symbol:
-                index_name = idx
-                break
-
+        index_name = ETF_TO_INDEX.get(symbol)
         if index_name is None or index_name not in stop_losses:
             return None
 
         index_stop = stop_losses[index_name]
 
-        # Get today's calibration ratio
-        ratio = self._db.get_calibration(date.today(), symbol)
+        if ratios is None:
+            ratio = self._db.get_calibration(date.today(), symbol)
+        else:
+            ratio = ratios.get(symbol)
         if ratio is None or ratio == 0:
             logger.warning(
                 "No calibration ratio for %s, cannot convert stop", symbol
@@ -1,20 +1,58 @@
-"""Claude SDK agent runner for Layer 2."""
+"""Claude SDK agent runner for Layer 2.
+
+Requests are laid out for prompt caching: tool definitions and the system
+prompt form a cached prefix, the week's strategy section is a second cached
+block at the start of the user message, and only the volatile run context
+(trigger, market data, portfolio) follows it.  Repeated intraday runs within
+one blog week therefore re-send only that small suffix uncached.
+
+:meth:`AgentRunner.decide` adds decision memoization on top of
+:meth:`AgentRunner.run` (see :mod:`trading.layer2.decision_cache`).
+
+Each run has a hard deadline (``agent_deadline_sec``).  The response is
+streamed and abandoned once the deadline passes; ``decide`` then uses the
+deterministic trigger -> scenario fallback (:mod:`trading.layer2.fallback`)
+so a slow model response cannot stall the 15-minute tick.
+"""
 
 from __future__ import annotations
 
 import json
 import logging
+import time
 import uuid
+from dataclasses import dataclass, replace
 from typing import Any, Optional
 
 from trading.config import TradingConfig
 from trading.data.database import Database
 from trading.data.models import MarketData, Portfolio, StrategyIntent, StrategySpec
+from trading.layer2.decision_cache import DecisionCache, fingerprint
+from trading.layer2.fallback import fallback_intent
 from trading.layer2.system_prompt import SYSTEM_PROMPT, TOOL_DEFINITIONS
 from trading.layer2.tools.strategy_intent import parse_strategy_intent
 
 logger = logging.getLogger(__name__)
 
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 4096
+_CACHE = {"type": "ephemeral"}
+
+
+class AgentTimeout(TimeoutError):
+    """The agent run did not finish within ``agent_deadline_sec``."""
+
+
+@dataclass
+class AgentDecision:
+    """Outcome of :meth:`AgentRunner.decide`."""
+
+    intent: Optional[StrategyIntent]
+    fingerprint: str
+    cache_hit: bool = False
+    source_run_id: Optional[str] = None  # cache hit: run_id of the reused intent
+    fallback: bool = False  # deadline exceeded, deterministic intent
+
 
 class AgentRunner:
     """Runs the Claude agent to interpret strategy and emit intent.
@@ -26,6 +64,62 @@ class AgentRunner:
     def __init__(self, config: TradingConfig, db: Database) -> None:
         self._config = config
         self._db = db
+        self._client: Any = None  # long-lived anthropic.Anthropic (pooled)
+        self._tools: Optional[list[dict]] = None
+        self._decisions = DecisionCache(config.decision_cache_ttl_sec)
+
+    def decide(
+        self,
+        trigger_reason: str,
+        market_data: MarketData,
+        portfolio: Portfolio,
+        strategy_spec: StrategySpec,
+        current_scenario: Optional[str] = None,
+    ) -> AgentDecision:
+        """Return an intent for this situation, reusing a recent one if possible.
+
+        The situation fingerprint covers the trigger family, blog date and
+        quantized market / drift buckets; a cached intent for the same
+        fingerprint within ``decision_cache_ttl_sec`` is returned without
+        calling Claude, under a new run_id (``source_run_id`` names the
+        original run).  Failed runs (no intent) are not cached.  If the
+        run misses its deadline the deterministic fallback intent (possibly
+        None) is returned with ``fallback=True`` and not cached;
+        *current_scenario* (default: the ``current_scenario`` state key) is
+        the scenario the fallback holds on drift.
+        """
+        fp = fingerprint(
+            trigger_reason, market_data, portfolio, strategy_spec,
+            self._config.decision_drift_bucket_pct,
+        )
+        cached = self._decisions.get(fp)
+        if cached is not None:
+            # A fresh run_id keeps client_order_ids (which embed it) unique
+            intent = replace(cached, run_id=self._generate_run_id())
+            logger.info(
+                "Reusing cached decision %s from run %s for trigger %s as run %s "
+                "(scenario=%s)",
+                fp, cached.run_id, trigger_reason, intent.run_id, cached.scenario,
+            )
+            return AgentDecision(
+                intent=intent, fingerprint=fp, cache_hit=True,
+                source_run_id=cached.run_id,
+            )
+
+        try:
+            intent = self.run(trigger_reason, market_data, portfolio, strategy_spec)
+        except AgentTimeout as exc:
+            logger.warning("%s — using deterministic fallback", exc)
+            return AgentDecision(
+                intent=self._fallback(
+                    trigger_reason, market_data, strategy_spec, current_scenario,
+                ),
+                fingerprint=fp,
+                fallback=True,
+            )
+        if intent is not None:
+            self._decisions.put(fp, intent)
+        return AgentDecision(intent=intent, fingerprint=fp)
 
     def run(
         self,
@@ -51,18 +145,26 @@ class AgentRunner:
         -------
         Optional[StrategyIntent]
             The strategy intent emitted by Claude, or None on error.
+
+        Raises
+        ------
+        AgentTimeout
+            If the run does not finish within ``agent_deadline_sec``.
         """
         run_id = self._generate_run_id()
-        user_message = self._build_user_message(
+        content = self._build_user_content(
             run_id, trigger_reason, market_data, portfolio, strategy_spec
         )
 
         logger.info("Starting agent run %s (trigger: %s)", run_id, trigger_reason)
+        deadline = time.monotonic() + self._config.agent_deadline_sec
 
         try:
             # Call Claude SDK and extract tool calls
-            tool_calls = self._invoke_claude(user_message)
+            tool_calls = self._invoke_claude(content, deadline)
             return self._extract_intent(tool_calls)
+        except AgentTimeout:
+            raise
         except Exception:
             logger.exception("Agent run %s failed", run_id)
             return None
@@ -79,7 +181,36 @@ class AgentRunner:
         portfolio: Portfolio,
         strategy_spec: StrategySpec,
     ) -> str:
-        """Build the user message with all context for Claude."""
+        """Build the user message with all context for Claude (as text)."""
+        return "".join(
+            block["text"] for block in self._build_user_content(
+                run_id, trigger_reason, market_data, portfolio, strategy_spec,
+            )
+        )
+
+    def _build_user_content(
+        self,
+        run_id: str,
+        trigger_reason: str,
+        market_data: MarketData,
+        portfolio: Portfolio,
+        strategy_spec: StrategySpec,
+    ) -> list[dict]:
+        """Build the user message content blocks.
+
+        The first block holds the strategy section only, so it is identical
+        for every run against the same blog and is marked for caching; the
+        second holds everything that changes between runs.
+        """
+        strategy_block = {
+            "type": "text",
+            "text": (
+                f"--- STRATEGY ---\n"
+                f"{self._build_strategy_section(strategy_spec)}\n"
+            ),
+            "cache_control": _CACHE,
+        }
+
         # Market data summary
         market_section = (
             f"VIX: {market_data.vix}\n"
@@ -109,7 +240,24 @@ class AgentRunner:
                     f"${pos.market_value:,.2f} ({pct:.1f}%)\n"
                 )
 
-        # Strategy spec summary
+        run_block = {
+            "type": "text",
+            "text": (
+                f"=== TRADING SYSTEM RUN ===\n"
+                f"Run ID: {run_id}\n"
+                f"Trigger: {trigger_reason}\n\n"
+                f"--- MARKET DATA ---\n{market_section}\n"
+                f"--- PORTFOLIO ---\n{portfolio_section}\n"
+                f"Please analyze the above data, select the appropriate scenario, "
+                f"and emit your strategy_intent using the emit_strategy_intent tool. "
+                f"Use run_id='{run_id}' and blog_reference='{strategy_spec.blog_date}'."
+            ),
+        }
+        return [strategy_block, run_block]
+
+    @staticmethod
+    def _build_strategy_section(strategy_spec: StrategySpec) -> str:
+        """Strategy spec summary (stable for the whole blog week)."""
         scenarios_section = ""
         for name, sc in strategy_spec.scenarios.items():
             alloc_str = ", ".join(f"{s}: {p}%" for s, p in sorted(sc.allocation.items()))
@@ -119,7 +267,7 @@ class AgentRunner:
                 f"Triggers: {triggers_str}\n"
             )
 
-        strategy_section = (
+        return (
             f"Blog Date: {strategy_spec.blog_date}\n"
             f"Current Allocation: {strategy_spec.current_allocation}\n"
             f"VIX Triggers: {strategy_spec.vix_triggers}\n"
@@ -131,24 +279,38 @@ class AgentRunner:
             f"Scenarios:\n{scenarios_section}"
         )
 
-        return (
-            f"=== TRADING SYSTEM RUN ===\n"
-            f"Run ID: {run_id}\n"
-            f"Trigger: {trigger_reason}\n\n"
-            f"--- MARKET DATA ---\n{market_section}\n"
-            f"--- PORTFOLIO ---\n{portfolio_section}\n"
-            f"--- STRATEGY ---\n{strategy_section}\n"
-            f"Please analyze the above data, select the appropriate scenario, "
-            f"and emit your strategy_intent using the emit_strategy_intent tool. "
-            f"Use run_id='{run_id}' and blog_reference='{strategy_spec.blog_date}'."
+    def _fallback(
+        self,
+        trigger_reason: str,
+        market_data: MarketData,
+        strategy_spec: StrategySpec,
+        current_scenario: Optional[str] = None,
+    ) -> Optional[StrategyIntent]:
+        recent_vix = self._db.get_recent_market_values("vix", 2)
+        return fallback_intent(
+            run_id=self._generate_run_id(),
+            trigger_reason=trigger_reason,
+            market_data=market_data,
+            strategy_spec=strategy_spec,
+            current_scenario=(
+                current_scenario or self._db.get_state("current_scenario", "base")
+            ),
+            # The current tick's state is already saved: previous is second
+            prev_vix=recent_vix[1] if len(recent_vix) > 1 else None,
         )
 
-    def _invoke_claude(self, user_message: str) -> list[dict]:
+    def _invoke_claude(
+        self, user_message: str | list[dict], deadline: Optional[float] = None,
+    ) -> list[dict]:
         """Invoke Claude SDK and return tool call results.
 
-        Uses the Anthropic Messages API with tool use. Gracefully degrades
-        to empty tool calls when the SDK is not installed or the API key
-        is not configured.
+        Uses the Anthropic Messages API with tool use, streaming the
+        response. Tools and the system prompt are sent as a cached prefix.
+        *deadline* (a ``time.monotonic()`` value) bounds the whole call:
+        the HTTP timeout is the remaining budget, and the stream is
+        abandoned with :class:`AgentTimeout` once it passes. Gracefully
+        degrades to empty tool calls when the SDK is not installed or the
+        API key is not configured.
         """
         try:
             import anthropic
@@ -160,14 +322,34 @@ class AgentRunner:
             return []
 
         try:
-            client = anthropic.Anthropic()  # reads ANTHROPIC_API_KEY from env
-            response = client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=4096,
-                system=SYSTEM_PROMPT,
-                tools=self._convert_tools(TOOL_DEFINITIONS),
+            if self._client is None:
+                # Kept for the process lifetime so its connection pool is reused
+                self._client = anthropic.Anthropic()  # reads ANTHROPIC_API_KEY from env
+            if self._tools is None:
+                self._tools = self._convert_tools(TOOL_DEFINITIONS)
+            if deadline is None:
+                deadline = time.monotonic() + self._config.agent_deadline_sec
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AgentTimeout("Agent deadline exceeded before request")
+
+            # No SDK retries: a retry would not fit in the budget anyway
+            client = self._client.with_options(timeout=remaining, max_retries=0)
+            with client.messages.stream(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": _CACHE}],
+                tools=self._tools,
                 messages=[{"role": "user", "content": user_message}],
-            )
+            ) as stream:
+                for _event in stream:
+                    if time.monotonic() >= deadline:
+                        raise AgentTimeout(
+                            f"Agent deadline ({self._config.agent_deadline_sec:.0f}s) "
+                            "exceeded while streaming"
+                        )
+                response = stream.get_final_message()
+            self._log_usage(response)
             tool_calls = []
             for block in response.content:
                 if block.type == "tool_use":
@@ -181,6 +363,32 @@ class AgentRunner:
                 "ANTHROPIC_API_KEY not set or invalid — returning empty tool calls."
             )
             return []
+        except anthropic.APITimeoutError as exc:
+            raise AgentTimeout(
+                f"Agent deadline ({self._config.agent_deadline_sec:.0f}s) exceeded"
+            ) from exc
+
+    def close(self) -> None:
+        """Close the pooled API client."""
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                logger.debug("Error closing Anthropic client", exc_info=True)
+            self._client = None
+
+    @staticmethod
+    def _log_usage(response) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        logger.info(
+            "Agent tokens: input=%s cache_read=%s cache_write=%s output=%s",
+            getattr(usage, "input_tokens", None),
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "cache_creation_input_tokens", None),
+            getattr(usage, "output_tokens", None),
+        )
 
     @staticmethod
     def _convert_tools(tool_defs: list[dict]) -> list[dict]:
@@ -0,0 +1,151 @@
+"""Memoization of Layer 2 decisions for near-identical situations.
+
+Repeated triggers (``portfolio_drift_exceeded`` on consecutive ticks,
+``daily_check_missed`` right after ``daily_check``, VIX flapping around a
+threshold) often describe the same situation.  Each situation is reduced to
+a quantized fingerprint:
+
+- trigger family (``daily_check_missed`` counts as ``daily_check``;
+  parenthesised details such as failure counts are dropped)
+- blog date
+- VIX and 10Y yield bucket relative to the standard / blog thresholds
+- which side of each blog trading level every index is on
+- per-symbol allocation drift from target, in ``drift_bucket_pct`` steps
+
+An intent emitted for a fingerprint is reused while it is younger than the
+TTL, skipping the Claude round-trip.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_right
+from typing import Callable, Optional
+
+from trading.core.constants import VIX_CAUTION, VIX_PANIC, VIX_RISK_ON, VIX_STRESS
+from trading.data.models import MarketData, Portfolio, StrategyIntent, StrategySpec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SEC = 1800.0
+DEFAULT_DRIFT_BUCKET_PCT = 2.5
+
+_STANDARD_VIX_THRESHOLDS = (VIX_RISK_ON, VIX_CAUTION, VIX_STRESS, VIX_PANIC)
+_TRIGGER_ALIASES = {"daily_check_missed": "daily_check"}
+_DETAIL_RE = re.compile(r"\s*\(.*\)\s*$")
+
+
+def trigger_family(trigger_reason: str) -> str:
+    """``"api_failure_alert (3 consecutive)"`` -> ``"api_failure_alert"``."""
+    base = _DETAIL_RE.sub("", trigger_reason)
+    return _TRIGGER_ALIASES.get(base, base)
+
+
+def _bucket(value: Optional[float], thresholds) -> Optional[int]:
+    if value is None:
+        return None
+    return bisect_right(sorted(set(thresholds)), value)
+
+
+def situation(
+    trigger_reason: str,
+    market_data: MarketData,
+    portfolio: Portfolio,
+    strategy_spec: StrategySpec,
+    drift_bucket_pct: float = DEFAULT_DRIFT_BUCKET_PCT,
+) -> dict:
+    """The quantized description of a run that the fingerprint hashes."""
+    levels: dict[str, list[bool]] = {}
+    for index_name, lv in sorted(strategy_spec.trading_levels.items()):
+        current = market_data.get_index(index_name)
+        if current is None:
+            continue
+        levels[index_name] = [
+            lv.buy_level is not None and current <= lv.buy_level,
+            lv.sell_level is not None and current >= lv.sell_level,
+            lv.stop_loss is not None and current <= lv.stop_loss,
+        ]
+
+    target = strategy_spec.current_allocation
+    step = drift_bucket_pct if drift_bucket_pct > 0 else DEFAULT_DRIFT_BUCKET_PCT
+    drift = {
+        symbol: round((portfolio.get_position_pct(symbol) - target.get(symbol, 0.0)) / step)
+        for symbol in sorted(set(target) | set(portfolio.positions))
+    }
+
+    return {
+        "trigger": trigger_family(trigger_reason),
+        "blog_date": strategy_spec.blog_date,
+        "vix": _bucket(
+            market_data.vix,
+            _STANDARD_VIX_THRESHOLDS + tuple(strategy_spec.vix_triggers.values()),
+        ),
+        "us10y": _bucket(market_data.us10y, strategy_spec.yield_triggers.values()),
+        "levels": levels,
+        "drift": drift,
+    }
+
+
+def fingerprint(
+    trigger_reason: str,
+    market_data: MarketData,
+    portfolio: Portfolio,
+    strategy_spec: StrategySpec,
+    drift_bucket_pct: float = DEFAULT_DRIFT_BUCKET_PCT,
+) -> str:
+    """Stable short hash of :func:`situation`."""
+    payload = json.dumps(
+        situation(trigger_reason, market_data, portfolio, strategy_spec, drift_bucket_pct),
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class DecisionCache:
+    """Recent intents by situation fingerprint, each valid for *ttl_sec*."""
+
+    def __init__(
+        self,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_sec
+        self._clock = clock
+        self._entries: dict[str, tuple[float, StrategyIntent]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: str) -> Optional[StrategyIntent]:
+        """Return a copy of the cached intent for *key*, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, intent = entry
+            if self._clock() >= expires:
+                del self._entries[key]
+                return None
+            return copy.deepcopy(intent)
+
+    def put(self, key: str, intent: StrategyIntent) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            now = self._clock()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[key] = (now + self._ttl, copy.deepcopy(intent))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
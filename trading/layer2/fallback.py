@@ -0,0 +1,100 @@
+"""Deterministic Layer 2 fallback used when the agent misses its deadline.
+
+Maps the live trigger to a scenario with the backtest's rules
+(:class:`~trading.backtest.trigger_matcher.TriggerMatcher` and its
+``TRIGGER_SCENARIO_MAP``), so a slow model response degrades to the same
+behaviour the strategy is backtested with:
+
+- a VIX cross or index level hit resolves to the first candidate scenario
+  present in the blog, else stays in the current scenario;
+- portfolio drift re-rebalances to the current scenario;
+- anything else (daily checks, API alerts) takes no action, as does a
+  current scenario the blog no longer defines.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import Optional
+
+from trading.data.models import MarketData, StrategyIntent, StrategySpec
+from trading.layer2.decision_cache import trigger_family
+
+logger = logging.getLogger(__name__)
+
+
+def classify_trigger(
+    trigger_reason: str,
+    market_data: MarketData,
+    strategy_spec: StrategySpec,
+    prev_vix: Optional[float] = None,
+) -> Optional[str]:
+    """Backtest trigger type (``vix_caution``, ``drift``, ...) or None.
+
+    Only the check matching the live trigger runs: a VIX cross is
+    classified by the VIX rules alone, a level hit by the index levels
+    alone.  Daily checks, API alerts and unknown triggers return None.
+    """
+    # Imported here: the backtest package is only needed on this rare path
+    from trading.backtest.trigger_matcher import TriggerMatcher
+
+    family = trigger_family(trigger_reason)
+    if family == "portfolio_drift_exceeded":
+        return "drift"
+    if family == "vix_threshold_crossed":
+        vix_only = dataclasses.replace(strategy_spec, trading_levels={})
+        return TriggerMatcher(prev_vix=prev_vix).check_market(market_data, vix_only)
+    if family == "index_hit_level":
+        # Without a previous VIX the matcher checks index levels only
+        return TriggerMatcher().check_market(market_data, strategy_spec)
+    return None
+
+
+def fallback_intent(
+    run_id: str,
+    trigger_reason: str,
+    market_data: MarketData,
+    strategy_spec: StrategySpec,
+    current_scenario: str = "base",
+    prev_vix: Optional[float] = None,
+) -> Optional[StrategyIntent]:
+    """Build the deterministic intent for this trigger, or None for no action."""
+    from trading.backtest.trigger_matcher import TriggerMatcher
+
+    trigger = classify_trigger(trigger_reason, market_data, strategy_spec, prev_vix)
+    if trigger is None:
+        logger.info("Fallback: no deterministic action for trigger %s", trigger_reason)
+        return None
+
+    if trigger == "drift":
+        scenario = current_scenario
+    else:
+        scenario = (
+            TriggerMatcher().resolve_scenario(trigger, strategy_spec) or current_scenario
+        )
+    if scenario not in strategy_spec.scenarios:
+        # Any other allocation would be rejected against the scenario name
+        logger.warning(
+            "Fallback: scenario %s not in blog %s — no action",
+            scenario, strategy_spec.blog_date,
+        )
+        return None
+    allocation = strategy_spec.scenarios[scenario].allocation
+
+    logger.info(
+        "Fallback: trigger %s classified as %s -> scenario %s",
+        trigger_reason, trigger, scenario,
+    )
+    return StrategyIntent(
+        run_id=run_id,
+        scenario=scenario,
+        rationale=(
+            f"Deterministic fallback (agent deadline exceeded): "
+            f"{trigger_reason} -> {trigger} -> {scenario}"
+        ),
+        target_allocation=dict(allocation),
+        priority_actions=[],
+        confidence="low",
+        blog_reference=strategy_spec.blog_date,
+    )
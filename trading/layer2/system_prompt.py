@@ -38,11 +38,17 @@ TOOL_DEFINITIONS: list[dict] = [
         "name": "get_market_data",
         "description": (
             "Get current market data including VIX, US 10Y yield, index levels, "
-            "commodity prices, and ETF prices."
+            "commodity prices, and ETF prices. Optionally include daily "
+            "open/high/low/close history per metric."
         ),
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "history_days": {
+                    "type": "integer",
+                    "description": "Days of daily OHLC history to include (0-365, default 0).",
+                },
+            },
             "required": [],
         },
     },
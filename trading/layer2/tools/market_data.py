@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import date, timedelta
 from typing import Any
 
 from trading.data.database import Database
@@ -10,7 +11,10 @@ from trading.data.database import Database
 logger = logging.getLogger(__name__)
 
 
-def get_market_data(db: Database, monitor: Any) -> dict:
+MAX_HISTORY_DAYS = 365
+
+
+def get_market_data(db: Database, monitor: Any, history_days: int = 0) -> dict:
     """Return current market data as a dict for Claude.
 
     Reads the latest market state from the database and merges
@@ -23,12 +27,17 @@ def get_market_data(db: Database, monitor: Any) -> dict:
     monitor:
         MarketMonitor instance (provides ``latest_data`` attribute
         with a :class:`MarketData` object).
+    history_days:
+        If positive, also return daily OHLC per metric for the last
+        *history_days* calendar days (capped at MAX_HISTORY_DAYS) under
+        ``daily_history``, read from the market_states_daily rollup plus
+        any days not yet rolled up.
 
     Returns
     -------
     dict
         Market data with keys: vix, us10y, sp500, nasdaq, dow,
-        gold, oil, copper, etf_prices.
+        gold, oil, copper, etf_prices (and daily_history when requested).
     """
     result: dict[str, Any] = {
         "vix": None,
@@ -54,12 +63,17 @@ def get_market_data(db: Database, monitor: Any) -> dict:
         result["oil"] = md.oil
         result["copper"] = md.copper
         result["etf_prices"] = dict(md.etf_prices) if md.etf_prices else {}
-        return result
+    else:
+        # Fallback to database stored values
+        latest = db.get_latest_market_state()
+        for key in ("vix", "us10y", "sp500", "nasdaq", "dow", "gold", "oil"):
+            if key in latest:
+                result[key] = latest[key]
 
-    # Fallback to database stored values
-    for key in ("vix", "us10y", "sp500", "nasdaq", "dow", "gold", "oil"):
-        val = db.get_previous_market_state(key)
-        if val is not None:
-            result[key] = val
+    if history_days > 0:
+        days = min(history_days, MAX_HISTORY_DAYS)
+        result["daily_history"] = db.get_daily_market_history(
+            since=date.today() - timedelta(days=days),
+        )
 
     return result
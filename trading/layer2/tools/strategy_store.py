@@ -0,0 +1,192 @@
+"""Change-aware cache of the latest parsed strategy blog.
+
+``TradingSystem`` used to glob and sort the blogs directory every tick and
+re-parse only when the newest file's *date* changed, so a corrected blog
+saved under the same date was never picked up.  :class:`StrategyStore`
+keeps the parsed spec keyed by ``(path, mtime_ns, size, sha256)``:
+
+- with inotify (Linux) an unchanged directory costs one non-blocking read
+  per tick, no glob and no stat;
+- elsewhere, or if the watch cannot be set up, it stats the directory and
+  the current blog (two syscalls) and rescans only when either changed;
+- a changed mtime with identical bytes (``touch``) is not re-parsed;
+- a blog that fails to parse is remembered, not retried every tick, and
+  the previous spec stays in effect until the file changes again.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Optional
+
+from trading.data.models import StrategySpec
+from trading.layer2.tools.strategy_parser import find_latest_blog, parse_blog
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _InotifyWatch:
+    """Non-blocking inotify watch on one directory (Linux only)."""
+
+    def __init__(self, fd: int) -> None:
+        self._fd = fd
+        self.alive = True
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional[_InotifyWatch]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(str(directory)), _WATCH_MASK) < 0:
+                os.close(fd)
+                return None
+        except (OSError, AttributeError):
+            return None
+        return cls(fd)
+
+    def changed(self) -> bool:
+        """Drain pending events; True if any arrived since the last call.
+
+        If the directory itself went away the watch is dead (``alive`` is
+        cleared) and the caller should fall back to stat polling.
+        """
+        seen = False
+        while self.alive:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.close()
+                return True
+            if not data:
+                break
+            seen = True
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                _wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + length
+                if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_Q_OVERFLOW):
+                    self.close()
+        return seen
+
+    def close(self) -> None:
+        if self.alive:
+            self.alive = False
+            os.close(self._fd)
+
+
+def _stat_key(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class StrategyStore:
+    """Latest weekly blog's :class:`StrategySpec`, re-parsed only on change."""
+
+    def __init__(self, blogs_dir: str | Path, use_inotify: bool = True) -> None:
+        self._dir = Path(blogs_dir)
+        self._watch = _InotifyWatch.open(self._dir) if use_inotify else None
+        self._dir_key: Optional[tuple[int, int]] = None
+        self._path: Optional[Path] = None
+        self._file_key: Optional[tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._spec: Optional[StrategySpec] = None
+        self._scanned = False
+
+        # for tests / diagnostics
+        self.parses = 0
+        self.scans = 0
+
+    @property
+    def spec(self) -> Optional[StrategySpec]:
+        return self._spec
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    @property
+    def watching(self) -> bool:
+        return self._watch is not None and self._watch.alive
+
+    def close(self) -> None:
+        if self._watch is not None:
+            self._watch.close()
+
+    def refresh(self) -> bool:
+        """Pick up blog changes; return True if :attr:`spec` was replaced."""
+        if self._scanned and not self._may_have_changed():
+            return False
+        self._scanned = True
+        self.scans += 1
+        self._dir_key = _stat_key(self._dir)
+
+        latest = find_latest_blog(self._dir)
+        if latest is None:
+            if self._spec is None:
+                logger.error("No weekly strategy blog found in %s", self._dir)
+            return False
+
+        file_key = _stat_key(latest)
+        if latest == self._path and file_key == self._file_key:
+            return False
+        try:
+            digest = hashlib.sha256(latest.read_bytes()).hexdigest()
+        except OSError:
+            logger.exception("Failed to read strategy blog: %s", latest)
+            return False
+
+        same_content = latest == self._path and digest == self._digest
+        self._path, self._file_key, self._digest = latest, file_key, digest
+        if same_content:
+            return False
+
+        self.parses += 1
+        try:
+            spec = parse_blog(latest)
+        except Exception:
+            logger.exception("Failed to parse strategy blog: %s", latest)
+            return False
+        logger.info("Loaded strategy from %s (blog_date=%s)", latest.name, spec.blog_date)
+        self._spec = spec
+        return True
+
+    def _may_have_changed(self) -> bool:
+        if self.watching:
+            return self._watch.changed()
+        if _stat_key(self._dir) != self._dir_key:
+            return True
+        return self._path is not None and _stat_key(self._path) != self._file_key
@@ -0,0 +1,224 @@
+"""Fill tracking for submitted orders (Layer 3).
+
+Order updates arrive from Alpaca's trade-updates websocket and wake
+waiters immediately.  A polling fallback does one batched ``get_orders``
+per cycle (orders since the earliest tracked submission, filtered to the
+tracked client IDs): every ``poll_interval`` while the stream is down, and
+every ``stream_poll_interval`` as a safety net while it is up.  The stream
+counts as up once its first message arrives, not when its thread starts,
+so a connection that never comes up is polled at the fast interval.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from trading.services.alpaca_client import AlpacaClient, _order_to_dict
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({
+    "filled", "canceled", "cancelled", "expired", "rejected", "failed",
+})
+
+DEFAULT_POLL_INTERVAL = 2.0  # seconds, stream down
+DEFAULT_STREAM_POLL_INTERVAL = 15.0  # seconds, stream up (missed events)
+_CLOCK_SKEW = timedelta(minutes=1)
+
+
+def is_terminal(status: Optional[str]) -> bool:
+    return status in TERMINAL_STATUSES
+
+
+class FillTracker:
+    """Tracks order state from stream events with a polling fallback.
+
+    Call :meth:`track` before submitting an order (so no event can be
+    missed), then :meth:`wait` for the orders to reach a terminal status.
+
+    *stream* is anything with the ``TradingStream`` interface
+    (``subscribe_trade_updates(handler)``, blocking ``run()``, ``stop()``);
+    without one the tracker only polls.
+    """
+
+    def __init__(
+        self,
+        client: AlpacaClient,
+        stream: Any = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        stream_poll_interval: float = DEFAULT_STREAM_POLL_INTERVAL,
+    ) -> None:
+        self._client = client
+        self._stream = stream
+        self._poll_interval = poll_interval
+        self._stream_poll_interval = stream_poll_interval
+
+        self._cond = threading.Condition()
+        self._orders: dict[str, dict] = {}  # latest known order dict per tracked id
+        self._submitted: dict[str, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stream_alive = False
+        self.polls = 0  # for tests / diagnostics
+
+    # ------------------------------------------------------------------
+    # Stream lifecycle
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_config(cls, client: AlpacaClient, config) -> FillTracker:
+        """Build a tracker, with a TradingStream when enabled in *config*."""
+        stream = None
+        if config.trade_stream and config.api_key:
+            try:
+                from alpaca.trading.stream import TradingStream
+
+                stream = TradingStream(
+                    api_key=config.api_key,
+                    secret_key=config.secret_key,
+                    paper=config.is_paper,
+                )
+            except Exception:
+                logger.exception("Trade-updates stream unavailable, polling only")
+        return cls(client, stream=stream)
+
+    @property
+    def stream_alive(self) -> bool:
+        return self._stream_alive
+
+    def start(self) -> None:
+        """Start the stream thread (no-op without a stream or if running)."""
+        if self._stream is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stream.subscribe_trade_updates(self._on_trade_update)
+        self._thread = threading.Thread(
+            target=self._run_stream, name="trade-updates", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stream is not None and self._thread is not None:
+            try:
+                self._stream.stop()
+            except Exception:
+                logger.debug("Error stopping trade-updates stream", exc_info=True)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run_stream(self) -> None:
+        try:
+            self._stream.run()
+        except Exception:
+            logger.exception("Trade-updates stream stopped")
+        finally:
+            self._stream_alive = False
+            with self._cond:
+                self._cond.notify_all()  # let waiters switch to fast polling
+
+    async def _on_trade_update(self, update) -> None:
+        if not self._stream_alive:
+            # First message: the websocket is connected and subscribed
+            with self._cond:
+                self._stream_alive = True
+                self._cond.notify_all()
+        order = getattr(update, "order", None)
+        if order is None:
+            return
+        self._record(_order_to_dict(order))
+
+    # ------------------------------------------------------------------
+    # Tracking
+    # ------------------------------------------------------------------
+
+    def track(self, client_order_id: str, submitted_at: Optional[datetime] = None) -> None:
+        """Register an order before it is submitted."""
+        self.start()
+        with self._cond:
+            self._submitted[client_order_id] = submitted_at or datetime.now(timezone.utc)
+
+    def forget(self, client_order_ids: list[str]) -> None:
+        with self._cond:
+            for cid in client_order_ids:
+                self._submitted.pop(cid, None)
+                self._orders.pop(cid, None)
+
+    def _record(self, info: dict, tracked_only: bool = True) -> None:
+        cid = info.get("client_order_id")
+        with self._cond:
+            if tracked_only and cid not in self._submitted:
+                return
+            self._orders[cid] = info
+            self._cond.notify_all()
+
+    def _all_terminal(self, ids: list[str]) -> bool:
+        return all(is_terminal(self._orders.get(c, {}).get("status")) for c in ids)
+
+    def poll(self, client_order_ids: list[str]) -> None:
+        """One batched lookup of *client_order_ids* via ``get_orders``."""
+        with self._cond:
+            since = [self._submitted[c] for c in client_order_ids if c in self._submitted]
+        after = min(since) - _CLOCK_SKEW if since else None
+        self.polls += 1
+        found = self._client.get_orders_by_client_ids(client_order_ids, after=after)
+        for info in (found or {}).values():
+            self._record(info, tracked_only=False)
+
+    def wait(
+        self,
+        client_order_ids: list[str],
+        timeout: float,
+        until: Optional[Callable[[dict[str, dict]], bool]] = None,
+    ) -> dict[str, dict]:
+        """Block until every order is terminal or *timeout* seconds pass.
+
+        *until*, if given, is an extra early-exit condition evaluated on
+        every update with the known order dicts of *client_order_ids*.
+        Returns the latest known order dict per id (ids never seen are
+        omitted).
+        """
+        def _done() -> bool:
+            if self._all_terminal(client_order_ids):
+                return True
+            return until is not None and until(self._known(client_order_ids))
+
+        deadline = time.monotonic() + timeout
+        # With a live stream the first poll is a safety net, not the driver
+        next_poll = time.monotonic() + (
+            self._stream_poll_interval if self._stream_alive else 0.0
+        )
+        while True:
+            with self._cond:
+                if _done():
+                    break
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if now >= next_poll:
+                pending = [
+                    c for c in client_order_ids
+                    if not is_terminal(self._orders.get(c, {}).get("status"))
+                ]
+                self.poll(pending)
+                interval = (
+                    self._stream_poll_interval if self._stream_alive
+                    else self._poll_interval
+                )
+                next_poll = time.monotonic() + interval
+                continue
+            with self._cond:
+                alive = self._stream_alive
+                self._cond.wait_for(
+                    lambda: _done() or self._stream_alive != alive,
+                    timeout=min(next_poll, deadline) - now,
+                )
+                if self._stream_alive != alive and not self._stream_alive:
+                    next_poll = time.monotonic()  # stream dropped: poll now
+
+        with self._cond:
+            return self._known(client_order_ids)
+
+    def _known(self, client_order_ids: list[str]) -> dict[str, dict]:
+        return {c: dict(self._orders[c]) for c in client_order_ids if c in self._orders}
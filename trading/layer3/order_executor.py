@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 
 from trading.config import TradingConfig
 from trading.data.database import Database
 from trading.data.models import Order
+from trading.layer3.fill_tracker import FillTracker, is_terminal
 from trading.services.alpaca_client import AlpacaClient
 
 logger = logging.getLogger(__name__)
@@ -19,12 +20,19 @@ class OrderExecutor:
     """Executes orders via Alpaca and logs results to the database.
 
     In dry_run mode, orders are logged but not actually submitted.
+
+    Live orders are submitted in two concurrent waves, sells then buys,
+    with at most ``order_submit_concurrency`` calls in flight.  Database
+    writes stay on the calling thread; only the broker calls run in the
+    pool.
     """
 
     def __init__(self, config: TradingConfig, db: Database) -> None:
         self._config = config
         self._db = db
         self._client: Optional[AlpacaClient] = None
+        self._tracker: Optional[FillTracker] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
 
     def _get_client(self) -> AlpacaClient:
         """Lazy-init Alpaca client."""
@@ -32,6 +40,28 @@ class OrderExecutor:
             self._client = AlpacaClient(self._config.alpaca)
         return self._client
 
+    def _get_tracker(self) -> FillTracker:
+        """Lazy-init fill tracker (trade-updates stream + polling fallback)."""
+        if self._tracker is None:
+            self._tracker = FillTracker.from_config(self._get_client(), self._config.alpaca)
+        return self._tracker
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max(1, self._config.order_submit_concurrency),
+                thread_name_prefix="order-submit",
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the trade-updates stream and the submission pool."""
+        if self._tracker is not None:
+            self._tracker.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
     def execute(self, orders: list[Order]) -> list[dict]:
         """Submit orders to Alpaca and log to database.
 
@@ -45,16 +75,17 @@ class OrderExecutor:
         list[dict]
             Results with keys: client_order_id, order_id, status, filled_price.
         """
-        results: list[dict] = []
+        if self._config.dry_run:
+            return [self._dry_run_order(order) for order in orders]
 
-        for order in orders:
-            if self._config.dry_run:
-                result = self._dry_run_order(order)
-            else:
-                result = self._live_order(order)
-            results.append(result)
+        sells = [o for o in orders if o.side == "sell"]
+        buys = [o for o in orders if o.side != "sell"]
 
-        return results
+        results = self._submit_wave(sells)
+        if sells and buys:
+            self._wait_for_sell_cash(sells, buys, results)
+        results.update(self._submit_wave(buys, results))
+        return [results[o.client_order_id] for o in orders]
 
     def _dry_run_order(self, order: Order) -> dict:
         """Log order without submitting to Alpaca."""
@@ -85,30 +116,71 @@ class OrderExecutor:
             "filled_price": order.limit_price,
         }
 
-    def _live_order(self, order: Order) -> dict:
-        """Submit order to Alpaca."""
+    def _submit_wave(
+        self, orders: list[Order], done: Optional[dict[str, dict]] = None,
+    ) -> dict[str, dict]:
+        """Submit *orders* concurrently; return results by client_order_id.
+
+        Each order is tracked and saved as ``submitted`` before any broker
+        call, and the client_order_id is passed through unchanged, so a
+        retried or duplicated id is rejected by Alpaca instead of placing a
+        second order.  Ids already in *done* (or repeated within the wave)
+        are not sent again.
+        """
+        seen = set(done or ())
+        wave: list[Order] = []
+        for order in orders:
+            if order.client_order_id in seen:
+                logger.warning("Duplicate client_order_id %s skipped", order.client_order_id)
+                continue
+            seen.add(order.client_order_id)
+            wave.append(order)
+        if not wave:
+            return {}
+
         client = self._get_client()
+        tracker = self._get_tracker()
+        for order in wave:
+            logger.info(
+                "Submitting %s %s %.6f shares of %s @ limit $%.2f (id: %s)",
+                order.side.upper(),
+                order.order_type,
+                order.quantity,
+                order.symbol,
+                order.limit_price or 0,
+                order.client_order_id,
+            )
+            # Track before submitting so no stream event can be missed
+            tracker.track(order.client_order_id)
+            self._db.save_trade(
+                client_order_id=order.client_order_id,
+                symbol=order.symbol,
+                side=order.side,
+                quantity=order.quantity,
+                status="submitted",
+            )
+
+        if len(wave) == 1:
+            responses = [self._submit_one(client, wave[0])]
+        else:
+            pool = self._get_pool()
+            futures = [pool.submit(self._submit_one, client, o) for o in wave]
+            responses = [f.result() for f in futures]
 
-        logger.info(
-            "Submitting %s %s %.6f shares of %s @ limit $%.2f (id: %s)",
-            order.side.upper(),
-            order.order_type,
-            order.quantity,
-            order.symbol,
-            order.limit_price or 0,
-            order.client_order_id,
-        )
+        return {
+            order.client_order_id: self._record_submission(order, response)
+            for order, response in zip(wave, responses)
+        }
 
-        # Save pending trade first
-        self._db.save_trade(
-            client_order_id=order.client_order_id,
-            symbol=order.symbol,
-            side=order.side,
-            quantity=order.quantity,
-            status="submitted",
-        )
+    @staticmethod
+    def _submit_one(client: AlpacaClient, order: Order) -> Optional[dict]:
+        try:
+            return client.submit_order(order)
+        except Exception:
+            logger.exception("Unexpected error submitting %s", order.client_order_id)
+            return None
 
-        result = client.submit_order(order)
+    def _record_submission(self, order: Order, result: Optional[dict]) -> dict:
         if result is None:
             logger.error("Order submission failed for %s", order.client_order_id)
             self._db.update_trade_status(order.client_order_id, "failed")
@@ -138,6 +210,48 @@ class OrderExecutor:
             "filled_price": filled_price,
         }
 
+    def _wait_for_sell_cash(
+        self, sells: list[Order], buys: list[Order], results: dict[str, dict],
+    ) -> None:
+        """Hold the buy wave until sell proceeds cover it.
+
+        Returns immediately when current cash already covers the buys'
+        limit notional; otherwise waits (up to ``sell_settle_timeout_sec``)
+        until cash plus filled sell proceeds covers it or every sell is
+        final.  Buys that still lack cash are left to Alpaca's
+        buying-power check.
+        """
+        needed = sum(b.quantity * (b.limit_price or 0.0) for b in buys)
+        account = self._get_client().get_account()
+        cash = account["cash"] if account else 0.0
+        if cash >= needed:
+            return
+
+        pending = [
+            o.client_order_id for o in sells
+            if results.get(o.client_order_id, {}).get("status") != "failed"
+        ]
+        if not pending:
+            return
+
+        def _covered(known: dict[str, dict]) -> bool:
+            proceeds = 0.0
+            for info in known.values():
+                qty, price = info.get("filled_qty"), info.get("filled_avg_price")
+                if qty and price:
+                    proceeds += float(qty) * float(price)
+            return cash + proceeds >= needed
+
+        known = self._get_tracker().wait(
+            pending, timeout=self._config.sell_settle_timeout_sec, until=_covered,
+        )
+        if not _covered(known):
+            logger.warning(
+                "Sell proceeds do not yet cover buys ($%.2f needed, $%.2f cash); "
+                "submitting buys anyway",
+                needed, cash,
+            )
+
     def check_fill_status(self, client_order_id: str) -> dict:
         """Check if an order has been filled.
 
@@ -151,41 +265,38 @@ class OrderExecutor:
         dict
             Order status with keys: client_order_id, status, filled_price.
         """
-        client = self._get_client()
-
-        # Alpaca's get_order expects their internal ID, but we use client_order_id.
-        # We search through recent orders.
-        try:
-            from alpaca.trading.requests import GetOrdersRequest
-            from alpaca.trading.enums import QueryOrderStatus
-
-            req = GetOrdersRequest(status=QueryOrderStatus.ALL)
-            orders = client._trading.get_orders(req)
-            for o in orders:
-                if o.client_order_id == client_order_id:
-                    filled_price = float(o.filled_avg_price) if o.filled_avg_price else None
-                    status = str(o.status)
-
-                    if filled_price is not None:
-                        self._db.update_trade_status(
-                            client_order_id,
-                            status,
-                            filled_price=filled_price,
-                            filled_at=str(o.filled_at) if o.filled_at else None,
-                        )
-
-                    return {
-                        "client_order_id": client_order_id,
-                        "status": status,
-                        "filled_price": filled_price,
-                    }
-        except Exception:
-            logger.exception("Error checking fill status for %s", client_order_id)
-
+        tracker = self._get_tracker()
+        tracker.poll([client_order_id])
+        found = tracker.wait([client_order_id], timeout=0)
+        info = found.get(client_order_id)
+        if info is not None and is_terminal(info.get("status")):
+            tracker.forget([client_order_id])
+        return self._apply_fill(client_order_id, info)
+
+    def _apply_fill(self, client_order_id: str, info: Optional[dict]) -> dict:
+        """Record a known order state in the DB and return the status dict."""
+        if info is None:
+            return {
+                "client_order_id": client_order_id,
+                "status": "unknown",
+                "filled_price": None,
+            }
+        status = info.get("status", "unknown")
+        price_str = info.get("filled_avg_price")
+        filled_price = float(price_str) if price_str else None
+        if filled_price is not None:
+            # Holdings changed: drop cached account/positions
+            self._get_client().invalidate_portfolio()
+            self._db.update_trade_status(
+                client_order_id,
+                status,
+                filled_price=filled_price,
+                filled_at=info.get("filled_at"),
+            )
         return {
             "client_order_id": client_order_id,
-            "status": "unknown",
-            "filled_price": None,
+            "status": status,
+            "filled_price": filled_price,
         }
 
     def wait_for_fills(
@@ -193,7 +304,11 @@ class OrderExecutor:
         order_ids: list[str],
         timeout_seconds: int = 60,
     ) -> list[dict]:
-        """Poll for order fills until timeout.
+        """Wait for orders to reach a terminal status.
+
+        Fills are confirmed as soon as the trade-updates stream reports
+        them; while the stream is unavailable the tracker polls all pending
+        orders with one ``get_orders`` call per cycle.
 
         Parameters
         ----------
@@ -205,29 +320,22 @@ class OrderExecutor:
         Returns
         -------
         list[dict]
-            Final status for each order.
+            Final status for each order (``"timeout"`` if never seen).
         """
-        pending = set(order_ids)
-        results: dict[str, dict] = {}
-        deadline = time.time() + timeout_seconds
-
-        while pending and time.time() < deadline:
-            for oid in list(pending):
-                status = self.check_fill_status(oid)
-                results[oid] = status
-                if status["status"] in ("filled", "cancelled", "expired", "failed", "rejected"):
-                    pending.discard(oid)
-
-            if pending:
-                time.sleep(2)
-
-        # Mark remaining as timed out
-        for oid in pending:
-            if oid not in results:
-                results[oid] = {
+        tracker = self._get_tracker()
+        found = tracker.wait(order_ids, timeout=timeout_seconds)
+
+        results: list[dict] = []
+        for oid in order_ids:
+            info = found.get(oid)
+            if info is None:
+                results.append({
                     "client_order_id": oid,
                     "status": "timeout",
                     "filled_price": None,
-                }
-
-        return [results[oid] for oid in order_ids if oid in results]
+                })
+                continue
+            results.append(self._apply_fill(oid, info))
+            if is_terminal(info.get("status")):
+                tracker.forget([oid])
+        return results
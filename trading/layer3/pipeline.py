@@ -0,0 +1,179 @@
+"""Layer 3 pipeline: apply one agent decision to one account.
+
+Validate, generate and execute the intent, log the decision, then (live
+only) wait for fills, re-sync stop orders and notify.  ``TradingSystem``
+runs it for its account; ``MultiAccountSystem`` runs it once per account
+on that account's worker thread.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Optional
+
+from trading.config import TradingConfig
+from trading.data.database import Database
+from trading.data.models import MarketData, Portfolio, StrategySpec
+from trading.layer1.stop_loss_manager import StopLossManager
+from trading.layer3.order_executor import OrderExecutor
+from trading.layer3.order_generator import OrderGenerator
+from trading.layer3.order_validator import OrderValidator
+
+if TYPE_CHECKING:
+    from trading.layer2.agent_runner import AgentDecision
+    from trading.services.email_notifier import EmailNotifier
+
+logger = logging.getLogger(__name__)
+
+
+def _no_phase(name: str) -> AbstractContextManager:
+    return nullcontext()
+
+
+class ExecutionPipeline:
+    """Validate → generate → execute → log → fills → stop re-sync.
+
+    *fetch_portfolio* refreshes the portfolio after fills for the stop
+    re-sync.  *label* (the account name) prefixes log lines and
+    notifications; *phase* times each step (see ``TickTimer.span``).
+    """
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        db: Database,
+        validator: OrderValidator,
+        generator: OrderGenerator,
+        executor: OrderExecutor,
+        stop_mgr: StopLossManager,
+        notifier: EmailNotifier,
+        fetch_portfolio: Callable[[], Optional[Portfolio]],
+        label: Optional[str] = None,
+        phase: Callable[[str], AbstractContextManager] = _no_phase,
+    ) -> None:
+        self._config = config
+        self._db = db
+        self._validator = validator
+        self._generator = generator
+        self._executor = executor
+        self._stop_mgr = stop_mgr
+        self._notifier = notifier
+        self._fetch_portfolio = fetch_portfolio
+        self._tag = f"[{label}] " if label else ""
+        self._phase = phase
+
+    def run(
+        self,
+        trigger_reason: str,
+        decision: AgentDecision,
+        market_data: MarketData,
+        portfolio: Portfolio,
+        strategy_spec: StrategySpec,
+    ) -> str:
+        """Apply *decision*; return the result logged (NO_ACTION, REJECTED, APPROVED)."""
+        intent = decision.intent
+        memo = {
+            "fingerprint": decision.fingerprint,
+            "cache_hit": decision.cache_hit,
+            "fallback": decision.fallback,
+            "source_run_id": decision.source_run_id,
+        }
+        now = datetime.now(timezone.utc).isoformat()
+        if intent is None:
+            logger.info("%sAgent returned no intent for trigger=%s", self._tag, trigger_reason)
+            self._db.log_decision(
+                timestamp=now,
+                run_id=None,
+                trigger_type=trigger_reason,
+                result="NO_ACTION",
+                rationale=(
+                    "Fallback: no deterministic action for this trigger"
+                    if decision.fallback else "Agent returned no intent"
+                ),
+                **memo,
+            )
+            return "NO_ACTION"
+
+        # Validate
+        with self._phase("validation"):
+            validation = self._validator.validate(intent, strategy_spec, portfolio)
+        if not validation.is_approved:
+            logger.warning(
+                "%sValidation rejected intent (scenario=%s): %s",
+                self._tag, intent.scenario, validation.errors,
+            )
+            self._db.log_decision(
+                timestamp=now,
+                run_id=intent.run_id,
+                trigger_type=trigger_reason,
+                result="REJECTED",
+                scenario=intent.scenario,
+                rationale=f"Validation errors: {validation.errors}",
+                **memo,
+            )
+            self._notifier.alert(f"{self._tag}Order rejected: {validation.errors}")
+            return "REJECTED"
+
+        # Generate orders
+        with self._phase("order_generation"):
+            orders = self._generator.generate(intent, portfolio, market_data.etf_prices)
+        if not orders:
+            logger.info("%sNo orders generated for scenario=%s", self._tag, intent.scenario)
+            self._db.log_decision(
+                timestamp=now,
+                run_id=intent.run_id,
+                trigger_type=trigger_reason,
+                result="APPROVED",
+                scenario=intent.scenario,
+                rationale="Approved but no orders needed (within thresholds)",
+                **memo,
+            )
+            self._db.set_state("current_scenario", intent.scenario)
+            return "APPROVED"
+
+        # Execute
+        logger.info(
+            "%sExecuting %d orders for scenario=%s",
+            self._tag, len(orders), intent.scenario,
+        )
+        with self._phase("execution"):
+            results = self._executor.execute(orders)
+        self._db.log_decision(
+            timestamp=now,
+            run_id=intent.run_id,
+            trigger_type=trigger_reason,
+            result="APPROVED",
+            scenario=intent.scenario,
+            rationale=intent.rationale,
+            **memo,
+        )
+        self._db.set_state("current_scenario", intent.scenario)
+
+        # Wait for fills (skip in dry-run)
+        if not self._config.dry_run:
+            submitted_ids = [
+                r["client_order_id"] for r in results
+                if r.get("status") not in ("dry_run", "failed")
+            ]
+            if submitted_ids:
+                with self._phase("fills"):
+                    fill_results = self._executor.wait_for_fills(submitted_ids)
+                logger.info("%sFill results: %s", self._tag, fill_results)
+
+                # Re-sync stop orders after fills
+                with self._phase("stop_resync"):
+                    refreshed = self._fetch_portfolio()
+                    if refreshed is not None:
+                        self._stop_mgr.resync_after_fill_or_rebalance(
+                            refreshed, strategy_spec,
+                        )
+
+        order_summary = ", ".join(
+            f"{r['client_order_id']}={r['status']}" for r in results
+        )
+        self._notifier.info(
+            f"{self._tag}Orders executed (scenario={intent.scenario}): {order_summary}"
+        )
+        return "APPROVED"
@@ -15,10 +15,12 @@ Usage::
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import logging
 import signal
 import sys
-from datetime import date, datetime, timezone
+import threading
+from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
@@ -28,16 +30,27 @@ from trading.config import TradingConfig
 from trading.core.holidays import USMarketCalendar
 from trading.core.scheduler_guard import SchedulerGuard
 from trading.data.database import Database
-from trading.data.models import CheckResultType, MarketData, Portfolio, StrategySpec
+from trading.data.models import (
+    CheckResult,
+    CheckResultType,
+    MarketData,
+    Portfolio,
+    StrategySpec,
+)
+from trading.data.retention import run_retention
+from trading.layer1.fast_path import FastPathMonitor
 from trading.layer1.loss_calculator import LossCalculator
 from trading.layer1.market_monitor import MarketMonitor
 from trading.layer1.rule_engine import RuleEngine
 from trading.layer1.stop_loss_manager import StopLossManager
 from trading.layer2.agent_runner import AgentRunner
-from trading.layer2.tools.strategy_parser import find_latest_blog, parse_blog
+from trading.layer2.tools.strategy_store import StrategyStore
 from trading.layer3.order_executor import OrderExecutor
 from trading.layer3.order_generator import OrderGenerator
 from trading.layer3.order_validator import OrderValidator
+from trading.layer3.pipeline import ExecutionPipeline
+from trading.multi_account import MultiAccountSystem
+from trading.orchestrator import Orchestrator
 from trading.services.email_notifier import EmailNotifier
 
 logger = logging.getLogger(__name__)
@@ -76,30 +89,11 @@ def _setup_logging(log_dir: Path) -> None:
     root.addHandler(console_handler)
 
 
-# ---------------------------------------------------------------------------
-# Strategy loader
-# ---------------------------------------------------------------------------
-
-def _load_strategy(blogs_dir: Path) -> Optional[StrategySpec]:
-    """Find and parse the latest weekly strategy blog."""
-    blog_path = find_latest_blog(blogs_dir)
-    if blog_path is None:
-        logger.error("No weekly strategy blog found in %s", blogs_dir)
-        return None
-    try:
-        spec = parse_blog(blog_path)
-        logger.info("Loaded strategy from %s (blog_date=%s)", blog_path.name, spec.blog_date)
-        return spec
-    except Exception:
-        logger.exception("Failed to parse strategy blog: %s", blog_path)
-        return None
-
-
 # ---------------------------------------------------------------------------
 # TradingSystem: the main orchestrator
 # ---------------------------------------------------------------------------
 
-class TradingSystem:
+class TradingSystem(Orchestrator):
     """Central orchestrator binding all three layers together.
 
     Holds references to every subsystem and provides the tick methods
@@ -121,6 +115,11 @@ class TradingSystem:
         self._rule_engine = RuleEngine(config, self._db)
         self._loss_calc = LossCalculator(self._db)
         self._stop_mgr = StopLossManager(config, self._db)
+        self._fast_path: Optional[FastPathMonitor] = (
+            FastPathMonitor(config) if config.fast_tick_interval_sec > 0 else None
+        )
+        # Serialises full ticks and fast-path polls (one DB connection)
+        self._tick_lock = threading.Lock()
 
         # Layer 2
         self._agent = AgentRunner(config, self._db)
@@ -130,40 +129,12 @@ class TradingSystem:
         self._generator = OrderGenerator(config)
         self._executor = OrderExecutor(config, self._db)
 
-        # Cached strategy (reloaded when blog changes)
-        self._strategy: Optional[StrategySpec] = None
-        self._strategy_blog_date: Optional[str] = None
+        # Cached strategy (re-parsed only when the latest blog changes)
+        self._strategy_store = StrategyStore(
+            config.blogs_dir, use_inotify=config.strategy_inotify,
+        )
         self._blog_just_updated: bool = False
 
-    # ------------------------------------------------------------------
-    # Strategy helpers
-    # ------------------------------------------------------------------
-
-    def _ensure_strategy(self) -> Optional[StrategySpec]:
-        """Return the current StrategySpec, reloading if a newer blog exists.
-
-        Sets ``_blog_just_updated`` flag when a new blog is detected, so
-        callers can trigger stop-order sync only on blog changes.
-        """
-        self._blog_just_updated = False
-        latest = find_latest_blog(self._config.blogs_dir)
-        if latest is None:
-            if self._strategy is not None:
-                return self._strategy
-            logger.error("No strategy blog available")
-            return None
-
-        blog_date = latest.stem[:10]  # "YYYY-MM-DD"
-        if blog_date != self._strategy_blog_date:
-            spec = _load_strategy(self._config.blogs_dir)
-            if spec is not None:
-                self._strategy = spec
-                self._strategy_blog_date = spec.blog_date
-                self._blog_just_updated = True
-                logger.info("Strategy updated to blog_date=%s", spec.blog_date)
-
-        return self._strategy
-
     # ------------------------------------------------------------------
     # Snapshot helpers
     # ------------------------------------------------------------------
@@ -185,22 +156,6 @@ class TradingSystem:
             if today.weekday() == 0:  # Monday
                 self._loss_calc.create_weekly_snapshot(portfolio)
 
-    # ------------------------------------------------------------------
-    # Missed daily check detection
-    # ------------------------------------------------------------------
-
-    def _daily_check_was_missed(self, now_et: datetime) -> bool:
-        """Return True if today's 6:30 daily check did not run.
-
-        We track this via a DB state key ``daily_check_YYYY-MM-DD``.
-        """
-        today_str = now_et.date().isoformat()
-        return self._db.get_state(f"daily_check_{today_str}", "0") == "0"
-
-    def _mark_daily_check_done(self, now_et: datetime) -> None:
-        today_str = now_et.date().isoformat()
-        self._db.set_state(f"daily_check_{today_str}", "1")
-
     # ------------------------------------------------------------------
     # Layer 2 + 3 pipeline
     # ------------------------------------------------------------------
@@ -215,163 +170,127 @@ class TradingSystem:
         """Run Layer 2 (Claude agent) then Layer 3 (validate/execute)."""
         logger.info("Running agent pipeline: trigger=%s", trigger_reason)
 
-        # Layer 2: Claude agent
-        intent = self._agent.run(trigger_reason, market_data, portfolio, strategy_spec)
-        if intent is None:
-            logger.info("Agent returned no intent for trigger=%s", trigger_reason)
-            self._db.log_decision(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                run_id=None,
-                trigger_type=trigger_reason,
-                result="NO_ACTION",
-                rationale="Agent returned no intent",
-            )
-            return
-
-        # Layer 3: Validate
-        validation = self._validator.validate(intent, strategy_spec, portfolio)
-        if not validation.is_approved:
-            logger.warning(
-                "Validation rejected intent (scenario=%s): %s",
-                intent.scenario, validation.errors,
-            )
-            self._db.log_decision(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                run_id=intent.run_id,
-                trigger_type=trigger_reason,
-                result="REJECTED",
-                scenario=intent.scenario,
-                rationale=f"Validation errors: {validation.errors}",
+        # Layer 2: Claude agent (or a cached decision for the same situation)
+        with self._phase("agent"):
+            decision = self._agent.decide(
+                trigger_reason, market_data, portfolio, strategy_spec,
             )
+        intent = decision.intent
+        if decision.fallback:
             self._notifier.alert(
-                f"Order rejected: {validation.errors}"
-            )
-            return
-
-        # Layer 3: Generate orders
-        prices = market_data.etf_prices
-        orders = self._generator.generate(intent, portfolio, prices)
-        if not orders:
-            logger.info("No orders generated for scenario=%s", intent.scenario)
-            self._db.log_decision(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                run_id=intent.run_id,
-                trigger_type=trigger_reason,
-                result="APPROVED",
-                scenario=intent.scenario,
-                rationale="Approved but no orders needed (within thresholds)",
+                f"Agent deadline exceeded for trigger {trigger_reason}; "
+                f"deterministic fallback used "
+                f"(scenario={intent.scenario if intent else 'no action'})"
             )
-            return
 
-        # Layer 3: Execute
-        logger.info("Executing %d orders for scenario=%s", len(orders), intent.scenario)
-        results = self._executor.execute(orders)
-
-        # Log the decision
-        self._db.log_decision(
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            run_id=intent.run_id,
-            trigger_type=trigger_reason,
-            result="APPROVED",
-            scenario=intent.scenario,
-            rationale=intent.rationale,
+        # Layer 3: validate / generate / execute / fills
+        self._execution_pipeline().run(
+            trigger_reason, decision, market_data, portfolio, strategy_spec,
         )
 
-        # Wait for fills (skip in dry-run)
-        if not self._config.dry_run:
-            submitted_ids = [
-                r["client_order_id"] for r in results
-                if r.get("status") not in ("dry_run", "failed")
-            ]
-            if submitted_ids:
-                fill_results = self._executor.wait_for_fills(submitted_ids)
-                logger.info("Fill results: %s", fill_results)
-
-                # Re-sync stop orders after fills
-                refreshed_portfolio = self._monitor.fetch_portfolio()
-                if refreshed_portfolio is not None:
-                    self._stop_mgr.resync_after_fill_or_rebalance(
-                        refreshed_portfolio, strategy_spec,
-                    )
-
-        # Notify
-        order_summary = ", ".join(
-            f"{r['client_order_id']}={r['status']}" for r in results
-        )
-        self._notifier.info(
-            f"Orders executed (scenario={intent.scenario}): {order_summary}"
+    def _execution_pipeline(self) -> ExecutionPipeline:
+        return ExecutionPipeline(
+            self._config, self._db, self._validator, self._generator,
+            self._executor, self._stop_mgr, self._notifier,
+            fetch_portfolio=self._monitor.fetch_portfolio,
+            phase=self._phase,
         )
 
     # ------------------------------------------------------------------
     # Scheduled jobs
     # ------------------------------------------------------------------
 
-    def market_tick(self) -> None:
+    def market_tick(self, escalation: Optional[str] = None) -> None:
         """15-minute interval check during market hours (9:30-16:00 ET Mon-Fri).
 
         This is the main loop that runs Layer 1, and conditionally
-        triggers Layer 2 + 3.
+        triggers Layer 2 + 3.  *escalation* is the trigger a fast-path
+        poll detected when it runs this tick early.
+        """
+        with self._tick_lock:
+            self._market_tick_locked(escalation)
+
+    def _market_tick_locked(self, escalation: Optional[str] = None) -> None:
+        """Body of :meth:`market_tick`; the caller holds ``_tick_lock``."""
+        self._run_job("market_tick", self._market_tick_inner, escalation)
+
+    def fast_tick(self) -> None:
+        """Fast-path poll between full ticks; escalates when a rule fires.
+
+        The escalated tick runs without releasing the lock taken for the
+        poll, so a scheduled tick cannot handle the same event in between
+        and have it handled twice.
         """
+        if self._fast_path is None or not self._market_open():
+            return
+        if not self._tick_lock.acquire(blocking=False):
+            return  # a full tick is running
         try:
-            self._market_tick_inner()
-        except Exception:
-            logger.exception("Unhandled error in market_tick")
-            self._notifier.critical("Unhandled error in market_tick — see logs")
+            try:
+                reason = self._fast_path.poll()
+            except Exception:
+                logger.exception("Unhandled error in fast_tick")
+                return
+            if reason is not None:
+                logger.info("Fast path detected %s — running full tick now", reason)
+                self._market_tick_locked(escalation=reason)
+        finally:
+            self._tick_lock.release()
 
-    def _market_tick_inner(self) -> None:
+    def _market_open(self) -> bool:
         import pytz
         now_et = datetime.now(pytz.timezone("US/Eastern"))
         today = now_et.date()
+        if today.weekday() >= 5 or self._calendar.is_market_holiday(today):
+            return False
+        opened = (now_et.hour, now_et.minute) >= (9, 30)
+        return opened and now_et.time() < self._calendar.get_market_close_time(today)
 
-        # Skip weekends
-        if today.weekday() >= 5:
-            logger.debug("Weekend — skipping market tick")
-            return
+    def _market_tick_inner(self, escalation: Optional[str] = None) -> None:
+        import pytz
+        now_et = datetime.now(pytz.timezone("US/Eastern"))
 
-        # Skip market holidays
-        if self._calendar.is_market_holiday(today):
-            logger.info("Market holiday (%s) — skipping", today)
+        # Skip weekends, holidays and ticks after an early close (M3 fix)
+        closed = self._closed_reason(now_et)
+        if closed:
+            logger.info("%s — skipping market tick", closed)
             return
 
-        # Skip ticks after early close time (M3 fix: half-day trading)
-        if self._calendar.is_early_close(today):
-            close_time = self._calendar.get_market_close_time(today)
-            if now_et.hour > close_time.hour or (
-                now_et.hour == close_time.hour and now_et.minute > 0
-            ):
-                logger.info(
-                    "Early close day (%s) — market closed at %s, skipping",
-                    today, close_time.strftime("%H:%M"),
-                )
-                return
-
         logger.info(
             "Market tick at %s ET", now_et.strftime("%Y-%m-%d %H:%M:%S"),
         )
 
         # Load strategy
-        strategy = self._ensure_strategy()
+        with self._phase("strategy_load"):
+            strategy = self._ensure_strategy()
         if strategy is None:
             logger.error("No strategy available — skipping tick")
             self._notifier.alert("No strategy blog found. Skipping market tick.")
             return
 
-        # Fetch market data and portfolio
-        market_data = self._monitor.fetch_market_data()
-        portfolio = self._monitor.fetch_portfolio()
-        if portfolio is None:
-            logger.error("Could not fetch portfolio — skipping tick")
-            self._notifier.alert("Portfolio fetch failed. Skipping market tick.")
-            return
+        # Layer 1 bookkeeping lands in one commit, before the agent runs
+        with self._db.transaction():
+            # Fetch market data and portfolio
+            with self._phase("market_fetch"):
+                market_data = self._monitor.fetch_market_data()
+            with self._phase("portfolio_fetch"):
+                portfolio = self._monitor.fetch_portfolio()
+            if portfolio is None:
+                logger.error("Could not fetch portfolio — skipping tick")
+                self._notifier.alert("Portfolio fetch failed. Skipping market tick.")
+                return
 
-        # Calibrate index-to-ETF ratios
-        self._monitor.calibrate_index_etf_ratios(market_data)
+            # Calibrate index-to-ETF ratios
+            with self._phase("calibration"):
+                ratios = self._monitor.calibrate_index_etf_ratios(market_data)
 
-        # Update high-water mark every tick (H2 fix)
-        self._loss_calc.update_hwm_if_needed(portfolio)
+            # Update high-water mark every tick (H2 fix)
+            with self._phase("hwm_update"):
+                self._loss_calc.update_hwm_if_needed(portfolio)
 
-        # Handle snapshots (daily at 9:30, weekly on Monday 9:30)
-        self._handle_snapshots(portfolio, now_et)
+            # Handle snapshots (daily at 9:30, weekly on Monday 9:30)
+            with self._phase("snapshots"):
+                self._handle_snapshots(portfolio, now_et)
 
         # Detect missed daily check — run it now if missed
         if self._daily_check_was_missed(now_et):
@@ -383,11 +302,21 @@ class TradingSystem:
 
         # Sync stop orders only when strategy blog changes (H1 fix)
         if self._blog_just_updated:
-            self._stop_mgr.sync_stop_orders(strategy, portfolio)
+            with self._phase("stop_sync"):
+                self._stop_mgr.sync_stop_orders(strategy, portfolio)
 
         # Layer 1: Rule engine check
-        result = self._rule_engine.check(market_data, portfolio, strategy)
+        with self._phase("rule_check"):
+            result = self._rule_engine.check(market_data, portfolio, strategy)
+        if (result.type == CheckResultType.NO_ACTION
+                and escalation == "vix_threshold_crossed"):
+            # The cross happened between two fast polls; this tick only
+            # compares against the last stored reading and cannot see it.
+            result = CheckResult.TRIGGER_FIRED("vix_threshold_crossed (fast path)")
         logger.info("Rule engine result: %s (reason=%s)", result.type.value, result.reason)
+        self._set_outcome(result.type.value)
+        if self._fast_path is not None:
+            self._fast_path.seed(market_data, portfolio, strategy, ratios)
 
         if result.type == CheckResultType.NO_ACTION:
             return
@@ -406,9 +335,10 @@ class TradingSystem:
                 "Alpaca handled execution. Re-syncing stops."
             )
             # Re-sync remaining stop orders after a fill
-            refreshed = self._monitor.fetch_portfolio()
-            if refreshed is not None:
-                self._stop_mgr.resync_after_fill_or_rebalance(refreshed, strategy)
+            with self._phase("stop_resync"):
+                refreshed = self._monitor.fetch_portfolio()
+                if refreshed is not None:
+                    self._stop_mgr.resync_after_fill_or_rebalance(refreshed, strategy)
             return
 
         if result.type == CheckResultType.TRIGGER_FIRED:
@@ -424,38 +354,31 @@ class TradingSystem:
         analysis. This check does NOT require market data to be live;
         it uses the most recent cached values.
         """
-        try:
-            self._daily_check_inner()
-        except Exception:
-            logger.exception("Unhandled error in daily_check")
-            self._notifier.critical("Unhandled error in daily_check — see logs")
+        self._run_job("daily_check", self._daily_check_inner)
 
     def _daily_check_inner(self) -> None:
         import pytz
         now_et = datetime.now(pytz.timezone("US/Eastern"))
-        today = now_et.date()
 
-        # Skip weekends
-        if today.weekday() >= 5:
-            logger.debug("Weekend — skipping daily check")
-            return
-
-        # Skip market holidays
-        if self._calendar.is_market_holiday(today):
-            logger.info("Market holiday (%s) — skipping daily check", today)
+        closed = self._closed_reason(now_et, early_close=False)
+        if closed:
+            logger.info("%s — skipping daily check", closed)
             return
 
         logger.info("Daily check at %s ET", now_et.strftime("%Y-%m-%d %H:%M:%S"))
 
-        strategy = self._ensure_strategy()
+        with self._phase("strategy_load"):
+            strategy = self._ensure_strategy()
         if strategy is None:
             logger.error("No strategy available — skipping daily check")
             self._notifier.alert("No strategy blog found. Skipping daily check.")
             return
 
         # Fetch data (may use cached/stale values for pre-market)
-        market_data = self._monitor.fetch_market_data()
-        portfolio = self._monitor.fetch_portfolio()
+        with self._phase("market_fetch"):
+            market_data = self._monitor.fetch_market_data()
+        with self._phase("portfolio_fetch"):
+            portfolio = self._monitor.fetch_portfolio()
         if portfolio is None:
             logger.error("Could not fetch portfolio — skipping daily check")
             self._notifier.alert("Portfolio fetch failed. Skipping daily check.")
@@ -463,13 +386,30 @@ class TradingSystem:
 
         # Run agent pipeline
         self._run_agent_pipeline("daily_check", market_data, portfolio, strategy)
+        self._set_outcome("completed")
 
         # Mark daily check as done
         self._mark_daily_check_done(now_et)
 
+    def retention_job(self) -> None:
+        """Daily after-close rollup/prune of intraday market_states rows."""
+        try:
+            run_retention(
+                self._db,
+                retain_days=self._config.market_state_retention_days,
+                vacuum=self._config.market_state_vacuum,
+            )
+        except Exception:
+            logger.exception("Unhandled error in retention_job")
+
     def shutdown(self) -> None:
         """Clean up resources."""
         logger.info("Shutting down trading system")
+        self._monitor.close()
+        self._executor.close()
+        self._agent.close()
+        self._notifier.shutdown()
+        self._strategy_store.close()
         self._db.close()
 
 
@@ -543,37 +483,7 @@ def main() -> None:
     # Load config from environment, override dry_run from CLI
     config = TradingConfig.from_env()
     # TradingConfig is frozen, so create a new instance with the CLI override
-    config = TradingConfig(
-        project_root=config.project_root,
-        db_path=config.db_path,
-        lock_file=config.lock_file,
-        blogs_dir=config.blogs_dir,
-        log_dir=config.log_dir,
-        alpaca=config.alpaca,
-        fmp=config.fmp,
-        email=config.email,
-        max_daily_loss_pct=config.max_daily_loss_pct,
-        max_weekly_loss_pct=config.max_weekly_loss_pct,
-        max_drawdown_pct=config.max_drawdown_pct,
-        vix_extreme=config.vix_extreme,
-        max_daily_orders=config.max_daily_orders,
-        max_daily_turnover_pct=config.max_daily_turnover_pct,
-        max_single_order_pct=config.max_single_order_pct,
-        max_deviation_pct=config.max_deviation_pct,
-        min_trade_pct=config.min_trade_pct,
-        min_trade_usd=config.min_trade_usd,
-        api_fail_warn_threshold=config.api_fail_warn_threshold,
-        api_fail_halt_threshold=config.api_fail_halt_threshold,
-        fmp_quote_max_staleness=config.fmp_quote_max_staleness,
-        fmp_treasury_max_staleness=config.fmp_treasury_max_staleness,
-        alpaca_position_max_staleness=config.alpaca_position_max_staleness,
-        alpaca_quote_max_staleness=config.alpaca_quote_max_staleness,
-        index_etf_tolerance_pct=config.index_etf_tolerance_pct,
-        check_interval_minutes=config.check_interval_minutes,
-        daily_check_hour=config.daily_check_hour,
-        daily_check_minute=config.daily_check_minute,
-        dry_run=dry_run,
-    )
+    config = dataclasses.replace(config, dry_run=dry_run)
 
     # Setup logging
     _setup_logging(config.log_dir)
@@ -583,7 +493,15 @@ def main() -> None:
     logger.info("Trading system starting in %s mode", mode_label)
     logger.info("=" * 60)
 
-    if not config.dry_run:
+    if config.accounts:
+        for account in config.accounts:
+            account_config = config.for_account(account)
+            logger.info(
+                "Account %s: %s, %s", account.name,
+                "PAPER" if account_config.alpaca.is_paper else "PRODUCTION",
+                "DRY-RUN" if account_config.dry_run else "LIVE",
+            )
+    elif not config.dry_run:
         logger.warning(
             "LIVE MODE: Orders will be submitted to Alpaca (%s)",
             "PAPER" if config.alpaca.is_paper else "PRODUCTION",
@@ -600,8 +518,12 @@ def main() -> None:
 
     system = None
     try:
-        # Initialize trading system
-        system = TradingSystem(config)
+        # Initialize trading system (one process for all accounts when
+        # TRADING_ACCOUNTS is set)
+        if config.accounts:
+            system = MultiAccountSystem(config)
+        else:
+            system = TradingSystem(config)
 
         # Build scheduler
         scheduler = BlockingScheduler(
@@ -621,6 +543,18 @@ def main() -> None:
             name="15-min market hours check",
         )
 
+        # Job 1b: optional fast-path poll between ticks (market hours are
+        # checked inside fast_tick); single-account mode only
+        if config.fast_tick_interval_sec > 0 and not config.accounts:
+            scheduler.add_job(
+                system.fast_tick,
+                trigger="interval",
+                seconds=config.fast_tick_interval_sec,
+                id="fast_tick",
+                name="Fast-path VIX / level poll",
+                misfire_grace_time=int(config.fast_tick_interval_sec),
+            )
+
         # Job 2: Daily Claude check at 6:30 ET (Mon-Fri)
         scheduler.add_job(
             system.daily_check,
@@ -633,6 +567,18 @@ def main() -> None:
             name="Daily 6:30 ET Claude check",
         )
 
+        # Job 3: market_states retention after the close (Mon-Fri 17:30 ET)
+        scheduler.add_job(
+            system.retention_job,
+            trigger="cron",
+            day_of_week="mon-fri",
+            hour=17,
+            minute=30,
+            timezone=TZ,
+            id="retention",
+            name="Daily market_states rollup",
+        )
+
         # Graceful shutdown on SIGINT/SIGTERM
         def _signal_handler(signum: int, frame) -> None:
             sig_name = signal.Signals(signum).name
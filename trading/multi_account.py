@@ -0,0 +1,500 @@
+"""Multi-account orchestration: one market / agent pass, many accounts.
+
+``TradingSystem`` drives one Alpaca account.  Running several accounts on
+the same blog (paper plus live, or several live sub-accounts) as separate
+processes fetches the same quotes, parses the same blog and calls the
+agent once per process.  :class:`MultiAccountSystem` does that work once
+per tick and fans the result out:
+
+- shared, on the scheduler thread and the shared database (``db_path``):
+  strategy load, FMP / ETF market data, index-ETF calibration and the
+  Layer 2 agent run;
+- per account (``TRADING_ACCOUNTS``), concurrently: portfolio fetch,
+  snapshots / HWM, stop orders, the rule engine (kill switch and drift
+  use the account's own limits and history) and Layer 3 validate /
+  generate / execute.
+
+Each account has its own Alpaca keys, risk limits
+(:meth:`TradingConfig.for_account`) and database under
+``<db dir>/accounts/``.  An account's work runs on its own worker thread,
+which owns the account's SQLite connection; the tick's market_states row,
+API-failure count and index-ETF calibration are copied into each account
+database so its rule engine and stop orders see what a single-account
+database would.
+
+The agent runs at most once per trigger: for the first account (in
+configured order) whose rules fired, with that account's portfolio as
+context.  The intent is then validated and executed against every
+account that is not halted or handling a stop fill; accounts already at
+target simply generate no orders.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from trading.config import TradingConfig
+from trading.core.constants import INDEX_ETF_PAIRS
+from trading.core.holidays import USMarketCalendar
+from trading.data.database import Database
+from trading.data.models import (
+    CheckResult,
+    CheckResultType,
+    MarketData,
+    Portfolio,
+    StrategySpec,
+)
+from trading.data.retention import run_retention
+from trading.layer1.loss_calculator import LossCalculator
+from trading.layer1.market_monitor import MarketMonitor
+from trading.layer1.rule_engine import RuleEngine
+from trading.layer1.stop_loss_manager import StopLossManager
+from trading.layer2.agent_runner import AgentDecision, AgentRunner
+from trading.layer2.tools.strategy_store import StrategyStore
+from trading.layer3.order_executor import OrderExecutor
+from trading.layer3.order_generator import OrderGenerator
+from trading.layer3.order_validator import OrderValidator
+from trading.layer3.pipeline import ExecutionPipeline
+from trading.orchestrator import Orchestrator
+from trading.services.alpaca_client import AlpacaClient
+from trading.services.email_notifier import EmailNotifier
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FOR_ETF = dict(INDEX_ETF_PAIRS)
+
+# Results that may still trade on a fanned-out intent this tick
+_TRADABLE = (CheckResultType.NO_ACTION, CheckResultType.TRIGGER_FIRED)
+# Tick outcome when accounts disagree: the most consequential wins
+_OUTCOME_ORDER = (
+    CheckResultType.TRIGGER_FIRED,
+    CheckResultType.STOP_TRIGGERED,
+    CheckResultType.HALT,
+    CheckResultType.NO_ACTION,
+)
+
+
+@dataclass
+class AccountCheck:
+    """One account's Layer 1 outcome for a run."""
+
+    account: str
+    portfolio: Optional[Portfolio] = None
+    result: Optional[CheckResult] = None  # None: rules not evaluated
+
+    @property
+    def tradable(self) -> bool:
+        """Portfolio known and not halted or handling a stop fill."""
+        if self.portfolio is None:
+            return False
+        return self.result is None or self.result.type in _TRADABLE
+
+
+class AccountRunner:
+    """One account's broker client, database and Layer 1 / 3 components.
+
+    All work is submitted to the account's single worker thread, which
+    opens (and therefore owns) the account's SQLite connection.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: TradingConfig,
+        alpaca: Optional[AlpacaClient] = None,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.alpaca = alpaca or AlpacaClient(config.alpaca)
+        self.db = Database(config.db_path)
+        self._notifier = EmailNotifier(config)
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"account-{name}",
+        )
+        self.submit(self._open).result()
+
+    def _open(self) -> None:
+        Path(self.config.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db.connect()
+        self.db.migrate()
+        self._loss_calc = LossCalculator(self.db)
+        self._stop_mgr = StopLossManager(self.config, self.db)
+        self._rule_engine = RuleEngine(self.config, self.db, alpaca=self.alpaca)
+        self._validator = OrderValidator(self.config, self.db)
+        self._generator = OrderGenerator(self.config)
+        self._executor = OrderExecutor(self.config, self.db)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run *fn* on the account's worker thread."""
+        return self._worker.submit(fn, *args)
+
+    def close(self) -> None:
+        def _close() -> None:
+            self._executor.close()
+            self.db.close()
+
+        self.submit(_close).result()
+        self._worker.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Layer 1 (account side)
+    # ------------------------------------------------------------------
+
+    def check(
+        self,
+        market_data: MarketData,
+        api_failures: int,
+        ratios: dict[str, float],
+        strategy: StrategySpec,
+        blog_updated: bool,
+        now_et: Optional[datetime] = None,
+    ) -> AccountCheck:
+        """Fetch the portfolio and, given *now_et*, run the account's rules.
+
+        Without *now_et* (daily check) only the portfolio is fetched.
+        """
+        self.db.refresh_state_cache()
+        # Layer 1 bookkeeping lands in one commit; the rest commits as it goes
+        with self.db.transaction():
+            self._record_market(market_data, api_failures, ratios)
+            portfolio = self.alpaca.get_portfolio()
+            if portfolio is None:
+                logger.error("[%s] Could not fetch portfolio — skipping account", self.name)
+                self._notifier.alert(
+                    f"[{self.name}] Portfolio fetch failed. Skipping account this run."
+                )
+                return AccountCheck(self.name)
+            if now_et is None:
+                return AccountCheck(self.name, portfolio)
+
+            self._loss_calc.update_hwm_if_needed(portfolio)
+            if now_et.hour == 9 and now_et.minute < 45:
+                self._loss_calc.create_daily_snapshot(portfolio)
+                if now_et.weekday() == 0:  # Monday
+                    self._loss_calc.create_weekly_snapshot(portfolio)
+
+        # Sync stop orders only when strategy blog changes (H1 fix)
+        if blog_updated:
+            self._stop_mgr.sync_stop_orders(strategy, portfolio)
+
+        result = self._rule_engine.check(market_data, portfolio, strategy)
+        logger.info(
+            "[%s] Rule engine result: %s (reason=%s)",
+            self.name, result.type.value, result.reason,
+        )
+        if result.type == CheckResultType.HALT:
+            # Log and notify only — do NOT change positions
+            logger.critical("[%s] HALT: %s", self.name, result.reason)
+            self._notifier.critical(
+                f"[{self.name}] HALT: {result.reason}. No position changes."
+            )
+        elif result.type == CheckResultType.STOP_TRIGGERED:
+            # Alpaca server-side already handled the stop
+            self._notifier.alert(
+                f"[{self.name}] Stop order filled: {result.details}. "
+                "Alpaca handled execution. Re-syncing stops."
+            )
+            refreshed = self.alpaca.get_portfolio()
+            if refreshed is not None:
+                self._stop_mgr.resync_after_fill_or_rebalance(refreshed, strategy)
+        return AccountCheck(self.name, portfolio, result)
+
+    def _record_market(
+        self, market_data: MarketData, api_failures: int, ratios: dict[str, float],
+    ) -> None:
+        """Copy the tick's shared market state into the account database."""
+        self.db.save_market_state(
+            timestamp=market_data.timestamp.isoformat(),
+            vix=market_data.vix,
+            us10y=market_data.us10y,
+            sp500=market_data.sp500,
+            nasdaq=market_data.nasdaq,
+            dow=market_data.dow,
+            gold=market_data.gold,
+            oil=market_data.oil,
+            copper=market_data.copper,
+        )
+        self.db.set_state("consecutive_api_failures", str(api_failures), durable=True)
+        # Stop prices are converted with today's ratios from this database
+        today = date.today()
+        for symbol, ratio in ratios.items():
+            self.db.save_calibration(today, symbol, _INDEX_FOR_ETF.get(symbol, ""), ratio)
+
+    # ------------------------------------------------------------------
+    # Layer 3
+    # ------------------------------------------------------------------
+
+    def apply(
+        self,
+        trigger_reason: str,
+        decision: AgentDecision,
+        market_data: MarketData,
+        portfolio: Portfolio,
+        strategy_spec: StrategySpec,
+    ) -> str:
+        """Validate, generate and execute the shared intent for this account.
+
+        Returns the decision result logged to the account database.
+        """
+        self.db.refresh_state_cache()
+        return self._execution_pipeline().run(
+            trigger_reason, decision, market_data, portfolio, strategy_spec,
+        )
+
+    def _execution_pipeline(self) -> ExecutionPipeline:
+        return ExecutionPipeline(
+            self.config, self.db, self._validator, self._generator,
+            self._executor, self._stop_mgr, self._notifier,
+            fetch_portfolio=self.alpaca.get_portfolio,
+            label=self.name,
+        )
+
+
+class MultiAccountSystem(Orchestrator):
+    """Scheduler target that trades every configured account from one tick.
+
+    Exposes the same jobs as ``TradingSystem`` (``market_tick``,
+    ``daily_check``, ``retention_job``, ``shutdown``).
+    """
+
+    def __init__(self, config: TradingConfig) -> None:
+        names = [a.name for a in config.accounts]
+        if not names:
+            raise ValueError("No accounts configured (TRADING_ACCOUNTS is empty)")
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate account names in TRADING_ACCOUNTS: {names}")
+
+        self._config = config
+        self._calendar = USMarketCalendar()
+        self._notifier = EmailNotifier(config)
+
+        # Shared database: market data, calibration, agent state, metrics
+        self._db = Database(config.db_path)
+        self._db.connect()
+        self._db.migrate()
+
+        self._accounts = [
+            AccountRunner(a.name, config.for_account(a)) for a in config.accounts
+        ]
+        # ETF quotes are account-independent: read them with the first
+        # account's client
+        self._monitor = MarketMonitor(config, self._db, alpaca=self._accounts[0].alpaca)
+        self._agent = AgentRunner(config, self._db)
+        self._strategy_store = StrategyStore(
+            config.blogs_dir, use_inotify=config.strategy_inotify,
+        )
+        self._blog_just_updated = False
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _fan_out(
+        self, calls: dict[str, tuple[Callable[..., Any], tuple]],
+    ) -> dict[str, Any]:
+        """Run one call per account concurrently; failures become None.
+
+        *calls* maps account name to ``(bound method, args)``.  One
+        account's error is logged and reported without affecting others.
+        """
+        by_name = {a.name: a for a in self._accounts}
+        futures = {
+            name: by_name[name].submit(fn, *args) for name, (fn, args) in calls.items()
+        }
+        results: dict[str, Any] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception:
+                logger.exception("[%s] Unhandled error in account run", name)
+                self._notifier.critical(f"[{name}] Unhandled account error — see logs")
+                results[name] = None
+        return results
+
+    def _check_accounts(
+        self,
+        market_data: MarketData,
+        strategy: StrategySpec,
+        now_et: Optional[datetime],
+    ) -> list[AccountCheck]:
+        failures = int(self._db.get_state("consecutive_api_failures", "0"))
+        ratios = self._db.get_calibrations(date.today())
+        results = self._fan_out({
+            a.name: (a.check, (market_data, failures, ratios, strategy,
+                               self._blog_just_updated, now_et))
+            for a in self._accounts
+        })
+        return [results[a.name] or AccountCheck(a.name) for a in self._accounts]
+
+    # ------------------------------------------------------------------
+    # Layer 2 once, Layer 3 per account
+    # ------------------------------------------------------------------
+
+    def _run_agent_pipeline(
+        self,
+        trigger_reason: str,
+        market_data: MarketData,
+        checks: list[AccountCheck],
+        strategy_spec: StrategySpec,
+        reference: Optional[AccountCheck] = None,
+    ) -> dict[str, Optional[str]]:
+        """Decide once, then apply the intent to every tradable account.
+
+        *reference* is the account whose portfolio the agent sees (default:
+        the first tradable one).  Returns each target account's result.
+        """
+        targets = [c for c in checks if c.tradable]
+        if not targets:
+            logger.warning("No tradable account for trigger=%s", trigger_reason)
+            return {}
+        reference = reference or targets[0]
+        logger.info(
+            "Running agent pipeline: trigger=%s (context: %s, accounts: %s)",
+            trigger_reason, reference.account, [c.account for c in targets],
+        )
+
+        by_name = {a.name: a for a in self._accounts}
+        ref = by_name[reference.account]
+        current_scenario = ref.submit(ref.db.get_state, "current_scenario", "base").result()
+        with self._phase("agent"):
+            decision = self._agent.decide(
+                trigger_reason, market_data, reference.portfolio, strategy_spec,
+                current_scenario=current_scenario,
+            )
+        if decision.fallback:
+            intent = decision.intent
+            self._notifier.alert(
+                f"Agent deadline exceeded for trigger {trigger_reason}; "
+                f"deterministic fallback used "
+                f"(scenario={intent.scenario if intent else 'no action'})"
+            )
+
+        with self._phase("accounts_execute"):
+            return self._fan_out({
+                c.account: (by_name[c.account].apply, (
+                    trigger_reason, decision, market_data, c.portfolio, strategy_spec,
+                ))
+                for c in targets
+            })
+
+    # ------------------------------------------------------------------
+    # Scheduled jobs
+    # ------------------------------------------------------------------
+
+    def market_tick(self) -> None:
+        """15-minute market-hours check across all accounts."""
+        self._run_job("market_tick", self._market_tick_inner)
+
+    def _market_tick_inner(self) -> None:
+        import pytz
+        now_et = datetime.now(pytz.timezone("US/Eastern"))
+
+        closed = self._closed_reason(now_et)
+        if closed:
+            logger.info("%s — skipping market tick", closed)
+            return
+
+        logger.info(
+            "Market tick at %s ET (%d accounts)",
+            now_et.strftime("%Y-%m-%d %H:%M:%S"), len(self._accounts),
+        )
+
+        with self._phase("strategy_load"):
+            strategy = self._ensure_strategy()
+        if strategy is None:
+            self._notifier.alert("No strategy blog found. Skipping market tick.")
+            return
+
+        with self._db.transaction():
+            with self._phase("market_fetch"):
+                market_data = self._monitor.fetch_market_data()
+            with self._phase("calibration"):
+                self._monitor.calibrate_index_etf_ratios(market_data)
+
+        with self._phase("accounts_check"):
+            checks = self._check_accounts(market_data, strategy, now_et)
+
+        if self._daily_check_was_missed(now_et):
+            logger.warning("Missed daily 6:30 check — running now")
+            self._run_agent_pipeline("daily_check_missed", market_data, checks, strategy)
+            self._mark_daily_check_done(now_et)
+
+        results = {c.result.type for c in checks if c.result is not None}
+        for outcome in _OUTCOME_ORDER:
+            if outcome in results:
+                self._set_outcome(outcome.value)
+                break
+
+        fired = [
+            c for c in checks
+            if c.result is not None and c.result.type == CheckResultType.TRIGGER_FIRED
+        ]
+        if fired:
+            reason = fired[0].result.reason
+            if len(fired) > 1:
+                logger.info(
+                    "Triggers fired on %s; using %s (%s)",
+                    [c.account for c in fired], fired[0].account, reason,
+                )
+            self._run_agent_pipeline(reason, market_data, checks, strategy, fired[0])
+
+    def daily_check(self) -> None:
+        """Daily 6:30 ET agent check, applied to every account."""
+        self._run_job("daily_check", self._daily_check_inner)
+
+    def _daily_check_inner(self) -> None:
+        import pytz
+        now_et = datetime.now(pytz.timezone("US/Eastern"))
+
+        closed = self._closed_reason(now_et, early_close=False)
+        if closed:
+            logger.info("%s — skipping daily check", closed)
+            return
+
+        logger.info("Daily check at %s ET", now_et.strftime("%Y-%m-%d %H:%M:%S"))
+
+        with self._phase("strategy_load"):
+            strategy = self._ensure_strategy()
+        if strategy is None:
+            self._notifier.alert("No strategy blog found. Skipping daily check.")
+            return
+
+        with self._phase("market_fetch"):
+            market_data = self._monitor.fetch_market_data()
+        with self._phase("accounts_check"):
+            checks = self._check_accounts(market_data, strategy, None)
+
+        self._run_agent_pipeline("daily_check", market_data, checks, strategy)
+        self._set_outcome("completed")
+        self._mark_daily_check_done(now_et)
+
+    def retention_job(self) -> None:
+        """Daily after-close rollup/prune, shared and account databases."""
+        def _run(db: Database) -> None:
+            run_retention(
+                db,
+                retain_days=self._config.market_state_retention_days,
+                vacuum=self._config.market_state_vacuum,
+            )
+
+        try:
+            _run(self._db)
+        except Exception:
+            logger.exception("Unhandled error in retention_job")
+        self._fan_out({a.name: (_run, (a.db,)) for a in self._accounts})
+
+    def shutdown(self) -> None:
+        """Clean up resources."""
+        logger.info("Shutting down multi-account trading system")
+        self._monitor.close()
+        self._agent.close()
+        for account in self._accounts:
+            account.close()
+        self._notifier.shutdown()
+        self._strategy_store.close()
+        self._db.close()
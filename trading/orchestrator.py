@@ -0,0 +1,140 @@
+"""Scheduler-job plumbing shared by ``TradingSystem`` and ``MultiAccountSystem``.
+
+Both orchestrators run the same jobs on the same calendar: each run is
+timed as a tick (:mod:`trading.data.tick_metrics`), skips weekends and
+holidays, reloads the strategy only when the blog changes and records
+whether the daily 6:30 check ran.
+
+Only a run's Layer 1 bookkeeping (market state, calibration, HWM,
+snapshots) shares one database transaction, committed before the agent,
+execution and fill phases so their minutes-long waits do not hold the
+SQLite write lock.  Later writes commit as they happen.
+
+Subclasses set ``_config``, ``_calendar``, ``_notifier``, ``_db`` and
+``_strategy_store`` in their constructor.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from trading.config import TradingConfig
+from trading.core.holidays import USMarketCalendar
+from trading.data.database import Database
+from trading.data.models import StrategySpec
+from trading.data.tick_metrics import TickTimer, record_tick
+from trading.layer2.tools.strategy_store import StrategyStore
+from trading.services.email_notifier import EmailNotifier
+
+logger = logging.getLogger(__name__)
+
+
+class Orchestrator:
+    """Base for the scheduler targets (see module docstring)."""
+
+    _config: TradingConfig
+    _calendar: USMarketCalendar
+    _notifier: EmailNotifier
+    _db: Database
+    _strategy_store: StrategyStore
+
+    # Phase timings of the scheduler run in progress (None between runs)
+    _tick: Optional[TickTimer] = None
+    _blog_just_updated: bool = False
+
+    # ------------------------------------------------------------------
+    # Tick instrumentation
+    # ------------------------------------------------------------------
+
+    def _run_job(self, job: str, inner: Callable[..., None], *args: Any) -> None:
+        """Run ``inner(*args)`` as one timed scheduler run."""
+        timer = self._tick = TickTimer(job)
+        try:
+            # Pick up state written by another connection (e.g. an
+            # operator tool) since the last run; normally a no-op.
+            self._db.refresh_state_cache()
+            inner(*args)
+        except Exception:
+            timer.outcome = "error"
+            logger.exception("Unhandled error in %s", job)
+            self._notifier.critical(f"Unhandled error in {job} — see logs")
+        finally:
+            self._tick = None
+            self._record_tick(timer)
+
+    def _phase(self, name: str) -> AbstractContextManager:
+        """Time a phase of the current run (no-op outside a run)."""
+        if self._tick is None:
+            return nullcontext()
+        return self._tick.span(name)
+
+    def _set_outcome(self, outcome: str) -> None:
+        if self._tick is not None:
+            self._tick.outcome = outcome
+
+    def _record_tick(self, timer: TickTimer) -> None:
+        """Persist the finished run's timings."""
+        total_ms = timer.finish()
+        logger.info(
+            "%s %s finished in %.0f ms (outcome=%s)",
+            timer.job, timer.tick_id, total_ms, timer.outcome,
+        )
+        record_tick(
+            self._db, timer,
+            persist=self._config.tick_metrics_enabled,
+            json_log=self._config.tick_metrics_json_log,
+        )
+
+    # ------------------------------------------------------------------
+    # Calendar, strategy and daily-check helpers
+    # ------------------------------------------------------------------
+
+    def _closed_reason(self, now_et: datetime, early_close: bool = True) -> Optional[str]:
+        """Why the market is closed at *now_et*, or None on a trading day.
+
+        With *early_close*, a half day counts as closed after its close.
+        """
+        today = now_et.date()
+        if today.weekday() >= 5:
+            return "Weekend"
+        if self._calendar.is_market_holiday(today):
+            return f"Market holiday ({today})"
+        if early_close and self._calendar.is_early_close(today):
+            close_time = self._calendar.get_market_close_time(today)
+            if (now_et.hour, now_et.minute) > (close_time.hour, 0):
+                return (
+                    f"Early close day ({today}) — market closed at "
+                    f"{close_time.strftime('%H:%M')}"
+                )
+        return None
+
+    def _ensure_strategy(self) -> Optional[StrategySpec]:
+        """Return the current StrategySpec, reloading if the latest blog changed.
+
+        Sets ``_blog_just_updated`` flag when a new blog, or an edit to the
+        current one, is loaded, so callers can trigger stop-order sync only
+        on blog changes.
+        """
+        self._blog_just_updated = self._strategy_store.refresh()
+        spec = self._strategy_store.spec
+        if spec is None:
+            logger.error("No strategy blog available")
+            return None
+        if self._blog_just_updated:
+            logger.info("Strategy updated to blog_date=%s", spec.blog_date)
+        return spec
+
+    def _daily_check_was_missed(self, now_et: datetime) -> bool:
+        """Return True if today's 6:30 daily check did not run.
+
+        We track this via a DB state key ``daily_check_YYYY-MM-DD``.
+        """
+        today_str = now_et.date().isoformat()
+        return self._db.get_state(f"daily_check_{today_str}", "0") == "0"
+
+    def _mark_daily_check_done(self, now_et: datetime) -> None:
+        today_str = now_et.date().isoformat()
+        self._db.set_state(f"daily_check_{today_str}", "1", durable=True)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Optional
 
 from alpaca.common.exceptions import APIError
@@ -20,6 +21,7 @@ from alpaca.trading.requests import (
 
 from trading.config import AlpacaConfig
 from trading.data.models import Order, Portfolio, Position
+from trading.services.ttl_cache import TTLCache, get_shared_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +31,18 @@ class AlpacaClient:
 
     Converts alpaca-py objects into the project's own data models
     (:class:`Position`, :class:`Portfolio`, :class:`Order`).
+
+    Account, positions and quotes are read through a TTL cache shared by
+    every client of the same account in the process (see
+    :mod:`trading.services.ttl_cache`).  Order submit/replace/cancel and
+    :meth:`invalidate_portfolio` drop the cached account and positions.
     """
 
-    def __init__(self, config: AlpacaConfig) -> None:
+    def __init__(self, config: AlpacaConfig, cache: Optional[TTLCache] = None) -> None:
         self._config = config
+        self._cache = cache if cache is not None else get_shared_cache()
+        # Namespace cache keys per account so several accounts can coexist
+        self._ns = (config.base_url, config.api_key)
         self._trading = TradingClient(
             api_key=config.api_key,
             secret_key=config.secret_key,
@@ -50,6 +60,12 @@ class AlpacaClient:
 
     def get_account(self) -> Optional[dict]:
         """Return account info as a plain dict, or *None* on error."""
+        acct = self._cache.get_or_load(
+            (self._ns, "account"), self._fetch_account, self._config.account_ttl_sec,
+        )
+        return dict(acct) if acct is not None else None
+
+    def _fetch_account(self) -> Optional[dict]:
         try:
             acct = self._trading.get_account()
             return {
@@ -71,6 +87,12 @@ class AlpacaClient:
 
     def get_positions(self) -> Optional[dict[str, Position]]:
         """Return current positions keyed by symbol."""
+        positions = self._cache.get_or_load(
+            (self._ns, "positions"), self._fetch_positions, self._config.account_ttl_sec,
+        )
+        return dict(positions) if positions is not None else None
+
+    def _fetch_positions(self) -> Optional[dict[str, Position]]:
         try:
             raw = self._trading.get_all_positions()
             positions: dict[str, Position] = {}
@@ -123,26 +145,33 @@ class AlpacaClient:
 
     def get_quote(self, symbol: str) -> Optional[float]:
         """Return the latest mid-price for *symbol*, or *None*."""
-        try:
-            req = StockLatestQuoteRequest(symbol_or_symbols=symbol)
-            quotes = self._data.get_stock_latest_quote(req)
-            q = quotes.get(symbol)
-            if q is None:
-                return None
-            bid = float(q.bid_price) if q.bid_price else 0.0
-            ask = float(q.ask_price) if q.ask_price else 0.0
-            if bid and ask:
-                return round((bid + ask) / 2, 4)
-            return ask or bid or None
-        except APIError as exc:
-            logger.error("Alpaca get_quote(%s) error: %s", symbol, exc)
-            return None
+        return self.get_quotes([symbol]).get(symbol)
 
     def get_quotes(self, symbols: list[str]) -> dict[str, float]:
-        """Return latest mid-prices for multiple symbols."""
+        """Return latest mid-prices for multiple symbols.
+
+        Symbols with a fresh cached quote are served locally; only the rest
+        are requested from Alpaca (in one call).
+        """
         result: dict[str, float] = {}
-        if not symbols:
+        missing: list[str] = []
+        for sym in symbols:
+            price = self._cache.get((self._ns, "quote", sym))
+            if price is None:
+                missing.append(sym)
+            else:
+                result[sym] = price
+        if not missing:
             return result
+
+        fetched = self._fetch_quotes(missing)
+        for sym, price in fetched.items():
+            self._cache.set((self._ns, "quote", sym), price, self._config.quote_ttl_sec)
+        result.update(fetched)
+        return result
+
+    def _fetch_quotes(self, symbols: list[str]) -> dict[str, float]:
+        result: dict[str, float] = {}
         try:
             req = StockLatestQuoteRequest(symbol_or_symbols=symbols)
             quotes = self._data.get_stock_latest_quote(req)
@@ -157,12 +186,20 @@ class AlpacaClient:
             logger.error("Alpaca get_quotes error: %s", exc)
         return result
 
+    def invalidate_portfolio(self) -> None:
+        """Drop cached account and positions (after an order or a fill)."""
+        ns = self._ns
+        self._cache.invalidate(
+            lambda k: k[0] == ns and k[1] in ("account", "positions")
+        )
+
     # ------------------------------------------------------------------
     # Orders
     # ------------------------------------------------------------------
 
     def submit_order(self, order: Order) -> Optional[dict]:
         """Submit an order and return summary dict, or *None* on error."""
+        self.invalidate_portfolio()
         try:
             tif = _parse_tif(order.time_in_force)
             side = OrderSide.BUY if order.side == "buy" else OrderSide.SELL
@@ -211,6 +248,7 @@ class AlpacaClient:
         client_order_id: Optional[str] = None,
     ) -> Optional[dict]:
         """Replace (modify) an existing order."""
+        self.invalidate_portfolio()
         try:
             req = ReplaceOrderRequest(
                 qty=qty,
@@ -225,6 +263,7 @@ class AlpacaClient:
 
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order. Returns True on success."""
+        self.invalidate_portfolio()
         try:
             self._trading.cancel_order_by_id(order_id)
             return True
@@ -241,6 +280,36 @@ class AlpacaClient:
             logger.error("Alpaca get_order(%s) error: %s", order_id, exc)
             return None
 
+    def get_orders_by_client_ids(
+        self,
+        client_order_ids: list[str],
+        after: Optional[datetime] = None,
+    ) -> Optional[dict[str, dict]]:
+        """Look up several orders with one ``get_orders`` call.
+
+        Fetches orders of any status submitted after *after* and keeps the
+        ones whose client_order_id is requested.  Returns ``{}`` when none
+        match and *None* on error.
+        """
+        wanted = set(client_order_ids)
+        if not wanted:
+            return {}
+        try:
+            req = GetOrdersRequest(
+                status=QueryOrderStatus.ALL,
+                after=after,
+                limit=max(len(wanted) * 4, 50),
+            )
+            orders = self._trading.get_orders(req)
+        except APIError as exc:
+            logger.error("Alpaca get_orders_by_client_ids error: %s", exc)
+            return None
+        return {
+            o.client_order_id: _order_to_dict(o)
+            for o in orders
+            if o.client_order_id in wanted
+        }
+
     def list_open_stop_orders(self, symbol: str | None = None) -> list[dict]:
         """List open stop orders, optionally filtered by symbol."""
         try:
@@ -275,18 +344,27 @@ def _parse_tif(tif_str: str) -> TimeInForce:
     return mapping.get(tif_str.lower(), TimeInForce.DAY)
 
 
+def _enum_str(value) -> str:
+    """``OrderStatus.FILLED`` -> ``"filled"`` (plain strings pass through)."""
+    return str(getattr(value, "value", value))
+
+
 def _order_to_dict(order) -> dict:
     """Convert an alpaca-py order object to a plain dict."""
+    filled_at = getattr(order, "filled_at", None)
+    filled_qty = getattr(order, "filled_qty", None)
     return {
         "id": str(order.id),
         "client_order_id": order.client_order_id,
         "symbol": order.symbol,
-        "side": str(order.side),
+        "side": _enum_str(order.side),
         "qty": str(order.qty) if order.qty else None,
-        "order_type": str(order.order_type),
-        "status": str(order.status),
+        "order_type": _enum_str(order.order_type),
+        "status": _enum_str(order.status),
         "limit_price": str(order.limit_price) if order.limit_price else None,
         "stop_price": str(order.stop_price) if order.stop_price else None,
         "filled_avg_price": str(order.filled_avg_price) if order.filled_avg_price else None,
+        "filled_qty": str(filled_qty) if filled_qty else None,
         "created_at": str(order.created_at) if order.created_at else None,
+        "filled_at": str(filled_at) if filled_at else None,
     }
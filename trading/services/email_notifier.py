@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import logging
-import smtplib
 from datetime import datetime
-from email.mime.text import MIMEText
-from pathlib import Path
+from typing import Optional
 
-from trading.config import EmailConfig, TradingConfig
+from trading.config import TradingConfig
+from trading.services.notification_queue import NotificationQueue, get_notification_queue
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +15,18 @@ logger = logging.getLogger(__name__)
 class EmailNotifier:
     """Send email notifications at INFO / ALERT / CRITICAL levels.
 
-    Every notification is logged to a file. If SMTP delivery fails the
-    log entry is still written so that trading is never blocked by an
-    email outage.
+    Every notification is logged to a file synchronously. SMTP delivery
+    happens on a shared background queue (see
+    :mod:`trading.services.notification_queue`): CRITICAL is sent at once,
+    INFO / ALERT are batched into digests. Trading is never blocked by a
+    slow or failing mail server.
     """
 
     def __init__(self, config: TradingConfig) -> None:
         self._email = config.email
         self._log_dir = config.log_dir
         self._log_dir.mkdir(parents=True, exist_ok=True)
+        self._queue: Optional[NotificationQueue] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -42,6 +44,17 @@ class EmailNotifier:
         """Send a CRITICAL-level notification."""
         self._notify("CRITICAL", message)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver queued notifications now; False if *timeout* elapsed."""
+        if self._queue is None:
+            return True
+        return self._queue.flush(timeout)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Flush pending notifications and stop the delivery worker."""
+        if self._queue is not None:
+            self._queue.shutdown(timeout)
+
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
@@ -53,7 +66,7 @@ class EmailNotifier:
         # Always log to file first.
         self._log_to_file(level, body)
 
-        # Attempt email delivery; never raise.
+        # Queue email delivery; never blocks or raises.
         self._send_email(level, body)
 
     def _send_email(self, level: str, body: str) -> None:
@@ -61,24 +74,9 @@ class EmailNotifier:
         if not cfg.sender or not cfg.password or not cfg.recipient:
             logger.debug("Email not configured — skipping SMTP delivery")
             return
-
-        subject = f"[{level}] Trading Bot"
-        msg = MIMEText(body, "plain", "utf-8")
-        msg["Subject"] = subject
-        msg["From"] = cfg.sender
-        msg["To"] = cfg.recipient
-
-        try:
-            with smtplib.SMTP(cfg.smtp_host, cfg.smtp_port, timeout=10) as srv:
-                srv.ehlo()
-                srv.starttls()
-                srv.ehlo()
-                srv.login(cfg.sender, cfg.password)
-                srv.sendmail(cfg.sender, [cfg.recipient], msg.as_string())
-            logger.debug("Email sent: %s", subject)
-        except Exception as exc:
-            # SMTP failure must never block trading.
-            logger.warning("Email delivery failed (%s): %s", subject, exc)
+        if self._queue is None:
+            self._queue = get_notification_queue(cfg)
+        self._queue.put(level, body)
 
     def _log_to_file(self, level: str, body: str) -> None:
         today = datetime.now().strftime("%Y-%m-%d")
@@ -4,25 +4,27 @@ from __future__ import annotations
 
 import json
 import logging
-import urllib.error
-import urllib.parse
-import urllib.request
 from typing import Optional
 
 from trading.config import FMPConfig
 from trading.core.constants import FMP_SYMBOLS
+from trading.services.http_session import (
+    HTTPSession,
+    HTTPStatusError,
+    TransportError,
+    get_session,
+)
 
 logger = logging.getLogger(__name__)
 
-_REQUEST_TIMEOUT = 10  # seconds
-
 
 class FMPClient:
-    """Client for the FMP REST API using urllib (no external dependencies)."""
+    """Client for the FMP REST API over the shared pooled HTTP session."""
 
-    def __init__(self, config: FMPConfig) -> None:
+    def __init__(self, config: FMPConfig, session: Optional[HTTPSession] = None) -> None:
         self._api_key = config.api_key
         self._base_url = config.base_url.rstrip("/")
+        self._session = session or get_session()
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -98,16 +100,13 @@ class FMPClient:
     def _get_json(self, url: str) -> Optional[list | dict]:
         """Issue a GET request and return parsed JSON, or *None*."""
         try:
-            req = urllib.request.Request(url)
-            with urllib.request.urlopen(req, timeout=_REQUEST_TIMEOUT) as resp:
-                body = resp.read().decode("utf-8")
-                return json.loads(body)
-        except urllib.error.HTTPError as exc:
+            return self._session.get_json(url)
+        except HTTPStatusError as exc:
             logger.error("FMP HTTP %s for %s: %s", exc.code, url.split("?")[0], exc.reason)
             return None
-        except urllib.error.URLError as exc:
-            logger.error("FMP network error for %s: %s", url.split("?")[0], exc.reason)
+        except TransportError as exc:
+            logger.error("FMP network error for %s: %s", url.split("?")[0], exc)
             return None
-        except (json.JSONDecodeError, OSError) as exc:
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError) as exc:
             logger.error("FMP response error: %s", exc)
             return None
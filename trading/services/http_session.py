@@ -0,0 +1,294 @@
+"""Pooled keep-alive HTTP session (stdlib only) shared by the FMP fetchers.
+
+``urllib.request.urlopen`` opens a new TCP + TLS connection per call.  This
+module keeps idle ``http.client`` connections per host and reuses them,
+asks for gzip, retries transient failures with jittered exponential backoff
+and spaces requests to each host according to a per-host rate limit.
+
+Use :func:`get_session` for the process-wide instance.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import logging
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_BASE = 0.5  # seconds; attempt n sleeps U(0, base * 2**n)
+DEFAULT_BACKOFF_CAP = 8.0
+MAX_IDLE_PER_HOST = 4
+
+# Requests per second per host (FMP paid plans allow 300-750/min).
+DEFAULT_RATE_LIMITS: dict[str, float] = {
+    "financialmodelingprep.com": 5.0,
+}
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPStatusError(Exception):
+    """Non-2xx response (after retries for retryable statuses)."""
+
+    def __init__(self, url: str, code: int, reason: str) -> None:
+        super().__init__(f"HTTP {code} {reason}")
+        self.url = url
+        self.code = code
+        self.reason = reason
+
+
+class TransportError(OSError):
+    """Network-level failure (connect, timeout, reset, corrupt body) after retries."""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class _HostRateLimiter:
+    """Minimum spacing between requests to one host (thread-safe)."""
+
+    def __init__(self, rate_per_sec: float, clock: Callable[[], float]) -> None:
+        self._interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._clock = clock
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot; return seconds to wait before sending."""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+            return slot - now
+
+
+class HTTPSession:
+    """Connection-pooling GET client with gzip, retries and rate limits."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        rate_limits: Optional[dict[str, float]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self._rate_limits = dict(
+            DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits
+        )
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._limiters: dict[str, _HostRateLimiter] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0  # for tests / diagnostics
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, headers: Optional[dict[str, str]] = None) -> Response:
+        """GET *url*, returning a 2xx :class:`Response`.
+
+        Raises :class:`HTTPStatusError` for non-2xx responses and
+        :class:`TransportError` for network failures, once retries for
+        connection errors / 429 / 5xx are exhausted.
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        req_headers = {"Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        if headers:
+            req_headers.update(headers)
+
+        attempt = 0
+        while True:
+            self._throttle(host)
+            try:
+                resp = self._send(key, path, req_headers)
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt >= self._max_retries:
+                    raise TransportError(f"{host}: {exc}") from exc
+                logger.warning(
+                    "HTTP transport error for %s (attempt %d): %s",
+                    _redact(url), attempt + 1, exc,
+                )
+                self._sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if 200 <= resp.status < 300:
+                return resp
+            if resp.status in _RETRY_STATUSES and attempt < self._max_retries:
+                delay = self._backoff(attempt)
+                retry_after = _retry_after(resp.headers)
+                if retry_after is not None:
+                    delay = min(max(delay, retry_after), self._backoff_cap)
+                logger.warning(
+                    "HTTP %d for %s, retrying in %.2fs",
+                    resp.status, _redact(url), delay,
+                )
+                self._sleep(delay)
+                attempt += 1
+                continue
+            raise HTTPStatusError(url, resp.status, resp.headers.get("_reason", ""))
+
+    def get_json(self, url: str, headers: Optional[dict[str, str]] = None):
+        """GET *url* and decode the JSON body (raises ValueError on bad JSON)."""
+        return self.get(url, headers).json()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle = [c for conns in self._idle.values() for c in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _send(
+        self, key: tuple[str, str, int], path: str, headers: dict[str, str],
+    ) -> Response:
+        conn, reused = self._acquire(key)
+        try:
+            try:
+                conn.request("GET", path, headers=headers)
+                raw = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection: reconnect once.
+                conn.close()
+                conn = self._connect(key)
+                conn.request("GET", path, headers=headers)
+                raw = conn.getresponse()
+
+            body = raw.read()
+            resp_headers = {k.lower(): v for k, v in raw.getheaders()}
+            resp_headers["_reason"] = raw.reason
+            if resp_headers.get("content-encoding", "").lower() == "gzip":
+                try:
+                    body = gzip.decompress(body)
+                except (OSError, EOFError, zlib.error) as exc:
+                    # Truncated / corrupt body: retried like any transport error
+                    raise TransportError(f"bad gzip body: {exc}") from exc
+        except BaseException:
+            conn.close()
+            raise
+
+        if raw.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return Response(status=raw.status, headers=resp_headers, body=body)
+
+    def _acquire(self, key) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            conns = self._idle.get(key)
+            if conns:
+                return conns.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < MAX_IDLE_PER_HOST:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, key) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        with self._lock:
+            self.connections_opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self._timeout)
+        return http.client.HTTPConnection(host, port, timeout=self._timeout)
+
+    def _throttle(self, host: str) -> None:
+        rate = self._rate_for(host)
+        if rate is None:
+            return
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = _HostRateLimiter(rate, self._clock)
+                self._limiters[host] = limiter
+        wait = limiter.reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def _rate_for(self, host: str) -> Optional[float]:
+        for suffix, rate in self._rate_limits.items():
+            if host == suffix or host.endswith("." + suffix):
+                return rate
+        return None
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(self._backoff_cap, self._backoff_base * (2 ** attempt))
+        return self._rng.uniform(0, ceiling)
+
+
+def _retry_after(headers: dict[str, str]) -> Optional[float]:
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def _redact(url: str) -> str:
+    """Drop the query string (it carries the API key) for logging."""
+    return url.split("?")[0]
+
+
+_default_session: Optional[HTTPSession] = None
+_default_lock = threading.Lock()
+
+
+def get_session() -> HTTPSession:
+    """Return the process-wide shared session, creating it on first use."""
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = HTTPSession()
+        return _default_session
@@ -0,0 +1,286 @@
+"""Background SMTP delivery for notifications.
+
+``EmailNotifier`` used to connect, STARTTLS and log in for every message,
+inline on the trading path.  Messages now go into a bounded in-memory queue
+drained by one worker thread per SMTP account:
+
+- CRITICAL messages wake the worker and are sent immediately.
+- INFO / ALERT messages are coalesced: everything queued within
+  ``digest_interval_sec`` of the first pending message goes out as one
+  digest email.
+- The SMTP connection is kept open and reused while it is fresh
+  (``keepalive_sec``); a dropped connection is reopened once per message.
+- When the queue is full the oldest non-critical message is dropped (it is
+  still in the notification log file).
+
+Use :func:`get_notification_queue` for the shared per-account instance; all
+queues are flushed on :func:`shutdown_notification_queues` and at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from email.mime.text import MIMEText
+from typing import Callable, Optional
+
+from trading.config import EmailConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0  # seconds, per SMTP operation
+DEFAULT_KEEPALIVE_SEC = 120.0  # reuse an open connection for this long
+_LEVEL_ORDER = {"INFO": 0, "ALERT": 1, "CRITICAL": 2}
+
+
+class NotificationQueue:
+    """Bounded queue of (level, body) drained by a background SMTP worker."""
+
+    def __init__(
+        self,
+        config: EmailConfig,
+        smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+        timeout: float = DEFAULT_TIMEOUT,
+        keepalive_sec: float = DEFAULT_KEEPALIVE_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._cfg = config
+        self._smtp_factory = smtp_factory
+        self._timeout = timeout
+        self._keepalive = keepalive_sec
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._pending: deque[tuple[str, str]] = deque()
+        self._first_pending: Optional[float] = None  # oldest non-critical
+        self._flush_requested = False
+        self._stopping = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._conn: Optional[smtplib.SMTP] = None
+        self._conn_used = 0.0
+
+        # for tests / diagnostics
+        self.emails_sent = 0
+        self.connections_opened = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def put(self, level: str, body: str) -> None:
+        """Queue a message; never blocks on SMTP."""
+        with self._cond:
+            if len(self._pending) >= max(1, self._cfg.queue_size):
+                if not self._drop_oldest_noncritical() and level != "CRITICAL":
+                    self.dropped += 1
+                    logger.warning("Notification queue full, dropping %s message", level)
+                    return
+            self._pending.append((level, body))
+            if level != "CRITICAL" and self._first_pending is None:
+                self._first_pending = self._clock()
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send everything queued now; return False if *timeout* passed first."""
+        with self._cond:
+            if not self._pending and not self._busy:
+                return True
+            self._flush_requested = True
+            self._ensure_worker()
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout=timeout,
+            )
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Flush all pending messages, stop the worker and close SMTP."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Notification worker did not finish within %.0fs", timeout)
+            return
+        with self._cond:
+            self._thread = None
+            self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        # Caller holds self._cond
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="email-notifier", daemon=True,
+            )
+            self._thread.start()
+
+    def _drop_oldest_noncritical(self) -> bool:
+        for i, (level, _body) in enumerate(self._pending):
+            if level != "CRITICAL":
+                del self._pending[i]
+                self.dropped += 1
+                logger.warning("Notification queue full, dropped oldest %s message", level)
+                return True
+        return False
+
+    def _ready(self) -> bool:
+        if self._stopping or self._flush_requested:
+            return True
+        if any(level == "CRITICAL" for level, _ in self._pending):
+            return True
+        return (
+            self._first_pending is not None
+            and self._clock() - self._first_pending >= self._cfg.digest_interval_sec
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready():
+                    wait = None
+                    if self._first_pending is not None:
+                        wait = max(
+                            0.0,
+                            self._first_pending + self._cfg.digest_interval_sec - self._clock(),
+                        )
+                    self._cond.wait(wait)
+                batch = list(self._pending)
+                self._pending.clear()
+                self._first_pending = None
+                self._flush_requested = False
+                stopping = self._stopping
+                self._busy = True
+            try:
+                if batch:
+                    self._deliver(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+            if stopping:
+                self._close()
+                return
+
+    def _deliver(self, batch: list[tuple[str, str]]) -> None:
+        for subject, body in _compose(batch):
+            self._send(subject, body)
+
+    def _send(self, subject: str, body: str) -> None:
+        cfg = self._cfg
+        msg = MIMEText(body, "plain", "utf-8")
+        msg["Subject"] = subject
+        msg["From"] = cfg.sender
+        msg["To"] = cfg.recipient
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.sendmail(cfg.sender, [cfg.recipient], msg.as_string())
+                self._conn_used = self._clock()
+                self.emails_sent += 1
+                logger.debug("Email sent: %s", subject)
+                return
+            except smtplib.SMTPServerDisconnected as exc:
+                # Reused connection closed by the server: reconnect once
+                self._close()
+                if attempt == 0:
+                    continue
+                logger.warning("Email delivery failed (%s): %s", subject, exc)
+            except Exception as exc:
+                # SMTP failure must never block trading.
+                self._close()
+                logger.warning("Email delivery failed (%s): %s", subject, exc)
+                return
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._conn is not None and self._clock() - self._conn_used < self._keepalive:
+            return self._conn
+        self._close()
+        cfg = self._cfg
+        srv = self._smtp_factory(cfg.smtp_host, cfg.smtp_port, timeout=self._timeout)
+        try:
+            srv.ehlo()
+            if cfg.smtp_starttls:
+                srv.starttls()
+                srv.ehlo()
+            if cfg.password and srv.has_extn("auth"):
+                srv.login(cfg.sender, cfg.password)
+        except Exception:
+            srv.close()
+            raise
+        self.connections_opened += 1
+        self._conn = srv
+        self._conn_used = self._clock()
+        return srv
+
+    def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+
+def _compose(batch: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Turn queued messages into (subject, body) emails.
+
+    Each CRITICAL message is its own email; the rest form one digest.
+    """
+    emails = [
+        ("[CRITICAL] Trading Bot", body) for level, body in batch if level == "CRITICAL"
+    ]
+    rest = [(level, body) for level, body in batch if level != "CRITICAL"]
+    if len(rest) == 1:
+        level, body = rest[0]
+        emails.append((f"[{level}] Trading Bot", body))
+    elif rest:
+        top = max((level for level, _ in rest), key=lambda lv: _LEVEL_ORDER.get(lv, 0))
+        emails.append((
+            f"[{top}] Trading Bot ({len(rest)} notifications)",
+            "\n\n".join(f"[{level}] {body}" for level, body in rest),
+        ))
+    return emails
+
+
+_queues: dict[EmailConfig, NotificationQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_notification_queue(config: EmailConfig) -> NotificationQueue:
+    """Return the shared queue for this SMTP account, creating it on first use."""
+    with _queues_lock:
+        queue = _queues.get(config)
+        if queue is None:
+            if not _queues:
+                atexit.register(shutdown_notification_queues)
+            queue = NotificationQueue(config)
+            _queues[config] = queue
+        return queue
+
+
+def shutdown_notification_queues(timeout: float = 30.0) -> None:
+    """Flush and stop every shared queue."""
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        queue.shutdown(timeout)
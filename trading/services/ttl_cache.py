@@ -0,0 +1,91 @@
+"""Process-wide TTL cache for broker reads (quotes, account, positions).
+
+Layer 1 (MarketMonitor, StopLossManager, RuleEngine) and Layer 3
+(OrderExecutor) each hold their own ``AlpacaClient`` but ask for the same
+quotes / account / positions within a tick.  They all share one cache so
+repeated reads inside the TTL are served locally; writes (order submit,
+replace, cancel) and detected fills invalidate the affected entries.
+
+Use :func:`get_shared_cache` for the process-wide instance.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe key/value cache with a per-entry time-to-live."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[Hashable, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value for *key*, or *default* if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if self._clock() < expires:
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value, ttl: float) -> None:
+        """Store *value* for *ttl* seconds (``ttl <= 0`` stores nothing)."""
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object], ttl: float):
+        """Return the cached value, or call *loader* and cache its result.
+
+        ``None`` results (API errors) are not cached so the next caller
+        retries.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches *predicate*; return the count."""
+        with self._lock:
+            stale = [k for k in self._entries if predicate(k)]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_cache: Optional[TTLCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> TTLCache:
+    """Return the process-wide cache, creating it on first use."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = TTLCache()
+        return _shared_cache
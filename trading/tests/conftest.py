@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import asyncio
+import gzip
+import json
+import random
+import socketserver
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
 
 import pytest
 
@@ -35,6 +45,70 @@ def tmp_db():
     db.close()
 
 
+def build_year_db(path, days: int = 365, ticks_per_day: int = 26, seed: int = 7):
+    """Create a schema-001 database filled with *days* of synthetic history.
+
+    ``market_states`` gets *ticks_per_day* rows per weekday (15-minute
+    ticks) and ``trades`` a few orders per week, mirroring a year of live
+    operation before later migrations were applied.
+    """
+    from trading.data.migrator import MIGRATIONS_DIR
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.executescript((MIGRATIONS_DIR / "001_initial.sql").read_text())
+    start = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+    states = []
+    trades = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        if day.weekday() >= 5:
+            continue
+        for t in range(ticks_per_day):
+            ts = day + timedelta(minutes=15 * t)
+            states.append((
+                ts.isoformat(),
+                round(rng.uniform(12, 35), 2),
+                round(rng.uniform(3.5, 5.0), 3),
+                round(rng.uniform(5000, 7000), 2),
+                round(rng.uniform(17000, 23000), 2),
+                round(rng.uniform(38000, 48000), 2),
+                round(rng.uniform(2000, 3500), 2),
+                round(rng.uniform(60, 90), 2) if t % 2 == 0 else None,
+                None,
+            ))
+        if day.weekday() in (0, 3):
+            for n in range(3):
+                trades.append((
+                    f"{day.date().isoformat()}-{n}",
+                    rng.choice(["SPY", "QQQ", "GLD", "XLE"]),
+                    rng.choice(["buy", "sell"]),
+                    round(rng.uniform(1, 50), 4),
+                    round(rng.uniform(100, 700), 2),
+                    "filled",
+                    day.strftime("%Y-%m-%d %H:%M:%S"),
+                ))
+    conn.executemany(
+        "INSERT INTO market_states (timestamp, vix, us10y, sp500, nasdaq, dow, gold, oil, copper) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        states,
+    )
+    conn.executemany(
+        "INSERT INTO trades (client_order_id, symbol, side, quantity, filled_price, status, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        trades,
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def year_db(tmp_path):
+    """Path to a schema-001 database holding a year of synthetic history."""
+    return build_year_db(tmp_path / "year.db")
+
+
 @pytest.fixture
 def config(tmp_path):
     """Return a TradingConfig suitable for testing (dry_run=True, temp paths)."""
@@ -207,3 +281,311 @@ def sample_strategy_spec():
         bubble_score=9,
         pre_event_dates=["2026-02-18"],
     )
+
+
+# ---------------------------------------------------------------------------
+# Local HTTP stub server
+# ---------------------------------------------------------------------------
+
+class StubHTTPServer:
+    """Keep-alive HTTP/1.1 server on localhost with scripted responses.
+
+    ``add(path, *responses)`` queues responses for a path (query string
+    ignored); each response is ``(status, body)`` or
+    ``(status, body, headers)`` where a non-bytes body is JSON-encoded.
+    The last response repeats.  ``gzip=True`` in headers compresses the
+    body when the client accepts gzip; ``delay=<seconds>`` stalls the reply.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[str, list[tuple]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.client_ports: set[int] = set()
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def do_GET(self) -> None:
+                stub.client_ports.add(self.client_address[1])
+                path = self.path.split("?")[0]
+                stub.requests.append((self.path, dict(self.headers)))
+                queue = stub.routes.get(path) or [(404, {"error": "not found"})]
+                status, body, *rest = queue.pop(0) if len(queue) > 1 else queue[0]
+                headers = dict(rest[0]) if rest else {}
+                delay = headers.pop("delay", 0)
+                if delay:
+                    time.sleep(delay)
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode("utf-8")
+                if headers.pop("gzip", False) and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, str(v))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, path: str, *responses: tuple) -> None:
+        self.routes[path] = list(responses)
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP stub server (see StubHTTPServer)."""
+    server = StubHTTPServer()
+    yield server
+    server.close()
+
+
+# ---------------------------------------------------------------------------
+# Local SMTP stand-in
+# ---------------------------------------------------------------------------
+
+class LocalSMTPServer:
+    """Minimal threaded SMTP server on localhost that records deliveries.
+
+    Speaks just enough ESMTP for ``smtplib``: EHLO/HELO (advertising
+    ``AUTH PLAIN``, no STARTTLS), AUTH PLAIN, MAIL, RCPT, DATA, NOOP, RSET
+    and QUIT.  ``messages`` holds ``(mail_from, rcpt_tos, data)`` tuples,
+    ``connections`` counts accepted sockets and ``logins`` counts AUTHs.
+    ``delay`` stalls every reply by that many seconds.
+    """
+
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, list[str], str]] = []
+        self.connections = 0
+        self.logins = 0
+        self.delay = 0.0
+        stub = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                if stub.delay:
+                    time.sleep(stub.delay)
+                self.wfile.write(line.encode("ascii") + b"\r\n")
+
+            def handle(self) -> None:
+                stub.connections += 1
+                self.reply("220 localhost test SMTP")
+                mail_from, rcpts = "", []
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw:
+                        return
+                    cmd, _, arg = raw.decode("ascii").strip().partition(" ")
+                    cmd = cmd.upper()
+                    if cmd == "EHLO":
+                        self.wfile.write(b"250-localhost\r\n")
+                        self.reply("250 AUTH PLAIN")
+                    elif cmd == "HELO":
+                        self.reply("250 localhost")
+                    elif cmd == "AUTH":
+                        stub.logins += 1
+                        self.reply("235 Authentication successful")
+                    elif cmd == "MAIL":
+                        mail_from, rcpts = arg.split(":", 1)[1].strip("<> "), []
+                        self.reply("250 OK")
+                    elif cmd == "RCPT":
+                        rcpts.append(arg.split(":", 1)[1].strip("<> "))
+                        self.reply("250 OK")
+                    elif cmd == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        lines = []
+                        while True:
+                            line = self.rfile.readline()
+                            if not line or line == b".\r\n":
+                                break
+                            lines.append(line.decode("utf-8"))
+                        stub.messages.append((mail_from, rcpts, "".join(lines)))
+                        self.reply("250 OK queued")
+                    elif cmd in ("NOOP", "RSET"):
+                        self.reply("250 OK")
+                    elif cmd == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        self.reply("502 Command not implemented")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def subjects(self) -> list[str]:
+        return [
+            line.split(":", 1)[1].strip()
+            for _, _, data in self.messages
+            for line in data.splitlines()
+            if line.startswith("Subject:")
+        ]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def smtp_server():
+    """Local SMTP stand-in (see LocalSMTPServer)."""
+    server = LocalSMTPServer()
+    yield server
+    server.close()
+
+
+class LocalTradeStream:
+    """Stand-in for alpaca-py ``TradingStream`` (trade-updates websocket).
+
+    ``run()`` blocks on its own event loop like the real stream; ``push()``
+    delivers an order update to the subscribed async handler from any
+    thread, and ``disconnect()`` makes ``run()`` fail as on a dropped
+    connection.
+    """
+
+    def __init__(self) -> None:
+        self._handler = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._done: asyncio.Future | None = None
+        self.running = threading.Event()
+
+    def subscribe_trade_updates(self, handler) -> None:
+        self._handler = handler
+
+    def run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        self._done = loop.create_future()
+        self.running.set()
+        try:
+            loop.run_until_complete(self._done)
+        finally:
+            self.running.clear()
+            loop.close()
+
+    def stop(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(
+                lambda: self._done.done() or self._done.set_result(None)
+            )
+
+    def disconnect(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(
+                lambda: self._done.done()
+                or self._done.set_exception(ConnectionError("stream dropped"))
+            )
+
+    def push(self, client_order_id: str, status: str,
+             filled_avg_price: str | None = None, symbol: str = "SPY",
+             qty: str = "1") -> None:
+        assert self.running.wait(2), "stream not running"
+        order = SimpleNamespace(
+            id=f"id-{client_order_id}", client_order_id=client_order_id,
+            symbol=symbol, side="buy", qty=qty, order_type="limit",
+            status=status, limit_price=None, stop_price=None,
+            filled_avg_price=filled_avg_price,
+            filled_qty=qty if filled_avg_price else "0",
+            created_at="2026-02-17T15:00:00Z",
+            filled_at="2026-02-17T15:00:01Z" if filled_avg_price else None,
+        )
+        update = SimpleNamespace(event=status, order=order)
+        asyncio.run_coroutine_threadsafe(self._handler(update), self._loop).result(2)
+
+
+@pytest.fixture
+def trade_stream():
+    """Local trade-updates stream (see LocalTradeStream)."""
+    stream = LocalTradeStream()
+    yield stream
+    stream.stop()
+
+
+class StubModelClient:
+    """Stand-in for ``anthropic.Anthropic`` with the streaming messages API.
+
+    ``messages.stream(**params)`` yields *events* text events, sleeping
+    *event_delay* seconds before each, then returns a final message whose
+    content is *tool_calls* as ``tool_use`` blocks.  *error* is raised from
+    ``stream()`` instead.  Calls and ``with_options`` kwargs are recorded.
+    """
+
+    def __init__(self, tool_calls: list[dict] | None = None, events: int = 3,
+                 event_delay: float = 0.0, error: Exception | None = None) -> None:
+        self.tool_calls = tool_calls or []
+        self.events = events
+        self.event_delay = event_delay
+        self.error = error
+        self.calls: list[dict] = []
+        self.options: list[dict] = []
+        self.closed = False
+        self.messages = SimpleNamespace(stream=self._stream)
+
+    def with_options(self, **kwargs) -> "StubModelClient":
+        self.options.append(kwargs)
+        return self
+
+    def close(self) -> None:
+        self.closed = True
+
+    def _stream(self, **params):
+        self.calls.append(params)
+        if self.error is not None:
+            raise self.error
+        return _StubMessageStream(self)
+
+
+class _StubMessageStream:
+    def __init__(self, client: StubModelClient) -> None:
+        self._client = client
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def __iter__(self):
+        for _ in range(self._client.events):
+            time.sleep(self._client.event_delay)
+            yield SimpleNamespace(type="text", text="...")
+
+    def get_final_message(self):
+        content = [
+            SimpleNamespace(type="tool_use", name=c["name"], input=c["input"])
+            for c in self._client.tool_calls
+        ]
+        return SimpleNamespace(content=content, usage=None)
+
+
+@pytest.fixture
+def model_client():
+    """Streaming model client stub (see StubModelClient); configure per test."""
+    return StubModelClient()
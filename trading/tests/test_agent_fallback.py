@@ -0,0 +1,196 @@
+"""Tests for the Layer 2 deadline and deterministic fallback."""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import pytest
+
+from trading.config import TradingConfig
+from trading.data.models import (
+    MarketData,
+    Portfolio,
+    Position,
+    ScenarioSpec,
+    StrategySpec,
+    TradingLevel,
+)
+from trading.layer2.agent_runner import AgentRunner, AgentTimeout
+from trading.layer2.fallback import classify_trigger, fallback_intent
+
+_BASE_INTENT = {
+    "name": "emit_strategy_intent",
+    "input": {
+        "run_id": "stub", "scenario": "base", "rationale": "stub",
+        "target_allocation": {"SPY": 50.0, "BIL": 50.0},
+        "confidence": "medium", "blog_reference": "2026-02-16",
+    },
+}
+
+
+def _market(vix: float = 18.5, sp500: float = 6828.0) -> MarketData:
+    return MarketData(
+        timestamp=datetime.now(timezone.utc),
+        vix=vix, us10y=4.20, sp500=sp500, nasdaq=21700.0,
+        etf_prices={"SPY": 683.1, "BIL": 91.5},
+    )
+
+
+def _portfolio() -> Portfolio:
+    return Portfolio(
+        account_value=100000, cash=50000,
+        positions={"SPY": Position("SPY", 73.2, 50000, 48000, 683.1)},
+    )
+
+
+def _strategy() -> StrategySpec:
+    def sc(name, spy):
+        return ScenarioSpec(name=name, probability=25, triggers=[],
+                            allocation={"SPY": spy, "BIL": 100.0 - spy})
+
+    return StrategySpec(
+        blog_date="2026-02-16",
+        current_allocation={"SPY": 50.0, "BIL": 50.0},
+        scenarios={"base": sc("base", 50.0), "bull": sc("bull", 70.0),
+                   "bear": sc("bear", 30.0)},
+        trading_levels={"sp500": TradingLevel(buy_level=6700.0, stop_loss=6500.0)},
+        stop_losses={},
+        vix_triggers={"caution": 20.0, "stress": 23.0, "risk_on": 17.0},
+        yield_triggers={},
+    )
+
+
+class TestFallbackMapping:
+    def test_vix_cross_up_maps_to_bear(self):
+        trigger = classify_trigger("vix_threshold_crossed", _market(vix=21.0),
+                                   _strategy(), prev_vix=19.0)
+        assert trigger == "vix_caution"
+
+        intent = fallback_intent("r1", "vix_threshold_crossed", _market(vix=21.0),
+                                 _strategy(), prev_vix=19.0)
+        assert intent.scenario == "bear"
+        assert intent.target_allocation == {"SPY": 30.0, "BIL": 70.0}
+        assert intent.confidence == "low"
+
+    def test_stop_level_prefers_bear(self):
+        intent = fallback_intent("index_hit_level", "index_hit_level",
+                                 _market(sp500=6400.0), _strategy())
+        assert intent.scenario == "bear"
+
+    def test_missing_candidate_stays_in_current_scenario(self):
+        spec = _strategy()
+        del spec.scenarios["bull"]
+        intent = fallback_intent("r1", "index_hit_level", _market(sp500=6650.0), spec)
+        # index_buy_level -> ["bull", "base"]: base is present
+        assert intent.scenario == "base"
+
+        del spec.scenarios["base"]
+        intent = fallback_intent("r1", "index_hit_level", _market(sp500=6650.0), spec,
+                                 current_scenario="bear")
+        assert intent.scenario == "bear"
+        assert intent.target_allocation == spec.scenarios["bear"].allocation
+
+    def test_current_scenario_missing_from_blog_takes_no_action(self):
+        spec = _strategy()
+        del spec.scenarios["bull"], spec.scenarios["base"]
+        assert fallback_intent("r1", "index_hit_level", _market(sp500=6650.0), spec,
+                               current_scenario="tail_risk") is None
+        assert fallback_intent("r1", "portfolio_drift_exceeded", _market(), spec,
+                               current_scenario="tail_risk") is None
+
+    def test_drift_rebalances_to_current_scenario(self):
+        intent = fallback_intent("r1", "portfolio_drift_exceeded", _market(), _strategy(),
+                                 current_scenario="bull")
+        assert intent.scenario == "bull"
+        assert intent.target_allocation == {"SPY": 70.0, "BIL": 30.0}
+
+    def test_daily_check_takes_no_action(self):
+        assert fallback_intent("r1", "daily_check", _market(), _strategy()) is None
+
+    @pytest.mark.parametrize("trigger", [
+        "daily_check", "daily_check_missed", "api_failure_alert (3 consecutive)", "unknown",
+    ])
+    def test_non_market_triggers_ignore_market_state(self, trigger):
+        # sp500 below its buy level and VIX crossing: neither may leak in
+        market = _market(vix=21.0, sp500=6650.0)
+        assert classify_trigger(trigger, market, _strategy(), prev_vix=19.0) is None
+        assert fallback_intent("r1", trigger, market, _strategy(), prev_vix=19.0) is None
+
+    def test_vix_cross_ignores_index_levels(self):
+        market = _market(vix=18.5, sp500=6650.0)
+        assert classify_trigger("vix_threshold_crossed", market, _strategy(),
+                                prev_vix=18.0) is None
+
+    def test_level_hit_ignores_vix(self):
+        assert classify_trigger("index_hit_level", _market(vix=21.0), _strategy(),
+                                prev_vix=19.0) is None
+
+
+class TestDeadline:
+    @pytest.fixture
+    def runner(self, tmp_db, model_client):
+        config = dataclasses.replace(TradingConfig(dry_run=True), agent_deadline_sec=0.2)
+        model_client.tool_calls = [_BASE_INTENT]
+        runner = AgentRunner(config, tmp_db)
+        runner._client = model_client
+        with patch("trading.layer2.agent_runner.TOOL_DEFINITIONS", []):
+            yield runner
+
+    def test_slow_stream_is_abandoned_at_deadline(self, runner, model_client):
+        model_client.events, model_client.event_delay = 50, 0.05
+
+        start = time.monotonic()
+        with pytest.raises(AgentTimeout):
+            runner.run("daily_check", _market(), _portfolio(), _strategy())
+
+        assert time.monotonic() - start < 0.5
+        assert model_client.options[0]["max_retries"] == 0
+        assert 0 < model_client.options[0]["timeout"] <= 0.2
+
+    def test_http_timeout_maps_to_agent_timeout(self, runner, model_client):
+        model_client.error = anthropic.APITimeoutError(request=MagicMock())
+        with pytest.raises(AgentTimeout):
+            runner.run("daily_check", _market(), _portfolio(), _strategy())
+
+    def test_fast_stream_returns_intent(self, runner):
+        intent = runner.run("daily_check", _market(), _portfolio(), _strategy())
+        assert intent.scenario == "base"
+
+    def test_decide_falls_back_and_does_not_cache(self, runner, model_client, tmp_db):
+        model_client.events, model_client.event_delay = 50, 0.05
+        tmp_db.save_market_state(timestamp="2026-02-17T14:00:00+00:00", vix=19.0)
+        tmp_db.save_market_state(timestamp="2026-02-17T14:15:00+00:00", vix=21.0)
+
+        decision = runner.decide("vix_threshold_crossed", _market(vix=21.0),
+                                 _portfolio(), _strategy())
+        assert decision.fallback and not decision.cache_hit
+        assert decision.intent.scenario == "bear"
+
+        model_client.events, model_client.event_delay = 1, 0.0
+        again = runner.decide("vix_threshold_crossed", _market(vix=21.0),
+                              _portfolio(), _strategy())
+        assert not again.fallback and not again.cache_hit
+        assert again.intent.scenario == "base"
+
+    def test_drift_fallback_holds_the_current_scenario(self, runner, model_client, tmp_db):
+        model_client.events, model_client.event_delay = 50, 0.05
+        tmp_db.set_state("current_scenario", "bear")
+
+        decision = runner.decide("portfolio_drift_exceeded", _market(), _portfolio(),
+                                 _strategy())
+        assert decision.intent.scenario == "bear"
+        assert decision.intent.target_allocation == {"SPY": 30.0, "BIL": 70.0}
+
+        decision = runner.decide("portfolio_drift_exceeded", _market(), _portfolio(),
+                                 _strategy(), current_scenario="bull")
+        assert decision.intent.scenario == "bull"
+
+
+def test_fallback_recorded_in_decisions(tmp_db):
+    tmp_db.log_decision("2026-02-17T14:00:00Z", "r1", "vix_threshold_crossed",
+                        "APPROVED", scenario="bear", fallback=True)
+    assert tmp_db.get_recent_decisions()[0]["fallback"] == 1
@@ -1,13 +1,13 @@
 """Tests for the AgentRunner (F1 — Claude SDK integration).
 
 Covers: _invoke_claude normal/error paths, run() end-to-end,
-_build_user_message format, _extract_intent parsing, _convert_tools.
+_build_user_message format, prompt-cache layout, _extract_intent parsing,
+_convert_tools.
 """
 
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -74,23 +74,6 @@ def _make_strategy() -> StrategySpec:
     )
 
 
-def _mock_tool_use_block(name: str, input_data: dict):
-    """Create a mock content block that looks like a tool_use block."""
-    block = SimpleNamespace()
-    block.type = "tool_use"
-    block.name = name
-    block.input = input_data
-    return block
-
-
-def _mock_text_block(text: str):
-    """Create a mock content block that looks like a text block."""
-    block = SimpleNamespace()
-    block.type = "text"
-    block.text = text
-    return block
-
-
 # ---------------------------------------------------------------------------
 # Tests — _invoke_claude
 # ---------------------------------------------------------------------------
@@ -100,49 +83,39 @@ class TestInvokeClaude:
     """Tests for the _invoke_claude method."""
 
     @patch("trading.layer2.agent_runner.TOOL_DEFINITIONS", [])
-    def test_invoke_claude_returns_tool_calls(self, tmp_db):
-        """Normal response with tool_use blocks returns extracted tool_calls."""
+    def test_invoke_claude_returns_tool_calls(self, tmp_db, model_client):
+        """Normal streamed response with tool_use blocks returns extracted tool_calls."""
         runner = AgentRunner(_make_config(), tmp_db)
+        model_client.tool_calls = [{
+            "name": "emit_strategy_intent",
+            "input": {
+                "run_id": "abc123",
+                "scenario": "base",
+                "rationale": "VIX stable",
+                "target_allocation": {"SPY": 50.0, "BIL": 50.0},
+                "confidence": "medium",
+                "blog_reference": "2026-02-16",
+            },
+        }]
 
-        mock_response = SimpleNamespace(
-            content=[
-                _mock_text_block("Analyzing the data..."),
-                _mock_tool_use_block("emit_strategy_intent", {
-                    "run_id": "abc123",
-                    "scenario": "base",
-                    "rationale": "VIX stable",
-                    "target_allocation": {"SPY": 50.0, "BIL": 50.0},
-                    "confidence": "medium",
-                    "blog_reference": "2026-02-16",
-                }),
-            ]
-        )
-
-        with patch("anthropic.Anthropic") as mock_cls:
-            mock_client = MagicMock()
-            mock_cls.return_value = mock_client
-            mock_client.messages.create.return_value = mock_response
-
+        with patch("anthropic.Anthropic", return_value=model_client):
             result = runner._invoke_claude("test message")
 
         assert len(result) == 1
         assert result[0]["name"] == "emit_strategy_intent"
         assert result[0]["input"]["scenario"] == "base"
 
-    def test_invoke_claude_no_api_key(self, tmp_db):
+    def test_invoke_claude_no_api_key(self, tmp_db, model_client):
         """When ANTHROPIC_API_KEY is missing, returns empty list gracefully."""
         runner = AgentRunner(_make_config(), tmp_db)
 
         import anthropic
-        with patch("anthropic.Anthropic") as mock_cls:
-            mock_cls.return_value.messages.create.side_effect = (
-                anthropic.AuthenticationError(
-                    message="Invalid API key",
-                    response=MagicMock(status_code=401),
-                    body=None,
-                )
-            )
-
+        model_client.error = anthropic.AuthenticationError(
+            message="Invalid API key",
+            response=MagicMock(status_code=401),
+            body=None,
+        )
+        with patch("anthropic.Anthropic", return_value=model_client):
             result = runner._invoke_claude("test message")
 
         assert result == []
@@ -238,6 +211,48 @@ class TestBuildUserMessage:
         assert "SPY" in msg
 
 
+class TestPromptCaching:
+    """Stable prefix blocks are marked for caching; run context is not."""
+
+    def _content(self, runner, run_id="r1", trigger="vix_spike", vix=20.5):
+        md = _make_market_data()
+        md.vix = vix
+        return runner._build_user_content(
+            run_id, trigger, md, _make_portfolio(), _make_strategy(),
+        )
+
+    def test_strategy_block_is_cached_and_stable(self, tmp_db):
+        runner = AgentRunner(_make_config(), tmp_db)
+
+        first = self._content(runner, run_id="r1", trigger="vix_spike", vix=20.5)
+        second = self._content(runner, run_id="r2", trigger="daily_check", vix=31.0)
+
+        assert first[0] == second[0]
+        assert first[0]["cache_control"] == {"type": "ephemeral"}
+        assert "Blog Date: 2026-02-16" in first[0]["text"]
+        assert "cache_control" not in first[1]
+        assert "r1" in first[1]["text"] and "VIX: 20.5" in first[1]["text"]
+        assert "r1" not in first[0]["text"]
+
+    @patch("trading.layer2.agent_runner.TOOL_DEFINITIONS", [])
+    def test_client_reused_and_system_cached(self, tmp_db, model_client):
+        runner = AgentRunner(_make_config(), tmp_db)
+
+        with patch("anthropic.Anthropic", return_value=model_client) as mock_cls:
+            runner._invoke_claude(self._content(runner))
+            runner._invoke_claude(self._content(runner, run_id="r2"))
+
+        mock_cls.assert_called_once()
+        assert len(model_client.calls) == 2
+        params = model_client.calls[-1]
+        assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
+        content = params["messages"][0]["content"]
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+
+        runner.close()
+        assert model_client.closed
+
+
 # ---------------------------------------------------------------------------
 # Tests — _extract_intent
 # ---------------------------------------------------------------------------
@@ -0,0 +1,191 @@
+"""Tests for the AlpacaClient shared TTL read cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from alpaca.common.exceptions import APIError
+
+from trading.config import AlpacaConfig
+from trading.data.models import Order
+from trading.services.ttl_cache import TTLCache, get_shared_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _account():
+    return SimpleNamespace(
+        account_number="PA1", status="ACTIVE", equity="100000", cash="5000",
+        buying_power="10000", portfolio_value="100000", currency="USD",
+    )
+
+
+def _position(symbol: str, qty: str = "10"):
+    return SimpleNamespace(
+        symbol=symbol, qty=qty, market_value="1000", cost_basis="900",
+        current_price="100",
+    )
+
+
+def _quote(bid: float, ask: float):
+    return SimpleNamespace(bid_price=bid, ask_price=ask)
+
+
+def _make_client(cache: TTLCache, config: AlpacaConfig | None = None):
+    with patch("trading.services.alpaca_client.TradingClient"), \
+         patch("trading.services.alpaca_client.StockHistoricalDataClient"):
+        from trading.services.alpaca_client import AlpacaClient
+        client = AlpacaClient(config or AlpacaConfig(api_key="k"), cache=cache)
+    client._trading = MagicMock()
+    client._trading.get_account.return_value = _account()
+    client._trading.get_all_positions.return_value = [_position("SPY")]
+    client._data = MagicMock()
+    client._data.get_stock_latest_quote.side_effect = lambda req: {
+        s: _quote(99.0, 101.0) for s in (
+            [req.symbol_or_symbols] if isinstance(req.symbol_or_symbols, str)
+            else req.symbol_or_symbols
+        )
+    }
+    return client
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TTLCache(clock=clock)
+
+
+class TestPortfolioCache:
+    def test_clients_share_account_and_positions(self, cache):
+        a = _make_client(cache)
+        b = _make_client(cache)
+        b._trading = a._trading
+
+        assert a.get_portfolio() is not None
+        assert b.get_portfolio() is not None
+        a.get_positions()
+
+        assert a._trading.get_account.call_count == 1
+        assert a._trading.get_all_positions.call_count == 1
+
+    def test_entries_expire_after_ttl(self, cache, clock):
+        client = _make_client(cache, AlpacaConfig(api_key="k", account_ttl_sec=30.0))
+        client.get_account()
+        clock.now = 29.0
+        client.get_account()
+        assert client._trading.get_account.call_count == 1
+
+        clock.now = 31.0
+        client.get_account()
+        assert client._trading.get_account.call_count == 2
+
+    def test_submit_order_invalidates(self, cache):
+        client = _make_client(cache)
+        client._trading.submit_order.return_value = MagicMock(
+            id="1", client_order_id="c1", symbol="SPY", qty=1, status="accepted",
+            limit_price=None, stop_price=None, filled_avg_price=None, created_at=None,
+        )
+        client.get_portfolio()
+
+        client.submit_order(Order(
+            client_order_id="c1", symbol="SPY", side="buy", quantity=1.0,
+            order_type="market",
+        ))
+        client.get_portfolio()
+
+        assert client._trading.get_account.call_count == 2
+        assert client._trading.get_all_positions.call_count == 2
+
+    def test_invalidate_keeps_quotes(self, cache):
+        client = _make_client(cache)
+        client.get_quotes(["SPY"])
+        client.invalidate_portfolio()
+        client.get_quotes(["SPY"])
+        assert client._data.get_stock_latest_quote.call_count == 1
+
+    def test_errors_are_not_cached(self, cache):
+        client = _make_client(cache)
+        client._trading.get_account.side_effect = [APIError("boom"), _account()]
+
+        assert client.get_account() is None
+        assert client.get_account()["equity"] == 100000.0
+
+    def test_returned_values_are_copies(self, cache):
+        client = _make_client(cache)
+        client.get_positions().pop("SPY")
+        client.get_account()["cash"] = 0.0
+
+        assert "SPY" in client.get_positions()
+        assert client.get_account()["cash"] == 5000.0
+
+    def test_accounts_are_namespaced(self, cache):
+        a = _make_client(cache, AlpacaConfig(api_key="one"))
+        b = _make_client(cache, AlpacaConfig(api_key="two"))
+        a.get_account()
+        b.get_account()
+        assert a._trading.get_account.call_count == 1
+        assert b._trading.get_account.call_count == 1
+
+    def test_zero_ttl_disables_cache(self, cache):
+        client = _make_client(cache, AlpacaConfig(api_key="k", account_ttl_sec=0))
+        client.get_account()
+        client.get_account()
+        assert client._trading.get_account.call_count == 2
+
+
+class TestQuoteCache:
+    def test_only_missing_symbols_are_requested(self, cache):
+        client = _make_client(cache)
+        client.get_quotes(["SPY", "QQQ"])
+        result = client.get_quotes(["SPY", "QQQ", "GLD"])
+
+        assert result == {"SPY": 100.0, "QQQ": 100.0, "GLD": 100.0}
+        calls = client._data.get_stock_latest_quote.call_args_list
+        assert len(calls) == 2
+        assert calls[1].args[0].symbol_or_symbols == ["GLD"]
+
+    def test_fully_cached_request_skips_api(self, cache):
+        client = _make_client(cache)
+        client.get_quotes(["SPY", "QQQ"])
+        assert client.get_quote("QQQ") == 100.0
+        assert client._data.get_stock_latest_quote.call_count == 1
+
+    def test_quotes_expire(self, cache, clock):
+        client = _make_client(cache, AlpacaConfig(api_key="k", quote_ttl_sec=10.0))
+        client.get_quotes(["SPY"])
+        clock.now = 11.0
+        client.get_quotes(["SPY"])
+        assert client._data.get_stock_latest_quote.call_count == 2
+
+
+class TestFillInvalidation:
+    def test_filled_order_invalidates_portfolio(self, tmp_db, config):
+        from trading.layer3.order_executor import OrderExecutor
+
+        executor = OrderExecutor(config, tmp_db)
+        executor._client = MagicMock()
+        executor._client.get_orders_by_client_ids.return_value = {"c1": {
+            "client_order_id": "c1", "status": "filled",
+            "filled_avg_price": "101.5", "filled_at": "2026-02-17T15:00:00Z",
+        }}
+
+        result = executor.check_fill_status("c1")
+
+        assert result["status"] == "filled"
+        executor._client.invalidate_portfolio.assert_called_once()
+
+
+def test_shared_cache_is_singleton():
+    assert get_shared_cache() is get_shared_cache()
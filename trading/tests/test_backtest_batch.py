@@ -0,0 +1,92 @@
+"""Tests for the batched multi-timeline backtest runner."""
+
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from trading.backtest.batch import run_batch
+from trading.backtest.config import BacktestConfig, CostModel
+from trading.backtest.engine import PhaseAEngine, PhaseBEngine
+from trading.backtest.strategy_timeline import StrategyTimeline
+from trading.tests.test_backtest_engine import _random_market, _snap_key, _write_blog
+
+
+def _timeline(tmp_path, name, blogs):
+    d = tmp_path / name
+    d.mkdir()
+    for date_str, alloc in blogs:
+        _write_blog(d, date_str, alloc)
+    tl = StrategyTimeline()
+    tl.build(d)
+    return tl
+
+
+@pytest.fixture
+def timelines(tmp_path):
+    return [
+        _timeline(tmp_path, "t1", [
+            ("2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30}),
+            ("2026-01-26", {"SPY": 40, "QQQ": 20, "XLV": 10, "BIL": 30}),
+        ]),
+        _timeline(tmp_path, "t2", [
+            ("2026-01-12", {"SPY": 50, "GLD": 10, "XLP": 10, "BIL": 30}),
+            ("2026-02-09", {"SPY": 30, "QQQ": 30, "BIL": 40}),
+        ]),
+    ]
+
+
+def _single(timeline, config, dp):
+    engine_cls = PhaseBEngine if config.phase == "B" else PhaseAEngine
+    return engine_cls(config, timeline, dp).run()
+
+
+class TestRunBatch:
+    def test_matches_individual_runs(self, timelines):
+        dp = _random_market(11, date(2026, 1, 5), date(2026, 3, 31))
+        base = BacktestConfig(
+            start=date(2026, 1, 12), end=date(2026, 3, 31),
+            slippage_bps=2, cost_model=CostModel(spread_bps=3),
+        )
+        jobs = []
+        for tl in timelines:
+            for phase in ("A", "B"):
+                for timing in ("transition", "week_end"):
+                    jobs.append((tl, replace(base, phase=phase, rebalance_timing=timing)))
+        # Different ranges on the same axis
+        jobs.append((timelines[0], replace(base, phase="B", start=date(2026, 1, 5),
+                                           end=date(2026, 2, 20))))
+        jobs.append((timelines[1], replace(base, phase="A", start=date(2026, 2, 2),
+                                           rebalance_timing="week_end")))
+
+        batched = run_batch(jobs, dp)
+
+        assert len(batched) == len(jobs)
+        for (tl, config), result in zip(jobs, batched):
+            expected = _single(tl, config, dp)
+            assert result.phase == expected.phase
+            assert _snap_key(result) == _snap_key(expected)
+            assert result.trade_records == expected.trade_records
+            assert result.total_cost == expected.total_cost
+            assert result.start_date == config.start
+
+    def test_fetches_each_day_once(self, timelines):
+        dp = _random_market(2, date(2026, 1, 5), date(2026, 2, 27))
+        calls = []
+        original = dp.get_etf_prices
+        dp.get_etf_prices = lambda d: calls.append(d) or original(d)
+        config = BacktestConfig(start=date(2026, 1, 12), end=date(2026, 2, 27))
+        jobs = [(tl, replace(config, phase="A")) for tl in timelines] * 3
+
+        run_batch(jobs, dp)
+
+        assert len(calls) == len(set(calls))
+
+    def test_empty(self):
+        assert run_batch([], None) == []
+
+    def test_invalid_job_raises(self, timelines):
+        dp = _random_market(2, date(2026, 1, 5), date(2026, 1, 30))
+        config = BacktestConfig(start=date(2026, 1, 5), end=date(2026, 1, 30))
+        with pytest.raises(ValueError, match="before first valid blog"):
+            run_batch([(timelines[1], config)], dp)
@@ -8,7 +8,7 @@ import pytest
 
 from trading.backtest.config import BacktestConfig
 from trading.backtest.data_provider import DataProvider
-from trading.backtest.engine import PhaseAEngine, PhaseBEngine
+from trading.backtest.engine import EventDrivenPhaseBEngine, PhaseAEngine, PhaseBEngine
 from trading.backtest.strategy_timeline import StrategyTimeline
 from trading.config import AlpacaConfig
 
@@ -383,6 +383,92 @@ class TestPhaseBEngine:
         trade_days = [s for s in result.daily_snapshots if s.trades_today > 0]
         assert len(trade_days) >= 2
 
+    def test_precomputed_schedule_matches_inline_check(self, tmp_path):
+        """Schedule-driven run must equal the day-by-day check() path."""
+        from trading.backtest.trigger_matcher import TriggerMatcher
+
+        class _InlineMatcher:
+            """Duck-typed matcher: forces the engine's check() path."""
+
+            def __init__(self):
+                self._tm = TriggerMatcher(drift_threshold_pct=2.0)
+
+            def check(self, market_data, portfolio, strategy):
+                return self._tm.check(market_data, portfolio, strategy)
+
+            def resolve_scenario(self, trigger, strategy):
+                return self._tm.resolve_scenario(trigger, strategy)
+
+        _write_blog(tmp_path, "2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30})
+        _write_blog(tmp_path, "2026-01-19", {"SPY": 40, "QQQ": 20, "BIL": 40})
+        timeline = StrategyTimeline()
+        timeline.build(tmp_path)
+
+        start = date(2026, 1, 5)
+        end = date(2026, 1, 30)
+        dp = _make_data_provider(["SPY", "QQQ", "XLV", "XLP", "GLD", "BIL"], start, end)
+        days = dp.get_trading_days(start, end)
+        vix_path = [18, 21, 22, 24, 19, 16, 15, 18, 21, 25, 23, 19, 16, 17, 18,
+                    20, 22, 16, 15, 21]
+        dp.inject_fmp_data("vix", dict(zip(days, vix_path)))
+
+        for timing in ("transition", "week_end"):
+            config = BacktestConfig(
+                start=start, end=end, phase="B", rebalance_timing=timing,
+            )
+            fast = PhaseBEngine(config, timeline, dp)
+            fast.set_trigger_matcher(TriggerMatcher(drift_threshold_pct=2.0))
+            inline = PhaseBEngine(config, timeline, dp)
+            inline.set_trigger_matcher(_InlineMatcher())
+
+            a, b = fast.run(), inline.run()
+            assert [(s.date, s.total_value, s.scenario, s.trades_today)
+                    for s in a.daily_snapshots] == \
+                [(s.date, s.total_value, s.scenario, s.trades_today)
+                 for s in b.daily_snapshots]
+            assert len(a.trade_records) == len(b.trade_records)
+
+    def test_schedule_honours_matcher_vix_seed(self, tmp_path):
+        from trading.backtest.trigger_matcher import TriggerMatcher
+
+        _write_blog(tmp_path, "2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30})
+        timeline = StrategyTimeline()
+        timeline.build(tmp_path)
+        start, end = date(2026, 1, 5), date(2026, 1, 9)
+        dp = _make_data_provider(["SPY", "QQQ", "BIL"], start, end)
+        days = dp.get_trading_days(start, end)
+        dp.inject_fmp_data("vix", dict.fromkeys(days, 21.0))
+
+        engine = PhaseBEngine(BacktestConfig(start=start, end=end, phase="B"), timeline, dp)
+        engine.set_trigger_matcher(TriggerMatcher(prev_vix=19.0))
+        schedule = engine._prepare_schedule(days)
+
+        assert schedule.market_trigger(days[0]) == "vix_caution"
+        engine.set_trigger_matcher(TriggerMatcher())
+        assert engine._prepare_schedule(days).market_trigger(days[0]) is None
+
+    def test_matcher_subclass_keeps_daily_check(self, tmp_path):
+        from trading.backtest.trigger_matcher import TriggerMatcher
+
+        calls = []
+
+        class _Matcher(TriggerMatcher):
+            def check_market(self, market_data, strategy):
+                calls.append(market_data)
+                return super().check_market(market_data, strategy)
+
+        _write_blog(tmp_path, "2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30})
+        timeline = StrategyTimeline()
+        timeline.build(tmp_path)
+        start, end = date(2026, 1, 5), date(2026, 1, 9)
+        dp = _make_data_provider(["SPY", "QQQ", "BIL"], start, end)
+        engine = PhaseBEngine(BacktestConfig(start=start, end=end, phase="B"), timeline, dp)
+        engine.set_trigger_matcher(_Matcher())
+
+        assert engine._prepare_schedule(dp.get_trading_days(start, end)) is None
+        engine.run()
+        assert calls
+
     def test_trade_records_populated(self, tmp_path):
         """BacktestResult.trade_records should contain all individual trades."""
         _write_blog(tmp_path, "2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30})
@@ -459,3 +545,125 @@ class TestPhaseBEngine:
                         f"{trade.symbol}: price {trade.price} should be near "
                         f"open {expected_open}, not close {base[trade.symbol]}"
                     )
+
+
+# --- Event-driven Phase B ---
+
+def _random_market(seed: int, start: date, end: date, missing: int = 3):
+    """Random-walk ETF closes/opens, VIX and S&P with a few missing days."""
+    import random
+    from datetime import timedelta
+
+    rng = random.Random(seed)
+    dp = DataProvider(AlpacaConfig())
+    base = {"SPY": 500.0, "QQQ": 400.0, "XLV": 150.0, "XLP": 80.0, "GLD": 250.0, "BIL": 100.0}
+    days = dp.get_trading_days(start, end)
+    gaps = set(rng.sample(days[5:], missing))
+    closes = {s: {} for s in base}
+    opens = {s: {} for s in base}
+    vix, sp500 = {}, {}
+    level, v = 6000.0, 18.0
+    for d in days:
+        v = min(max(v + rng.gauss(0, 1.8), 11.0), 40.0)
+        level *= 1 + rng.gauss(0, 0.012)
+        vix[d], sp500[d] = round(v, 2), round(level, 2)
+        if d in gaps:
+            continue
+        for sym in base:
+            base[sym] *= 1 + rng.gauss(0, 0.015 if sym != "BIL" else 0.0005)
+            closes[sym][d] = round(base[sym], 2)
+            opens[sym][d] = round(base[sym] * (1 + rng.gauss(0, 0.004)), 2)
+    for sym in base:
+        dp.inject_etf_data(sym, closes[sym])
+        dp.inject_etf_open_data(sym, opens[sym])
+    dp.inject_fmp_data("vix", vix)
+    dp.inject_fmp_data("sp500", sp500)
+    return dp
+
+
+def _snap_key(result):
+    return [
+        (s.date, s.total_value, s.cash, s.positions_value, s.allocation,
+         s.scenario, s.trades_today)
+        for s in result.daily_snapshots
+    ]
+
+
+class TestEventDrivenPhaseBEngine:
+    @pytest.fixture
+    def timeline(self, tmp_path):
+        _write_blog(tmp_path, "2026-01-05", {"SPY": 60, "QQQ": 10, "BIL": 30})
+        _write_blog(tmp_path, "2026-01-26", {"SPY": 40, "QQQ": 20, "XLV": 10, "BIL": 30})
+        _write_blog(tmp_path, "2026-02-16", {"SPY": 50, "GLD": 10, "XLP": 10, "BIL": 30})
+        tl = StrategyTimeline()
+        tl.build(tmp_path)
+        return tl
+
+    @pytest.mark.parametrize("seed", [1, 7, 42])
+    @pytest.mark.parametrize("timing", ["transition", "week_end"])
+    @pytest.mark.parametrize("drift", [1.0, 3.0])
+    def test_matches_daily_engine(self, timeline, seed, timing, drift):
+        from trading.backtest.config import CostModel
+        from trading.backtest.trigger_matcher import TriggerMatcher
+
+        start, end = date(2026, 1, 5), date(2026, 3, 31)
+        dp = _random_market(seed, start, end)
+        config = BacktestConfig(
+            start=start, end=end, phase="B", rebalance_timing=timing,
+            slippage_bps=3, cost_model=CostModel(spread_bps=5),
+        )
+
+        daily = PhaseBEngine(config, timeline, dp)
+        daily.set_trigger_matcher(TriggerMatcher(drift_threshold_pct=drift))
+        event = EventDrivenPhaseBEngine(config, timeline, dp)
+        event.set_trigger_matcher(TriggerMatcher(drift_threshold_pct=drift))
+
+        a, b = daily.run(), event.run()
+
+        assert any(t.reason.startswith("trigger:") for t in a.trade_records)
+        assert _snap_key(a) == _snap_key(b)
+        assert a.trade_records == b.trade_records
+        assert a.total_return_pct == b.total_return_pct
+        assert a.total_cost == b.total_cost
+        assert a.phase == b.phase
+
+    def test_quiet_days_do_not_touch_the_portfolio(self, timeline):
+        """Only event days fetch open prices or call rebalance."""
+        start, end = date(2026, 1, 5), date(2026, 3, 31)
+        dp = _random_market(3, start, end)
+        calls = []
+        original = dp.get_etf_open_prices
+        dp.get_etf_open_prices = lambda d: calls.append(d) or original(d)
+
+        config = BacktestConfig(start=start, end=end, phase="B")
+        result = EventDrivenPhaseBEngine(config, timeline, dp).run()
+
+        assert result.trading_days > 0
+        assert len(calls) < len(result.daily_snapshots) // 2
+
+    def test_custom_matcher_falls_back_to_daily_loop(self, timeline):
+        from trading.backtest.trigger_matcher import TriggerMatcher
+
+        class _Matcher:
+            def __init__(self):
+                self._tm = TriggerMatcher()
+
+            def check(self, market_data, portfolio, strategy):
+                return self._tm.check(market_data, portfolio, strategy)
+
+            def resolve_scenario(self, trigger, strategy):
+                return self._tm.resolve_scenario(trigger, strategy)
+
+        start, end = date(2026, 1, 5), date(2026, 2, 27)
+        dp = _random_market(5, start, end)
+        config = BacktestConfig(start=start, end=end, phase="B")
+        event = EventDrivenPhaseBEngine(config, timeline, dp)
+        event.set_trigger_matcher(_Matcher())
+
+        assert _snap_key(event.run()) == _snap_key(PhaseBEngine(config, timeline, dp).run())
+
+    def test_start_before_effective_raises(self, timeline):
+        dp = _random_market(1, date(2026, 1, 5), date(2026, 1, 30))
+        config = BacktestConfig(start=date(2026, 1, 1), end=date(2026, 1, 30), phase="B")
+        with pytest.raises(ValueError, match="before first valid blog"):
+            EventDrivenPhaseBEngine(config, timeline, dp).run()
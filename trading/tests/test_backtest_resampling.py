@@ -0,0 +1,93 @@
+"""Tests for block-bootstrap / permutation significance tests."""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from trading.backtest.resampling import (
+    MIN_WEEKS,
+    resample_weekly_excess,
+    stationary_bootstrap_indices,
+)
+
+
+def _series(mean: float, n: int = 120, seed: int = 0) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.gauss(mean, 1.0) for _ in range(n)]
+
+
+class TestStationaryBootstrapIndices:
+    def test_shape_and_range(self):
+        idx = stationary_bootstrap_indices(np.random.default_rng(0), 30, 200, 4.0)
+        assert idx.shape == (200, 30)
+        assert idx.min() >= 0 and idx.max() < 30
+
+    def test_blocks_advance_by_one(self):
+        """Within a block, consecutive indices step by +1 (mod n)."""
+        n = 25
+        idx = stationary_bootstrap_indices(np.random.default_rng(1), n, 500, 5.0)
+        steps = (idx[:, 1:] - idx[:, :-1]) % n
+        continuing = steps == 1
+        # Mean block length ~5 => ~80% of steps continue the block
+        assert 0.7 < continuing.mean() < 0.9
+
+    def test_block_length_one_is_iid(self):
+        idx = stationary_bootstrap_indices(np.random.default_rng(2), 50, 400, 1.0)
+        steps = (idx[:, 1:] - idx[:, :-1]) % 50
+        assert (steps == 1).mean() < 0.05
+
+
+class TestResampleWeeklyExcess:
+    def test_seeded_reproducible(self):
+        x = _series(0.2)
+        a = resample_weekly_excess(x, n_resamples=2000, seed=3)
+        b = resample_weekly_excess(x, n_resamples=2000, seed=3)
+        c = resample_weekly_excess(x, n_resamples=2000, seed=4)
+        assert a == b
+        assert a != c
+
+    def test_strong_signal_is_significant(self):
+        r = resample_weekly_excess(_series(0.6), n_resamples=5000)
+        assert r.bootstrap_p_value < 0.01
+        assert r.permutation_p_value < 0.01
+        assert r.bootstrap_ci_low > 0
+        assert r.prob_positive > 0.99
+
+    def test_no_signal_is_not_significant(self):
+        x = _series(0.0, seed=5)
+        x = [v - sum(x) / len(x) + 0.01 for v in x]  # mean ~0
+        r = resample_weekly_excess(x, n_resamples=5000)
+        assert r.p_value > 0.5
+        assert r.bootstrap_ci_low < 0 < r.bootstrap_ci_high
+
+    def test_observed_mean_and_counts(self):
+        x = _series(0.1, n=52)
+        r = resample_weekly_excess(x, n_resamples=1000, block_length=3.0, seed=9)
+        assert r.n_weeks == 52
+        assert r.n_resamples == 1000
+        assert r.observed_mean == pytest.approx(sum(x) / 52)
+        assert 0 < r.bootstrap_p_value <= 1
+        assert 0 < r.permutation_p_value <= 1
+        assert r.p_value == max(r.bootstrap_p_value, r.permutation_p_value)
+
+    def test_too_few_weeks(self):
+        assert resample_weekly_excess([1.0] * (MIN_WEEKS - 1)) is None
+
+    def test_disabled(self):
+        assert resample_weekly_excess(_series(0.1), n_resamples=0) is None
+
+    def test_missing_numpy_is_an_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        with pytest.raises(ImportError, match="numpy"):
+            resample_weekly_excess(_series(0.1), n_resamples=100)
+
+    def test_fast_enough_for_optimizer(self):
+        x = _series(0.1, n=300)
+        t0 = time.perf_counter()
+        resample_weekly_excess(x, n_resamples=20_000)
+        assert time.perf_counter() - t0 < 5.0
@@ -4,7 +4,11 @@ from datetime import date, datetime
 
 import pytest
 
-from trading.backtest.trigger_matcher import TriggerMatcher, TRIGGER_SCENARIO_MAP
+from trading.backtest.trigger_matcher import (
+    TRIGGER_SCENARIO_MAP,
+    TriggerMatcher,
+    build_trigger_schedule,
+)
 from trading.data.models import MarketData, ScenarioSpec, StrategySpec, TradingLevel
 
 
@@ -286,3 +290,86 @@ class TestTriggerScenarioMap:
         for trigger, candidates in TRIGGER_SCENARIO_MAP.items():
             for c in candidates:
                 assert c in valid_scenarios, f"{trigger}: {c} is not a valid scenario"
+
+
+# --- Precomputed schedule Tests ---
+
+class _StubProvider:
+    def __init__(self, vix: dict[date, float], sp500: dict[date, float] | None = None,
+                 no_prices: set[date] | None = None):
+        self._vix = vix
+        self._sp500 = sp500 or {}
+        self._no_prices = no_prices or set()
+
+    def get_etf_prices(self, d):
+        return {} if d in self._no_prices else {"SPY": 100.0}
+
+    def get_market_data(self, d):
+        return MarketData(
+            timestamp=datetime(d.year, d.month, d.day),
+            vix=self._vix.get(d),
+            sp500=self._sp500.get(d, 6000.0),
+        )
+
+
+class _StubTimeline:
+    def __init__(self, strategy, first_day: date | None = None):
+        self._strategy = strategy
+        self._first = first_day
+
+    def get_strategy(self, d):
+        if self._first and d < self._first:
+            return None
+        return self._strategy
+
+
+class TestTriggerSchedule:
+    DAYS = [date(2026, 1, d) for d in (5, 6, 7, 8, 9)]
+
+    def test_matches_day_by_day_check(self):
+        vix = dict(zip(self.DAYS, [19.0, 21.0, 24.0, 19.5, 18.0]))
+        sp500 = dict(zip(self.DAYS, [6000, 6000, 5750, 6000, 6300]))
+        levels = {"sp500": TradingLevel(buy_level=5800, sell_level=6200, stop_loss=5500)}
+        strat = _strategy(trading_levels=levels)
+        provider = _StubProvider(vix, sp500)
+
+        schedule = build_trigger_schedule(self.DAYS, provider, _StubTimeline(strat))
+
+        tm = TriggerMatcher(drift_threshold_pct=1000)
+        expected = [
+            tm.check(provider.get_market_data(d), _MockPortfolio(), strat)
+            for d in self.DAYS
+        ]
+        assert [schedule.market_trigger(d) for d in self.DAYS] == expected
+        assert schedule.vix_triggers[1] == "vix_caution"
+        assert schedule.index_triggers[4] == "index_sell_level"
+        assert schedule.trigger_count == sum(1 for t in expected if t)
+
+    def test_unevaluated_days_do_not_move_vix_state(self):
+        # Jan 6 has no prices: the engine skips it, so the 19 -> 21 cross
+        # is seen between Jan 5 and Jan 7.
+        vix = dict(zip(self.DAYS, [19.0, 25.0, 21.0, 21.0, 21.0]))
+        schedule = build_trigger_schedule(
+            self.DAYS, _StubProvider(vix, no_prices={self.DAYS[1]}),
+            _StubTimeline(_strategy()),
+        )
+        assert schedule.evaluated == [True, False, True, True, True]
+        assert schedule.market_trigger(self.DAYS[2]) == "vix_caution"
+
+    def test_days_without_strategy_are_skipped(self):
+        vix = dict(zip(self.DAYS, [25.0, 19.0, 21.0, 21.0, 21.0]))
+        schedule = build_trigger_schedule(
+            self.DAYS, _StubProvider(vix),
+            _StubTimeline(_strategy(), first_day=self.DAYS[1]),
+        )
+        assert schedule.evaluated[0] is False
+        assert schedule.market_trigger(self.DAYS[1]) is None
+        assert schedule.market_trigger(self.DAYS[2]) == "vix_caution"
+
+    def test_matches_only_same_days(self):
+        schedule = build_trigger_schedule(
+            self.DAYS, _StubProvider({}), _StubTimeline(_strategy()),
+        )
+        assert schedule.matches(list(self.DAYS))
+        assert not schedule.matches(self.DAYS[:-1])
+        assert schedule.market_trigger(date(2026, 2, 2)) is None
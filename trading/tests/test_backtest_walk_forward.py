@@ -7,6 +7,7 @@ from datetime import date, timedelta
 import pytest
 
 from trading.backtest.metrics import BacktestResult
+from trading.backtest.resampling import ResamplingResult
 from trading.backtest.walk_forward import (
     WalkForwardResult,
     WeeklyExcess,
@@ -218,6 +219,24 @@ class TestVerdict:
         verdict, _ = determine_verdict(0.15, 0.40, [], 30)
         assert verdict == "NOT_SIGNIFICANT"
 
+    def test_resampling_must_agree_for_significant(self):
+        weak = ResamplingResult(
+            n_weeks=20, n_resamples=1000, seed=1, block_length=4.0,
+            observed_mean=0.3, bootstrap_ci_low=-0.1, bootstrap_ci_high=0.7,
+            bootstrap_p_value=0.12, prob_positive=0.9, permutation_p_value=0.04,
+        )
+        verdict, detail = determine_verdict(0.03, 0.65, [], 100, weak)
+        assert verdict == "INCONCLUSIVE"
+        assert "Bootstrap p=0.1200" in detail
+
+        strong = ResamplingResult(
+            n_weeks=20, n_resamples=1000, seed=1, block_length=4.0,
+            observed_mean=0.3, bootstrap_ci_low=0.1, bootstrap_ci_high=0.5,
+            bootstrap_p_value=0.01, prob_positive=0.99, permutation_p_value=0.02,
+        )
+        verdict, _ = determine_verdict(0.03, 0.65, [], 100, strong)
+        assert verdict == "SIGNIFICANT"
+
 
 class TestReport:
 
@@ -257,3 +276,16 @@ class TestReport:
         ]
         for header in expected:
             assert header in content, f"Missing: {header}"
+
+    def test_report_includes_resampling(self, tmp_path):
+        wf_result = _make_wf_result(resampling=ResamplingResult(
+            n_weeks=20, n_resamples=5000, seed=7, block_length=4.0,
+            observed_mean=0.3, bootstrap_ci_low=-0.1, bootstrap_ci_high=0.7,
+            bootstrap_p_value=0.12, prob_positive=0.9, permutation_p_value=0.04,
+        ))
+        report_path = tmp_path / "report.md"
+        write_walk_forward_report(wf_result, report_path)
+        content = report_path.read_text()
+
+        assert "Block bootstrap (5,000 resamples" in content
+        assert "Sign-flip permutation: p=0.0400 (seed 7)" in content
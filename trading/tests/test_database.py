@@ -0,0 +1,224 @@
+"""Tests for Database unit-of-work transactions."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from trading.data.database import Database
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """On-disk database so a second connection can observe commits."""
+    db = Database(tmp_path / "trading.db")
+    db.connect()
+    db.migrate()
+    yield db
+    db.close()
+
+
+def _other_conn(db) -> sqlite3.Connection:
+    return sqlite3.connect(db.db_path)
+
+
+def _write_tick(db) -> None:
+    db.set_state("consecutive_api_failures", "0")
+    db.save_market_state(timestamp="2026-02-17T15:00:00+00:00", vix=18.0, sp500=6800.0)
+    db.update_high_water_mark(100000.0)
+    for sym, idx in (("SPY", "^GSPC"), ("QQQ", "^NDX"), ("DIA", "^DJI")):
+        db.save_calibration(date(2026, 2, 17), sym, idx, 10.0)
+    db.log_decision("2026-02-17T15:00:00+00:00", None, "tick", "NO_ACTION")
+
+
+class TestTransaction:
+    def test_without_transaction_each_write_commits(self, tmp_db):
+        before = tmp_db.commits
+        _write_tick(tmp_db)
+        assert tmp_db.commits - before == 7
+
+    def test_tick_writes_land_in_one_commit(self, file_db):
+        before = file_db.commits
+        with file_db.transaction():
+            _write_tick(file_db)
+            # Not visible to other connections until the block exits
+            other = _other_conn(file_db)
+            assert other.execute("SELECT COUNT(*) FROM calibration").fetchone()[0] == 0
+            other.close()
+
+        assert file_db.commits - before == 1
+        other = _other_conn(file_db)
+        assert other.execute("SELECT COUNT(*) FROM calibration").fetchone()[0] == 3
+        other.close()
+
+    def test_nested_blocks_join_outer(self, tmp_db):
+        before = tmp_db.commits
+        with tmp_db.transaction():
+            tmp_db.set_state("a", "1")
+            with tmp_db.transaction():
+                tmp_db.set_state("b", "1")
+            assert tmp_db.in_transaction
+            assert tmp_db.commits == before
+        assert not tmp_db.in_transaction
+        assert tmp_db.commits - before == 1
+
+    def test_error_rolls_back_tick(self, tmp_db):
+        tmp_db.set_state("consecutive_api_failures", "2")
+
+        with pytest.raises(RuntimeError):
+            with tmp_db.transaction():
+                tmp_db.set_state("consecutive_api_failures", "3")
+                tmp_db.update_high_water_mark(123.0)
+                raise RuntimeError("boom")
+
+        assert tmp_db.get_state("consecutive_api_failures") == "2"
+        assert tmp_db.get_high_water_mark() == 0.0
+        assert not tmp_db.in_transaction
+
+    def test_broker_records_survive_rollback(self, tmp_db):
+        with pytest.raises(RuntimeError):
+            with tmp_db.transaction():
+                tmp_db.save_trade("c1", "SPY", "buy", 1.0, "submitted")
+                assert tmp_db.increment_stop_seq("SPY", "2026-02-16") == 0
+                tmp_db.set_state("later", "1")
+                raise RuntimeError("boom")
+
+        assert [t["client_order_id"] for t in tmp_db.get_recent_trades()] == ["c1"]
+        assert tmp_db.increment_stop_seq("SPY", "2026-02-16") == 1
+        assert tmp_db.get_state("later") == "0"
+
+    def test_durable_state_survives_rollback(self, tmp_db):
+        with pytest.raises(RuntimeError):
+            with tmp_db.transaction():
+                tmp_db.set_state("stop_fill_processed_stop-1", "1", durable=True)
+                tmp_db.set_state("later", "1")
+                raise RuntimeError("boom")
+
+        assert tmp_db.get_state("stop_fill_processed_stop-1") == "1"
+        assert tmp_db.get_state("later") == "0"
+
+    def test_empty_transaction_does_not_commit(self, tmp_db):
+        before = tmp_db.commits
+        with tmp_db.transaction():
+            tmp_db.get_state("x")
+        assert tmp_db.commits == before
+
+
+class TestMigrations:
+    def test_migrate_is_idempotent(self, tmp_db):
+        count = tmp_db.conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0]
+        assert tmp_db.migrate() == []
+        assert tmp_db.conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == count
+
+    def test_upgrade_backfills_trade_date(self, tmp_path):
+        from trading.data.migrator import MIGRATIONS_DIR
+
+        db = Database(tmp_path / "old.db")
+        db.connect()
+        db.conn.executescript((MIGRATIONS_DIR / "001_initial.sql").read_text())
+        db.conn.execute(
+            "INSERT INTO trades (client_order_id, symbol, side, quantity, status, created_at) "
+            "VALUES ('old-1', 'SPY', 'buy', 1.0, 'filled', '2026-02-17 15:00:00')"
+        )
+        db.conn.commit()
+
+        db.migrate()
+
+        row = db.conn.execute("SELECT trade_date FROM trades").fetchone()
+        expected = db.conn.execute(
+            "SELECT date('2026-02-17 15:00:00', 'localtime')"
+        ).fetchone()[0]
+        assert row["trade_date"] == expected
+        db.close()
+
+
+class TestIndexedQueries:
+    def test_today_counts_use_stored_trade_date(self, tmp_db):
+        tmp_db.save_trade("c1", "SPY", "buy", 2.0, "filled", filled_price=100.0)
+        tmp_db.save_trade("c2", "QQQ", "sell", 1.0, "submitted")
+        tmp_db.conn.execute(
+            "INSERT INTO trades (client_order_id, symbol, side, quantity, status, "
+            "filled_price, created_at) VALUES ('old', 'SPY', 'buy', 5.0, 'filled', 10.0, "
+            "'2020-01-02 15:00:00')"
+        )
+
+        assert tmp_db.count_today_orders() == 2
+        assert tmp_db.get_today_turnover() == pytest.approx(200.0)
+
+    def test_latest_market_state_skips_nulls(self, tmp_db):
+        tmp_db.save_market_state("t1", vix=20.0, sp500=6800.0, copper=4.5)
+        tmp_db.save_market_state("t2", vix=21.0, sp500=None)
+        tmp_db.save_market_state("t3", vix=None, sp500=None, us10y=4.2)
+
+        assert tmp_db.get_latest_market_state() == {
+            "vix": 21.0, "sp500": 6800.0, "copper": 4.5, "us10y": 4.2,
+        }
+        assert tmp_db.get_previous_market_state("vix") == 21.0
+        assert tmp_db.get_previous_market_state("bogus") is None
+
+    def test_latest_market_state_empty(self, tmp_db):
+        assert tmp_db.get_latest_market_state() == {}
+
+    @pytest.mark.parametrize("sql, index", [
+        ("SELECT COUNT(*) FROM trades WHERE trade_date = '2026-02-17'",
+         "idx_trades_trade_date"),
+        ("SELECT copper FROM market_states WHERE copper IS NOT NULL "
+         "ORDER BY id DESC LIMIT 1", "idx_ms_copper"),
+    ])
+    def test_queries_use_indexes(self, tmp_db, sql, index):
+        plan = " ".join(
+            r["detail"] for r in tmp_db.conn.execute(f"EXPLAIN QUERY PLAN {sql}")
+        )
+        assert index in plan
+
+
+class TestStateCache:
+    def _trace(self, db) -> list[str]:
+        statements: list[str] = []
+        db.conn.set_trace_callback(statements.append)
+        return statements
+
+    def test_reads_served_from_memory(self, tmp_db):
+        tmp_db.set_state("consecutive_api_failures", "2")
+        tmp_db.get_state("current_scenario")  # warm
+        statements = self._trace(tmp_db)
+
+        for _ in range(10):
+            assert tmp_db.get_state("consecutive_api_failures") == "2"
+            assert tmp_db.get_state("daily_check_2026-02-17") == "0"
+
+        assert not [s for s in statements if "FROM state" in s]
+
+    def test_write_through(self, tmp_db):
+        tmp_db.get_state("x")
+        tmp_db.set_state("x", "5")
+        assert tmp_db.get_state("x") == "5"
+        tmp_db.invalidate_state_cache()
+        assert tmp_db.get_state("x") == "5"
+
+    def test_rollback_drops_cache(self, tmp_db):
+        tmp_db.set_state("x", "1")
+        with pytest.raises(RuntimeError):
+            with tmp_db.transaction():
+                tmp_db.set_state("x", "2")
+                assert tmp_db.get_state("x") == "2"
+                raise RuntimeError("boom")
+        assert tmp_db.get_state("x") == "1"
+
+    def test_refresh_picks_up_external_writes(self, file_db):
+        file_db.set_state("current_scenario", "base")
+        assert file_db.get_state("current_scenario") == "base"
+        assert file_db.refresh_state_cache() is False
+
+        other = _other_conn(file_db)
+        other.execute(
+            "UPDATE state SET value = 'bear' WHERE key = 'current_scenario'"
+        )
+        other.commit()
+        other.close()
+
+        assert file_db.get_state("current_scenario") == "base"
+        assert file_db.refresh_state_cache() is True
+        assert file_db.get_state("current_scenario") == "bear"
@@ -0,0 +1,232 @@
+"""Tests for Layer 2 decision memoization."""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from trading.config import TradingConfig
+from trading.data.models import (
+    MarketData,
+    Portfolio,
+    Position,
+    ScenarioSpec,
+    StrategyIntent,
+    StrategySpec,
+    TradingLevel,
+)
+from trading.layer2.agent_runner import AgentRunner
+from trading.layer2.decision_cache import DecisionCache, fingerprint, trigger_family
+from trading.layer3.fill_tracker import FillTracker
+from trading.layer3.order_executor import OrderExecutor
+from trading.layer3.order_generator import OrderGenerator
+
+
+def _market(vix: float = 18.5, sp500: float = 6828.0) -> MarketData:
+    return MarketData(
+        timestamp=datetime.now(timezone.utc),
+        vix=vix, us10y=4.20, sp500=sp500, nasdaq=21700.0, dow=44500.0,
+        gold=5046.0, oil=62.8, copper=5.8,
+        etf_prices={"SPY": 683.1, "BIL": 91.5},
+    )
+
+
+def _portfolio(spy_value: float = 50000.0) -> Portfolio:
+    return Portfolio(
+        account_value=100000, cash=100000 - spy_value,
+        positions={"SPY": Position("SPY", spy_value / 683.1, spy_value, 48000, 683.1)},
+    )
+
+
+def _strategy(blog_date: str = "2026-02-16") -> StrategySpec:
+    return StrategySpec(
+        blog_date=blog_date,
+        current_allocation={"SPY": 50.0, "BIL": 50.0},
+        scenarios={
+            "base": ScenarioSpec(
+                name="base", probability=60, triggers=[],
+                allocation={"SPY": 50.0, "BIL": 50.0},
+            ),
+        },
+        trading_levels={"sp500": TradingLevel(buy_level=6700.0, sell_level=7000.0)},
+        stop_losses={},
+        vix_triggers={"caution": 20.0},
+        yield_triggers={"warning": 4.36},
+    )
+
+
+def _fp(trigger="portfolio_drift_exceeded", market=None, portfolio=None, strategy=None):
+    return fingerprint(
+        trigger, market or _market(), portfolio or _portfolio(), strategy or _strategy(),
+    )
+
+
+class TestFingerprint:
+    def test_trigger_family(self):
+        assert trigger_family("daily_check_missed") == "daily_check"
+        assert trigger_family("api_failure_alert (4 consecutive)") == "api_failure_alert"
+        assert trigger_family("vix_threshold_crossed") == "vix_threshold_crossed"
+
+    def test_small_moves_share_a_fingerprint(self):
+        base = _fp()
+        assert _fp(market=_market(vix=18.9, sp500=6850.0)) == base
+        assert _fp(portfolio=_portfolio(spy_value=50800.0)) == base
+
+    def test_daily_check_missed_matches_daily_check(self):
+        assert _fp("daily_check_missed") == _fp("daily_check")
+
+    def test_material_changes_change_fingerprint(self):
+        base = _fp()
+        assert _fp(market=_market(vix=21.0)) != base            # crossed caution
+        assert _fp(market=_market(sp500=6650.0)) != base        # hit buy level
+        assert _fp(portfolio=_portfolio(spy_value=56000.0)) != base
+        assert _fp(strategy=_strategy("2026-02-23")) != base
+        assert _fp("index_hit_level") != base
+
+
+class TestDecisionCache:
+    def _intent(self) -> StrategyIntent:
+        return StrategyIntent(
+            run_id="r1", scenario="base", rationale="calm",
+            target_allocation={"SPY": 50.0, "BIL": 50.0}, priority_actions=[],
+            confidence="medium", blog_reference="2026-02-16",
+        )
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = DecisionCache(ttl_sec=60, clock=lambda: now[0])
+        cache.put("k", self._intent())
+
+        now[0] = 59.0
+        assert cache.get("k").scenario == "base"
+        now[0] = 60.0
+        assert cache.get("k") is None
+
+    def test_returns_copies(self):
+        cache = DecisionCache(ttl_sec=60)
+        cache.put("k", self._intent())
+        cache.get("k").target_allocation["SPY"] = 0.0
+        assert cache.get("k").target_allocation["SPY"] == 50.0
+
+    def test_zero_ttl_disables(self):
+        cache = DecisionCache(ttl_sec=0)
+        cache.put("k", self._intent())
+        assert cache.get("k") is None
+
+
+_BASE_INTENT = {
+    "name": "emit_strategy_intent",
+    "input": {
+        "run_id": "stub", "scenario": "base", "rationale": "stub",
+        "target_allocation": {"SPY": 50.0, "BIL": 50.0},
+        "confidence": "medium", "blog_reference": "2026-02-16",
+    },
+}
+
+
+class TestAgentDecide:
+    @pytest.fixture
+    def runner(self, tmp_db, model_client):
+        model_client.tool_calls = [_BASE_INTENT]
+        runner = AgentRunner(TradingConfig(dry_run=True), tmp_db)
+        runner._client = model_client
+        with patch("trading.layer2.agent_runner.TOOL_DEFINITIONS", []):
+            yield runner
+
+    def test_repeat_trigger_reuses_intent(self, runner):
+        first = runner.decide("portfolio_drift_exceeded", _market(), _portfolio(), _strategy())
+        second = runner.decide(
+            "portfolio_drift_exceeded", _market(vix=18.7), _portfolio(50500.0), _strategy(),
+        )
+
+        assert not first.cache_hit and second.cache_hit
+        assert second.fingerprint == first.fingerprint
+        assert second.intent.scenario == "base"
+        assert second.intent.run_id != first.intent.run_id
+        assert second.source_run_id == first.intent.run_id
+        assert len(runner._client.calls) == 1
+
+    def test_reused_intent_does_not_resend_order_ids(self, runner, tmp_db):
+        broker = _Broker()
+        config = dataclasses.replace(runner._config, dry_run=False)
+        executor = OrderExecutor(config, tmp_db)
+        executor._client = broker
+        executor._tracker = FillTracker(broker, poll_interval=0.01)
+        generator = OrderGenerator(config)
+        prices = {"SPY": 683.1, "BIL": 91.5}
+
+        ids = []
+        for trigger in ("portfolio_drift_exceeded", "portfolio_drift_exceeded"):
+            decision = runner.decide(trigger, _market(), _portfolio(), _strategy())
+            orders = generator.generate(decision.intent, _portfolio(), prices)
+            ids.append([o.client_order_id for o in orders])
+            executor.execute(orders)
+        executor.close()
+
+        assert ids[0] and not set(ids[0]) & set(ids[1])
+        assert broker.rejected == []
+        trades = {t["client_order_id"]: t["status"] for t in tmp_db.get_recent_trades()}
+        assert {trades[cid] for cid in ids[0]} == {"filled"}
+
+    def test_vix_flapping_hits_both_buckets(self, runner):
+        for vix in (19.5, 20.5, 19.6, 20.4):
+            runner.decide("vix_threshold_crossed", _market(vix=vix), _portfolio(), _strategy())
+        assert len(runner._client.calls) == 2
+
+    def test_material_change_calls_model(self, runner):
+        runner.decide("portfolio_drift_exceeded", _market(), _portfolio(), _strategy())
+        decision = runner.decide(
+            "portfolio_drift_exceeded", _market(vix=24.0), _portfolio(), _strategy(),
+        )
+        assert not decision.cache_hit
+        assert len(runner._client.calls) == 2
+
+    def test_failed_run_not_cached(self, runner):
+        runner._client.tool_calls = []
+        runner.decide("daily_check", _market(), _portfolio(), _strategy())
+        decision = runner.decide("daily_check_missed", _market(), _portfolio(), _strategy())
+        assert decision.intent is None and not decision.cache_hit
+        assert len(runner._client.calls) == 2
+
+
+class _Broker:
+    """Fills every order; rejects a client_order_id it has already seen."""
+
+    def __init__(self) -> None:
+        self.seen: set[str] = set()
+        self.rejected: list[str] = []
+
+    def submit_order(self, order):
+        if order.client_order_id in self.seen:
+            self.rejected.append(order.client_order_id)
+            return None
+        self.seen.add(order.client_order_id)
+        return {"id": f"id-{order.client_order_id}", "status": "filled",
+                "filled_avg_price": "100.0", "created_at": "2026-02-17T15:00:00Z"}
+
+    def get_account(self):
+        return {"cash": 1_000_000.0}
+
+    def get_orders_by_client_ids(self, ids, after=None):
+        return {}
+
+    def invalidate_portfolio(self):
+        pass
+
+
+def test_cache_hit_recorded_in_decisions(tmp_db):
+    tmp_db.log_decision("2026-02-17T14:00:00Z", "r1", "daily_check", "APPROVED",
+                        scenario="base", fingerprint="abc", cache_hit=False)
+    tmp_db.log_decision("2026-02-17T14:15:00Z", "r2", "daily_check_missed", "APPROVED",
+                        scenario="base", fingerprint="abc", cache_hit=True,
+                        source_run_id="r1")
+
+    rows = tmp_db.get_recent_decisions()
+    assert [
+        (r["trigger_type"], r["run_id"], r["cache_hit"], r["source_run_id"]) for r in rows
+    ] == [
+        ("daily_check_missed", "r2", 1, "r1"), ("daily_check", "r1", 0, None),
+    ]
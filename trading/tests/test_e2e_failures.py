@@ -966,7 +966,7 @@ class TestAlpacaOrderRejected:
     def test_rejected_order_returns_failed_status(self, config, tmp_db):
         """When AlpacaClient.submit_order() returns None (rejection),
         OrderExecutor marks the trade as 'failed' in the database."""
-        # Use live mode to exercise _live_order path
+        # Use live mode to exercise the _submit_wave path
         from trading.config import TradingConfig
         live_config = TradingConfig(
             dry_run=False,
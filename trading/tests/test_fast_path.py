@@ -0,0 +1,138 @@
+"""Tests for fast-path polling between full ticks."""
+
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from trading.config import AlpacaConfig
+from trading.layer1.fast_path import FastPathMonitor
+
+_RATIOS = {"SPY": 6828.0 / 683.1, "QQQ": 21700.0 / 531.2, "DIA": 44500.0 / 441.3}
+
+
+class _QuoteFeed:
+    """Minimal FMP stand-in: serves scripted index / VIX levels."""
+
+    def __init__(self) -> None:
+        self.levels = {"^VIX": 20.5, "^GSPC": 6828.0, "^NDX": 21700.0, "^DJI": 44500.0}
+        self.fail = False
+        self.calls: list[list[str]] = []
+
+    def fetch_quotes(self, symbols):
+        self.calls.append(list(symbols))
+        if self.fail:
+            return None
+        return {s: {"symbol": s, "price": self.levels[s]} for s in symbols}
+
+
+@pytest.fixture
+def feed():
+    return _QuoteFeed()
+
+
+@pytest.fixture
+def fast(config, feed, sample_market_data, sample_portfolio, sample_strategy_spec):
+    monitor = FastPathMonitor(config, fmp=feed)
+    monitor.seed(sample_market_data, sample_portfolio, sample_strategy_spec, _RATIOS)
+    return monitor
+
+
+class TestFastPathMonitor:
+    def test_not_polled_before_first_full_tick(self, config, feed):
+        monitor = FastPathMonitor(config, fmp=feed)
+        assert monitor.poll() is None
+        assert feed.calls == []
+
+    def test_one_cheap_quote_call_per_poll(self, fast, feed):
+        assert fast.poll() is None
+        assert feed.calls == [["^VIX", "^GSPC", "^NDX", "^DJI"]]
+
+    def test_vix_cross_against_previous_poll(self, fast, feed):
+        feed.levels["^VIX"] = 20.8
+        assert fast.poll() is None
+        feed.levels["^VIX"] = 19.6  # crossed 20 down
+        assert fast.poll() == "vix_threshold_crossed"
+        feed.levels["^VIX"] = 19.4
+        assert fast.poll() is None
+        assert fast.escalations == 1
+
+    def test_new_level_hit_escalates_once(self, fast, feed):
+        feed.levels["^GSPC"] = 6450.0  # below buy_level 6500
+        assert fast.poll() == "index_hit_level"
+        feed.levels["^GSPC"] = 6440.0
+        assert fast.poll() is None
+        feed.levels["^GSPC"] = 6290.0  # now also below stop_loss 6300
+        assert fast.poll() == "index_hit_level"
+
+    def test_drift_estimated_from_index_move(
+        self, config, feed, sample_market_data, sample_portfolio, sample_strategy_spec,
+    ):
+        spec = dataclasses.replace(sample_strategy_spec, trading_levels={})
+        monitor = FastPathMonitor(config, fmp=feed)
+        monitor.seed(sample_market_data, sample_portfolio, spec, _RATIOS)
+
+        feed.levels["^GSPC"] = 6900.0  # SPY ~22.2%: within threshold
+        assert monitor.poll() is None
+        feed.levels["^GSPC"] = 8200.0  # SPY ~25.3% vs 22% target
+        assert monitor.poll() == "portfolio_drift_exceeded"
+
+    def test_quote_failure_is_quiet(self, fast, feed):
+        feed.fail = True
+        assert fast.poll() is None
+        assert fast.escalations == 0
+
+    def test_seed_resets_baseline(self, fast, feed, sample_market_data,
+                                  sample_portfolio, sample_strategy_spec):
+        feed.levels["^GSPC"] = 6450.0
+        low = dataclasses.replace(sample_market_data, sp500=6450.0)
+        fast.seed(low, sample_portfolio, sample_strategy_spec, _RATIOS)
+        assert fast.poll() is None  # already hit at the last full tick
+
+
+class TestFastTick:
+    @pytest.fixture
+    def system(self, config):
+        from trading.main import TradingSystem
+
+        config = dataclasses.replace(
+            config, alpaca=AlpacaConfig(api_key="k", secret_key="s"),
+            fast_tick_interval_sec=30,
+        )
+        system = TradingSystem(config)
+        system._fast_path = MagicMock()
+        system._market_tick_locked = MagicMock()
+        yield system
+        system.shutdown()
+
+    def test_escalates_to_full_tick_under_the_same_lock(self, system):
+        held = []
+        system._market_tick_locked.side_effect = (
+            lambda escalation: held.append(system._tick_lock.locked())
+        )
+        system._fast_path.poll.return_value = "index_hit_level"
+        with patch.object(system, "_market_open", return_value=True):
+            system.fast_tick()
+        system._market_tick_locked.assert_called_once_with(escalation="index_hit_level")
+        assert held == [True]
+        assert not system._tick_lock.locked()
+
+    def test_quiet_poll_runs_nothing_else(self, system):
+        system._fast_path.poll.return_value = None
+        with patch.object(system, "_market_open", return_value=True):
+            system.fast_tick()
+        system._market_tick_locked.assert_not_called()
+        assert not system._tick_lock.locked()
+
+    def test_skipped_while_full_tick_runs(self, system):
+        with patch.object(system, "_market_open", return_value=True):
+            with system._tick_lock:
+                system.fast_tick()
+        system._fast_path.poll.assert_not_called()
+
+    def test_skipped_outside_market_hours(self, system):
+        with patch.object(system, "_market_open", return_value=False):
+            system.fast_tick()
+        system._fast_path.poll.assert_not_called()
@@ -0,0 +1,171 @@
+"""Tests for stream-driven fill tracking with polling fallback."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from trading.layer3.fill_tracker import FillTracker
+
+
+def _order(cid: str, status: str, price: str | None = None) -> dict:
+    return {"client_order_id": cid, "status": status, "filled_avg_price": price,
+            "filled_at": None}
+
+
+def _client(responses=None) -> MagicMock:
+    client = MagicMock()
+    client.get_orders_by_client_ids.side_effect = (
+        responses if responses is not None else (lambda ids, after=None: {})
+    )
+    return client
+
+
+def _push_later(delay, fn, *args):
+    t = threading.Timer(delay, fn, args)
+    t.start()
+    return t
+
+
+class TestStream:
+    def test_fill_event_wakes_waiter(self, trade_stream):
+        client = _client()
+        tracker = FillTracker(client, stream=trade_stream, stream_poll_interval=30)
+        tracker.track("c1")
+        trade_stream.push("c1", "new")
+        assert tracker.stream_alive
+
+        _push_later(0.05, trade_stream.push, "c1", "filled", "101.5")
+        start = time.monotonic()
+        found = tracker.wait(["c1"], timeout=5)
+
+        assert found["c1"]["status"] == "filled"
+        assert time.monotonic() - start < 1.0
+        assert tracker.polls == 0
+        tracker.stop()
+
+    def test_untracked_orders_are_ignored(self, trade_stream):
+        tracker = FillTracker(_client(), stream=trade_stream, stream_poll_interval=30)
+        tracker.track("c1")
+        trade_stream.push("other", "filled", "10")
+        assert tracker.wait(["other"], timeout=0) == {}
+        tracker.stop()
+
+    def test_partial_fill_is_not_terminal(self, trade_stream):
+        tracker = FillTracker(_client(), stream=trade_stream, stream_poll_interval=30)
+        tracker.track("c1")
+        trade_stream.push("c1", "partially_filled", "100")
+
+        found = tracker.wait(["c1"], timeout=0.1)
+        assert found["c1"]["status"] == "partially_filled"
+        tracker.stop()
+
+    def test_stream_drop_switches_to_polling(self, trade_stream):
+        calls = []
+
+        def _lookup(ids, after=None):
+            calls.append(list(ids))
+            return {"c1": _order("c1", "filled", "99")} if len(calls) >= 1 else {}
+
+        tracker = FillTracker(_client(_lookup), stream=trade_stream,
+                              poll_interval=0.05, stream_poll_interval=30)
+        tracker.track("c1")
+        trade_stream.push("c1", "new")
+
+        _push_later(0.05, trade_stream.disconnect)
+        found = tracker.wait(["c1"], timeout=5)
+
+        assert found["c1"]["status"] == "filled"
+        assert not tracker.stream_alive
+        assert calls == [["c1"]]
+
+    def test_stream_without_messages_is_not_alive(self, trade_stream):
+        calls = []
+
+        def _lookup(ids, after=None):
+            calls.append(list(ids))
+            return {"c1": _order("c1", "filled", "99")} if len(calls) >= 2 else {}
+
+        tracker = FillTracker(_client(_lookup), stream=trade_stream,
+                              poll_interval=0.05, stream_poll_interval=30)
+        tracker.track("c1")
+        assert trade_stream.running.wait(2)
+        assert not tracker.stream_alive
+
+        start = time.monotonic()
+        found = tracker.wait(["c1"], timeout=5)
+
+        assert found["c1"]["status"] == "filled"
+        assert time.monotonic() - start < 1.0
+        assert len(calls) == 2
+        tracker.stop()
+
+
+class TestPolling:
+    def test_one_batched_call_per_cycle(self):
+        calls = []
+
+        def _lookup(ids, after=None):
+            calls.append((sorted(ids), after))
+            if len(calls) == 1:
+                return {"a": _order("a", "filled", "1"), "b": _order("b", "new")}
+            return {"b": _order("b", "canceled")}
+
+        tracker = FillTracker(_client(_lookup), poll_interval=0.01)
+        for cid in ("a", "b"):
+            tracker.track(cid)
+
+        found = tracker.wait(["a", "b"], timeout=2)
+
+        assert {c: o["status"] for c, o in found.items()} == {"a": "filled", "b": "canceled"}
+        assert [ids for ids, _ in calls] == [["a", "b"], ["b"]]
+        assert all(after is not None for _, after in calls)
+
+    def test_timeout_returns_last_known(self):
+        tracker = FillTracker(
+            _client(lambda ids, after=None: {"a": _order("a", "new")}),
+            poll_interval=0.01,
+        )
+        tracker.track("a")
+        tracker.track("b")
+
+        found = tracker.wait(["a", "b"], timeout=0.05)
+
+        assert found == {"a": _order("a", "new")}
+
+    def test_api_error_keeps_waiting(self):
+        responses = iter([None, {"a": _order("a", "filled", "5")}])
+        tracker = FillTracker(
+            _client(lambda ids, after=None: next(responses)), poll_interval=0.01,
+        )
+        tracker.track("a")
+        assert tracker.wait(["a"], timeout=2)["a"]["status"] == "filled"
+
+
+class TestExecutor:
+    def test_wait_for_fills_updates_trades(self, tmp_db, config, trade_stream):
+        from trading.layer3.order_executor import OrderExecutor
+
+        executor = OrderExecutor(config, tmp_db)
+        executor._client = _client()
+        executor._tracker = FillTracker(
+            executor._client, stream=trade_stream, stream_poll_interval=30,
+        )
+        tmp_db.save_trade("c1", "SPY", "buy", 1.0, "submitted")
+        tmp_db.save_trade("c2", "QQQ", "buy", 1.0, "submitted")
+        executor._tracker.track("c1")
+        executor._tracker.track("c2")
+        assert trade_stream.running.wait(2)
+
+        _push_later(0.02, trade_stream.push, "c1", "filled", "100.0")
+        _push_later(0.04, trade_stream.push, "c2", "rejected")
+        results = executor.wait_for_fills(["c1", "c2", "c3"], timeout_seconds=0.3)
+
+        assert [(r["client_order_id"], r["status"]) for r in results] == [
+            ("c1", "filled"), ("c2", "rejected"), ("c3", "timeout"),
+        ]
+        trades = {t["client_order_id"]: t for t in tmp_db.get_recent_trades()}
+        assert trades["c1"]["filled_price"] == 100.0
+        executor._client.invalidate_portfolio.assert_called()
+        executor.close()
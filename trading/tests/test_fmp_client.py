@@ -1,18 +1,17 @@
 """Tests for the FMPClient class.
 
-All HTTP calls are mocked via unittest.mock so no real API access is needed.
+HTTP calls go to a local stub server (``stub_server`` fixture), so no real
+API access is needed.
 """
 
 from __future__ import annotations
 
-import json
-import urllib.error
-from io import BytesIO
-from unittest.mock import MagicMock, patch
+import socket
 
 import pytest
 
 from trading.services.fmp_client import FMPClient
+from trading.services.http_session import HTTPSession
 from trading.config import FMPConfig
 
 
@@ -20,18 +19,22 @@ from trading.config import FMPConfig
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _mock_urlopen(response_data):
-    """Create a mock context-manager response that returns *response_data* as JSON."""
-    mock_resp = MagicMock()
-    mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-    mock_resp.__exit__ = MagicMock(return_value=False)
-    mock_resp.read.return_value = json.dumps(response_data).encode("utf-8")
-    return mock_resp
+def _no_sleep(_seconds: float) -> None:
+    pass
 
 
-def _make_client() -> FMPClient:
-    """Create an FMPClient with a dummy API key."""
-    return FMPClient(FMPConfig(api_key="test_key"))
+def _make_client(base_url: str = "https://financialmodelingprep.com/api/v3", **session_kw) -> FMPClient:
+    """Create an FMPClient with a dummy API key and a private session."""
+    session = HTTPSession(sleep=_no_sleep, rate_limits={}, **session_kw)
+    return FMPClient(FMPConfig(api_key="test_key", base_url=base_url), session=session)
+
+
+def _unused_url() -> str:
+    """URL of a localhost port with nothing listening."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
 
 
 # ---------------------------------------------------------------------------
@@ -40,15 +43,14 @@ def _make_client() -> FMPClient:
 
 class TestFetchQuotes:
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_success(self, mock_urlopen) -> None:
+    def test_success(self, stub_server) -> None:
         """Successful quote fetch returns a dict keyed by symbol."""
-        mock_urlopen.return_value = _mock_urlopen([
+        stub_server.add("/quote/^VIX,^GSPC", (200, [
             {"symbol": "^VIX", "price": 20.5, "name": "VIX"},
             {"symbol": "^GSPC", "price": 6828.3, "name": "S&P 500"},
-        ])
+        ]))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_quotes(["^VIX", "^GSPC"])
 
         assert result is not None
@@ -56,6 +58,7 @@ class TestFetchQuotes:
         assert "^GSPC" in result
         assert result["^VIX"]["price"] == 20.5
         assert result["^GSPC"]["price"] == 6828.3
+        assert "apikey=test_key" in stub_server.requests[0][0]
 
     def test_empty_list_returns_empty_dict(self) -> None:
         """Passing an empty symbol list returns an empty dict (no HTTP call)."""
@@ -63,57 +66,54 @@ class TestFetchQuotes:
         result = client.fetch_quotes([])
         assert result == {}
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_http_error_returns_none(self, mock_urlopen) -> None:
-        """An HTTPError from the server results in None."""
-        mock_urlopen.side_effect = urllib.error.HTTPError(
-            url="https://example.com",
-            code=403,
-            msg="Forbidden",
-            hdrs=None,
-            fp=BytesIO(b""),
-        )
+    def test_http_error_returns_none(self, stub_server) -> None:
+        """An HTTP error status from the server results in None."""
+        stub_server.add("/quote/^VIX,^GSPC", (403, {"Error Message": "Forbidden"}))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_quotes(["^VIX", "^GSPC"])
         assert result is None
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_timeout_returns_none(self, mock_urlopen) -> None:
-        """A URLError (network / timeout) results in None."""
-        mock_urlopen.side_effect = urllib.error.URLError("Connection timed out")
+    def test_timeout_returns_none(self, stub_server) -> None:
+        """A read timeout results in None."""
+        stub_server.add("/quote/^VIX", (200, [], {"delay": 0.5}))
 
-        client = _make_client()
+        client = _make_client(stub_server.url, timeout=0.1, max_retries=0)
         result = client.fetch_quotes(["^VIX"])
         assert result is None
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_single_symbol(self, mock_urlopen) -> None:
+    def test_single_symbol(self, stub_server) -> None:
         """Fetching a single symbol works correctly."""
-        mock_urlopen.return_value = _mock_urlopen([
-            {"symbol": "^VIX", "price": 15.3},
-        ])
+        stub_server.add("/quote/^VIX", (200, [{"symbol": "^VIX", "price": 15.3}]))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_quotes(["^VIX"])
 
         assert result is not None
         assert len(result) == 1
         assert result["^VIX"]["price"] == 15.3
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_json_decode_error_returns_none(self, mock_urlopen) -> None:
+    def test_json_decode_error_returns_none(self, stub_server) -> None:
         """Malformed JSON from the server results in None."""
-        mock_resp = MagicMock()
-        mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-        mock_resp.__exit__ = MagicMock(return_value=False)
-        mock_resp.read.return_value = b"not valid json"
-        mock_urlopen.return_value = mock_resp
+        stub_server.add("/quote/^VIX", (200, b"not valid json"))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_quotes(["^VIX"])
         assert result is None
 
+    def test_repeated_polls_reuse_connection(self, stub_server) -> None:
+        """Quote and treasury polls share one keep-alive connection."""
+        stub_server.add("/quote/^VIX", (200, [{"symbol": "^VIX", "price": 15.3}]))
+        stub_server.add("/treasury", (200, [{"date": "2026-02-14", "year10": 4.36}]))
+
+        client = _make_client(stub_server.url)
+        for _ in range(3):
+            assert client.fetch_quotes(["^VIX"]) is not None
+            assert client.fetch_treasury() is not None
+
+        assert len(stub_server.requests) == 6
+        assert len(stub_server.client_ports) == 1
+
 
 # ---------------------------------------------------------------------------
 # fetch_treasury
@@ -121,10 +121,9 @@ class TestFetchQuotes:
 
 class TestFetchTreasury:
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_success(self, mock_urlopen) -> None:
+    def test_success(self, stub_server) -> None:
         """Successful treasury fetch returns yield values."""
-        mock_urlopen.return_value = _mock_urlopen([
+        stub_server.add("/treasury", (200, [
             {
                 "date": "2026-02-14",
                 "month1": 5.25,
@@ -134,9 +133,9 @@ class TestFetchTreasury:
                 "year10": 4.36,
                 "year30": 4.55,
             }
-        ])
+        ]))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_treasury()
 
         assert result is not None
@@ -146,51 +145,40 @@ class TestFetchTreasury:
         # "date" should be excluded from the result
         assert "date" not in result
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_empty_response_returns_none(self, mock_urlopen) -> None:
+    def test_empty_response_returns_none(self, stub_server) -> None:
         """An empty list from the API returns None."""
-        mock_urlopen.return_value = _mock_urlopen([])
+        stub_server.add("/treasury", (200, []))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_treasury()
         assert result is None
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_http_error_returns_none(self, mock_urlopen) -> None:
-        """An HTTPError from the server results in None."""
-        mock_urlopen.side_effect = urllib.error.HTTPError(
-            url="https://example.com",
-            code=500,
-            msg="Internal Server Error",
-            hdrs=None,
-            fp=BytesIO(b""),
-        )
+    def test_http_error_returns_none(self, stub_server) -> None:
+        """A persistent 5xx from the server results in None (after retries)."""
+        stub_server.add("/treasury", (500, {"error": "Internal Server Error"}))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_treasury()
         assert result is None
+        assert len(stub_server.requests) == 3  # initial + 2 retries
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_url_error_returns_none(self, mock_urlopen) -> None:
-        """A URLError (network issue) results in None."""
-        mock_urlopen.side_effect = urllib.error.URLError("DNS resolution failed")
-
-        client = _make_client()
+    def test_url_error_returns_none(self) -> None:
+        """A network failure (connection refused) results in None."""
+        client = _make_client(_unused_url())
         result = client.fetch_treasury()
         assert result is None
 
-    @patch("trading.services.fmp_client.urllib.request.urlopen")
-    def test_non_numeric_values_skipped(self, mock_urlopen) -> None:
+    def test_non_numeric_values_skipped(self, stub_server) -> None:
         """Non-numeric yield values are silently skipped."""
-        mock_urlopen.return_value = _mock_urlopen([
+        stub_server.add("/treasury", (200, [
             {
                 "date": "2026-02-14",
                 "year10": 4.36,
                 "year2": "N/A",
             }
-        ])
+        ]))
 
-        client = _make_client()
+        client = _make_client(stub_server.url)
         result = client.fetch_treasury()
 
         assert result is not None
@@ -0,0 +1,226 @@
+"""Tests for the pooled keep-alive HTTP session."""
+
+from __future__ import annotations
+
+import gzip
+import random
+import threading
+from datetime import date
+
+import pytest
+
+from trading.services.http_session import (
+    HTTPSession,
+    HTTPStatusError,
+    TransportError,
+    get_session,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _session(**kw) -> tuple[HTTPSession, _Clock]:
+    clock = _Clock()
+    kw.setdefault("rate_limits", {})
+    return HTTPSession(sleep=clock.sleep, clock=clock, rng=random.Random(0), **kw), clock
+
+
+class TestPooling:
+    def test_keep_alive_reuses_one_connection(self, stub_server):
+        stub_server.add("/ping", (200, {"ok": True}))
+        session, _ = _session()
+
+        for _ in range(5):
+            assert session.get_json(f"{stub_server.url}/ping?apikey=k") == {"ok": True}
+
+        assert session.connections_opened == 1
+        assert len(stub_server.client_ports) == 1
+
+    def test_server_close_opens_new_connection(self, stub_server):
+        stub_server.add("/bye", (200, {"ok": 1}, {"Connection": "close"}))
+        session, _ = _session()
+
+        session.get(f"{stub_server.url}/bye")
+        session.get(f"{stub_server.url}/bye")
+
+        assert session.connections_opened == 2
+
+    def test_concurrent_requests_use_separate_connections(self, stub_server):
+        stub_server.add("/slow", (200, {"ok": 1}, {"delay": 0.1}))
+        session, _ = _session()
+        barrier = threading.Barrier(3)
+        errors: list[Exception] = []
+
+        def _worker():
+            barrier.wait()
+            try:
+                session.get(f"{stub_server.url}/slow")
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert session.connections_opened == 3
+        # All three went back to the idle pool: next call reuses one.
+        session.get(f"{stub_server.url}/slow")
+        assert session.connections_opened == 3
+
+    def test_close_drops_idle_connections(self, stub_server):
+        stub_server.add("/ping", (200, {}))
+        session, _ = _session()
+        session.get(f"{stub_server.url}/ping")
+        session.close()
+        session.get(f"{stub_server.url}/ping")
+        assert session.connections_opened == 2
+
+    def test_default_session_is_shared(self):
+        assert get_session() is get_session()
+
+
+class TestGzip:
+    def test_requests_and_decodes_gzip(self, stub_server):
+        payload = [{"symbol": "^VIX", "price": 20.0}] * 50
+        stub_server.add("/quote", (200, payload, {"gzip": True}))
+        session, _ = _session()
+
+        assert session.get_json(f"{stub_server.url}/quote") == payload
+        assert "gzip" in stub_server.requests[0][1]["Accept-Encoding"]
+
+    def test_truncated_gzip_raises_transport_error(self, stub_server):
+        body = gzip.compress(b'{"ok": true}')[:-6]
+        stub_server.add("/broken", (200, body, {"Content-Encoding": "gzip"}))
+        session, clock = _session(max_retries=1)
+
+        with pytest.raises(TransportError):
+            session.get_json(f"{stub_server.url}/broken")
+        assert len(stub_server.requests) == 2
+        assert len(clock.sleeps) == 1
+
+    def test_corrupt_gzip_is_retried(self, stub_server):
+        stub_server.add(
+            "/flaky",
+            (200, b"not gzip at all", {"Content-Encoding": "gzip"}),
+            (200, {"ok": True}, {"gzip": True}),
+        )
+        session, _ = _session(max_retries=1)
+
+        assert session.get_json(f"{stub_server.url}/flaky") == {"ok": True}
+
+
+class TestRetries:
+    def test_retries_5xx_then_succeeds(self, stub_server):
+        stub_server.add("/flaky", (503, {}), (502, {}), (200, {"ok": True}))
+        session, clock = _session(max_retries=2, backoff_base=0.5)
+
+        assert session.get_json(f"{stub_server.url}/flaky") == {"ok": True}
+        assert len(stub_server.requests) == 3
+        assert len(clock.sleeps) == 2
+        # Full jitter: attempt n sleeps within [0, base * 2**n]
+        assert 0 <= clock.sleeps[0] <= 0.5
+        assert 0 <= clock.sleeps[1] <= 1.0
+
+    def test_gives_up_after_max_retries(self, stub_server):
+        stub_server.add("/down", (503, {}))
+        session, _ = _session(max_retries=1)
+
+        with pytest.raises(HTTPStatusError) as exc_info:
+            session.get(f"{stub_server.url}/down")
+        assert exc_info.value.code == 503
+        assert len(stub_server.requests) == 2
+
+    def test_client_errors_are_not_retried(self, stub_server):
+        stub_server.add("/forbidden", (403, {}))
+        session, clock = _session()
+
+        with pytest.raises(HTTPStatusError):
+            session.get(f"{stub_server.url}/forbidden")
+        assert len(stub_server.requests) == 1
+        assert clock.sleeps == []
+
+    def test_retry_after_is_honoured(self, stub_server):
+        stub_server.add("/limited", (429, {}, {"Retry-After": "2"}), (200, {}))
+        session, clock = _session(backoff_base=0.1)
+
+        session.get(f"{stub_server.url}/limited")
+        assert clock.sleeps == [2.0]
+
+    def test_connection_refused_raises_transport_error(self):
+        import socket
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        session, clock = _session(max_retries=2)
+
+        with pytest.raises(TransportError):
+            session.get(f"http://127.0.0.1:{port}/x")
+        assert len(clock.sleeps) == 2
+
+    def test_jitter_is_seeded(self):
+        a, _ = _session()
+        b, _ = _session()
+        assert [a._backoff(i) for i in range(4)] == [b._backoff(i) for i in range(4)]
+
+
+class TestRateLimit:
+    def test_requests_to_limited_host_are_spaced(self, stub_server):
+        stub_server.add("/ping", (200, {}))
+        session, clock = _session(rate_limits={"127.0.0.1": 4.0})
+
+        for _ in range(3):
+            session.get(f"{stub_server.url}/ping")
+
+        # First request goes immediately, then one slot every 0.25s
+        assert clock.sleeps == pytest.approx([0.25, 0.25])
+
+    def test_unlisted_host_is_not_limited(self, stub_server):
+        stub_server.add("/ping", (200, {}))
+        session, clock = _session(rate_limits={"example.com": 1.0})
+
+        for _ in range(3):
+            session.get(f"{stub_server.url}/ping")
+        assert clock.sleeps == []
+
+    def test_subdomains_share_the_limit(self):
+        session, _ = _session(rate_limits={"financialmodelingprep.com": 5.0})
+        assert session._rate_for("api.financialmodelingprep.com") == 5.0
+        assert session._rate_for("financialmodelingprep.com") == 5.0
+        assert session._rate_for("notfinancialmodelingprep.com") is None
+
+
+class TestBacktestFetcher:
+    def test_fmp_historical_uses_pooled_session(self, stub_server):
+        from trading.backtest.data_provider import DataProvider
+        from trading.config import AlpacaConfig, FMPConfig
+
+        stub_server.add("/historical-price-full/%5EVIX", (200, {
+            "historical": [
+                {"date": "2026-01-06", "close": 18.0, "open": 17.5},
+                {"date": "2026-01-05", "close": 17.0},
+            ],
+        }, {"gzip": True}))
+        dp = DataProvider(AlpacaConfig(), FMPConfig(api_key="k", base_url=stub_server.url))
+
+        close, open_ = dp._fetch_fmp_historical("^VIX", date(2026, 1, 5), date(2026, 1, 6))
+        dp._fetch_fmp_historical("^VIX", date(2026, 1, 5), date(2026, 1, 6))
+
+        assert close == {date(2026, 1, 6): 18.0, date(2026, 1, 5): 17.0}
+        assert open_ == {date(2026, 1, 6): 17.5}
+        assert len(stub_server.client_ports) == 1
+        assert stub_server.requests[0][1]["User-Agent"] == "trading-backtest"
@@ -0,0 +1,116 @@
+"""Tests for MarketMonitor's concurrent source fetches."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from trading.layer1.market_monitor import MarketMonitor
+
+
+def _slow(delay: float, value):
+    def _fn(*args, **kwargs):
+        time.sleep(delay)
+        return value
+    return _fn
+
+
+@pytest.fixture
+def make_monitor(tmp_db, config):
+    monitors: list[MarketMonitor] = []
+
+    def _make(deadline: float = 5.0, fmp_delay=0.0, treasury_delay=0.0, alpaca_delay=0.0):
+        cfg = replace(config, market_data_deadline_sec=deadline)
+        with patch("trading.layer1.market_monitor.FMPClient"), \
+                patch("trading.layer1.market_monitor.AlpacaClient"):
+            monitor = MarketMonitor(cfg, tmp_db)
+        monitor._fmp = MagicMock()
+        monitor._fmp.fetch_quotes.side_effect = _slow(
+            fmp_delay, {"^VIX": {"price": 21.0}, "^GSPC": {"price": 6900.0}},
+        )
+        monitor._fmp.fetch_treasury.side_effect = _slow(treasury_delay, {"year10": 4.40})
+        monitor._alpaca = MagicMock()
+        monitor._alpaca.get_quotes.side_effect = _slow(alpaca_delay, {"SPY": 690.0})
+        monitors.append(monitor)
+        return monitor
+
+    yield _make
+    for m in monitors:
+        m.close()
+
+
+class TestConcurrentFetch:
+    def test_latency_is_slowest_source_not_sum(self, make_monitor):
+        monitor = make_monitor(fmp_delay=0.3, treasury_delay=0.3, alpaca_delay=0.3)
+
+        t0 = time.perf_counter()
+        md = monitor.fetch_market_data()
+        elapsed = time.perf_counter() - t0
+
+        assert elapsed < 0.8  # sequential would be >= 0.9s
+        assert md.vix == 21.0
+        assert md.us10y == 4.40
+        assert md.etf_prices == {"SPY": 690.0}
+
+    def test_sources_run_on_separate_threads(self, make_monitor):
+        monitor = make_monitor()
+        seen: set[str] = set()
+        barrier = threading.Barrier(3, timeout=2)
+
+        def _record(value):
+            def _fn(*args, **kwargs):
+                seen.add(threading.current_thread().name)
+                barrier.wait()  # deadlocks unless all three run at once
+                return value
+            return _fn
+
+        monitor._fmp.fetch_quotes.side_effect = _record({"^VIX": {"price": 20.0}})
+        monitor._fmp.fetch_treasury.side_effect = _record({"year10": 4.3})
+        monitor._alpaca.get_quotes.side_effect = _record({"SPY": 680.0})
+
+        md = monitor.fetch_market_data()
+
+        assert len(seen) == 3
+        assert md.vix == 20.0
+
+    def test_late_fmp_falls_back_to_previous(self, make_monitor, tmp_db):
+        tmp_db.save_market_state(
+            timestamp=datetime.now().isoformat(), vix=18.5, us10y=4.1, sp500=6700.0,
+        )
+        tmp_db.set_state("consecutive_api_failures", "0")
+        monitor = make_monitor(deadline=0.2, fmp_delay=1.0)
+
+        t0 = time.perf_counter()
+        md = monitor.fetch_market_data()
+        elapsed = time.perf_counter() - t0
+
+        assert elapsed < 0.8
+        assert md.vix == 18.5  # previous value via resolve_conflict
+        assert md.sp500 == 6700.0
+        assert md.etf_prices == {"SPY": 690.0}
+        assert tmp_db.get_state("consecutive_api_failures") == "1"
+
+    def test_late_treasury_keeps_previous_yield(self, make_monitor, tmp_db):
+        tmp_db.save_market_state(timestamp=datetime.now().isoformat(), us10y=4.1)
+        monitor = make_monitor(deadline=0.2, treasury_delay=1.0)
+
+        md = monitor.fetch_market_data()
+
+        assert md.vix == 21.0
+        assert md.us10y == 4.1
+        assert tmp_db.get_state("consecutive_api_failures") == "0"
+
+    def test_source_exception_counts_as_failure(self, make_monitor, tmp_db):
+        tmp_db.set_state("consecutive_api_failures", "0")
+        monitor = make_monitor()
+        monitor._fmp.fetch_quotes.side_effect = RuntimeError("boom")
+
+        md = monitor.fetch_market_data()
+
+        assert md.etf_prices == {"SPY": 690.0}
+        assert tmp_db.get_state("consecutive_api_failures") == "1"
@@ -0,0 +1,164 @@
+"""Tests for the versioned migration runner."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from trading.data.database import Database
+from trading.data.migrator import (
+    MigrationError,
+    MigrationRunner,
+    discover_migrations,
+    main,
+    split_sql,
+)
+
+
+def _write(directory, name, text):
+    (directory / name).write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def mig_dir(tmp_path):
+    d = tmp_path / "migrations"
+    d.mkdir()
+    _write(d, "001_base.sql", "CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT);\n")
+    _write(d, "002_seed.py", (
+        "def upgrade(conn):\n"
+        "    conn.executemany('INSERT INTO t (v) VALUES (?)', [('a',), ('b',)])\n"
+    ))
+    _write(d, "README.md", "not a migration")
+    return d
+
+
+def _tables(conn) -> set[str]:
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+class TestDiscovery:
+    def test_sorted_and_typed(self, mig_dir):
+        migs = discover_migrations(mig_dir)
+        assert [(m.version, m.name, m.kind) for m in migs] == [
+            (1, "base", "sql"), (2, "seed", "py"),
+        ]
+
+    def test_duplicate_version_rejected(self, mig_dir):
+        _write(mig_dir, "002_other.sql", "SELECT 1;")
+        with pytest.raises(MigrationError, match="Duplicate"):
+            discover_migrations(mig_dir)
+
+    def test_split_sql_keeps_trigger_body(self):
+        script = (
+            "-- comment\n"
+            "CREATE TABLE a (x);\n\n"
+            "CREATE TRIGGER tr AFTER INSERT ON a BEGIN\n"
+            "    UPDATE a SET x = 1;\n"
+            "END;\n"
+        )
+        stmts = split_sql(script)
+        assert len(stmts) == 2
+        assert stmts[1].startswith("CREATE TRIGGER") and stmts[1].endswith("END;")
+
+
+class TestRunner:
+    def test_applies_sql_and_python_in_order(self, mig_dir):
+        conn = sqlite3.connect(":memory:")
+        runner = MigrationRunner(conn, mig_dir)
+
+        applied = runner.apply()
+
+        assert [a.migration.version for a in applied] == [1, 2]
+        assert runner.current_version() == 2
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+        assert runner.apply() == []
+
+    def test_only_new_migrations_run(self, mig_dir):
+        conn = sqlite3.connect(":memory:")
+        MigrationRunner(conn, mig_dir).apply()
+        _write(mig_dir, "003_col.sql", "ALTER TABLE t ADD COLUMN w REAL;\n")
+
+        applied = MigrationRunner(conn, mig_dir).apply()
+
+        assert [a.migration.version for a in applied] == [3]
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+
+    def test_failed_migration_rolls_back(self, mig_dir):
+        _write(mig_dir, "003_bad.sql", (
+            "ALTER TABLE t ADD COLUMN w REAL;\n"
+            "INSERT INTO missing_table VALUES (1);\n"
+        ))
+        conn = sqlite3.connect(":memory:")
+        runner = MigrationRunner(conn, mig_dir)
+
+        with pytest.raises(MigrationError, match="003_bad.sql"):
+            runner.apply()
+
+        assert runner.current_version() == 2
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(t)")]
+        assert "w" not in cols
+
+    def test_dry_run_leaves_database_unchanged(self, mig_dir):
+        conn = sqlite3.connect(":memory:")
+        runner = MigrationRunner(conn, mig_dir)
+
+        planned = runner.apply(dry_run=True)
+
+        assert [a.migration.version for a in planned] == [1, 2]
+        assert "t" not in _tables(conn)
+        assert runner.current_version() == 0
+
+    def test_python_migration_without_upgrade(self, mig_dir):
+        _write(mig_dir, "003_empty.py", "x = 1\n")
+        conn = sqlite3.connect(":memory:")
+        with pytest.raises(MigrationError, match="upgrade"):
+            MigrationRunner(conn, mig_dir).apply()
+
+
+class TestDatabaseMigrate:
+    def test_fresh_database_reaches_latest(self, tmp_db):
+        latest = discover_migrations()[-1].version
+        runner = MigrationRunner(tmp_db.conn)
+        assert runner.current_version() == latest
+        assert tmp_db.migrate() == []
+
+    def test_dry_run(self, tmp_path):
+        db = Database(tmp_path / "dry.db")
+        db.connect()
+        planned = db.migrate(dry_run=True)
+        assert planned
+        assert "trades" not in _tables(db.conn)
+        db.close()
+
+    def test_cli_status_and_apply(self, tmp_path, capsys):
+        path = tmp_path / "cli.db"
+        assert main(["--db", str(path), "--dry-run"]) == 0
+        assert "Would apply 001_initial.sql" in capsys.readouterr().out
+        assert main(["--db", str(path)]) == 0
+        assert main(["--db", str(path), "--status"]) == 0
+        out = capsys.readouterr().out
+        assert "pending" not in out.split("Current version")[-1]
+
+
+class TestYearOfData:
+    """Migration time on a database holding a year of 15-minute ticks."""
+
+    def test_upgrade_year_of_history(self, year_db):
+        db = Database(year_db)
+        db.connect()
+        n_states = db.conn.execute("SELECT COUNT(*) FROM market_states").fetchone()[0]
+        assert n_states > 6000
+
+        start = time.perf_counter()
+        applied = db.migrate()
+        elapsed = time.perf_counter() - start
+
+        assert [a.migration.version for a in applied][0] == 1
+        assert elapsed < 5.0
+        missing = db.conn.execute(
+            "SELECT COUNT(*) FROM trades WHERE trade_date IS NULL"
+        ).fetchone()[0]
+        assert missing == 0
+        db.close()
@@ -0,0 +1,263 @@
+"""Tests for the multi-account orchestrator."""
+
+from __future__ import annotations
+
+import dataclasses
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import pytz
+
+from trading import multi_account
+from trading.config import AccountConfig, AlpacaConfig, TradingConfig
+from trading.data.models import CheckResult, Portfolio, Position, StrategyIntent
+from trading.layer1.stop_loss_manager import StopLossManager
+from trading.layer2.agent_runner import AgentDecision
+from trading.multi_account import MultiAccountSystem
+
+BLOG = Path(__file__).resolve().parents[2] / "blogs" / "2025-11-17-weekly-strategy-en.md"
+ET = pytz.timezone("US/Eastern")
+TUESDAY_10AM = ET.localize(datetime(2026, 2, 17, 10, 0))
+
+
+def _account(name: str, **risk) -> AccountConfig:
+    return AccountConfig(
+        name=name, alpaca=AlpacaConfig(api_key=f"k-{name}", secret_key="s"), risk=risk,
+    )
+
+
+def _holding(portfolio: Portfolio, symbol: str, value: float, price: float) -> Portfolio:
+    positions = dict(portfolio.positions)
+    positions[symbol] = Position(
+        symbol=symbol, shares=value / price, market_value=value,
+        cost_basis=value, current_price=price,
+    )
+    return dataclasses.replace(portfolio, positions=positions)
+
+
+@pytest.fixture
+def on_target(sample_portfolio):
+    """Matches the base scenario exactly (cash parked in BIL)."""
+    return dataclasses.replace(_holding(sample_portfolio, "BIL", 28000, 91.5), cash=0)
+
+
+@pytest.fixture
+def base_intent(sample_strategy_spec):
+    return StrategyIntent(
+        run_id="run1",
+        scenario="base",
+        rationale="stay the course",
+        target_allocation=dict(sample_strategy_spec.scenarios["base"].allocation),
+        priority_actions=[],
+        confidence="high",
+        blog_reference="2026-02-16",
+    )
+
+
+@pytest.fixture
+def make_system(config, sample_market_data, base_intent):
+    """Build a system whose broker, rules and agent are stubbed."""
+    systems = []
+
+    def make(*accounts: AccountConfig) -> MultiAccountSystem:
+        system = MultiAccountSystem(dataclasses.replace(config, accounts=accounts))
+        systems.append(system)
+        system._monitor = MagicMock()
+        system._monitor.fetch_market_data.return_value = sample_market_data
+        system._agent = MagicMock()
+        system._agent.decide.return_value = AgentDecision(intent=base_intent, fingerprint="fp")
+        for account in system._accounts:
+            account.alpaca = MagicMock()
+            account._rule_engine = MagicMock()
+            account._rule_engine.check.return_value = CheckResult.NO_ACTION()
+            account._stop_mgr = MagicMock()
+        return system
+
+    yield make
+    for system in systems:
+        system.shutdown()
+
+
+@pytest.fixture
+def system(make_system):
+    return make_system(_account("paper"), _account("live"))
+
+
+def _accounts(system):
+    return {a.name: a for a in system._accounts}
+
+
+def _count(db, table: str) -> int:
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestAccountConfig:
+    def test_for_account_isolates_db_and_limits(self, config):
+        derived = config.for_account(_account("live", max_daily_loss_pct=-2.0))
+        assert derived.db_path == config.db_path.parent / "accounts" / "live.db"
+        assert derived.alpaca.api_key == "k-live"
+        assert derived.max_daily_loss_pct == -2.0
+        assert derived.max_weekly_loss_pct == config.max_weekly_loss_pct
+
+    def test_account_dry_run_only_adds_caution(self, config):
+        live = dataclasses.replace(config, dry_run=False)
+        assert live.for_account(_account("a")).dry_run is False
+        cautious = dataclasses.replace(_account("a"), dry_run=True)
+        assert live.for_account(cautious).dry_run is True
+        assert config.for_account(_account("a")).dry_run is True
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("TRADING_ACCOUNTS", "paper, live")
+        monkeypatch.setenv("ACCOUNT_LIVE_ALPACA_API_KEY", "live-key")
+        monkeypatch.setenv("ACCOUNT_LIVE_ALPACA_BASE_URL", "https://api.alpaca.markets")
+        monkeypatch.setenv("ACCOUNT_LIVE_MAX_DAILY_ORDERS", "4")
+        monkeypatch.setenv("ACCOUNT_PAPER_DRY_RUN", "true")
+
+        paper, live = TradingConfig.from_env().accounts
+        assert (paper.name, paper.dry_run, paper.risk) == ("paper", True, {})
+        assert live.alpaca.api_key == "live-key" and not live.alpaca.is_paper
+        assert live.risk == {"max_daily_orders": 4}
+
+
+class TestMultiAccountSystem:
+    def test_requires_distinct_accounts(self, make_system):
+        with pytest.raises(ValueError):
+            make_system()
+        with pytest.raises(ValueError):
+            make_system(_account("a"), _account("a"))
+
+    def test_account_check_records_shared_market_state(
+        self, system, sample_market_data, sample_portfolio, sample_strategy_spec,
+    ):
+        system._db.set_state("consecutive_api_failures", "2")
+        for account in system._accounts:
+            account.alpaca.get_portfolio.return_value = sample_portfolio
+
+        checks = system._check_accounts(sample_market_data, sample_strategy_spec, TUESDAY_10AM)
+
+        assert [c.account for c in checks] == ["paper", "live"]
+        assert all(c.tradable for c in checks)
+        for account in system._accounts:
+            state = account.submit(lambda db=account.db: (
+                _count(db, "market_states"),
+                db.get_state("consecutive_api_failures"),
+                db.get_high_water_mark(),
+            )).result()
+            assert state == (1, "2", sample_portfolio.account_value)
+
+    def test_stop_orders_use_the_shared_calibration(
+        self, system, sample_market_data, sample_portfolio, sample_strategy_spec,
+    ):
+        system._db.save_calibration(date.today(), "SPY", "^GSPC", 10.0)
+        system._blog_just_updated = True
+        brokers = {}
+        for account in system._accounts:
+            account.alpaca.get_portfolio.return_value = sample_portfolio
+            live = dataclasses.replace(account.config, dry_run=False)
+            account._stop_mgr = StopLossManager(live, account.db)
+            broker = account._stop_mgr._alpaca = brokers[account.name] = MagicMock()
+            broker.list_open_stop_orders.return_value = []
+
+        system._check_accounts(sample_market_data, sample_strategy_spec, TUESDAY_10AM)
+
+        for broker in brokers.values():
+            (order,), _ = broker.submit_order.call_args
+            assert (order.symbol, order.order_type, order.stop_price) == ("SPY", "stop", 630.0)
+
+    def test_agent_runs_once_and_each_account_trades_its_own_portfolio(
+        self, system, sample_market_data, sample_strategy_spec, on_target,
+    ):
+        accounts = _accounts(system)
+        drifted = dataclasses.replace(
+            _holding(on_target, "SPY", 17000, 683.1), cash=5000,
+        )
+        accounts["paper"].alpaca.get_portfolio.return_value = on_target
+        accounts["live"].alpaca.get_portfolio.return_value = drifted
+        accounts["live"]._rule_engine.check.return_value = (
+            CheckResult.TRIGGER_FIRED("portfolio_drift_exceeded")
+        )
+        checks = system._check_accounts(sample_market_data, sample_strategy_spec, TUESDAY_10AM)
+
+        results = system._run_agent_pipeline(
+            "portfolio_drift_exceeded", sample_market_data, checks,
+            sample_strategy_spec, checks[1],
+        )
+
+        assert results == {"paper": "APPROVED", "live": "APPROVED"}
+        system._agent.decide.assert_called_once()
+        assert system._agent.decide.call_args.args[2] is drifted
+        trades = {
+            name: a.submit(lambda db=a.db: [
+                (r["symbol"], r["side"], r["status"])
+                for r in db.conn.execute("SELECT * FROM trades")
+            ]).result()
+            for name, a in accounts.items()
+        }
+        assert trades == {"paper": [], "live": [("SPY", "buy", "dry_run")]}
+
+    def test_account_limits_apply_per_account(
+        self, make_system, sample_market_data, sample_strategy_spec, on_target,
+    ):
+        system = make_system(_account("paper"), _account("live", max_daily_orders=0))
+        for account in system._accounts:
+            account.alpaca.get_portfolio.return_value = on_target
+        checks = system._check_accounts(sample_market_data, sample_strategy_spec, None)
+
+        results = system._run_agent_pipeline(
+            "daily_check", sample_market_data, checks, sample_strategy_spec,
+        )
+        assert results == {"paper": "APPROVED", "live": "REJECTED"}
+        assert system._agent.decide.call_args.kwargs["current_scenario"] == "base"
+        # Only an approved intent moves the account's current scenario
+        scenarios = {
+            a.name: a.submit(a.db.get_state, "current_scenario", None).result()
+            for a in system._accounts
+        }
+        assert scenarios == {"paper": "base", "live": None}
+
+    def test_halted_and_failed_accounts_are_not_traded(
+        self, system, sample_market_data, sample_portfolio, sample_strategy_spec,
+    ):
+        accounts = _accounts(system)
+        accounts["paper"].alpaca.get_portfolio.side_effect = RuntimeError("boom")
+        accounts["live"].alpaca.get_portfolio.return_value = sample_portfolio
+        accounts["live"]._rule_engine.check.return_value = CheckResult.HALT("drawdown_exceeded")
+
+        checks = system._check_accounts(sample_market_data, sample_strategy_spec, TUESDAY_10AM)
+
+        assert checks[0].portfolio is None
+        assert checks[1].result.reason == "drawdown_exceeded"
+        assert system._run_agent_pipeline(
+            "index_hit_level", sample_market_data, checks, sample_strategy_spec,
+        ) == {}
+        system._agent.decide.assert_not_called()
+
+
+def test_market_tick_end_to_end(system, config, sample_portfolio, monkeypatch):
+    class _Now(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return TUESDAY_10AM.astimezone(tz) if tz else TUESDAY_10AM
+
+    monkeypatch.setattr(multi_account, "datetime", _Now)
+    config.blogs_dir.mkdir()
+    shutil.copy(BLOG, config.blogs_dir / "2026-02-16-weekly-strategy.md")
+    system._db.set_state("daily_check_2026-02-17", "1")
+    accounts = _accounts(system)
+    for account in system._accounts:
+        account.alpaca.get_portfolio.return_value = sample_portfolio
+    accounts["live"]._rule_engine.check.return_value = CheckResult.TRIGGER_FIRED("index_hit_level")
+
+    system.market_tick()
+
+    system._monitor.fetch_market_data.assert_called_once()
+    system._agent.decide.assert_called_once()
+    assert system._agent.decide.call_args.args[0] == "index_hit_level"
+    for account in system._accounts:
+        account._stop_mgr.sync_stop_orders.assert_called_once()  # first blog load
+    rows = system._db.get_tick_metrics("2000-01-01")
+    assert rows[0]["phase"] == "total" and rows[0]["outcome"] == "trigger_fired"
+    assert {"accounts_check", "agent", "accounts_execute"} <= {r["phase"] for r in rows}
@@ -0,0 +1,146 @@
+"""Tests for background, batched email delivery."""
+
+from __future__ import annotations
+
+import dataclasses
+import email
+import time
+
+import pytest
+
+from trading.config import EmailConfig, TradingConfig
+from trading.services.email_notifier import EmailNotifier
+from trading.services.notification_queue import NotificationQueue
+
+
+def _email_config(smtp_server, **overrides) -> EmailConfig:
+    return dataclasses.replace(
+        EmailConfig(
+            smtp_host="127.0.0.1", smtp_port=smtp_server.port,
+            sender="bot@example.com", password="secret", recipient="me@example.com",
+            smtp_starttls=False, digest_interval_sec=60.0,
+        ),
+        **overrides,
+    )
+
+
+def _body(data: str) -> str:
+    return email.message_from_string(data).get_payload(decode=True).decode("utf-8")
+
+
+@pytest.fixture
+def queue(smtp_server):
+    q = NotificationQueue(_email_config(smtp_server))
+    yield q
+    q.shutdown(5)
+
+
+class TestNotificationQueue:
+    def test_info_and_alert_coalesce_into_one_digest(self, queue, smtp_server):
+        queue.put("INFO", "orders executed")
+        queue.put("ALERT", "order rejected")
+        queue.put("INFO", "rebalanced")
+        assert smtp_server.messages == []  # still inside the digest window
+
+        assert queue.flush(5)
+        assert smtp_server.subjects() == ["[ALERT] Trading Bot (3 notifications)"]
+        body = _body(smtp_server.messages[0][2])
+        assert "[INFO] orders executed" in body and "[ALERT] order rejected" in body
+
+    def test_digest_window_elapses(self, smtp_server):
+        q = NotificationQueue(_email_config(smtp_server, digest_interval_sec=0.1))
+        try:
+            q.put("INFO", "one")
+            q.put("INFO", "two")
+            deadline = time.monotonic() + 5
+            while not smtp_server.messages and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert smtp_server.subjects() == ["[INFO] Trading Bot (2 notifications)"]
+        finally:
+            q.shutdown(5)
+
+    def test_critical_sent_immediately(self, queue, smtp_server):
+        queue.put("INFO", "routine")
+        queue.put("CRITICAL", "unhandled error")
+
+        deadline = time.monotonic() + 5
+        while len(smtp_server.messages) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # Critical goes alone; the pending INFO rides the same connection.
+        assert smtp_server.subjects() == ["[CRITICAL] Trading Bot", "[INFO] Trading Bot"]
+        assert smtp_server.connections == 1
+
+    def test_connection_reused_across_flushes(self, queue, smtp_server):
+        for i in range(3):
+            queue.put("ALERT", f"alert {i}")
+            assert queue.flush(5)
+
+        assert len(smtp_server.messages) == 3
+        assert smtp_server.connections == 1
+        assert smtp_server.logins == 1
+        assert queue.connections_opened == 1
+
+    def test_bounded_queue_drops_oldest_noncritical(self, smtp_server):
+        q = NotificationQueue(_email_config(smtp_server, queue_size=3))
+        with q._cond:  # hold the worker off so nothing drains meanwhile
+            for level, body in [("CRITICAL", "keep me"), ("INFO", "oldest"),
+                                ("INFO", "middle"), ("INFO", "newest")]:
+                q.put(level, body)
+            assert [body for _, body in q._pending] == ["keep me", "middle", "newest"]
+            assert q.dropped == 1
+        q.shutdown(5)
+
+        bodies = "".join(_body(data) for _, _, data in smtp_server.messages)
+        assert "keep me" in bodies and "newest" in bodies and "oldest" not in bodies
+
+    def test_full_queue_never_drops_critical(self, smtp_server):
+        q = NotificationQueue(_email_config(smtp_server, queue_size=1))
+        with q._cond:  # hold the worker off so the queue stays full
+            q.put("CRITICAL", "first")
+            q.put("INFO", "dropped")
+            q.put("CRITICAL", "second")
+            assert [body for _, body in q._pending] == ["first", "second"]
+            assert q.dropped == 1
+        q.shutdown(5)
+        assert "[CRITICAL] Trading Bot" in smtp_server.subjects()
+
+    def test_shutdown_flushes_pending(self, queue, smtp_server):
+        queue.put("INFO", "a")
+        queue.put("ALERT", "b")
+        queue.shutdown(5)
+
+        assert len(smtp_server.messages) == 1
+        assert queue.pending == 0
+
+    def test_smtp_failure_does_not_raise(self, smtp_server):
+        q = NotificationQueue(_email_config(smtp_server, smtp_port=1), timeout=0.5)
+        q.put("CRITICAL", "nobody listening")
+        assert q.flush(5)
+        q.shutdown(5)
+        assert q.emails_sent == 0
+
+
+class TestEmailNotifier:
+    def test_slow_server_does_not_block_notify(self, tmp_path, smtp_server):
+        smtp_server.delay = 0.2
+        config = TradingConfig(
+            dry_run=True, log_dir=tmp_path / "logs",
+            email=_email_config(smtp_server, digest_interval_sec=0.0),
+        )
+        notifier = EmailNotifier(config)
+
+        start = time.monotonic()
+        notifier.critical("first")
+        notifier.alert("second")
+        assert time.monotonic() - start < 0.1
+
+        notifier.shutdown(10)
+        assert len(smtp_server.messages) >= 1
+        log = next((tmp_path / "logs").glob("notifications_*.log")).read_text()
+        assert "[CRITICAL]" in log and "[ALERT]" in log
+
+    def test_unconfigured_email_only_logs(self, tmp_path):
+        notifier = EmailNotifier(TradingConfig(dry_run=True, log_dir=tmp_path))
+        notifier.info("no smtp")
+        assert notifier._queue is None
+        assert notifier.flush(1)
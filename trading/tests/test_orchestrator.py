@@ -0,0 +1,93 @@
+"""Tests for the transaction scope of scheduler runs."""
+
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from trading.config import AlpacaConfig
+from trading.data.database import Database
+from trading.data.models import CheckResult
+from trading.layer2.agent_runner import AgentDecision
+
+
+@pytest.fixture
+def system(config, sample_market_data, sample_portfolio, sample_strategy_spec):
+    from trading.main import TradingSystem
+
+    config = dataclasses.replace(config, alpaca=AlpacaConfig(api_key="k", secret_key="s"))
+    system = TradingSystem(config)
+    system._closed_reason = MagicMock(return_value=None)
+    system._ensure_strategy = MagicMock(return_value=sample_strategy_spec)
+
+    def fetch_market_data():
+        system._db.save_market_state(
+            timestamp=sample_market_data.timestamp.isoformat(),
+            vix=sample_market_data.vix,
+        )
+        return sample_market_data
+
+    system._monitor = MagicMock()
+    system._monitor.fetch_market_data.side_effect = fetch_market_data
+    system._monitor.fetch_portfolio.return_value = sample_portfolio
+    system._monitor.calibrate_index_etf_ratios.return_value = {}
+    system._rule_engine = MagicMock()
+    system._rule_engine.check.return_value = CheckResult.TRIGGER_FIRED("index_hit_level")
+    system._agent = MagicMock()
+    yield system
+    system.shutdown()
+
+
+def _today_et() -> str:
+    import pytz
+    return datetime.now(pytz.timezone("US/Eastern")).date().isoformat()
+
+
+class TestTickTransactionScope:
+    def test_bookkeeping_commits_before_the_agent_runs(self, system):
+        system._db.set_state(f"daily_check_{_today_et()}", "1")
+        seen = {}
+
+        def decide(*args, **kwargs):
+            # Another connection (retention, migrator, CLIs) must not be
+            # locked out while the agent call is in flight.
+            other = sqlite3.connect(system._db.db_path, timeout=0.1)
+            try:
+                seen["states"] = other.execute(
+                    "SELECT COUNT(*) FROM market_states"
+                ).fetchone()[0]
+                other.execute(
+                    "INSERT INTO state (key, value, updated_at) "
+                    "VALUES ('operator', '1', '')"
+                )
+                other.commit()
+            finally:
+                other.close()
+            return AgentDecision(intent=None, fingerprint="fp")
+
+        system._agent.decide.side_effect = decide
+        system.market_tick()
+
+        assert seen == {"states": 1}
+        assert system._db.get_recent_decisions()[0]["result"] == "NO_ACTION"
+
+    def test_guard_state_survives_a_later_error(self, system, config, sample_portfolio):
+        system._run_agent_pipeline = MagicMock()
+        system._rule_engine.check.side_effect = RuntimeError("boom")
+
+        system.market_tick()
+
+        system._run_agent_pipeline.assert_called_once()
+        db = Database(config.db_path)
+        db.connect()
+        try:
+            # A rollback here would rerun the missed daily check next tick
+            assert db.get_state(f"daily_check_{_today_et()}") == "1"
+            assert db.get_previous_market_state("vix") == 20.5
+            assert db.get_high_water_mark() == sample_portfolio.account_value
+        finally:
+            db.close()
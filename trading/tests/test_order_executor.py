@@ -0,0 +1,179 @@
+"""Tests for concurrent order submission in OrderExecutor."""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from trading.data.models import Order
+from trading.layer3.fill_tracker import FillTracker
+from trading.layer3.order_executor import OrderExecutor
+
+SUBMIT_LATENCY = 0.1
+
+
+def _order(cid: str, side: str, symbol: str = "SPY", qty: float = 1.0,
+           price: float = 100.0) -> Order:
+    return Order(client_order_id=cid, symbol=symbol, side=side, quantity=qty,
+                 order_type="limit", limit_price=price)
+
+
+class _SlowClient:
+    """Broker stand-in whose submit_order blocks for SUBMIT_LATENCY."""
+
+    def __init__(self, cash: float = 1_000_000.0, fail: set[str] = frozenset()):
+        self.cash = cash
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.calls: list[tuple[str, str, float]] = []  # (cid, side, start)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit_order(self, order: Order):
+        with self.lock:
+            self.calls.append((order.client_order_id, order.side, time.monotonic()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(SUBMIT_LATENCY)
+        with self.lock:
+            self.in_flight -= 1
+        if order.client_order_id in self.fail:
+            return None
+        return {"id": f"id-{order.client_order_id}", "status": "accepted",
+                "filled_avg_price": None, "created_at": "2026-02-17T15:00:00Z"}
+
+    def get_account(self):
+        return {"cash": self.cash}
+
+    def get_orders_by_client_ids(self, ids, after=None):
+        return {}
+
+    def invalidate_portfolio(self):
+        pass
+
+
+@pytest.fixture
+def live_config(config):
+    return dataclasses.replace(config, dry_run=False, order_submit_concurrency=4,
+                               sell_settle_timeout_sec=2.0)
+
+
+def _executor(config, db, client, stream=None) -> OrderExecutor:
+    executor = OrderExecutor(config, db)
+    executor._client = client
+    executor._tracker = FillTracker(client, stream=stream, poll_interval=0.05,
+                                    stream_poll_interval=30)
+    return executor
+
+
+class TestConcurrentSubmit:
+    def test_orders_submitted_in_parallel(self, live_config, tmp_db):
+        client = _SlowClient()
+        executor = _executor(live_config, tmp_db, client)
+        orders = [_order(f"b{i}", "buy") for i in range(4)]
+
+        start = time.monotonic()
+        results = executor.execute(orders)
+        elapsed = time.monotonic() - start
+
+        assert [r["status"] for r in results] == ["accepted"] * 4
+        assert client.max_in_flight == 4
+        assert elapsed < 2 * SUBMIT_LATENCY
+        trades = {t["client_order_id"]: t["status"] for t in tmp_db.get_recent_trades()}
+        assert trades == {f"b{i}": "accepted" for i in range(4)}
+        executor.close()
+
+    def test_concurrency_is_bounded(self, live_config, tmp_db):
+        client = _SlowClient()
+        cfg = dataclasses.replace(live_config, order_submit_concurrency=2)
+        executor = _executor(cfg, tmp_db, client)
+
+        executor.execute([_order(f"b{i}", "buy") for i in range(5)])
+
+        assert client.max_in_flight == 2
+        executor.close()
+
+    def test_sells_before_buys_results_in_input_order(self, live_config, tmp_db):
+        client = _SlowClient()
+        executor = _executor(live_config, tmp_db, client)
+        orders = [_order("b1", "buy"), _order("s1", "sell"),
+                  _order("b2", "buy"), _order("s2", "sell")]
+
+        results = executor.execute(orders)
+
+        sides = [side for _, side, _ in sorted(client.calls, key=lambda c: c[2])]
+        assert sides == ["sell", "sell", "buy", "buy"]
+        assert [r["client_order_id"] for r in results] == ["b1", "s1", "b2", "s2"]
+        executor.close()
+
+    def test_duplicate_client_order_id_submitted_once(self, live_config, tmp_db):
+        client = _SlowClient()
+        executor = _executor(live_config, tmp_db, client)
+
+        results = executor.execute([_order("b1", "buy"), _order("b1", "buy")])
+
+        assert [c[0] for c in client.calls] == ["b1"]
+        assert [r["client_order_id"] for r in results] == ["b1", "b1"]
+        executor.close()
+
+    def test_failed_submission_recorded(self, live_config, tmp_db):
+        client = _SlowClient(fail={"b2"})
+        executor = _executor(live_config, tmp_db, client)
+
+        results = executor.execute([_order("b1", "buy"), _order("b2", "buy")])
+
+        assert [r["status"] for r in results] == ["accepted", "failed"]
+        trades = {t["client_order_id"]: t["status"] for t in tmp_db.get_recent_trades()}
+        assert trades["b2"] == "failed"
+        executor.close()
+
+
+class TestSellCash:
+    def test_buys_wait_for_sell_proceeds(self, live_config, tmp_db, trade_stream):
+        client = _SlowClient(cash=50.0)
+        executor = _executor(live_config, tmp_db, client, stream=trade_stream)
+        orders = [_order("s1", "sell", "QQQ", qty=2, price=100.0),
+                  _order("b1", "buy", "SPY", qty=2, price=100.0)]
+
+        filled_at = []
+
+        def _fill():
+            assert trade_stream.running.wait(2)
+            time.sleep(0.3)
+            filled_at.append(time.monotonic())
+            trade_stream.push("s1", "filled", "100.0", symbol="QQQ", qty="2")
+
+        t = threading.Thread(target=_fill)
+        t.start()
+        executor.execute(orders)
+        t.join()
+
+        buy_start = next(start for cid, _, start in client.calls if cid == "b1")
+        assert buy_start >= filled_at[0]
+        executor.close()
+
+    def test_no_wait_when_cash_covers_buys(self, live_config, tmp_db):
+        client = _SlowClient(cash=10_000.0)
+        client.get_orders_by_client_ids = MagicMock(return_value={})
+        executor = _executor(live_config, tmp_db, client)
+
+        start = time.monotonic()
+        executor.execute([_order("s1", "sell"), _order("b1", "buy")])
+
+        assert time.monotonic() - start < 4 * SUBMIT_LATENCY
+        client.get_orders_by_client_ids.assert_not_called()
+        executor.close()
+
+    def test_buys_proceed_after_settle_timeout(self, live_config, tmp_db):
+        client = _SlowClient(cash=0.0)
+        cfg = dataclasses.replace(live_config, sell_settle_timeout_sec=0.2)
+        executor = _executor(cfg, tmp_db, client)
+
+        results = executor.execute([_order("s1", "sell"), _order("b1", "buy")])
+
+        assert [r["status"] for r in results] == ["accepted", "accepted"]
+        executor.close()
@@ -0,0 +1,144 @@
+"""Tests for the shared Layer 3 execution pipeline."""
+
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import MagicMock
+
+import pytest
+
+from trading.data.models import Order, StrategyIntent, ValidationResult
+from trading.layer2.agent_runner import AgentDecision
+from trading.layer3.pipeline import ExecutionPipeline
+
+
+@pytest.fixture
+def intent(sample_strategy_spec):
+    return StrategyIntent(
+        run_id="run1",
+        scenario="bear",
+        rationale="risk off",
+        target_allocation=dict(sample_strategy_spec.scenarios["bear"].allocation),
+        priority_actions=[],
+        confidence="high",
+        blog_reference="2026-02-16",
+    )
+
+
+@pytest.fixture
+def parts(config, tmp_db, sample_portfolio):
+    parts = {
+        "validator": MagicMock(),
+        "generator": MagicMock(),
+        "executor": MagicMock(),
+        "stop_mgr": MagicMock(),
+        "notifier": MagicMock(),
+        "fetch_portfolio": MagicMock(return_value=sample_portfolio),
+    }
+    parts["validator"].validate.return_value = ValidationResult.APPROVED()
+    parts["generator"].generate.return_value = [
+        Order("c1", "SPY", "sell", 1.0, "limit", limit_price=683.0),
+    ]
+    parts["executor"].execute.return_value = [
+        {"client_order_id": "c1", "order_id": "o1", "status": "accepted",
+         "filled_price": None},
+    ]
+    return parts
+
+
+def _pipeline(config, db, parts, **kw) -> ExecutionPipeline:
+    return ExecutionPipeline(
+        config, db, parts["validator"], parts["generator"], parts["executor"],
+        parts["stop_mgr"], parts["notifier"], parts["fetch_portfolio"], **kw,
+    )
+
+
+def _run(pipeline, decision, sample_market_data, sample_portfolio, sample_strategy_spec):
+    return pipeline.run(
+        "index_hit_level", decision, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    )
+
+
+class TestExecutionPipeline:
+    def test_no_intent_is_logged(
+        self, config, tmp_db, parts, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    ):
+        decision = AgentDecision(intent=None, fingerprint="fp", fallback=True)
+        result = _run(_pipeline(config, tmp_db, parts), decision,
+                      sample_market_data, sample_portfolio, sample_strategy_spec)
+
+        assert result == "NO_ACTION"
+        row = tmp_db.get_recent_decisions()[0]
+        assert (row["result"], row["fallback"]) == ("NO_ACTION", 1)
+        parts["validator"].validate.assert_not_called()
+
+    def test_rejected_intent_alerts_with_label(
+        self, config, tmp_db, parts, intent, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    ):
+        parts["validator"].validate.return_value = ValidationResult.REJECTED(["too big"])
+        result = _run(_pipeline(config, tmp_db, parts, label="live"),
+                      AgentDecision(intent=intent, fingerprint="fp"),
+                      sample_market_data, sample_portfolio, sample_strategy_spec)
+
+        assert result == "REJECTED"
+        assert tmp_db.get_recent_decisions()[0]["result"] == "REJECTED"
+        assert parts["notifier"].alert.call_args.args[0].startswith("[live] Order rejected")
+        parts["executor"].execute.assert_not_called()
+        assert tmp_db.get_state("current_scenario", None) is None
+
+    def test_approved_without_orders_sets_scenario(
+        self, config, tmp_db, parts, intent, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    ):
+        parts["generator"].generate.return_value = []
+        result = _run(_pipeline(config, tmp_db, parts),
+                      AgentDecision(intent=intent, fingerprint="fp"),
+                      sample_market_data, sample_portfolio, sample_strategy_spec)
+
+        assert result == "APPROVED"
+        assert tmp_db.get_state("current_scenario") == "bear"
+        parts["executor"].execute.assert_not_called()
+
+    def test_live_run_waits_for_fills_and_resyncs_stops(
+        self, config, tmp_db, parts, intent, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    ):
+        live = dataclasses.replace(config, dry_run=False)
+        phases = []
+
+        def phase(name):
+            phases.append(name)
+            return MagicMock()
+
+        decision = AgentDecision(intent=intent, fingerprint="fp", cache_hit=True,
+                                 source_run_id="run0")
+        result = _run(_pipeline(live, tmp_db, parts, phase=phase), decision,
+                      sample_market_data, sample_portfolio, sample_strategy_spec)
+
+        assert result == "APPROVED"
+        parts["executor"].wait_for_fills.assert_called_once_with(["c1"])
+        parts["stop_mgr"].resync_after_fill_or_rebalance.assert_called_once_with(
+            sample_portfolio, sample_strategy_spec,
+        )
+        assert phases == [
+            "validation", "order_generation", "execution", "fills", "stop_resync",
+        ]
+        row = tmp_db.get_recent_decisions()[0]
+        assert (row["result"], row["cache_hit"], row["source_run_id"]) == (
+            "APPROVED", 1, "run0",
+        )
+        assert tmp_db.get_state("current_scenario") == "bear"
+
+    def test_dry_run_skips_fills(
+        self, config, tmp_db, parts, intent, sample_market_data, sample_portfolio,
+        sample_strategy_spec,
+    ):
+        _run(_pipeline(config, tmp_db, parts),
+             AgentDecision(intent=intent, fingerprint="fp"),
+             sample_market_data, sample_portfolio, sample_strategy_spec)
+
+        parts["executor"].wait_for_fills.assert_not_called()
+        parts["notifier"].info.assert_called_once()
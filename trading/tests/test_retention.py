@@ -0,0 +1,137 @@
+"""Tests for market_states retention and the daily OHLC rollup."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from trading.data.database import Database
+from trading.data.retention import run_retention
+from trading.layer2.tools.market_data import get_market_data
+
+
+def _tick(db, ts: str, **values) -> None:
+    db.save_market_state(timestamp=ts, **values)
+
+
+@pytest.fixture
+def history_db(tmp_db):
+    # Two old days and one recent day of 15-minute ticks
+    _tick(tmp_db, "2026-01-05T14:30:00+00:00", vix=20.0, sp500=6000.0)
+    _tick(tmp_db, "2026-01-05T14:45:00+00:00", vix=23.0, sp500=None)
+    _tick(tmp_db, "2026-01-05T15:00:00+00:00", vix=19.0, sp500=6050.0)
+    _tick(tmp_db, "2026-01-06T14:30:00+00:00", vix=18.0, copper=4.5)
+    _tick(tmp_db, "2026-02-16T14:30:00+00:00", vix=17.0, sp500=6900.0)
+    return tmp_db
+
+
+def _raw_count(db) -> int:
+    return db.conn.execute("SELECT COUNT(*) FROM market_states").fetchone()[0]
+
+
+class TestRollup:
+    def test_old_rows_rolled_into_ohlc(self, history_db):
+        result = run_retention(history_db, retain_days=30, vacuum="none",
+                               today=date(2026, 2, 17))
+
+        assert result.cutoff == date(2026, 1, 18)
+        assert result.rows_deleted == 4
+        assert result.days_rolled == 2
+        assert _raw_count(history_db) == 1
+
+        rows = {
+            (r["metric"], r["date"]): dict(r)
+            for r in history_db.conn.execute("SELECT * FROM market_states_daily")
+        }
+        vix = rows[("vix", "2026-01-05")]
+        assert (vix["open"], vix["high"], vix["low"], vix["close"], vix["samples"]) == (
+            20.0, 23.0, 19.0, 19.0, 3,
+        )
+        sp = rows[("sp500", "2026-01-05")]
+        assert (sp["open"], sp["close"], sp["samples"]) == (6000.0, 6050.0, 2)
+        assert ("copper", "2026-01-06") in rows
+
+    def test_rerun_is_noop(self, history_db):
+        run_retention(history_db, retain_days=30, vacuum="none", today=date(2026, 2, 17))
+        again = run_retention(history_db, retain_days=30, vacuum="none",
+                              today=date(2026, 2, 17))
+        assert again.rows_deleted == 0
+
+    def test_newest_row_is_kept(self, history_db):
+        run_retention(history_db, retain_days=0, vacuum="none", today=date(2026, 3, 1))
+
+        assert _raw_count(history_db) == 1
+        assert history_db.get_previous_market_state_timestamp() is not None
+
+    def test_latest_state_falls_back_to_rollup(self, history_db):
+        run_retention(history_db, retain_days=30, vacuum="none", today=date(2026, 2, 17))
+
+        latest = history_db.get_latest_market_state()
+        assert latest["vix"] == 17.0          # still intraday
+        assert latest["copper"] == 4.5        # only in the rollup now
+
+    def test_old_tick_metrics_pruned(self, tmp_db):
+        rows = [
+            ("old", "market_tick", "2026-01-05T14:30:00+00:00", "total", 900.0, "no_action"),
+            ("old", "market_tick", "2026-01-05T14:30:00+00:00", "agent", 700.0, None),
+            ("new", "market_tick", "2026-02-16T14:30:00+00:00", "total", 800.0, "no_action"),
+        ]
+        tmp_db.save_tick_metrics(rows)
+
+        result = run_retention(tmp_db, retain_days=30, vacuum="none",
+                               today=date(2026, 2, 17))
+
+        assert result.metrics_deleted == 2
+        assert [r["tick_id"] for r in tmp_db.get_tick_metrics("2000-01-01")] == ["new"]
+
+    def test_invalid_vacuum_mode(self, history_db):
+        with pytest.raises(ValueError):
+            run_retention(history_db, vacuum="sometimes")
+
+
+class TestHistory:
+    def test_history_merges_rollup_and_raw(self, history_db):
+        run_retention(history_db, retain_days=30, vacuum="none", today=date(2026, 2, 17))
+
+        history = history_db.get_daily_market_history(since=date(2026, 1, 1))
+
+        vix = [(r["date"], r["close"]) for r in history if r["metric"] == "vix"]
+        assert vix == [("2026-01-05", 19.0), ("2026-01-06", 18.0), ("2026-02-16", 17.0)]
+
+    def test_tool_returns_history_on_request(self, history_db):
+        run_retention(history_db, retain_days=30, vacuum="none", today=date(2026, 2, 17))
+
+        without = get_market_data(history_db, monitor=None)
+        assert "daily_history" not in without
+        assert without["vix"] == 17.0
+
+        with_history = get_market_data(history_db, monitor=None, history_days=365)
+        dates = {r["date"] for r in with_history["daily_history"]}
+        assert {"2026-01-05", "2026-02-16"} <= dates
+
+
+class TestVacuum:
+    def test_year_of_history_shrinks(self, year_db):
+        db = Database(year_db)
+        db.connect()
+        db.migrate()
+        db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = year_db.stat().st_size
+
+        result = run_retention(db, retain_days=30, vacuum="full", today=date(2026, 1, 2))
+
+        assert result.rows_deleted > 5000
+        assert result.vacuum == "full"
+        assert year_db.stat().st_size < size_before
+        assert db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        # Subsequent incremental runs work on the converted file
+        db.save_market_state("2026-01-03T14:30:00+00:00", vix=15.0)
+        run_retention(db, retain_days=0, vacuum="incremental", today=date(2026, 1, 10))
+        db.close()
+
+    def test_vacuum_refused_inside_transaction(self, tmp_db):
+        with tmp_db.transaction():
+            with pytest.raises(RuntimeError):
+                tmp_db.vacuum("full")
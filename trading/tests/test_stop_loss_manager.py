@@ -1,7 +1,8 @@
 """Tests for the StopLossManager (H4).
 
 Covers: index-to-ETF conversion, orphaned stop cleanup, sequence uniqueness,
-dry-run mode, resync delegation, and stop-price sanity checks.
+dry-run mode, resync delegation, stop-price sanity checks, and diff-based
+reconciliation of the stop book.
 """
 
 from __future__ import annotations
@@ -167,19 +168,12 @@ class TestSyncStopOrders:
 class TestCleanupOrphanedStops:
     """Test that orphaned stop orders are cancelled."""
 
-    @patch("trading.layer1.stop_loss_manager.AlpacaClient")
-    @patch("trading.layer1.stop_loss_manager.EmailNotifier")
-    def test_cancels_orphaned_stop(
-        self, mock_notifier_cls, mock_alpaca_cls, tmp_db, config
-    ):
+    def test_cancels_orphaned_stop(self, tmp_db):
         """Stop orders for positions we no longer hold are cancelled."""
-        from trading.layer1.stop_loss_manager import StopLossManager
-
-        mgr = StopLossManager(config, tmp_db)
-        mock_alpaca = mgr._alpaca
+        mgr = _make_manager(TradingConfig(dry_run=False), tmp_db)
 
         # Alpaca has a stop for XLE, but we only hold SPY
-        mock_alpaca.list_open_stop_orders.return_value = [
+        mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "order-xle-1", "symbol": "XLE", "stop_price": "90.0"},
         ]
 
@@ -188,30 +182,21 @@ class TestCleanupOrphanedStops:
             positions={"SPY": Position("SPY", 73.0, 50000.0, 48000.0, 683.1)},
         )
 
-        mgr._cleanup_orphaned_stops(portfolio)
+        mgr.sync_stop_orders(_make_strategy(stop_losses={}), portfolio)
 
-        mock_alpaca.cancel_order.assert_called_once_with("order-xle-1")
+        mgr._alpaca.cancel_order.assert_called_once_with("order-xle-1")
 
-    @patch("trading.layer1.stop_loss_manager.AlpacaClient")
-    @patch("trading.layer1.stop_loss_manager.EmailNotifier")
-    def test_keeps_valid_stops(
-        self, mock_notifier_cls, mock_alpaca_cls, tmp_db, config
-    ):
+    def test_keeps_valid_stops(self, tmp_db):
         """Stop orders for positions we hold are NOT cancelled."""
-        from trading.layer1.stop_loss_manager import StopLossManager
-
-        mgr = StopLossManager(config, tmp_db)
-        mock_alpaca = mgr._alpaca
+        mgr = _make_manager(TradingConfig(dry_run=False), tmp_db)
 
-        mock_alpaca.list_open_stop_orders.return_value = [
+        mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "order-spy-1", "symbol": "SPY", "stop_price": "630.0"},
         ]
 
-        portfolio = _make_portfolio()
-
-        mgr._cleanup_orphaned_stops(portfolio)
+        mgr.sync_stop_orders(_make_strategy(stop_losses={}), _make_portfolio())
 
-        mock_alpaca.cancel_order.assert_not_called()
+        mgr._alpaca.cancel_order.assert_not_called()
 
 
 class TestSeqUniqueness:
@@ -262,20 +247,30 @@ class TestResyncDelegation:
         mgr.sync_stop_orders.assert_called_once_with(strategy, portfolio)
 
 
+def _spy_only() -> Portfolio:
+    return Portfolio(
+        account_value=55000, cash=5000,
+        positions={"SPY": Position("SPY", 73.0, 50000.0, 48000.0, 683.1)},
+    )
+
+
 class TestAtomicReplace:
-    """Tests for the atomic replace_order logic in _place_or_replace_stop (F3)."""
+    """Tests for the atomic replace_order logic when applying the diff (F3)."""
 
-    def test_replace_order_called_for_single_existing(self, tmp_db, config):
-        """When one existing stop exists, replace_order() is used (not cancel+submit)."""
-        config = TradingConfig(dry_run=False)
-        mgr = _make_manager(config, tmp_db)
+    @pytest.fixture
+    def mgr(self, tmp_db):
+        # etf_stop = 6300 / 10 = 630.0
+        tmp_db.save_calibration(date.today(), "SPY", "^GSPC", 10.0)
+        return _make_manager(TradingConfig(dry_run=False), tmp_db)
 
+    def test_replace_order_called_for_single_existing(self, mgr):
+        """When one existing stop exists, replace_order() is used (not cancel+submit)."""
         mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "stop-1", "symbol": "SPY", "stop_price": "620.0"},
         ]
         mgr._alpaca.replace_order.return_value = {"id": "stop-1-replaced"}
 
-        mgr._place_or_replace_stop("SPY", 73.0, 630.0, "2026-02-16")
+        mgr.sync_stop_orders(_make_strategy(), _spy_only())
 
         mgr._alpaca.replace_order.assert_called_once_with(
             order_id="stop-1",
@@ -285,17 +280,14 @@ class TestAtomicReplace:
         mgr._alpaca.cancel_order.assert_not_called()
         mgr._alpaca.submit_order.assert_not_called()
 
-    def test_replace_fallback_on_failure(self, tmp_db, config):
+    def test_replace_fallback_on_failure(self, mgr):
         """When replace_order() fails (returns None), fall back to cancel+submit."""
-        config = TradingConfig(dry_run=False)
-        mgr = _make_manager(config, tmp_db)
-
         mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "stop-1", "symbol": "SPY", "stop_price": "620.0"},
         ]
         mgr._alpaca.replace_order.return_value = None  # Replace failed
 
-        mgr._place_or_replace_stop("SPY", 73.0, 630.0, "2026-02-16")
+        mgr.sync_stop_orders(_make_strategy(), _spy_only())
 
         # Should have called replace first
         mgr._alpaca.replace_order.assert_called_once()
@@ -304,33 +296,41 @@ class TestAtomicReplace:
         # Then submit new order
         mgr._alpaca.submit_order.assert_called_once()
 
-    def test_skip_when_stop_price_unchanged(self, tmp_db, config):
-        """When stop_price is the same, no action is taken (idempotent)."""
-        config = TradingConfig(dry_run=False)
-        mgr = _make_manager(config, tmp_db)
+    def test_no_resubmit_when_fallback_cancel_fails(self, mgr):
+        """If the old stop cannot be cancelled, no second stop is placed."""
+        mgr._alpaca.list_open_stop_orders.return_value = [
+            {"id": "stop-1", "symbol": "SPY", "stop_price": "620.0"},
+        ]
+        mgr._alpaca.replace_order.return_value = None
+        mgr._alpaca.cancel_order.return_value = False
+
+        actions = mgr.sync_stop_orders(_make_strategy(), _spy_only())
 
+        mgr._alpaca.submit_order.assert_not_called()
+        assert [a.ok for a in actions] == [False]
+
+    def test_skip_when_stop_price_unchanged(self, mgr):
+        """When stop_price is the same, no action is taken (idempotent)."""
         mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "stop-1", "symbol": "SPY", "stop_price": "630.0"},
         ]
 
-        mgr._place_or_replace_stop("SPY", 73.0, 630.0, "2026-02-16")
+        actions = mgr.sync_stop_orders(_make_strategy(), _spy_only())
 
+        assert actions == []
         mgr._alpaca.replace_order.assert_not_called()
         mgr._alpaca.cancel_order.assert_not_called()
         mgr._alpaca.submit_order.assert_not_called()
 
-    def test_multiple_existing_cancels_extras(self, tmp_db, config):
-        """When 2+ stops exist, extras are cancelled before replace on the first."""
-        config = TradingConfig(dry_run=False)
-        mgr = _make_manager(config, tmp_db)
-
+    def test_multiple_existing_cancels_extras(self, mgr):
+        """When 2+ stops exist, extras are cancelled and the first is replaced."""
         mgr._alpaca.list_open_stop_orders.return_value = [
             {"id": "stop-1", "symbol": "SPY", "stop_price": "620.0"},
             {"id": "stop-2", "symbol": "SPY", "stop_price": "615.0"},
         ]
         mgr._alpaca.replace_order.return_value = {"id": "stop-1-replaced"}
 
-        mgr._place_or_replace_stop("SPY", 73.0, 630.0, "2026-02-16")
+        mgr.sync_stop_orders(_make_strategy(), _spy_only())
 
         # Extra stop-2 should be cancelled
         mgr._alpaca.cancel_order.assert_called_once_with("stop-2")
@@ -341,3 +341,69 @@ class TestAtomicReplace:
             stop_price=630.0,
         )
         mgr._alpaca.submit_order.assert_not_called()
+
+
+class TestReconcile:
+    """The stop book is listed once and only the difference is applied."""
+
+    @pytest.fixture
+    def mgr(self, tmp_db):
+        tmp_db.save_calibration(date.today(), "SPY", "^GSPC", 10.0)   # 630.00
+        tmp_db.save_calibration(date.today(), "QQQ", "^NDX", 40.0)    # 487.50
+        return _make_manager(TradingConfig(dry_run=False), tmp_db)
+
+    def test_one_list_call_and_one_calibration_read(self, mgr, tmp_db):
+        mgr._alpaca.list_open_stop_orders.return_value = []
+        tmp_db.get_calibration = MagicMock()
+
+        actions = mgr.sync_stop_orders(_make_strategy(), _make_portfolio())
+
+        mgr._alpaca.list_open_stop_orders.assert_called_once_with()
+        tmp_db.get_calibration.assert_not_called()
+        assert sorted((a.kind, a.symbol) for a in actions) == [
+            ("submit", "QQQ"), ("submit", "SPY"),
+        ]
+        assert mgr._alpaca.submit_order.call_count == 2
+        assert all(a.ok for a in actions)
+
+    def test_resync_applies_only_changes(self, mgr):
+        """After a rebalance only the resized position and the exit change."""
+        mgr._alpaca.list_open_stop_orders.return_value = [
+            {"id": "s-spy", "symbol": "SPY", "stop_price": "630.0", "qty": "73.0"},
+            {"id": "s-qqq", "symbol": "QQQ", "stop_price": "487.5", "qty": "18.8"},
+            {"id": "s-gld", "symbol": "GLD", "stop_price": "300.0", "qty": "5"},
+        ]
+        portfolio = _make_portfolio({
+            "SPY": Position("SPY", 73.0, 50000.0, 48000.0, 683.1),
+            "QQQ": Position("QQQ", 25.0, 13000.0, 12500.0, 531.2),
+        })
+
+        actions = mgr.sync_stop_orders(_make_strategy(), portfolio)
+
+        assert sorted((a.kind, a.symbol) for a in actions) == [
+            ("cancel", "GLD"), ("replace", "QQQ"),
+        ]
+        mgr._alpaca.cancel_order.assert_called_once_with("s-gld")
+        mgr._alpaca.replace_order.assert_called_once_with(
+            order_id="s-qqq", qty=25.0, stop_price=487.5,
+        )
+        mgr._alpaca.submit_order.assert_not_called()
+
+    def test_submit_failure_alerts(self, mgr):
+        mgr._alpaca.list_open_stop_orders.return_value = []
+        mgr._alpaca.submit_order.return_value = None
+
+        mgr.sync_stop_orders(_make_strategy(), _spy_only())
+
+        mgr._notifier.alert.assert_called_once()
+
+    def test_plan_leaves_held_symbols_without_stop_alone(self):
+        from trading.layer1.stop_loss_manager import plan_stop_actions
+
+        actions = plan_stop_actions(
+            desired={},
+            open_stops=[{"id": "s-spy", "symbol": "SPY", "stop_price": "630.0"}],
+            held_symbols={"SPY"},
+        )
+
+        assert actions == []
@@ -0,0 +1,119 @@
+"""Tests for the change-aware strategy blog cache."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from trading.layer2.tools import strategy_store
+from trading.layer2.tools.strategy_store import StrategyStore
+
+BLOG = Path(__file__).resolve().parents[2] / "blogs" / "2025-11-17-weekly-strategy-en.md"
+
+
+@pytest.fixture
+def blogs(tmp_path):
+    path = tmp_path / "blogs"
+    path.mkdir()
+    shutil.copy(BLOG, path / "2026-02-16-weekly-strategy.md")
+    return path
+
+
+@pytest.fixture(params=["inotify", "stat"])
+def store(request, blogs):
+    s = StrategyStore(blogs, use_inotify=request.param == "inotify")
+    if request.param == "inotify" and not s.watching:
+        s.close()
+        pytest.skip("inotify unavailable")
+    yield s
+    s.close()
+
+
+def _rewrite(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward (coarse-mtime filesystems)."""
+    st = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestStrategyStore:
+    def test_first_refresh_parses(self, store, blogs):
+        assert store.refresh() is True
+        assert store.spec is not None
+        assert store.path == blogs / "2026-02-16-weekly-strategy.md"
+        assert store.parses == 1
+
+    def test_unchanged_directory_is_not_rescanned(self, store):
+        store.refresh()
+        assert store.refresh() is False
+        assert store.refresh() is False
+        assert store.scans == 1 and store.parses == 1
+
+    def test_newer_blog_replaces_spec(self, store, blogs):
+        store.refresh()
+        shutil.copy(BLOG, blogs / "2026-02-23-weekly-strategy.md")
+        assert store.refresh() is True
+        assert store.path.name == "2026-02-23-weekly-strategy.md"
+        assert store.parses == 2
+
+    def test_same_date_edit_reloads(self, store, blogs):
+        store.refresh()
+        first = store.spec
+        path = blogs / "2026-02-16-weekly-strategy.md"
+        _rewrite(path, path.read_text(encoding="utf-8") + "\nCorrection: typo fixed.\n")
+
+        assert store.refresh() is True
+        assert store.spec is not first
+        assert store.parses == 2
+
+    def test_touch_without_content_change_is_not_reparsed(self, store, blogs):
+        store.refresh()
+        path = blogs / "2026-02-16-weekly-strategy.md"
+        _rewrite(path, path.read_text(encoding="utf-8"))
+
+        assert store.refresh() is False
+        assert store.parses == 1
+
+    def test_parse_failure_keeps_previous_spec_once(self, store, blogs, monkeypatch):
+        store.refresh()
+        first = store.spec
+
+        def boom(path):
+            raise ValueError("bad blog")
+
+        monkeypatch.setattr(strategy_store, "parse_blog", boom)
+        shutil.copy(BLOG, blogs / "2026-02-23-weekly-strategy.md")
+        assert store.refresh() is False
+        assert store.spec is first
+        assert store.refresh() is False
+        assert store.parses == 2  # the broken blog is not retried every tick
+
+
+def test_missing_directory(tmp_path):
+    store = StrategyStore(tmp_path / "missing")
+    try:
+        assert store.refresh() is False
+        assert store.spec is None
+    finally:
+        store.close()
+
+
+def test_inotify_falls_back_to_stat_when_directory_is_replaced(blogs):
+    store = StrategyStore(blogs)
+    if not store.watching:
+        pytest.skip("inotify unavailable")
+    try:
+        store.refresh()
+        shutil.rmtree(blogs)
+        store.refresh()
+        assert not store.watching
+
+        blogs.mkdir()
+        shutil.copy(BLOG, blogs / "2026-03-02-weekly-strategy.md")
+        assert store.refresh() is True
+        assert store.path.name == "2026-03-02-weekly-strategy.md"
+    finally:
+        store.close()
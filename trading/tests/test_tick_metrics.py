@@ -0,0 +1,135 @@
+"""Tests for per-tick phase timings and the latency summary CLI."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+
+import pytest
+
+from trading.config import AlpacaConfig
+from trading.data.database import Database
+from trading.data.tick_metrics import (
+    TickTimer,
+    main,
+    percentile,
+    record_tick,
+    summarize,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTickTimer:
+    def test_spans_accumulate_per_phase(self):
+        clock = _Clock()
+        timer = TickTimer("market_tick", clock=clock)
+        with timer.span("market_fetch"):
+            clock.now += 0.120
+        with timer.span("agent"):
+            clock.now += 1.0
+        with timer.span("agent"):
+            clock.now += 0.5
+        clock.now += 0.010
+
+        assert timer.finish("trigger_fired") == pytest.approx(1630.0)
+        assert timer.phases == pytest.approx({"market_fetch": 120.0, "agent": 1500.0})
+        phases = [r[3] for r in timer.rows()]
+        assert phases == ["total", "market_fetch", "agent"]
+        assert timer.rows()[0][5] == "trigger_fired"
+
+    def test_span_recorded_when_phase_raises(self):
+        clock = _Clock()
+        timer = TickTimer("market_tick", clock=clock)
+        with pytest.raises(RuntimeError):
+            with timer.span("rule_check"):
+                clock.now += 0.2
+                raise RuntimeError("boom")
+        assert timer.phases["rule_check"] == pytest.approx(200.0)
+
+
+class TestRecordAndSummarize:
+    def test_record_persists_rows(self, tmp_db):
+        timer = TickTimer("daily_check")
+        with timer.span("strategy_load"):
+            pass
+        record_tick(tmp_db, timer)
+
+        rows = tmp_db.get_tick_metrics("2000-01-01")
+        assert [(r["job"], r["phase"]) for r in rows] == [
+            ("daily_check", "total"), ("daily_check", "strategy_load"),
+        ]
+        assert tmp_db.get_tick_metrics("2000-01-01", job="market_tick") == []
+
+    def test_json_log_line(self, tmp_db, caplog):
+        timer = TickTimer("market_tick")
+        with caplog.at_level(logging.INFO, logger="trading.tick_metrics"):
+            record_tick(tmp_db, timer, persist=False, json_log=True)
+
+        payload = json.loads(caplog.records[-1].getMessage())
+        assert payload["tick_id"] == timer.tick_id and payload["outcome"] == "skipped"
+        assert tmp_db.get_tick_metrics("2000-01-01") == []
+
+    def test_percentiles(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 95) == pytest.approx(95.05)
+        assert percentile([7.0], 95) == 7.0
+
+    def test_summary_orders_total_first_then_by_time(self):
+        rows = (
+            [{"phase": "total", "duration_ms": v} for v in (900.0, 1000.0, 5000.0)]
+            + [{"phase": "market_fetch", "duration_ms": v} for v in (100.0, 120.0)]
+            + [{"phase": "agent", "duration_ms": 4000.0}]
+        )
+        summary = summarize(rows)
+        assert [s.phase for s in summary] == ["total", "agent", "market_fetch"]
+        assert summary[0].count == 3 and summary[0].p50_ms == 1000.0
+        assert summary[0].max_ms == 5000.0
+
+
+def test_cli_prints_summary(tmp_path, capsys):
+    db_path = tmp_path / "metrics.db"
+    db = Database(db_path)
+    db.connect()
+    db.migrate()
+    for _ in range(3):
+        record_tick(db, TickTimer("market_tick"))
+    db.close()
+
+    assert main(["--db", str(db_path), "--days", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "p95 ms" in out and "total" in out
+
+    assert main(["--db", str(db_path), "--job", "daily_check"]) == 0
+    assert "No tick metrics" in capsys.readouterr().out
+
+
+def test_trading_system_records_failed_tick(config):
+    from trading.main import TradingSystem
+
+    config = dataclasses.replace(config, alpaca=AlpacaConfig(api_key="k", secret_key="s"))
+    system = TradingSystem(config)
+    try:
+        def inner(escalation=None):
+            with system._phase("strategy_load"):
+                pass
+            raise RuntimeError("boom")
+
+        system._market_tick_inner = inner
+        system.market_tick()
+
+        rows = system._db.get_tick_metrics("2000-01-01")
+        assert [(r["phase"], r["outcome"]) for r in rows] == [
+            ("total", "error"), ("strategy_load", None),
+        ]
+        assert system._tick is None
+    finally:
+        system.shutdown()